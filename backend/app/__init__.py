@@ -7,6 +7,7 @@ from flask import Flask
 from app.config.settings import load_config
 from app.api.routes import register_routes
 from app.api.error_handlers import register_error_handlers
+from app.core.zoho.api_scheduler import configure_scheduler
 
 def create_app():
     """
@@ -19,6 +20,14 @@ def create_app():
     # Load configuration
     load_config(app)
     
+    # Apply the org's API limits to every Zoho call
+    zoho_config = app.config['ZOHO_API']
+    configure_scheduler(
+        zoho_config['daily_credits'],
+        zoho_config['max_concurrency'],
+        zoho_config['max_bulk_jobs']
+    )
+    
     # Register routes and error handlers
     register_routes(app)
     register_error_handlers(app)
@@ -4,9 +4,18 @@ Defines the API endpoints for the application
 """
 
 from flask import jsonify, request
-from app.core.services.dashboard_service import get_dashboard_data
+from app.core.services.dashboard_service import (
+    find_records, get_dashboard_response, get_history, get_record, get_rollup_deals, query_rollup
+)
+from app.core.zoho.rollup_cube import DIMENSIONS
+from app.core.services.history_store import HISTORY_FIELDS
+from app.core.services.record_repository import record_attributes
 from app.core.services.data_service import trigger_data_refresh
 from app.core.utils.helpers import get_service_health
+from app.core.zoho.bulk_callbacks import register_callback_route
+
+# Most records a list endpoint returns per request
+MAX_PAGE_SIZE = 1000
 
 def register_routes(app):
     """Register all API routes with the Flask application"""
@@ -20,11 +29,148 @@ def register_routes(app):
     def dashboard_data():
         """Get processed dashboard data"""
         try:
-            data = get_dashboard_data()
-            return jsonify(data)
+            return get_dashboard_response(request.environ)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def rollup_filters():
+        """Read cube filters from repeatable query parameters, e.g. ?region=APAC&region=EMEA"""
+        return {dimension: request.args.getlist(dimension) for dimension in DIMENSIONS if dimension in request.args}
+
+    def page_limit(default=100):
+        """
+        Read ?limit=, capped at MAX_PAGE_SIZE
+
+        Raises:
+            ValueError: If the limit is not positive; SQLite would read a negative one as no limit
+        """
+        limit = request.args.get('limit', default=default, type=int)
+        if limit < 1:
+            raise ValueError('limit must be a positive integer')
+        return min(limit, MAX_PAGE_SIZE)
+
+    def page_offset():
+        """
+        Read ?offset=
+
+        Raises:
+            ValueError: If the offset is negative
+        """
+        offset = request.args.get('offset', default=0, type=int)
+        if offset < 0:
+            raise ValueError('offset must not be negative')
+        return offset
+
+    @app.route('/api/rollup')
+    def rollup():
+        """Get deal totals grouped by cube dimensions, e.g. ?group_by=region,stage&quarter=2024-2025 Q1"""
+        try:
+            group_by = [d for d in request.args.get('group_by', '').split(',') if d]
+            return jsonify(query_rollup(group_by, rollup_filters()))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/rollup/deals')
+    def rollup_deals():
+        """Get the deals behind a rollup slice"""
+        try:
+            return jsonify(get_rollup_deals(rollup_filters(), page_limit()))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    def history_response(view, **params):
+        """Run a history query, answering 400 for invalid parameters"""
+        try:
+            return jsonify(get_history(view, **params))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/history/pipeline')
+    def history_pipeline():
+        """Get pipeline totals by region and stage as of a time, e.g. ?as_of=2024-05-01"""
+        if 'as_of' not in request.args:
+            return jsonify({'error': 'as_of is required'}), 400
+        return history_response('pipeline', as_of=request.args['as_of'])
+
+    @app.route('/api/history/deals')
+    def history_deals():
+        """Get deals as they were at a time, e.g. ?as_of=2024-05-01&stage=Proposal&limit=50"""
+        if 'as_of' not in request.args:
+            return jsonify({'error': 'as_of is required'}), 400
+        try:
+            limit = page_limit()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        filters = {field: request.args.getlist(field) for field in HISTORY_FIELDS if field in request.args}
+        return history_response('deals', as_of=request.args['as_of'], filters=filters, limit=limit)
+
+    @app.route('/api/history/deals/<deal_id>')
+    def history_deal_timeline(deal_id):
+        """Get every version of a deal"""
+        return history_response('timeline', deal_id=deal_id)
+
+    @app.route('/api/history/stage-movement')
+    def history_stage_movement():
+        """Get deals moving between stages by region, e.g. ?since=2024-04-01&until=2024-06-30"""
+        if 'since' not in request.args:
+            return jsonify({'error': 'since is required'}), 400
+        return history_response('stage_movement', since=request.args['since'], until=request.args.get('until'))
+
+    def records_response(module):
+        """
+        Answer a record query from the request parameters, e.g.
+        ?stage=Proposal&region=APAC&closing_date_from=2024-04-01&order_by=amount&limit=50&offset=50
+        """
+        try:
+            attributes = record_attributes(module)
+            filters = {attribute: request.args.getlist(attribute) for attribute in attributes
+                       if attribute in request.args}
+            ranges = {
+                attribute: (request.args.get(f'{attribute}_from'), request.args.get(f'{attribute}_to'))
+                for attribute in attributes
+                if f'{attribute}_from' in request.args or f'{attribute}_to' in request.args
+            }
+            return jsonify(find_records(
+                module,
+                filters=filters,
+                ranges=ranges,
+                order_by=request.args.get('order_by'),
+                descending=request.args.get('desc', 'true').lower() != 'false',
+                limit=page_limit(),
+                offset=page_offset()
+            ))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/deals')
+    def deals():
+        """Get a page of deals filtered, ranged and sorted by any field"""
+        return records_response('Deals')
+
+    @app.route('/api/deals/<deal_id>')
+    def deal(deal_id):
+        """Get a deal by id"""
+        try:
+            record = get_record('Deals', deal_id)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+        if record is None:
+            return jsonify({'error': f'No deal {deal_id}'}), 404
+        return jsonify(record)
+
+    @app.route('/api/accounts')
+    def accounts():
+        """Get a page of accounts filtered, ranged and sorted by any field"""
+        return records_response('Accounts')
+
     @app.route('/api/refresh', methods=['POST'])
     def refresh_data():
         """Trigger manual data refresh"""
@@ -32,4 +178,7 @@ def register_routes(app):
             result = trigger_data_refresh()
             return jsonify(result)
         except Exception as e:
-            return jsonify({'error': str(e)}), 500 
\ No newline at end of file
+            return jsonify({'error': str(e)}), 500
+
+    # Bulk job completion callbacks from Zoho CRM
+    register_callback_route(app) 
\ No newline at end of file
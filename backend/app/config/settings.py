@@ -18,8 +18,8 @@ def validate_config(config):
     
     # Validate data settings
     data_config = config.get('DATA', {})
-    if not os.path.exists(os.path.dirname(data_config.get('current_data_path', ''))):
-        os.makedirs(os.path.dirname(data_config.get('current_data_path', '')))
+    if not os.path.exists(os.path.dirname(data_config.get('snapshot_path', ''))):
+        os.makedirs(os.path.dirname(data_config.get('snapshot_path', '')))
     
     if not os.path.exists(data_config.get('archive_dir', '')):
         os.makedirs(data_config.get('archive_dir', ''))
@@ -39,15 +39,40 @@ def load_config(app):
         'client_secret': os.getenv('ZOHO_CLIENT_SECRET'),
         'refresh_token': os.getenv('ZOHO_REFRESH_TOKEN'),
         'api_domain': os.getenv('ZOHO_API_DOMAIN', 'https://www.zohoapis.com'),
-        'crm_domain': os.getenv('ZOHO_CRM_DOMAIN', 'https://www.zohoapis.in')
+        'crm_domain': os.getenv('ZOHO_CRM_DOMAIN', 'https://www.zohoapis.in'),
+        # Public URL of /api/zoho/bulk-callback; polling only when unset
+        'bulk_callback_url': os.getenv('ZOHO_BULK_CALLBACK_URL'),
+        # Overrides the datacenter, e.g. to use scripts/zoho_stub_server.py
+        'api_base_url': os.getenv('ZOHO_API_BASE_URL'),
+        # Org API limits enforced by the API scheduler
+        'daily_credits': int(os.getenv('ZOHO_DAILY_CREDITS', '50000')),
+        'max_concurrency': int(os.getenv('ZOHO_MAX_CONCURRENCY', '10')),
+        'max_bulk_jobs': int(os.getenv('ZOHO_MAX_BULK_JOBS', '3')),
+        # 'auto' picks paged REST or bulk read per module; 'rest' or 'bulk' forces one
+        'fetch_strategy': os.getenv('ZOHO_FETCH_STRATEGY', 'auto')
     }
     
     # Data settings
     app.config['DATA'] = {
         'refresh_interval': int(os.getenv('DATA_REFRESH_INTERVAL', '24')),
         'archive_retention_days': int(os.getenv('ARCHIVE_RETENTION_DAYS', '30')),
-        'current_data_path': os.path.join('data', 'current-data.json'),
-        'archive_dir': os.path.join('data', 'archive')
+        # Refreshed dataset; scripts/export_snapshot.py turns it into JSON
+        'snapshot_path': os.path.join('data', 'current.snapshot'),
+        # Names the ready-to-serve /api/dashboard-data generation
+        'response_path': os.path.join('data', 'current.response'),
+        'archive_dir': os.path.join('data', 'archive'),
+        # Deal versions with validity intervals, for as-of and timeline queries
+        'history_path': os.path.join('data', 'history.sqlite3'),
+        # Row-level deals and accounts, indexed for /api/deals and /api/accounts
+        'records_db_path': os.path.join('data', 'records.sqlite3'),
+        'records_dir': os.path.join('data', 'records'),
+        'sync_state_path': os.path.join('data', 'sync_state.json'),
+        'full_sync_interval_days': int(os.getenv('FULL_SYNC_INTERVAL_DAYS', '7')),
+        'field_cache_dir': os.path.join('data', 'field_cache'),
+        'field_cache_ttl_hours': int(os.getenv('FIELD_CACHE_TTL_HOURS', '24')),
+        'currency_cache_ttl_hours': int(os.getenv('CURRENCY_CACHE_TTL_HOURS', '6')),
+        'fetch_stats_path': os.path.join('data', 'fetch_stats.json'),
+        'deal_aggregates_path': os.path.join('data', 'aggregates', 'deals.json')
     }
     
     # Validate required configuration
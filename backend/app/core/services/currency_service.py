@@ -0,0 +1,166 @@
+"""
+Currency Service Module
+Caches the org's currencies and converts money columns to the base currency
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.core.zoho.schema import field_types
+from app.core.zoho.transformers import DEFAULT_CURRENCY, _amounts, _codes
+
+logger = logging.getLogger(__name__)
+
+# Default time the org's currencies are reused before being fetched again
+DEFAULT_CURRENCY_TTL_SECONDS = 6 * 60 * 60
+
+# Time a lookup that failed is reused before being retried
+FAILED_LOOKUP_TTL_SECONDS = 5 * 60
+
+# Per-record columns a money field is converted with
+CURRENCY_COLUMNS = ['Currency', 'Exchange_Rate']
+
+# Zoho data type of money fields
+MONEY_TYPE = 'currency'
+
+def money_columns(columns: Iterable[str], fields: Optional[Iterable[Dict[str, Any]]] = None) -> List[str]:
+    """
+    Get the money columns among some columns
+
+    Args:
+        columns (iterable): Column names
+        fields (list, optional): Field metadata of the module
+
+    Returns:
+        list: Columns of the currency data type, e.g. Amount
+    """
+    types = field_types(fields)
+    return [column for column in columns if types.get(column) == MONEY_TYPE]
+
+def to_base_amounts(amounts: pd.Series, currencies: Optional[pd.Series] = None,
+                    exchange_rates: Optional[pd.Series] = None,
+                    rates: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Convert a money column to the base currency
+
+    Zoho keeps each record's amounts in the record's currency along with
+    Exchange_Rate, the units of that currency worth one unit of the base
+    currency when the record was saved. Amounts are divided by the record's
+    rate; records without one use the org's current rate for their currency,
+    and records in a currency the org does not list are left as they are.
+
+    Args:
+        amounts (pd.Series): Amounts in the record currencies
+        currencies (pd.Series, optional): ISO code of each record's currency
+        exchange_rates (pd.Series, optional): Exchange_Rate of each record
+        rates (dict, optional): ISO code to the org's current exchange rate
+
+    Returns:
+        np.ndarray: float64 amounts in the base currency, NaN where missing
+    """
+    amount = _amounts(amounts)
+    rate = _amounts(exchange_rates) if exchange_rates is not None else np.full(len(amount), np.nan)
+    if currencies is not None and rates:
+        # One lookup per currency, spread over the records by code
+        codes, labels = _codes(currencies)
+        table = np.array([rates.get(str(label), np.nan) for label in labels] + [np.nan], dtype='float64')
+        rate = np.where(np.isnan(rate) | (rate <= 0), table[codes], rate)
+    rate = np.where(np.isnan(rate) | (rate <= 0), 1.0, rate)
+    return amount / rate
+
+class CurrencyService:
+    """The org's base currency and exchange rates, fetched at most once per TTL"""
+
+    def __init__(self, zoho_client, ttl_seconds: int = DEFAULT_CURRENCY_TTL_SECONDS):
+        """
+        Initialize the service
+
+        Args:
+            zoho_client (ZohoClient): Client the currencies are fetched with
+            ttl_seconds (int): Time fetched currencies stay valid
+        """
+        self.zoho_client = zoho_client
+        self.ttl_seconds = ttl_seconds
+        self._table = None
+        self._fetched_at = None
+        self._valid_for = ttl_seconds
+        self._lock = threading.Lock()
+
+    def _fetch(self) -> Tuple[Dict[str, Any], bool]:
+        failed = False
+        try:
+            currencies = list(self.zoho_client.get_currencies())
+        except Exception as e:
+            logger.warning(f'Could not fetch org currencies, amounts are not converted: {str(e)}')
+            currencies, failed = [], True
+        base = next((currency for currency in currencies if currency.get('is_base')), None)
+        if base:
+            base_currency = {key: base.get(key) for key in ('code', 'symbol', 'name')}
+        else:
+            # Orgs without multi-currency only report their currency through the org details
+            try:
+                base_currency = self.zoho_client.get_base_currency()
+            except Exception as e:
+                logger.warning(f"Could not fetch the org currency, using {DEFAULT_CURRENCY['code']}: {str(e)}")
+                base_currency, failed = None, True
+        table = {
+            'base_currency': base_currency or DEFAULT_CURRENCY,
+            'rates': {currency['code']: currency['exchange_rate'] for currency in currencies
+                      if currency.get('code') and currency.get('exchange_rate')}
+        }
+        return table, failed
+
+    def get_table(self) -> Dict[str, Any]:
+        """
+        Get the org's currencies, fetching them when the cached ones expired
+
+        A lookup that failed is only reused for FAILED_LOOKUP_TTL_SECONDS,
+        so amounts go back to being converted soon after Zoho recovers.
+
+        Returns:
+            dict: 'base_currency' with code, symbol and name, and 'rates'
+                mapping ISO codes to exchange rates against it
+        """
+        with self._lock:
+            expired = self._fetched_at is None or time.monotonic() - self._fetched_at >= self._valid_for
+            if expired:
+                self._table, failed = self._fetch()
+                self._fetched_at = time.monotonic()
+                self._valid_for = min(self.ttl_seconds, FAILED_LOOKUP_TTL_SECONDS) if failed else self.ttl_seconds
+                logger.info(f"Cached {len(self._table['rates'])} exchange rates against "
+                            f"{self._table['base_currency'].get('code')}")
+            return self._table
+
+    def get_base_currency(self) -> Dict[str, Any]:
+        """Get the org's base currency, e.g. {'code': 'USD', 'symbol': '$', 'name': 'US Dollar'}"""
+        return self.get_table()['base_currency']
+
+    def invalidate(self) -> None:
+        """Fetch the currencies again on next use"""
+        with self._lock:
+            self._fetched_at = None
+
+    def normalize(self, records: pd.DataFrame, fields: Optional[Iterable[Dict[str, Any]]] = None) -> pd.DataFrame:
+        """
+        Convert every money column of some records to the base currency
+
+        Args:
+            records (pd.DataFrame): Records with their Currency and
+                Exchange_Rate columns, e.g. from read_typed_csv
+            fields (list, optional): Field metadata of the module
+
+        Returns:
+            pd.DataFrame: The records with converted money columns; records
+                without currency columns are returned as they are
+        """
+        columns = money_columns(records.columns, fields)
+        if not columns or not any(column in records for column in CURRENCY_COLUMNS):
+            return records
+        rates = self.get_table()['rates']
+        return records.assign(**{
+            column: to_base_amounts(records[column], records.get('Currency'), records.get('Exchange_Rate'), rates)
+            for column in columns
+        })
\ No newline at end of file
@@ -4,11 +4,13 @@ Handles dashboard data preparation and caching
 """
 
 import logging
-import json
 import os
 from datetime import datetime, timedelta
-from flask import current_app
-from app.core.services.data_service import DataService
+from flask import current_app, jsonify
+from app.core.services.data_service import get_data_service
+from app.core.zoho.api_scheduler import PRIORITY_INTERACTIVE
+from app.core.services.response_snapshot import get_response_server
+from app.core.services.snapshot import read_dashboard_data
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,7 @@ class DashboardService:
     """Service for handling dashboard data operations"""
     
     def __init__(self):
-        self.data_service = DataService()
+        self.data_service = get_data_service()
     
     def get_dashboard_data(self):
         """
@@ -29,7 +31,8 @@ class DashboardService:
             # Check if data needs refresh
             if self._needs_refresh(current_data):
                 logger.info('Dashboard data needs refresh, fetching new data...')
-                return self.data_service.fetch_all_data()
+                # A user is waiting on this refresh, so it runs ahead of background syncs
+                return self.data_service.fetch_all_data(priority=PRIORITY_INTERACTIVE)
             
             return current_data
             
@@ -37,20 +40,131 @@ class DashboardService:
             logger.error(f'Failed to get dashboard data: {str(e)}')
             raise
     
+    def get_dashboard_response(self, environ):
+        """
+        Get the dashboard HTTP response, sent from the published generation while it is fresh
+        
+        Args:
+            environ (dict): WSGI environment of the request
+            
+        Returns:
+            Response: The published response bytes, or the refreshed data as JSON
+        """
+        generation = self._current_generation()
+        if generation is not None and not self._needs_refresh({'last_updated': generation.last_updated}):
+            return generation.response(environ)
+        return jsonify(self.get_dashboard_data())
+    
+    def query_rollup(self, group_by, filters):
+        """
+        Break deal totals down by cube dimensions
+        
+        Args:
+            group_by (list): Dimensions to group by, e.g. ['region', 'stage']
+            filters (dict): Dimension to the labels to keep
+            
+        Returns:
+            list: count, amount and weighted_amount per group
+        """
+        return self.data_service.get_rollup_cube().query(group_by, filters)
+    
+    def get_rollup_deals(self, filters, limit):
+        """
+        Get the deals behind a drill-down slice
+        
+        Args:
+            filters (dict): Dimension to the labels to keep
+            limit (int): Most deals returned, largest first
+            
+        Returns:
+            list: Deal detail rows
+        """
+        return self.data_service.get_rollup_cube().deals(filters, limit)
+    
+    def get_history(self, view, **params):
+        """
+        Answer a time-travel query from the deal history
+        
+        Args:
+            view (str): 'pipeline', 'deals', 'timeline' or 'stage_movement'
+            **params: Arguments of the HistoryStore query of that view
+            
+        Returns:
+            dict or list: The query result
+            
+        Raises:
+            ValueError: If the view is unknown or a parameter is invalid
+        """
+        history = self.data_service.history
+        queries = {
+            'pipeline': history.pipeline_as_of,
+            'deals': history.deals_as_of,
+            'timeline': history.deal_timeline,
+            'stage_movement': history.stage_movement
+        }
+        if view not in queries:
+            raise ValueError(f'Unknown history view: {view}')
+        return queries[view](**params)
+    
+    def find_records(self, module, filters=None, ranges=None, order_by=None, descending=True, limit=100, offset=0):
+        """
+        Find row-level records in the record database
+        
+        Args:
+            module (str): 'Deals' or 'Accounts'
+            filters (dict, optional): Attribute to the values to keep
+            ranges (dict, optional): Attribute to inclusive (low, high) bounds
+            order_by (str, optional): Attribute to sort by
+            descending (bool): Sort largest first
+            limit (int): Most records returned
+            offset (int): Records skipped, for paging
+            
+        Returns:
+            dict: The page of 'records' and the 'total' number matching
+            
+        Raises:
+            ValueError: If the module or an attribute is unknown
+        """
+        repository = self.data_service.records.repository(module)
+        return {
+            'records': repository.find(filters, ranges, order_by, descending, limit, offset),
+            'total': repository.count(filters, ranges)
+        }
+    
+    def get_record(self, module, record_id):
+        """
+        Get a row-level record by id
+        
+        Args:
+            module (str): 'Deals' or 'Accounts'
+            record_id (str): Zoho record id
+            
+        Returns:
+            dict: The record, None if unknown
+        """
+        return self.data_service.records.repository(module).get(record_id)
+    
     def _load_current_data(self):
-        """Load current data from file"""
-        data_path = current_app.config['DATA']['current_data_path']
+        """Load the aggregates of the current snapshot, leaving its record tables unread"""
+        data_path = current_app.config['DATA']['snapshot_path']
         
         if not os.path.exists(data_path):
             return None
             
         try:
-            with open(data_path, 'r') as f:
-                return json.load(f)
+            return read_dashboard_data(data_path)
         except Exception as e:
             logger.error(f'Failed to load current data: {str(e)}')
             return None
     
+    def _current_generation(self):
+        """Get the published response generation, None when there is none to serve"""
+        try:
+            return get_response_server(current_app.config['DATA']['response_path']).current()
+        except Exception as e:
+            logger.error(f'Failed to map published response: {str(e)}')
+            return None
+    
     def _needs_refresh(self, current_data):
         """Check if data needs to be refreshed"""
         if not current_data:
@@ -76,4 +190,28 @@ class DashboardService:
 def get_dashboard_data():
     """Get dashboard data for API endpoint"""
     service = DashboardService()
-    return service.get_dashboard_data() 
\ No newline at end of file
+    return service.get_dashboard_data()
+
+def get_dashboard_response(environ):
+    """Get the dashboard HTTP response for API endpoint"""
+    return DashboardService().get_dashboard_response(environ)
+
+def query_rollup(group_by, filters):
+    """Get a rollup cube slice for API endpoint"""
+    return DashboardService().query_rollup(group_by, filters)
+
+def get_rollup_deals(filters, limit):
+    """Get drill-down deal details for API endpoint"""
+    return DashboardService().get_rollup_deals(filters, limit)
+
+def get_history(view, **params):
+    """Get a deal history view for API endpoint"""
+    return DashboardService().get_history(view, **params)
+
+def find_records(module, **params):
+    """Get a page of row-level records for API endpoint"""
+    return DashboardService().find_records(module, **params)
+
+def get_record(module, record_id):
+    """Get a row-level record for API endpoint"""
+    return DashboardService().get_record(module, record_id)
\ No newline at end of file
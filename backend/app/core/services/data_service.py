@@ -4,17 +4,38 @@ Handles data fetching and processing from Zoho CRM
 """
 
 import logging
-import json
-import os
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from flask import current_app
 from app.core.zoho.bulk_reader import BulkReader
 from app.core.zoho.transformers import DataTransformer
+from app.core.zoho.delta_sync import DeltaSync, RecordStore, SyncState, MODIFIED_TIME_FIELD
+from app.core.zoho.deal_aggregates import DealAggregates, AGGREGATE_COLUMNS
+from app.core.zoho.sales_aggregates import SalesAggregator, SALES_COLUMNS
+from app.core.zoho.rollup_cube import RollupCube, CUBE_COLUMNS
+from app.core.zoho.schema import read_typed_csv, iter_typed_csv
+from app.core.zoho.field_cache import FieldMetadataCache
+from app.core.zoho.fetch_strategy import STRATEGY_AUTO
+from app.core.zoho.api_scheduler import get_scheduler, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from app.core.zoho.registry import get_registry
+from app.core.services.currency_service import CurrencyService, CURRENCY_COLUMNS, money_columns
+from app.core.services.snapshot import write_snapshot
+from app.core.services.response_snapshot import publish_response
+from app.core.services.snapshot_archive import SnapshotArchive
+from app.core.services.history_store import HistoryStore
+from app.core.services.record_repository import RecordDatabase, MODULES as RECORD_MODULES
 from app.models.deal import Deal
-from app.models.account import Account
+from app.models.account import Account, AccountTable
 
 logger = logging.getLogger(__name__)
 
+# Deal columns published with the dashboard response as fixed-layout arrays
+RESPONSE_ARRAYS = ['amount', 'probability', 'closing_date']
+
+# Days of stage movement shown on the dashboard
+STAGE_MOVEMENT_DAYS = 30
+
 class DataService:
     """Service for fetching and processing Zoho CRM data"""
     
@@ -29,36 +50,109 @@ class DataService:
         self.bulk_reader = bulk_reader
         self.logger = logging.getLogger(__name__)
         self.transformer = DataTransformer()
+        
+        data_config = current_app.config['DATA']
+        self.delta_sync = DeltaSync(
+            SyncState(data_config['sync_state_path']),
+            RecordStore(data_config['records_dir']),
+            data_config['full_sync_interval_days']
+        )
+        self.field_cache = FieldMetadataCache(
+            data_config['field_cache_dir'],
+            data_config['field_cache_ttl_hours'] * 3600
+        )
+        self.currency = CurrencyService(zoho_client, data_config['currency_cache_ttl_hours'] * 3600)
+        self.archive = SnapshotArchive(data_config['archive_dir'])
+        self.history = HistoryStore(data_config['history_path'])
+        self.records = RecordDatabase(data_config['records_db_path'])
+        self.deal_aggregates = DealAggregates(data_config['deal_aggregates_path'])
+        self.rollup_cube = None
+        self.last_credit_usage = None
+        # The refresh in flight, shared by callers arriving while it runs
+        self._refresh = None
+        self._refresh_lock = threading.Lock()
     
-    def fetch_all_data(self):
+    def fetch_all_data(self, priority=PRIORITY_BACKGROUND):
         """Fetch and transform all required data from Zoho CRM
         
+        Only one refresh runs at a time: the sync state, the aggregates and
+        the published snapshots are updated in place. A caller arriving
+        while a refresh runs waits for it and gets its result.
+        
+        Args:
+            priority (int): API priority class of the refresh's Zoho calls
+        
         Returns:
             dict: Combined dashboard data with deals and accounts info
         """
+        with self._refresh_lock:
+            refresh = self._refresh
+            running = refresh is not None
+            if not running:
+                refresh = self._refresh = Future()
+        if running:
+            logger.info('A refresh is already running, waiting for its result')
+            return refresh.result()
+        
         try:
-            # Get currency info first
-            currency_info = self.zoho_client.get_base_currency()
+            label = 'Interactive refresh' if priority == PRIORITY_INTERACTIVE else 'Background refresh'
+            with get_scheduler().track(label, priority) as usage:
+                try:
+                    data = self._fetch_all_data()
+                finally:
+                    self.last_credit_usage = usage.summary()
+            refresh.set_result(data)
+            return data
+        except BaseException as e:
+            refresh.set_exception(e)
+            raise
+        finally:
+            with self._refresh_lock:
+                self._refresh = None
+    
+    def _fetch_all_data(self):
+        """Fetch and transform all required data from Zoho CRM"""
+        try:
+            # Get currency info first, cached across refreshes
+            currency_info = self.currency.get_base_currency()
             
-            # Get deals data
+            # Get deals data, with amounts in the base currency
             deals_fields = self._get_module_fields('Deals')
-            deals_data = self.bulk_reader.read_records('Deals', fields=deals_fields)
-            transformed_deals = DataTransformer.transform_deals(deals_data, currency_info)
+            transformed_deals = {
+                **self._sync_deal_metrics(deals_fields),
+                'currency': currency_info
+            }
+            
+            # Regional and quarterly views, so the browser never needs the raw deals,
+            # and the rollup cube answering drill-down queries until the next refresh
+            deals_columns = self._load_module('Deals', list(dict.fromkeys([*SALES_COLUMNS, *CUBE_COLUMNS])))
+            sales_data = SalesAggregator.transform_sales(deals_columns)
+            self.rollup_cube = RollupCube.build(deals_columns)
+            
+            # Deal history for time-travel views, and the recent stage movement it holds
+            sales_data['stage_movement'] = {
+                **sales_data['stage_movement'],
+                **self._record_history(self.rollup_cube.details)
+            }
             
             # Get accounts data
             accounts_fields = self._get_module_fields('Accounts')
-            accounts_data = self.bulk_reader.read_records('Accounts', fields=accounts_fields)
+            accounts_data = self._sync_module('Accounts', accounts_fields)
             transformed_accounts = DataTransformer.transform_accounts(accounts_data)
             
             # Combine and save data
             dashboard_data = DataTransformer.combine_dashboard_data(
                 transformed_deals,
                 transformed_accounts,
-                currency_info
+                currency_info,
+                sales_data
             )
             
-            # Save to configured path
-            self._save_dashboard_data(dashboard_data)
+            # Save the aggregates with the row-level deals and accounts
+            self._save_snapshot(dashboard_data, {
+                'deals': self.rollup_cube.details,
+                'accounts': AccountTable.from_frame(accounts_data)
+            })
             
             return dashboard_data
             
@@ -67,12 +161,174 @@ class DataService:
             # Return empty data structure with default USD currency
             return DataTransformer.combine_dashboard_data(
                 DataTransformer.transform_deals([]),
-                DataTransformer.transform_accounts([])
+                DataTransformer.transform_accounts([]),
+                sales_data=SalesAggregator.empty()
             )
     
+    def _record_history(self, deals):
+        """Record the refreshed deals in the history store
+        
+        Args:
+            deals (DealTable): All deals of the refresh
+            
+        Returns:
+            dict: Stage movement by region over the last STAGE_MOVEMENT_DAYS,
+                empty if the history store failed
+        """
+        now = datetime.utcnow()
+        try:
+            self.history.record(deals, now)
+            return self.history.stage_movement(now - timedelta(days=STAGE_MOVEMENT_DAYS), now)
+        except Exception as e:
+            # History is a secondary view; the refresh goes on without it
+            logger.error(f'Failed to record deal history: {str(e)}')
+            return {}
+    
+    def get_rollup_cube(self):
+        """Get the rollup cube of the last refresh
+        
+        A process that has not refreshed yet builds it from the stored deals.
+        
+        Returns:
+            RollupCube: Deals aggregated by region, stage, owner, fiscal quarter and type
+        """
+        if self.rollup_cube is None:
+            self.rollup_cube = RollupCube.build(self._load_module('Deals', CUBE_COLUMNS))
+        return self.rollup_cube
+    
+    def _sync_module(self, module, fields):
+        """
+        Bring the local copy of a module up to date and return its records
+        
+        Args:
+            module (str): Module name (e.g., 'Deals', 'Accounts')
+            fields (list): Fields to export
+            
+        Returns:
+            pd.DataFrame: All stored records of the module, as columns
+        """
+        self._sync(module, fields)
+        return self._load_module(module)
+    
+    def _sync_deal_metrics(self, fields):
+        """
+        Bring the local copy of Deals up to date and return the deal metrics
+        
+        A delta sync only feeds the changed deals to the incremental
+        aggregates, so its cost follows the change rate rather than the
+        number of deals. Full syncs, or aggregates that missed a sync,
+        reload every deal and reconcile the aggregates against a full
+        recompute, which also checks them for drift.
+        
+        Args:
+            fields (list): Fields to export
+            
+        Returns:
+            dict: Deal metrics in DataTransformer.deal_metrics format
+        """
+        sync = self._sync('Deals', fields)
+        aggregates = self.deal_aggregates
+        
+        if sync['mode'] == 'delta' and aggregates.ready and aggregates.high_water_mark == sync['since']:
+            metadata = self._field_metadata('Deals')
+            changed = read_typed_csv(sync['file_path'], metadata, [*AGGREGATE_COLUMNS, *CURRENCY_COLUMNS])
+            changed = self.currency.normalize(changed, metadata)
+            counts = aggregates.apply(changed)
+            logger.info(f"Deal aggregates: {counts['inserted']} inserted, {counts['updated']} updated")
+        else:
+            drift = aggregates.reconcile(self._load_module('Deals', AGGREGATE_COLUMNS))
+            logger.info(f"Deal aggregates reconciled with a full recompute{' after drift' if drift else ''}")
+        
+        aggregates.high_water_mark = self.delta_sync.state.get('Deals').get('high_water_mark')
+        aggregates.save()
+        return aggregates.metrics()
+    
+    def _sync(self, module, fields):
+        """
+        Bring the local copy of a module up to date
+        
+        Only records modified since the last sync are exported, except on the
+        periodic full sync which also drops records deleted in Zoho.
+        
+        Args:
+            module (str): Module name (e.g., 'Deals', 'Accounts')
+            fields (list): Fields to export
+            
+        Returns:
+            dict: Sync statistics, see DeltaSync.sync_module
+        """
+        # Merging needs the record id and the watermark field in every export
+        fields = list(dict.fromkeys(['id', MODIFIED_TIME_FIELD, *fields]))
+        
+        strategy = current_app.config['ZOHO_API'].get('fetch_strategy', STRATEGY_AUTO)
+        stored_count = self.delta_sync.state.get(module).get('record_count')
+        
+        def export(criteria):
+            # Small modules and deltas are read through REST, large ones through bulk read
+            result = self.bulk_reader.read_module(module, fields, criteria, stored_count, strategy)
+            # A header the cache does not know means the schema changed in Zoho; the catalog has it
+            self.field_cache.validate_header(module, result['fields'])
+            return result['file_path']
+        
+        sync = self.delta_sync.sync_module(module, export)
+        self._load_records(module, sync)
+        return sync
+    
+    def _load_records(self, module, sync):
+        """
+        Bring the record database of a module in line with a sync
+        
+        A delta sync upserts the exported records; a full sync, or a module
+        never loaded, replaces the records with the whole local copy so that
+        records deleted in Zoho go away.
+        
+        Args:
+            module (str): Module name
+            sync (dict): Sync statistics from DeltaSync.sync_module
+        """
+        if module not in RECORD_MODULES:
+            return
+        try:
+            replace = sync['mode'] == 'full' or not self.records.loaded(module)
+            path = self.delta_sync.store.path(module) if replace else sync['file_path']
+            metadata = self._field_metadata(module)
+            chunks = (self.currency.normalize(chunk, metadata) for chunk in iter_typed_csv(path, metadata))
+            self.records.load(module, chunks, replace=replace)
+        except Exception as e:
+            # Row-level queries are a secondary view; the refresh goes on without them
+            logger.error(f'Failed to load {module} records: {str(e)}')
+    
+    def _load_module(self, module, usecols=None):
+        """
+        Load the stored records of a module with typed columns
+        
+        Money columns such as Amount are converted to the base currency by
+        each record's Currency and Exchange_Rate, which are loaded with them.
+        
+        Args:
+            module (str): Module name
+            usecols (list, optional): Only load these columns
+            
+        Returns:
+            pd.DataFrame: Stored records
+        """
+        metadata = self._field_metadata(module)
+        if usecols is not None and money_columns(usecols, metadata):
+            usecols = list(dict.fromkeys([*usecols, *CURRENCY_COLUMNS]))
+        records = self.delta_sync.store.load(module, metadata, usecols)
+        return self.currency.normalize(records, metadata)
+    
+    def _field_metadata(self, module):
+        """Get the cached field metadata of a module, which types its columns"""
+        metadata = self.field_cache.get(module)
+        return metadata['fields'] if metadata else None
+    
     def _get_module_fields(self, module):
         """
-        Dynamically fetch fields for a module from Zoho CRM
+        Get the fields to export for a module
+        
+        Field metadata is served from the on-disk field cache and only fetched
+        from Zoho CRM when the cached schema expired or was invalidated.
         
         Args:
             module (str): Module name (e.g., 'Deals', 'Accounts')
@@ -81,18 +337,16 @@ class DataService:
             list: List of field names to fetch
         """
         try:
-            # Get field metadata from Zoho
-            response = self.bulk_reader.client.get_module_fields(module)
+            metadata = self.field_cache.get_or_fetch(module, lambda: self._fetch_field_metadata(module))
             
-            # Extract field names from response
             fields = []
-            for field in response.get('fields', []):
+            for field in metadata:
                 # Skip system fields and read-only fields if needed
                 if field.get('system_field') or field.get('read_only'):
                     continue
                 fields.append(field['api_name'])
                 
-            logger.info(f'Fetched {len(fields)} fields for {module}')
+            logger.info(f'Using {len(fields)} fields for {module}')
             return fields
             
         except Exception as e:
@@ -100,6 +354,27 @@ class DataService:
             # Fall back to essential fields if API call fails
             return self._get_essential_fields(module)
     
+    def _fetch_field_metadata(self, module):
+        """
+        Fetch field metadata for a module from Zoho CRM
+        
+        Args:
+            module (str): Module name (e.g., 'Deals', 'Accounts')
+            
+        Returns:
+            list: Field metadata dicts with api_name, data_type, system_field and read_only
+        """
+        response = self.bulk_reader.client.get_module_fields(module)
+        return [
+            {
+                'api_name': field['api_name'],
+                'data_type': field.get('data_type'),
+                'system_field': bool(field.get('system_field')),
+                'read_only': bool(field.get('read_only'))
+            }
+            for field in response.get('fields', [])
+        ]
+    
     def _get_essential_fields(self, module):
         """
         Fallback method to get essential fields for a module
@@ -138,54 +413,54 @@ class DataService:
         logger.warning(f'Using essential fields for {module} due to API failure')
         return essential_fields.get(module, [])
     
-    def _save_current_data(self, data):
-        """Save current data to file"""
-        data_path = current_app.config['DATA']['current_data_path']
-        os.makedirs(os.path.dirname(data_path), exist_ok=True)
-        
-        with open(data_path, 'w') as f:
-            json.dump(data, f, indent=2)
-    
-    def _archive_old_data(self):
-        """Archive current data with timestamp"""
-        current_data_path = current_app.config['DATA']['current_data_path']
-        archive_dir = current_app.config['DATA']['archive_dir']
-        
-        if not os.path.exists(current_data_path):
-            return
-            
-        # Create archive directory if it doesn't exist
-        os.makedirs(archive_dir, exist_ok=True)
+    def _save_snapshot(self, data, tables):
+        """Save the refreshed dataset as the current snapshot, publish its response and archive it
         
-        # Generate archive filename with timestamp
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        archive_path = os.path.join(archive_dir, f'data_{timestamp}.json')
+        Args:
+            data (dict): Dashboard aggregates
+            tables (dict): Table name to its RecordTable
+        """
+        write_snapshot(current_app.config['DATA']['snapshot_path'], data, tables)
         
-        # Copy current data to archive
-        with open(current_data_path, 'r') as src, open(archive_path, 'w') as dst:
-            json.dump(json.load(src), dst, indent=2)
-            
-        # Clean up old archives
-        self._cleanup_old_archives()
+        # Publish the response bytes, as jsonify renders them, with the deals' numeric columns
+        deals = tables['deals']
+        publish_response(
+            current_app.config['DATA']['response_path'],
+            current_app.json.response(data).get_data(),
+            {f'deals.{attribute}': deals.column(attribute) for attribute in RESPONSE_ARRAYS},
+            data.get('last_updated')
+        )
+        self._archive_snapshot()
     
-    def _cleanup_old_archives(self):
-        """Remove archives older than retention period"""
-        archive_dir = current_app.config['DATA']['archive_dir']
-        retention_days = current_app.config['DATA']['archive_retention_days']
-        cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
-        
-        for filename in os.listdir(archive_dir):
-            if not filename.startswith('data_') or not filename.endswith('.json'):
-                continue
-                
-            filepath = os.path.join(archive_dir, filename)
-            file_date = datetime.strptime(filename[5:19], '%Y%m%d_%H%M%S')
-            
-            if file_date < cutoff_date:
-                os.remove(filepath)
-                logger.info(f'Removed old archive: {filename}')
+    def _archive_snapshot(self):
+        """Archive the current snapshot and drop archives older than the retention period"""
+        data_config = current_app.config['DATA']
+        try:
+            self.archive.add(data_config['snapshot_path'])
+            self.archive.prune(data_config['archive_retention_days'])
+        except Exception as e:
+            # A failed archive must not fail the refresh that was just saved
+            logger.error(f'Failed to archive snapshot: {str(e)}')
+
+_data_service = None
+_data_service_lock = threading.Lock()
+
+def get_data_service():
+    """Get the process-wide DataService, built on the shared Zoho clients
+    
+    Must first be called inside a Flask application context.
+    
+    Returns:
+        DataService: Service reused by every refresh in the process
+    """
+    global _data_service
+    with _data_service_lock:
+        if _data_service is None:
+            registry = get_registry()
+            _data_service = DataService(registry.get_client(), registry.get_bulk_reader())
+        return _data_service
 
 def trigger_data_refresh():
     """Trigger a manual data refresh"""
-    service = DataService()
-    return service.fetch_all_data() 
\ No newline at end of file
+    service = get_data_service()
+    return service.fetch_all_data(priority=PRIORITY_INTERACTIVE) 
\ No newline at end of file
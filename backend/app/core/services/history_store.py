@@ -0,0 +1,352 @@
+"""
+History Store Module
+Records every deal's field values as validity intervals for as-of and timeline queries
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+from app.core.zoho.sales_aggregates import UNASSIGNED_REGION
+from app.models.deal import DealTable
+from app.models.table import CategoryColumn, TextColumn
+
+logger = logging.getLogger(__name__)
+
+# Deal attributes whose changes start a new version; timestamps are left out so
+# edits to untracked fields do not add versions
+HISTORY_FIELDS = ['name', 'amount', 'stage', 'probability', 'closing_date', 'account_name', 'owner',
+                  'region', 'type']
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS refreshes (
+    refreshed_at TEXT PRIMARY KEY,
+    deals INTEGER NOT NULL,
+    changed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deal_versions (
+    deal_id TEXT NOT NULL,
+    valid_from TEXT NOT NULL,
+    valid_to TEXT,
+    row_hash INTEGER NOT NULL,
+    {', '.join(f'{field} {"REAL" if field in ("amount", "probability") else "TEXT"}' for field in HISTORY_FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS deal_versions_by_deal ON deal_versions (deal_id, valid_from);
+CREATE INDEX IF NOT EXISTS deal_versions_by_time ON deal_versions (valid_from, valid_to);
+CREATE INDEX IF NOT EXISTS deal_versions_current ON deal_versions (deal_id) WHERE valid_to IS NULL;
+CREATE INDEX IF NOT EXISTS deal_versions_by_amount ON deal_versions (amount);
+CREATE TABLE IF NOT EXISTS stage_transitions (
+    deal_id TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    from_stage TEXT,
+    to_stage TEXT,
+    region TEXT,
+    amount REAL
+);
+CREATE INDEX IF NOT EXISTS stage_transitions_by_time ON stage_transitions (changed_at);
+CREATE TABLE IF NOT EXISTS pipeline_summaries (
+    refreshed_at TEXT NOT NULL,
+    region TEXT,
+    stage TEXT,
+    count INTEGER NOT NULL,
+    amount REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pipeline_summaries_by_time ON pipeline_summaries (refreshed_at);
+"""
+
+def to_timestamp(value: Union[str, datetime]) -> str:
+    """
+    Normalize a time to the stored format, naive UTC to the second
+
+    Args:
+        value: datetime or ISO 8601 string, e.g. '2024-05-01' or
+            '2024-05-01T09:30:00+05:30'
+
+    Returns:
+        str: e.g. '2024-05-01T04:00:00'
+
+    Raises:
+        ValueError: If the string is not an ISO 8601 time
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec='seconds')
+
+# Multiplier combining the hashes of the tracked fields into one per deal
+HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+def _row_hashes(table: DealTable) -> np.ndarray:
+    """
+    Hash each deal's tracked fields from the column arrays
+
+    Category labels are hashed once and spread by code, numbers and dates
+    are hashed as they are stored; only the text columns are decoded.
+    """
+    rows = np.arange(len(table))
+    combined = np.zeros(len(table), dtype='uint64')
+    for field in HISTORY_FIELDS:
+        column = table.columns[field]
+        if isinstance(column, CategoryColumn):
+            hashes = pd.util.hash_array(column.labels)[column.codes]
+        elif isinstance(column, TextColumn):
+            hashes = pd.util.hash_array(np.array(column.values(rows), dtype=object))
+        else:
+            hashes = pd.util.hash_array(column.array)
+        combined = combined * HASH_MULTIPLIER ^ hashes
+    return combined.view('int64')
+
+def _frame(table: DealTable, rows: np.ndarray) -> pd.DataFrame:
+    """Tracked fields of some deals of a table, one row per deal"""
+    return pd.DataFrame({field: table.columns[field].values(rows) for field in HISTORY_FIELDS})
+
+def _pipeline_summary(table: DealTable, rows: np.ndarray) -> List[tuple]:
+    """Deal count and amount by region and stage, grouped on the category codes"""
+    region, stage = table.columns['region'], table.columns['stage']
+    codes = pd.DataFrame({'region': region.codes[rows], 'stage': stage.codes[rows],
+                          'amount': table.column('amount')[rows]})
+    summary = codes.groupby(['region', 'stage'])['amount'].agg(['size', 'sum']).reset_index()
+    return [(region.labels[r] or UNASSIGNED_REGION, stage.labels[s], int(count), float(amount))
+            for r, s, count, amount in summary.itertuples(index=False, name=None)]
+
+class HistoryStore:
+    """Deal versions with validity intervals, stage transitions and per-refresh pipeline totals"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open the store, creating its tables on first use
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def last_refresh(self) -> Optional[str]:
+        """Get the time of the latest recorded refresh"""
+        row = self._conn.execute('SELECT MAX(refreshed_at) FROM refreshes').fetchone()
+        return row[0]
+
+    def record(self, table: DealTable, refreshed_at: Union[str, datetime]) -> Dict[str, Any]:
+        """
+        Record the deals of a refresh
+
+        Each deal's tracked fields are hashed and compared with its current
+        version. Changed deals get their current version closed at
+        refreshed_at and a new one opened; deals no longer present are
+        closed; unchanged deals are not touched. Stage changes are kept as
+        transitions, and the refresh's pipeline totals by region and stage
+        are stored so as-of summaries read a few rows.
+
+        Args:
+            table (DealTable): All deals of the refresh
+            refreshed_at: Time of the refresh; later than any recorded one
+
+        Returns:
+            dict: refreshed_at, deals, added, changed, removed and stage_changes
+
+        Raises:
+            ValueError: If a later refresh is already recorded
+        """
+        refreshed_at = to_timestamp(refreshed_at)
+        deals = pd.DataFrame({'deal_id': table.columns['id'].values(np.arange(len(table))),
+                              'row_hash': _row_hashes(table), 'row': np.arange(len(table))})
+        deals = deals.drop_duplicates('deal_id', keep='last')
+
+        with self._lock, self._conn:
+            last = self.last_refresh()
+            if last is not None and last >= refreshed_at:
+                raise ValueError(f'Refresh {refreshed_at} is not later than the recorded refresh {last}')
+
+            cursor = self._conn.cursor()
+            cursor.row_factory = None
+            cursor.execute('SELECT deal_id, row_hash, stage FROM deal_versions WHERE valid_to IS NULL')
+            current = pd.DataFrame(cursor.fetchall(), columns=['deal_id', 'row_hash', 'stage'])
+            current = current.astype({'row_hash': 'Int64'}).rename(columns={'row_hash': 'current_hash',
+                                                                           'stage': 'current_stage'})
+            merged = deals.merge(current, on='deal_id', how='left')
+            is_new = merged['current_hash'].isna().to_numpy()
+            is_changed = ~is_new & (merged['row_hash'].to_numpy()
+                                    != merged['current_hash'].to_numpy(dtype='int64', na_value=0))
+            removed = current.loc[~current['deal_id'].isin(deals['deal_id']), 'deal_id']
+
+            # Only the deals getting a new version are decoded
+            opened = merged[is_new | is_changed]
+            opened = pd.concat([opened.reset_index(drop=True),
+                                _frame(table, opened['row'].to_numpy())], axis=1)
+            changed = opened[~opened['current_hash'].isna().to_numpy()]
+
+            self._conn.executemany(
+                'UPDATE deal_versions SET valid_to = ? WHERE deal_id = ? AND valid_to IS NULL',
+                [(refreshed_at, deal_id) for deal_id in [*changed['deal_id'], *removed]]
+            )
+            columns = ['deal_id', 'row_hash', *HISTORY_FIELDS]
+            self._conn.executemany(
+                f"INSERT INTO deal_versions (valid_from, {', '.join(columns)}) "
+                f"VALUES (?, {', '.join('?' * len(columns))})",
+                ((refreshed_at, *row) for row in opened[columns].astype(object).where(opened[columns].notna(), None)
+                 .itertuples(index=False, name=None))
+            )
+
+            moved = changed[changed['stage'].fillna('') != changed['current_stage'].fillna('')]
+            transitions = pd.DataFrame({
+                'deal_id': moved['deal_id'],
+                'changed_at': refreshed_at,
+                'from_stage': moved['current_stage'],
+                'to_stage': moved['stage'],
+                'region': moved['region'].fillna(UNASSIGNED_REGION),
+                'amount': moved['amount']
+            }).astype(object)
+            self._conn.executemany(
+                'INSERT INTO stage_transitions (deal_id, changed_at, from_stage, to_stage, region, amount) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                transitions.where(transitions.notna(), None).itertuples(index=False, name=None)
+            )
+
+            self._conn.executemany(
+                'INSERT INTO pipeline_summaries (refreshed_at, region, stage, count, amount) VALUES (?, ?, ?, ?, ?)',
+                [(refreshed_at, *row) for row in _pipeline_summary(table, deals['row'].to_numpy())]
+            )
+            self._conn.execute('INSERT INTO refreshes (refreshed_at, deals, changed) VALUES (?, ?, ?)',
+                               (refreshed_at, len(deals), len(opened) + len(removed)))
+
+        result = {
+            'refreshed_at': refreshed_at,
+            'deals': len(deals),
+            'added': len(opened) - len(changed),
+            'changed': len(changed),
+            'removed': len(removed),
+            'stage_changes': len(moved)
+        }
+        logger.info(f'Recorded deal history: {result}')
+        return result
+
+    def _refresh_as_of(self, as_of: str) -> Optional[str]:
+        row = self._conn.execute('SELECT MAX(refreshed_at) FROM refreshes WHERE refreshed_at <= ?', (as_of,)).fetchone()
+        return row[0]
+
+    def pipeline_as_of(self, as_of: Union[str, datetime]) -> Optional[Dict[str, Any]]:
+        """
+        Get the pipeline totals as they were at a time
+
+        Args:
+            as_of: Time to look at
+
+        Returns:
+            dict: 'as_of', the refresh the totals come from, and 'stages',
+                count and amount per region and stage; None before the
+                first refresh
+        """
+        with self._lock:
+            refreshed_at = self._refresh_as_of(to_timestamp(as_of))
+            if refreshed_at is None:
+                return None
+            rows = self._conn.execute(
+                'SELECT region, stage, count, amount FROM pipeline_summaries WHERE refreshed_at = ? '
+                'ORDER BY region, amount DESC', (refreshed_at,)
+            ).fetchall()
+        return {'as_of': refreshed_at, 'stages': [dict(row) for row in rows]}
+
+    def deals_as_of(self, as_of: Union[str, datetime], filters: Optional[Dict[str, List[str]]] = None,
+                    limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get deals as they were at a time, largest first
+
+        Args:
+            as_of: Time to look at
+            filters (dict, optional): Tracked field to the values to keep,
+                e.g. {'stage': ['Proposal'], 'region': ['APAC']}
+            limit (int): Most deals returned
+
+        Returns:
+            list: Deal id, validity interval and tracked fields of each deal
+
+        Raises:
+            ValueError: If a filter names an untracked field
+        """
+        as_of = to_timestamp(as_of)
+        conditions = ['valid_from <= ?', '(valid_to IS NULL OR valid_to > ?)']
+        params = [as_of, as_of]
+        for field, values in (filters or {}).items():
+            if field not in HISTORY_FIELDS:
+                raise ValueError(f'Unknown history field: {field}')
+            conditions.append(f"{field} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT deal_id, valid_from, valid_to, {', '.join(HISTORY_FIELDS)} FROM deal_versions "
+                f"WHERE {' AND '.join(conditions)} ORDER BY amount DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def deal_timeline(self, deal_id: str) -> List[Dict[str, Any]]:
+        """
+        Get every version of a deal, oldest first
+
+        Args:
+            deal_id (str): Zoho record id
+
+        Returns:
+            list: valid_from, valid_to (None for the current version), the
+                tracked fields, and 'changed', the fields that differ from
+                the previous version
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT valid_from, valid_to, {', '.join(HISTORY_FIELDS)} FROM deal_versions "
+                f"WHERE deal_id = ? ORDER BY valid_from", (str(deal_id),)
+            ).fetchall()
+        timeline = []
+        previous = None
+        for row in rows:
+            version = dict(row)
+            version['changed'] = [field for field in HISTORY_FIELDS
+                                  if previous is None or previous[field] != version[field]]
+            timeline.append(version)
+            previous = version
+        return timeline
+
+    def stage_movement(self, since: Union[str, datetime],
+                       until: Optional[Union[str, datetime]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Count deals moving between stages in a period, by region
+
+        Args:
+            since: Start of the period
+            until (optional): End of the period, now by default
+
+        Returns:
+            dict: Region to its transitions, most frequent first, each with
+                name ('Proposal → Closed Won'), from, to, count and value
+        """
+        until = to_timestamp(until or datetime.utcnow())
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT region, from_stage, to_stage, COUNT(*) AS count, SUM(amount) AS value '
+                'FROM stage_transitions WHERE changed_at > ? AND changed_at <= ? '
+                'GROUP BY region, from_stage, to_stage ORDER BY region, count DESC, value DESC',
+                (to_timestamp(since), until)
+            ).fetchall()
+        movement = {}
+        for row in rows:
+            movement.setdefault(row['region'], []).append({
+                'name': f"{row['from_stage'] or 'None'} → {row['to_stage'] or 'None'}",
+                'from': row['from_stage'],
+                'to': row['to_stage'],
+                'count': row['count'],
+                'value': row['value'] or 0.0
+            })
+        return movement
\ No newline at end of file
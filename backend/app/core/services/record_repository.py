@@ -0,0 +1,269 @@
+"""
+Record Repository Module
+Keeps row-level deals and accounts in an indexed SQLite database for drill-down queries
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from app.models.account import AccountTable
+from app.models.deal import DealTable
+from app.models.table import NUMBER, RecordTable
+
+logger = logging.getLogger(__name__)
+
+# Record tables stored per module, with the SQLite table holding them
+MODULES = {
+    'Deals': ('deals', DealTable),
+    'Accounts': ('accounts', AccountTable)
+}
+
+# Indexed attributes of each module; filters and sorts on other attributes scan the table
+INDEXES = {
+    'Deals': ['stage', 'owner', 'region', 'closing_date', 'account_name', 'amount'],
+    'Accounts': ['name', 'owner', 'industry']
+}
+
+def _module(module: str) -> Tuple[str, type]:
+    if module not in MODULES:
+        raise ValueError(f'No record table for module: {module}')
+    return MODULES[module]
+
+def _attributes(table_class: type) -> List[str]:
+    return [attribute for attribute, _, _ in table_class.FIELDS]
+
+def record_attributes(module: str) -> List[str]:
+    """
+    Get the attributes records of a module are stored with
+
+    Args:
+        module (str): Module name, a key of MODULES
+
+    Returns:
+        list: Attributes of the module's model, which filters and sorts may use
+
+    Raises:
+        ValueError: If the module has no record table
+    """
+    return _attributes(_module(module)[1])
+
+def _rows(table: RecordTable) -> Iterable[tuple]:
+    """Rows of a record table in the format of its to_dict, as tuples"""
+    rows = np.arange(len(table))
+    return zip(*(table.columns[attribute].values(rows) for attribute in _attributes(type(table))))
+
+class RecordDatabase:
+    """SQLite database of module records, written by refreshes and read by requests"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open the database, creating its tables and indexes on first use
+
+        The database runs in WAL mode: a refresh loading records does not
+        block requests reading them, which use their own connection per
+        thread.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conn = self._connect()
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS loads (module TEXT PRIMARY KEY, loaded_at TEXT, '
+                           'records INTEGER)')
+        for module, (name, table_class) in MODULES.items():
+            columns = [f"{attribute} {'REAL' if kind == NUMBER else 'TEXT'}"
+                       for attribute, _, kind in table_class.FIELDS]
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(columns)}, PRIMARY KEY (id))")
+            self._create_indexes(module)
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _create_indexes(self, module: str) -> None:
+        name, _ = MODULES[module]
+        for attribute in INDEXES[module]:
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {name}_by_{attribute} ON {name} ({attribute})')
+
+    def _drop_indexes(self, module: str) -> None:
+        name, _ = MODULES[module]
+        for attribute in INDEXES[module]:
+            self._conn.execute(f'DROP INDEX IF EXISTS {name}_by_{attribute}')
+
+    def reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def loaded(self, module: str) -> bool:
+        """Check whether a module's records have been loaded"""
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM loads WHERE module = ?', (module,)).fetchone() is not None
+
+    def load(self, module: str, chunks: Iterable[pd.DataFrame], replace: bool = False) -> Dict[str, Any]:
+        """
+        Bulk-load records in one transaction
+
+        Each chunk is converted to the module's record table and inserted
+        with executemany; records already stored are replaced by id.
+        Replacing loads drop the indexes first and rebuild them once at the
+        end, which is several times faster than updating them per row.
+        Readers see the previous records until the transaction commits.
+
+        Args:
+            module (str): Module name, a key of MODULES
+            chunks (iterable): Record frames with Zoho column names, e.g.
+                from iter_typed_csv
+            replace (bool): Drop the stored records first, for full syncs
+
+        Returns:
+            dict: 'loaded' records and 'total' records stored
+
+        Raises:
+            ValueError: If the module has no record table
+        """
+        name, table_class = _module(module)
+        attributes = _attributes(table_class)
+        insert = (f"INSERT OR REPLACE INTO {name} ({', '.join(attributes)}) "
+                  f"VALUES ({', '.join('?' * len(attributes))})")
+        loaded = 0
+        with self._lock, self._conn:
+            # Explicit, so dropping the indexes rolls back with a failed load
+            self._conn.execute('BEGIN')
+            if replace:
+                self._drop_indexes(module)
+                self._conn.execute(f'DELETE FROM {name}')
+            for chunk in chunks:
+                table = table_class.from_frame(chunk)
+                self._conn.executemany(insert, _rows(table))
+                loaded += len(table)
+            if replace:
+                self._create_indexes(module)
+            total = self._conn.execute(f'SELECT COUNT(*) FROM {name}').fetchone()[0]
+            self._conn.execute('INSERT OR REPLACE INTO loads (module, loaded_at, records) VALUES (?, ?, ?)',
+                               (module, datetime.utcnow().isoformat(), total))
+        logger.info(f"{'Replaced' if replace else 'Upserted'} {loaded} {module} records, {total} stored")
+        return {'loaded': loaded, 'total': total}
+
+    def repository(self, module: str) -> 'RecordRepository':
+        """Get the query API of a module's records"""
+        return RecordRepository(self, module)
+
+class RecordRepository:
+    """Queries over one module's records, answered from the indexed columns"""
+
+    def __init__(self, database: RecordDatabase, module: str):
+        """
+        Initialize the repository
+
+        Args:
+            database (RecordDatabase): Database holding the records
+            module (str): Module name, a key of MODULES
+
+        Raises:
+            ValueError: If the module has no record table
+        """
+        self.database = database
+        self.name, table_class = _module(module)
+        self.attributes = _attributes(table_class)
+
+    def _where(self, filters: Optional[Dict[str, List[Any]]],
+               ranges: Optional[Dict[str, Tuple[Any, Any]]]) -> Tuple[str, List[Any]]:
+        conditions, params = [], []
+        for attribute, values in (filters or {}).items():
+            self._check(attribute)
+            conditions.append(f"{attribute} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        for attribute, (low, high) in (ranges or {}).items():
+            self._check(attribute)
+            if low is not None:
+                conditions.append(f'{attribute} >= ?')
+                params.append(low)
+            if high is not None:
+                # Dates and times are stored as ISO text; a date-only bound includes its whole day
+                if isinstance(high, str) and len(high) == 10:
+                    high = f'{high}T23:59:59'
+                conditions.append(f'{attribute} <= ?')
+                params.append(high)
+        return (f"WHERE {' AND '.join(conditions)}" if conditions else ''), params
+
+    def _check(self, attribute: str) -> None:
+        if attribute not in self.attributes:
+            raise ValueError(f'Unknown {self.name} field: {attribute}')
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a record by id
+
+        Args:
+            record_id (str): Zoho record id
+
+        Returns:
+            dict: The record in its model's to_dict format, None if unknown
+        """
+        row = self.database.reader().execute(f'SELECT * FROM {self.name} WHERE id = ?',
+                                             (str(record_id),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def find(self, filters: Optional[Dict[str, List[Any]]] = None,
+             ranges: Optional[Dict[str, Tuple[Any, Any]]] = None, order_by: Optional[str] = None,
+             descending: bool = True, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Find records by field values, e.g. for the deal details table
+
+        Args:
+            filters (dict, optional): Attribute to the values to keep, e.g.
+                {'stage': ['Proposal'], 'region': ['APAC', 'EMEA']}
+            ranges (dict, optional): Attribute to inclusive (low, high)
+                bounds, either None, e.g. {'closing_date': ('2024-04-01', None)}
+            order_by (str, optional): Attribute to sort by, id when not given
+            descending (bool): Sort largest first
+            limit (int): Most records returned
+            offset (int): Records skipped, for paging
+
+        Returns:
+            list: Records in their model's to_dict format
+
+        Raises:
+            ValueError: If an attribute is not a field of the module
+        """
+        order_by = order_by or 'id'
+        self._check(order_by)
+        where, params = self._where(filters, ranges)
+        rows = self.database.reader().execute(
+            f"SELECT * FROM {self.name} {where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}, id "
+            f"LIMIT ? OFFSET ?", (*params, limit, offset)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, filters: Optional[Dict[str, List[Any]]] = None,
+              ranges: Optional[Dict[str, Tuple[Any, Any]]] = None) -> int:
+        """
+        Count records by field values
+
+        Args:
+            filters (dict, optional): See find
+            ranges (dict, optional): See find
+
+        Returns:
+            int: Number of matching records
+        """
+        where, params = self._where(filters, ranges)
+        return self.database.reader().execute(f'SELECT COUNT(*) FROM {self.name} {where}', params).fetchone()[0]
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""
+Response Snapshot Module
+Publishes ready-to-serve dashboard responses that the web process maps and sends as they are
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import numpy as np
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+logger = logging.getLogger(__name__)
+
+# Magic bytes and version of a generation file; other versions are not read
+RESPONSE_MAGIC = b'DRSP'
+RESPONSE_VERSION = 1
+
+# Fixed preamble: magic, version, generation, header offset, header length, body offset
+PREAMBLE = struct.Struct('<4sIQQQQ')
+
+# Arrays start on this boundary so they can be viewed in place
+ALIGNMENT = 64
+
+# Generations kept on disk; older ones are removed when a new one is published
+KEEP_GENERATIONS = 2
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def _generation_path(path: Path, generation: int) -> Path:
+    return path.with_name(f'{path.name}.{generation}')
+
+def _current_generation(path: Path) -> int:
+    """Get the generation a pointer file names, 0 when nothing is published"""
+    try:
+        return int(path.read_text().strip().rsplit('.', 1)[1])
+    except (OSError, IndexError, ValueError):
+        return 0
+
+def publish_response(path: Union[str, Path], body: bytes, arrays: Optional[Dict[str, np.ndarray]] = None,
+                     last_updated: Optional[str] = None, keep: int = KEEP_GENERATIONS) -> int:
+    """
+    Publish a response as the next generation
+
+    Each generation is its own file, never modified once written: the
+    fixed preamble, the arrays at aligned offsets, a JSON header locating
+    them, and the response body running to the end of the file. The file
+    at path only names the current generation and is replaced atomically,
+    so a reader sees either the old or the new generation, and a reader
+    still holding the old one keeps a valid mapping.
+
+    Args:
+        path: Pointer file naming the current generation
+        body (bytes): Response body exactly as it is sent
+        arrays (dict, optional): Name to a numeric array stored with the body
+        last_updated (str, optional): ISO time the data was refreshed
+        keep (int): Generations to keep on disk, the new one included
+
+    Returns:
+        int: The published generation
+    """
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    generation = _current_generation(path) + 1
+    generation_path = _generation_path(path, generation)
+    tmp_path = generation_path.with_name(generation_path.name + '.tmp')
+
+    header = {
+        'generation': generation,
+        'created_at': datetime.now().isoformat(),
+        'last_updated': last_updated,
+        'arrays': {}
+    }
+    with open(tmp_path, 'wb') as f:
+        f.seek(PREAMBLE.size)
+        for name, array in (arrays or {}).items():
+            array = np.ascontiguousarray(array)
+            if array.dtype.hasobject:
+                raise ValueError(f'Array {name} is not numeric')
+            offset = _aligned(f.tell())
+            f.seek(offset)
+            f.write(array.tobytes())
+            header['arrays'][name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        header_offset = f.tell()
+        header_bytes = json.dumps(header).encode()
+        f.write(header_bytes)
+        body_offset = f.tell()
+        f.write(body)
+        f.seek(0)
+        f.write(PREAMBLE.pack(RESPONSE_MAGIC, RESPONSE_VERSION, generation, header_offset, len(header_bytes),
+                              body_offset))
+    os.replace(tmp_path, generation_path)
+
+    pointer_tmp = path.with_name(path.name + '.tmp')
+    pointer_tmp.write_text(generation_path.name)
+    os.replace(pointer_tmp, path)
+    logger.info(f'Published response generation {generation} ({len(body)} bytes) at {path}')
+
+    for old in range(generation - keep, 0, -1):
+        old_path = _generation_path(path, old)
+        if not old_path.exists():
+            break
+        try:
+            old_path.unlink()
+        except OSError as e:
+            # Mapped files cannot be removed on every platform; the next publish retries
+            logger.debug(f'Could not remove response generation {old_path}: {str(e)}')
+    return generation
+
+class ResponseSnapshot:
+    """One published generation, mapped read-only"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Map a generation file and read its header
+
+        Args:
+            path: Generation file
+
+        Raises:
+            ValueError: If the file is not a generation of a supported version
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < PREAMBLE.size:
+            raise ValueError(f'{self.path} is not a response snapshot')
+        magic, version, generation, header_offset, header_length, body_offset = PREAMBLE.unpack_from(self._map)
+        if magic != RESPONSE_MAGIC or version != RESPONSE_VERSION:
+            raise ValueError(f'Unsupported response snapshot {self.path}')
+        self.generation = generation
+        self.header = json.loads(self._map[header_offset:header_offset + header_length])
+        self.body_offset = body_offset
+        self.body_length = len(self._map) - body_offset
+
+    @property
+    def last_updated(self) -> Optional[str]:
+        return self.header.get('last_updated')
+
+    def body(self) -> memoryview:
+        """Get the response body as a view of the mapping"""
+        return memoryview(self._map)[self.body_offset:]
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Get a stored array without copying it
+
+        Args:
+            name (str): Array name given when publishing
+
+        Returns:
+            np.ndarray: Read-only view of the mapping
+
+        Raises:
+            ValueError: If the generation has no such array
+        """
+        info = self.header['arrays'].get(name)
+        if info is None:
+            raise ValueError(f'Response generation {self.generation} has no array {name}')
+        dtype = np.dtype(info['dtype'])
+        count = int(np.prod(info['shape'], dtype='int64'))
+        return np.frombuffer(self._map, dtype, count, info['offset']).reshape(info['shape'])
+
+    def response(self, environ: Dict[str, Any]) -> Response:
+        """
+        Build the HTTP response of this generation
+
+        WSGI servers only accept bytes objects from a response iterable, so
+        the body is not yielded from the mapping; the file is handed to the
+        server's file wrapper at the body offset instead. Servers with
+        sendfile support (e.g. gunicorn) pass it to the socket from the page
+        cache the mapping keeps warm, others read it in blocks.
+
+        Args:
+            environ (dict): WSGI environment of the request
+
+        Returns:
+            Response: JSON response streaming the body
+        """
+        f = open(self.path, 'rb')
+        f.seek(self.body_offset)
+        response = Response(wrap_file(environ, f), mimetype='application/json', direct_passthrough=True)
+        response.content_length = self.body_length
+        return response
+
+class ResponseSnapshotServer:
+    """Follows the current generation of a pointer file"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize the server
+
+        Args:
+            path: Pointer file written by publish_response
+        """
+        self.path = Path(path)
+        self._current = None
+        self._pointer_key = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[ResponseSnapshot]:
+        """
+        Get the current generation, mapping a newly published one
+
+        The pointer file is stat'ed on every call, so a swap is picked up by
+        the next request. Old generations are never closed explicitly: their
+        mappings go away once no request or array view uses them.
+
+        Returns:
+            ResponseSnapshot: The current generation, None when nothing is published
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key == self._pointer_key:
+            return self._current
+        with self._lock:
+            if key != self._pointer_key:
+                name = self.path.read_text().strip()
+                self._current = ResponseSnapshot(self.path.with_name(name))
+                self._pointer_key = key
+                logger.info(f'Serving response generation {self._current.generation}')
+            return self._current
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+def get_response_server(path: Union[str, Path]) -> ResponseSnapshotServer:
+    """
+    Get the process-wide server of a pointer file
+
+    Args:
+        path: Pointer file written by publish_response
+
+    Returns:
+        ResponseSnapshotServer: Server shared by every request of the process
+    """
+    key = os.path.abspath(path)
+    with _servers_lock:
+        if key not in _servers:
+            _servers[key] = ResponseSnapshotServer(path)
+        return _servers[key]
\ No newline at end of file
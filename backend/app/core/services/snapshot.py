@@ -0,0 +1,185 @@
+"""
+Snapshot Module
+Stores each refreshed dataset as one binary snapshot with columnar record tables
+"""
+
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+import numpy as np
+from app.models.account import AccountTable
+from app.models.deal import DealTable
+from app.models.table import RecordTable, load_column
+
+logger = logging.getLogger(__name__)
+
+# Format name and version recorded in every snapshot; other versions are not read
+SNAPSHOT_FORMAT = 'dashboard-snapshot'
+SNAPSHOT_VERSION = 1
+
+# Members holding the metadata and the dashboard aggregates
+META_MEMBER = 'meta.json'
+AGGREGATES_MEMBER = 'aggregates.json'
+
+# zlib level of every member; higher levels barely shrink the arrays but write much slower
+COMPRESS_LEVEL = 1
+
+# Record tables a snapshot can hold
+TABLES = {
+    'deals': DealTable,
+    'accounts': AccountTable
+}
+
+def _member(table: str, attribute: str, array: str) -> str:
+    return f'{table}/{attribute}/{array}.npy'
+
+def write_snapshot(path: Union[str, Path], dashboard_data: Dict[str, Any],
+                   tables: Optional[Dict[str, RecordTable]] = None) -> Dict[str, Any]:
+    """
+    Write a refreshed dataset as a snapshot, replacing the previous one atomically
+
+    A snapshot is a zip file: the dashboard aggregates as compact JSON, and
+    every array of every table column as its own compressed .npy member, so
+    readers can load single columns. meta.json describes the tables and is
+    checked by readers against SNAPSHOT_VERSION. The file is written next
+    to its destination and renamed over it, so readers see either the old
+    or the new snapshot, never a partial one.
+
+    Args:
+        path: Snapshot file to write
+        dashboard_data (dict): Aggregates served by the dashboard
+        tables (dict, optional): Table name (a key of TABLES) to its records
+
+    Returns:
+        dict: The snapshot's metadata
+    """
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    meta = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'last_updated': dashboard_data.get('last_updated'),
+        'tables': {}
+    }
+
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as archive:
+        archive.writestr(AGGREGATES_MEMBER, json.dumps(dashboard_data, separators=(',', ':')))
+        for name, table in (tables or {}).items():
+            kinds = {attribute: kind for attribute, _, kind in table.FIELDS}
+            columns = {}
+            for attribute, column in table.columns.items():
+                arrays = column.arrays()
+                for array_name, array in arrays.items():
+                    with archive.open(_member(name, attribute, array_name), 'w', force_zip64=True) as f:
+                        np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+                columns[attribute] = {'kind': kinds[attribute], 'arrays': list(arrays)}
+            meta['tables'][name] = {'rows': len(table), 'columns': columns}
+        archive.writestr(META_MEMBER, json.dumps(meta, indent=2))
+
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote snapshot {path} with {', '.join(meta['tables']) or 'no'} tables")
+    return meta
+
+class SnapshotReader:
+    """Reads the parts of a snapshot a request needs"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a snapshot and check its metadata
+
+        Args:
+            path: Snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        self.path = Path(path)
+        self._archive = zipfile.ZipFile(self.path)
+        try:
+            self.meta = json.loads(self._archive.read(META_MEMBER))
+        except (KeyError, ValueError) as e:
+            self._archive.close()
+            raise ValueError(f'{self.path} is not a snapshot: {str(e)}')
+        if self.meta.get('format') != SNAPSHOT_FORMAT or self.meta.get('version') != SNAPSHOT_VERSION:
+            self._archive.close()
+            raise ValueError(f"Unsupported snapshot version {self.meta.get('version')} in {self.path}")
+
+    def close(self) -> None:
+        self._archive.close()
+
+    def __enter__(self) -> 'SnapshotReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def dashboard_data(self) -> Dict[str, Any]:
+        """Get the dashboard aggregates without touching the tables"""
+        return json.loads(self._archive.read(AGGREGATES_MEMBER))
+
+    def table(self, name: str, columns: Optional[Iterable[str]] = None) -> RecordTable:
+        """
+        Load a record table, or only some of its columns
+
+        Args:
+            name (str): Table name, e.g. 'deals'
+            columns (iterable, optional): Attributes to load, e.g. ['id',
+                'amount']; every stored column when not given
+
+        Returns:
+            RecordTable: The table, holding only the loaded columns
+
+        Raises:
+            ValueError: If the table or a column is not in the snapshot
+        """
+        info = self.meta['tables'].get(name)
+        if info is None or name not in TABLES:
+            raise ValueError(f'Snapshot has no table {name}')
+        attributes = list(columns) if columns is not None else list(info['columns'])
+        missing = [attribute for attribute in attributes if attribute not in info['columns']]
+        if missing:
+            raise ValueError(f"Snapshot table {name} has no columns {', '.join(missing)}")
+
+        loaded = {}
+        for attribute in attributes:
+            arrays = {}
+            for array_name in info['columns'][attribute]['arrays']:
+                with self._archive.open(_member(name, attribute, array_name)) as f:
+                    arrays[array_name] = np.lib.format.read_array(f, allow_pickle=False)
+            loaded[attribute] = load_column(info['columns'][attribute]['kind'], arrays)
+        return TABLES[name](loaded, info['rows'])
+
+def read_dashboard_data(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read the dashboard aggregates of a snapshot
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        dict: Dashboard data as written by write_snapshot
+    """
+    with SnapshotReader(path) as reader:
+        return reader.dashboard_data()
+
+def export_json(path: Union[str, Path], output_path: Union[str, Path], tables: List[str] = ()) -> None:
+    """
+    Export a snapshot as indented JSON
+
+    Args:
+        path: Snapshot file
+        output_path: JSON file to write
+        tables (list): Record tables to include in full under 'tables'
+    """
+    with SnapshotReader(path) as reader:
+        data = reader.dashboard_data()
+        if tables:
+            data['tables'] = {name: reader.table(name).to_dict() for name in tables}
+    with open(output_path, 'w') as f:
+        json.dump(data, f, indent=2)
\ No newline at end of file
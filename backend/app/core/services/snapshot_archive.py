@@ -0,0 +1,253 @@
+"""
+Snapshot Archive Module
+Keeps past snapshots in a content-addressed store of compressed, deduplicated and delta-encoded members
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+from app.core.services.snapshot import COMPRESS_LEVEL
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Version of the index layout; other versions are not read
+ARCHIVE_VERSION = 1
+
+INDEX_FILE = 'index.json'
+BLOBS_DIR = 'blobs'
+
+# Codec of new blobs; zstd when the zstandard package is installed
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'gzip'
+
+# Longest chain of deltas before a member is stored in full again
+MAX_DELTA_CHAIN = 16
+
+# Archives of the layout before this store, removed by age
+LEGACY_PREFIX = 'data_'
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError('Archive blob is zstd-compressed but zstandard is not installed')
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def _xor(data: bytes, base: bytes) -> bytes:
+    """
+    Delta of two byte strings: data XOR base over their common length, then
+    the rest of data as it is
+
+    Unchanged bytes become zeros, so the delta of a snapshot member that
+    only changed in some rows compresses to about the size of those rows.
+    Applying it to the same base gives data back.
+    """
+    common = min(len(data), len(base))
+    delta = bytearray(data)
+    np.bitwise_xor(np.frombuffer(data, np.uint8, common), np.frombuffer(base, np.uint8, common),
+                   out=np.frombuffer(delta, np.uint8, common))
+    return bytes(delta)
+
+class SnapshotArchive:
+    """Past snapshots stored once per distinct member, as deltas of the previous archive where they changed"""
+
+    def __init__(self, archive_dir: Union[str, Path], codec: str = DEFAULT_CODEC):
+        """
+        Open an archive directory, creating it on first use
+
+        Args:
+            archive_dir: Directory of the index and the blobs
+            codec (str): 'zstd' or 'gzip', compression of new blobs
+
+        Raises:
+            ValueError: If the codec is unknown or unavailable
+        """
+        if codec not in ('zstd', 'gzip') or (codec == 'zstd' and zstandard is None):
+            raise ValueError(f'Unsupported archive codec: {codec}')
+        self.archive_dir = Path(archive_dir)
+        self.codec = codec
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.archive_dir / INDEX_FILE) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {'version': ARCHIVE_VERSION, 'entries': [], 'blobs': {}}
+        if index.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive index version {index.get('version')}")
+        return index
+
+    def _save_index(self) -> None:
+        path = self.archive_dir / INDEX_FILE
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.archive_dir / BLOBS_DIR / digest[:2] / digest
+
+    def _chain(self, digest: str) -> int:
+        """Count the deltas to apply to rebuild a blob"""
+        depth = 0
+        while self._index['blobs'][digest].get('base'):
+            digest = self._index['blobs'][digest]['base']
+            depth += 1
+        return depth
+
+    def _read_blob(self, digest: str) -> bytes:
+        """Rebuild a member's bytes from its blob and the blobs it is a delta of"""
+        info = self._index['blobs'][digest]
+        data = _decompress(self._blob_path(digest).read_bytes(), info['codec'])
+        if info.get('base'):
+            data = _xor(data, self._read_blob(info['base']))[:info['size']]
+        return data
+
+    def _write_blob(self, digest: str, data: bytes, base: Optional[str]) -> int:
+        """Store a member, as a delta of base when that is smaller; returns the bytes written"""
+        stored = None
+        if base is not None and self._chain(base) < MAX_DELTA_CHAIN:
+            stored = _compress(_xor(data, self._read_blob(base)), self.codec)
+        if stored is None or len(stored) * 2 > len(data):
+            # Deltas of shifted or rewritten members do not compress; keep whichever is smaller
+            full = _compress(data, self.codec)
+            if stored is None or len(full) < len(stored):
+                stored, base = full, None
+
+        path = self._blob_path(digest)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(stored)
+        os.replace(tmp_path, path)
+        self._index['blobs'][digest] = {'size': len(data), 'stored': len(stored), 'codec': self.codec, 'base': base}
+        return len(stored)
+
+    def add(self, snapshot_path: Union[str, Path], archived_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Archive a snapshot
+
+        Every member of the snapshot zip is hashed; members already in the
+        store are only referenced, and new ones are written compressed, as a
+        delta of the same member of the previous archive when that is
+        smaller. An unchanged refresh therefore only adds its index entry
+        and the few members holding timestamps.
+
+        Args:
+            snapshot_path: Snapshot file written by write_snapshot
+            archived_at (datetime, optional): Time of the archive, now by default
+
+        Returns:
+            dict: The index entry, with 'written' bytes added to the store
+        """
+        archived_at = archived_at or datetime.utcnow()
+        with self._lock, zipfile.ZipFile(snapshot_path) as snapshot:
+            previous = dict(self._index['entries'][-1]['members']) if self._index['entries'] else {}
+            members = []
+            written = 0
+            for name in snapshot.namelist():
+                data = snapshot.read(name)
+                digest = hashlib.sha256(data).hexdigest()
+                if digest not in self._index['blobs']:
+                    written += self._write_blob(digest, data, previous.get(name))
+                members.append([name, digest])
+
+            entry = {
+                'id': hashlib.sha256(json.dumps(members).encode()).hexdigest(),
+                'archived_at': archived_at.isoformat(),
+                'members': members
+            }
+            self._index['entries'].append(entry)
+            self._save_index()
+        logger.info(f'Archived {snapshot_path} as {entry["id"][:12]}, {written} bytes written')
+        return {**entry, 'written': written}
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Get the archived snapshots, oldest first, as id and archived_at"""
+        return [{'id': entry['id'], 'archived_at': entry['archived_at']} for entry in self._index['entries']]
+
+    def restore(self, snapshot_id: str, output_path: Union[str, Path]) -> None:
+        """
+        Rebuild an archived snapshot as a snapshot file
+
+        Args:
+            snapshot_id (str): Id of an entry, e.g. from entries()
+            output_path: Snapshot file to write
+
+        Raises:
+            ValueError: If no archived snapshot has that id
+        """
+        with self._lock:
+            entry = next((entry for entry in self._index['entries'] if entry['id'] == snapshot_id), None)
+            if entry is None:
+                raise ValueError(f'No archived snapshot {snapshot_id}')
+            with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                                 compresslevel=COMPRESS_LEVEL) as snapshot:
+                for name, digest in entry['members']:
+                    snapshot.writestr(name, self._read_blob(digest))
+
+    def prune(self, retention_days: int) -> int:
+        """
+        Drop archives older than the retention period and the blobs only they used
+
+        Blobs that a kept delta is based on are kept too, however old.
+        Snapshot files of the previous archive layout are removed by age.
+
+        Args:
+            retention_days (int): Days archives are kept
+
+        Returns:
+            int: Number of blob files removed
+        """
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        with self._lock:
+            entries = self._index['entries']
+            kept = [entry for entry in entries if datetime.fromisoformat(entry['archived_at']) >= cutoff]
+            live = set()
+            for entry in kept:
+                for _, digest in entry['members']:
+                    while digest and digest not in live:
+                        live.add(digest)
+                        digest = self._index['blobs'][digest].get('base')
+
+            self._index['entries'] = kept
+            self._index['blobs'] = {digest: info for digest, info in self._index['blobs'].items() if digest in live}
+            self._save_index()
+
+            removed = 0
+            blobs_dir = self.archive_dir / BLOBS_DIR
+            for path in (blobs_dir.glob('*/*') if blobs_dir.exists() else []):
+                if path.name not in live:
+                    path.unlink()
+                    removed += 1
+
+        for path in self.archive_dir.glob(f'{LEGACY_PREFIX}*'):
+            if datetime.strptime(path.name[5:19], '%Y%m%d_%H%M%S') < cutoff:
+                path.unlink()
+                logger.info(f'Removed old archive: {path.name}')
+        if len(entries) != len(kept):
+            logger.info(f'Pruned {len(entries) - len(kept)} archived snapshots and {removed} blobs')
+        return removed
+
+    def disk_usage(self) -> int:
+        """Get the bytes the stored blobs take"""
+        return sum(info['stored'] for info in self._index['blobs'].values())
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Timestamps Module
+Shared parsing of Zoho CRM dates and datetimes, one value or whole columns at a time
+"""
+
+import functools
+import re
+from datetime import datetime
+from typing import Any, Callable, Optional
+import numpy as np
+import pandas as pd
+
+# Zoho layouts: dates like 2024-01-31, datetimes like 2024-01-31T10:15:00+05:30
+ZOHO_DATE_FORMAT = '%Y-%m-%d'
+ZOHO_LOCAL_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+ZOHO_DATETIME_LENGTH = 25
+
+# UTC offset of a Zoho datetime, after the local time
+ZOHO_OFFSET_PATTERN = re.compile(r'[+-]\d{2}:\d{2}')
+
+# Distinct values remembered by parse_timestamp
+TIMESTAMP_CACHE_SIZE = 65536
+
+# Columns with at most this share of distinct values are parsed once per value
+REPEATED_VALUE_RATIO = 0.5
+
+@functools.lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _parse_text(text: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Parse one Zoho date or datetime
+
+    Results are cached by text, so values repeated across records, such as
+    the closing days of deals, are only parsed once per process.
+
+    Args:
+        value: ISO 8601 text; datetimes are returned as they are
+
+    Returns:
+        datetime: Parsed value (timezone-aware if it had an offset), or None
+            if it is empty or not a valid date
+    """
+    if isinstance(value, datetime):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+    return _parse_text(value)
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Get a column as text with missing values empty"""
+    values = values.astype(object)
+    return values.where(values.notna(), '')
+
+def _by_distinct_value(values: pd.Series, parse: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Parse a column once per distinct value when its values repeat"""
+    codes, uniques = pd.factorize(values)
+    if len(uniques) > len(values) * REPEATED_VALUE_RATIO:
+        return parse(values)
+    parsed = parse(pd.Series(uniques, dtype=object))
+    return pd.Series(parsed.array.take(codes, allow_fill=True), index=values.index)
+
+def _offset_shift(offset: str) -> np.timedelta64:
+    """Get the shift of a UTC offset such as +05:30, NaT if it is malformed"""
+    offset = offset.strip('\x00')
+    if offset in ('', 'Z'):
+        return np.timedelta64(0, 's')
+    if not ZOHO_OFFSET_PATTERN.fullmatch(offset):
+        return np.timedelta64('NaT', 's')
+    sign = -1 if offset[0] == '-' else 1
+    return np.timedelta64(sign * (int(offset[1:3]) * 3600 + int(offset[4:6]) * 60), 's')
+
+def _parse_datetimes(values: pd.Series) -> pd.Series:
+    """
+    Parse Zoho datetimes to UTC
+
+    pandas parses each value with a UTC offset on its own, which is several
+    times slower than a naive parse; the offsets are few, so the local times
+    are parsed in one pass and shifted by the offset of their row.
+    """
+    text = _as_text(values).to_numpy(dtype=str)
+    width = text.dtype.itemsize // np.dtype('U1').itemsize
+    if width > ZOHO_DATETIME_LENGTH:
+        return pd.to_datetime(values, errors='coerce', utc=True, format='ISO8601')
+    text = text.astype(f'U{ZOHO_DATETIME_LENGTH}')
+    chars = text.view('U1').reshape(len(text), ZOHO_DATETIME_LENGTH)
+    lengths = np.char.str_len(text)
+    if not (np.isin(lengths, (0, 19, 20, 25)).all() and (chars[lengths > 0, 10] == 'T').all()):
+        return pd.to_datetime(values, errors='coerce', utc=True, format='ISO8601')
+    local = pd.to_datetime(text.astype('U19'), errors='coerce', format=ZOHO_LOCAL_DATETIME_FORMAT)
+    codes, offsets = pd.factorize(chars[:, 19:].copy().view('U6').ravel())
+    # A malformed offset makes its row NaT, like any other value that cannot be parsed
+    shifts = np.array([_offset_shift(offset) for offset in offsets], dtype='timedelta64[s]')
+    return pd.Series(local - shifts[codes], index=values.index).dt.tz_localize('UTC')
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """Parse Zoho dates, falling back to any ISO 8601 layout for other values"""
+    text = _as_text(values)
+    parsed = pd.to_datetime(text, errors='coerce', format=ZOHO_DATE_FORMAT)
+    failed = parsed.isna() & (text != '')
+    if failed.any():
+        parsed[failed] = pd.to_datetime(text[failed], errors='coerce', utc=True,
+                                        format='ISO8601').dt.tz_localize(None)
+    return parsed
+
+def parse_datetime_column(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of Zoho datetimes such as 2024-01-31T10:15:00+05:30
+
+    Args:
+        values (pd.Series): Datetime text or already parsed datetimes
+
+    Returns:
+        pd.Series: datetime64 in UTC, NaT where a value cannot be parsed
+    """
+    if values.dtype.kind == 'M':
+        if getattr(values.dt, 'tz', None) is None:
+            return values.dt.tz_localize('UTC')
+        return values.dt.tz_convert('UTC')
+    return _by_distinct_value(values, _parse_datetimes)
+
+def parse_date_column(values: pd.Series) -> pd.Series:
+    """
+    Parse a column of Zoho dates such as 2024-01-31
+
+    Dates repeat heavily (every deal closing on a day shares its value), so
+    each distinct value is parsed once and the results spread over the rows.
+
+    Args:
+        values (pd.Series): Date text or already parsed dates
+
+    Returns:
+        pd.Series: Naive datetime64, NaT where a value cannot be parsed
+    """
+    if values.dtype.kind == 'M':
+        if getattr(values.dt, 'tz', None) is not None:
+            return values.dt.tz_localize(None)
+        return values
+    return _by_distinct_value(values, _parse_dates)
\ No newline at end of file
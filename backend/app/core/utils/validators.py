@@ -4,7 +4,7 @@ Provides validation utilities for data processing
 """
 
 import re
-from datetime import datetime
+from app.core.utils.timestamps import parse_timestamp
 
 def validate_date_string(date_str):
     """
@@ -16,14 +16,10 @@ def validate_date_string(date_str):
     Returns:
         bool: True if valid, False otherwise
     """
-    if not date_str:
+    if not date_str or not isinstance(date_str, str):
         return False
         
-    try:
-        datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        return True
-    except (ValueError, AttributeError):
-        return False
+    return parse_timestamp(date_str) is not None
 
 def validate_email(email):
     """
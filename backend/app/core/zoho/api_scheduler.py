@@ -0,0 +1,371 @@
+"""
+Zoho API Scheduler Module
+Routes every Zoho CRM call through credit pools, concurrency caps and priorities
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Priority classes; lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITIES = {'interactive': PRIORITY_INTERACTIVE, 'background': PRIORITY_BACKGROUND}
+
+# Credit pools as token buckets: 'crm' is the org's rolling 24h API credit
+# allowance, 'bulk' rate limits bulk job submissions
+DEFAULT_DAILY_CREDITS = 50000
+DEFAULT_POOLS = {
+    'crm': {'capacity': DEFAULT_DAILY_CREDITS, 'refill_per_second': DEFAULT_DAILY_CREDITS / 86400},
+    'bulk': {'capacity': 10, 'refill_per_second': 10 / 60}
+}
+
+# Concurrent API calls allowed for the org, and bulk jobs allowed in flight
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_MAX_BULK_JOBS = 3
+
+# Credits charged per operation, by pool
+OPERATION_COSTS = {
+    'bulk_read_create': {'crm': 50, 'bulk': 1},
+    'bulk_read_status': {'crm': 1},
+    'bulk_read_download': {'crm': 1},
+    'records': {'crm': 1},
+    'record_count': {'crm': 1},
+    'fields': {'crm': 1},
+    'users': {'crm': 1},
+    'org': {'crm': 1},
+    'currencies': {'crm': 1}
+}
+DEFAULT_OPERATION_COST = {'crm': 1}
+
+# Retries of a throttled call and the pause applied when Zoho gives no Retry-After
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_THROTTLE_PAUSE = 60
+
+class RateLimitExceeded(Exception):
+    """Raised when Zoho rejects a call with HTTP 429"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def is_throttled(error: Exception) -> bool:
+    """Check whether an exception was caused by Zoho throttling the call"""
+    if isinstance(error, RateLimitExceeded):
+        return True
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 429
+
+def is_throttled_response(response: Any) -> bool:
+    """Check whether an SDK API response is Zoho's HTTP 429 (the SDK does not raise on it)"""
+    get_status_code = getattr(response, 'get_status_code', None)
+    return callable(get_status_code) and get_status_code() == 429
+
+def _retry_after(error: Any) -> Optional[float]:
+    """Get the Retry-After delay of a throttled call or response, if Zoho sent one"""
+    if isinstance(error, RateLimitExceeded):
+        return error.retry_after
+    if hasattr(error, 'get_headers'):
+        headers = error.get_headers() or {}
+    else:
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers['Retry-After'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until the bucket holds the given amount (0 if it already does)"""
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float('inf')
+        return missing / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        """Remove tokens from the bucket"""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+class PriorityGate:
+    """Concurrency limit that admits waiters in priority order"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+
+    def acquire(self, priority: int, ready: Optional[Callable[[], float]] = None) -> float:
+        """
+        Wait for a slot
+
+        Waiters are admitted by priority, then arrival order. When given, ready
+        is called under the gate's lock once the caller is next in line and a
+        slot is free; it returns 0 when the caller may proceed, or the number of
+        seconds to wait before asking again.
+
+        Args:
+            priority (int): Priority class (lower is served first)
+            ready (callable, optional): Extra admission check
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        started = time.monotonic()
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    if self._waiting[0] == ticket and self.active < self.limit:
+                        delay = ready() if ready else 0
+                        if delay <= 0:
+                            heapq.heappop(self._waiting)
+                            self.active += 1
+                            self._cond.notify_all()
+                            return time.monotonic() - started
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+
+    def release(self) -> None:
+        """Free a slot"""
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+class CreditUsage:
+    """Credits, calls and wait time accumulated by one refresh"""
+
+    def __init__(self, label: str, priority: int = PRIORITY_BACKGROUND):
+        self.label = label
+        self.priority = priority
+        self.credits = {}
+        self.calls = {}
+        self.wait_seconds = 0.0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, cost: Dict[str, float], waited: float) -> None:
+        """Record one admitted call"""
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            for pool, amount in cost.items():
+                self.credits[pool] = self.credits.get(pool, 0) + amount
+            self.wait_seconds += waited
+
+    def record_throttle(self) -> None:
+        """Record a call rejected by Zoho throttling"""
+        with self._lock:
+            self.throttled += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the usage
+
+        Returns:
+            dict: label, credits by pool, calls by operation, total calls,
+                seconds spent waiting for admission and throttled calls
+        """
+        with self._lock:
+            return {
+                'label': self.label,
+                'credits': dict(self.credits),
+                'calls': dict(self.calls),
+                'total_calls': sum(self.calls.values()),
+                'wait_seconds': round(self.wait_seconds, 2),
+                'throttled': self.throttled
+            }
+
+_current_usage: ContextVar[Optional[CreditUsage]] = ContextVar('zoho_credit_usage', default=None)
+
+class ApiScheduler:
+    """Admits Zoho API calls against credit pools, concurrency caps and priorities"""
+
+    def __init__(self, pools: Optional[Dict[str, Dict[str, float]]] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_bulk_jobs: int = DEFAULT_MAX_BULK_JOBS,
+                 costs: Optional[Dict[str, Dict[str, float]]] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        Initialize the scheduler
+
+        Args:
+            pools (dict, optional): Pool name to {'capacity', 'refill_per_second'}
+            max_concurrency (int): Maximum number of API calls in flight
+            max_bulk_jobs (int): Maximum number of bulk jobs in flight
+            costs (dict, optional): Operation name to credits charged per pool
+            max_retries (int): Retries of a call Zoho throttled
+        """
+        self.buckets = {
+            name: TokenBucket(pool['capacity'], pool['refill_per_second'])
+            for name, pool in (pools or DEFAULT_POOLS).items()
+        }
+        self.costs = costs or OPERATION_COSTS
+        self.max_retries = max_retries
+        self.calls = PriorityGate(max_concurrency)
+        self.bulk_jobs = PriorityGate(max_bulk_jobs)
+        self.totals = CreditUsage('process')
+        self._paused_until = 0.0
+
+    def cost(self, operation: str) -> Dict[str, float]:
+        """Get the credits an operation draws from each pool"""
+        return {
+            pool: amount
+            for pool, amount in self.costs.get(operation, DEFAULT_OPERATION_COST).items()
+            if pool in self.buckets
+        }
+
+    def _admit(self, cost: Dict[str, float]) -> Callable[[], float]:
+        """Build the admission check taking an operation's credits once all pools have them"""
+        def ready() -> float:
+            delay = max([self._paused_until - time.monotonic()] +
+                        [self.buckets[pool].time_until(amount) for pool, amount in cost.items()])
+            if delay <= 0:
+                for pool, amount in cost.items():
+                    self.buckets[pool].take(amount)
+            return delay
+        return ready
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every call for a while, e.g. after Zoho throttled us"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f'Zoho API calls paused for {seconds:.0f}s after throttling')
+
+    def call(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a Zoho API call once the scheduler admits it
+
+        The call waits for a concurrency slot and for its credits in every pool,
+        behind any higher-priority callers. Throttled calls, whether raised or
+        returned as a 429 SDK response, pause all traffic for Zoho's Retry-After
+        delay and are retried; the last 429 response is returned as is.
+
+        Args:
+            operation (str): Operation name, see OPERATION_COSTS
+            func (callable): Function performing the call
+            *args, **kwargs: Passed to func
+
+        Returns:
+            Whatever func returns
+
+        Raises:
+            Exception: Whatever func raises, once retries are exhausted
+        """
+        usage = _current_usage.get()
+        priority = usage.priority if usage else PRIORITY_BACKGROUND
+        cost = self.cost(operation)
+
+        for attempt in range(self.max_retries + 1):
+            waited = self.calls.acquire(priority, self._admit(cost))
+            self.totals.record(operation, cost, waited)
+            if usage:
+                usage.record(operation, cost, waited)
+            try:
+                result = func(*args, **kwargs)
+                if not is_throttled_response(result) or attempt == self.max_retries:
+                    return result
+                throttled = result
+            except Exception as e:
+                if not is_throttled(e) or attempt == self.max_retries:
+                    raise
+                throttled = e
+            finally:
+                self.calls.release()
+
+            self.totals.record_throttle()
+            if usage:
+                usage.record_throttle()
+            self.pause(_retry_after(throttled) or DEFAULT_THROTTLE_PAUSE)
+
+    @contextmanager
+    def bulk_job(self):
+        """Hold one of the bulk job slots from submission until the result is downloaded"""
+        usage = _current_usage.get()
+        self.bulk_jobs.acquire(usage.priority if usage else PRIORITY_BACKGROUND)
+        try:
+            yield
+        finally:
+            self.bulk_jobs.release()
+
+    @contextmanager
+    def track(self, label: str, priority: int = PRIORITY_BACKGROUND):
+        """
+        Attribute the calls made in this context to one refresh
+
+        The priority applies to every call made in the context, including calls
+        from worker threads started with contextvars.copy_context().
+
+        Args:
+            label (str): Name of the refresh in logs
+            priority (int): Priority class of its calls
+
+        Yields:
+            CreditUsage: Usage accumulated by the refresh
+        """
+        usage = CreditUsage(label, priority)
+        token = _current_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_usage.reset(token)
+            summary = usage.summary()
+            logger.info(f"{label} used {summary['credits']} credits in {summary['total_calls']} calls "
+                        f"(waited {summary['wait_seconds']}s, throttled {summary['throttled']}x)")
+
+_scheduler = ApiScheduler()
+
+def get_scheduler() -> ApiScheduler:
+    """Get the process-wide Zoho API scheduler"""
+    return _scheduler
+
+def configure_scheduler(daily_credits: int = DEFAULT_DAILY_CREDITS,
+                        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                        max_bulk_jobs: int = DEFAULT_MAX_BULK_JOBS) -> ApiScheduler:
+    """
+    Replace the process-wide scheduler with one using the org's limits
+
+    Args:
+        daily_credits (int): API credits the org gets per 24 hours
+        max_concurrency (int): Maximum number of API calls in flight
+        max_bulk_jobs (int): Maximum number of bulk jobs in flight
+
+    Returns:
+        ApiScheduler: The new scheduler
+    """
+    global _scheduler
+    pools = dict(DEFAULT_POOLS)
+    pools['crm'] = {'capacity': daily_credits, 'refill_per_second': daily_credits / 86400}
+    _scheduler = ApiScheduler(pools, max_concurrency, max_bulk_jobs)
+    return _scheduler
\ No newline at end of file
@@ -4,13 +4,9 @@ Handles OAuth2 authentication with Zoho API using the official SDK
 """
 
 import logging
-from zohocrmsdk.src.com.zoho.api.authenticator.oauth_token import OAuthToken
-from zohocrmsdk.src.com.zoho.crm.api.dc.data_center import INDataCenter
-from zohocrmsdk.src.com.zoho.api.logger import Logger
-from zohocrmsdk.src.com.zoho.crm.api.sdk_config import SDKConfig
 from zohocrmsdk.src.com.zoho.crm.api.initializer import Initializer
 from flask import current_app
-from backend.app.core.zoho.token_store import EnvironmentTokenStore
+from app.core.zoho.registry import get_registry
 
 logger = logging.getLogger(__name__)
 
@@ -21,29 +17,14 @@ class ZohoAuth:
         self.config = current_app.config['ZOHO_API']
         self._initialize_sdk()
     
-    def _initialize_sdk(self):
-        """Initialize the Zoho CRM SDK"""
+    def _initialize_sdk(self, force=False):
+        """Initialize the Zoho CRM SDK through the shared client registry
+        
+        Args:
+            force (bool): Initialize again even if the SDK already was
+        """
         try:
-            # Create OAuth token
-            token = OAuthToken(
-                client_id=self.config['client_id'],
-                client_secret=self.config['client_secret'],
-                refresh_token=self.config['refresh_token']
-            )
-            
-            # Use the new environment-based token store
-            store = EnvironmentTokenStore()
-            
-            # Initialize the SDK
-            Initializer.initialize(
-                environment=INDataCenter.PRODUCTION(),
-                token=token,
-                store=store,
-                sdk_config=SDKConfig(auto_refresh_fields=True, pick_list_validation=False)
-            )
-            
-            logger.info('Zoho CRM SDK initialized successfully')
-            
+            get_registry().initialize_sdk(self.config, force=force)
         except Exception as e:
             logger.error(f'Failed to initialize Zoho CRM SDK: {str(e)}')
             raise
@@ -68,7 +49,7 @@ class ZohoAuth:
         try:
             # The SDK handles token invalidation automatically
             # We just need to reinitialize
-            self._initialize_sdk()
+            self._initialize_sdk(force=True)
         except Exception as e:
             logger.error(f'Failed to invalidate token: {str(e)}')
             raise 
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+Zoho Bulk Callback Module
+Receives bulk job completion callbacks from Zoho CRM and lets callers wait on them
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from flask import Flask, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+# Route Zoho posts bulk job notifications to
+CALLBACK_ROUTE = '/api/zoho/bulk-callback'
+
+# Job states after which a bulk job will not change any more
+TERMINAL_STATES = ('COMPLETED', 'FAILED')
+
+# Callbacks nobody collects, e.g. for unknown or discarded jobs, are dropped after this many seconds
+UNCLAIMED_CALLBACK_TTL = 3600
+
+# Most callbacks kept at once; the oldest are dropped first
+MAX_CALLBACKS = 1000
+
+class BulkJobNotifier:
+    """Thread-safe registry of bulk job states reported through callbacks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}
+        self._payloads = {}
+
+    def _get_event(self, job_id: str) -> threading.Event:
+        with self._lock:
+            if job_id not in self._events:
+                self._events[job_id] = threading.Event()
+            return self._events[job_id]
+
+    def _expire(self) -> None:
+        """Drop callbacks older than UNCLAIMED_CALLBACK_TTL, then the oldest while MAX_CALLBACKS are kept"""
+        cutoff = time.monotonic() - UNCLAIMED_CALLBACK_TTL
+        expired = [job_id for job_id, entry in self._payloads.items() if entry['received_at'] < cutoff]
+        for job_id in expired:
+            self._payloads.pop(job_id)
+            self._events.pop(job_id, None)
+        while len(self._payloads) >= MAX_CALLBACKS:
+            job_id = next(iter(self._payloads))
+            self._payloads.pop(job_id)
+            self._events.pop(job_id, None)
+
+    def notify(self, job_id: str, state: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a callback for a job and wake up anyone waiting on it
+
+        The callback endpoint is not authenticated, so a callback is only a
+        hint that the job may have finished; wait_for_job confirms it.
+        Callbacks for jobs nobody waits on expire.
+
+        Args:
+            job_id (str): Bulk job ID
+            state (str): Job state reported by Zoho (e.g. 'COMPLETED')
+            payload (dict, optional): Full callback payload
+        """
+        job_id = str(job_id)
+        with self._lock:
+            # Re-inserted so the dict stays ordered by arrival
+            self._payloads.pop(job_id, None)
+            self._expire()
+            self._payloads[job_id] = {'state': state, 'payload': payload or {}, 'received_at': time.monotonic()}
+        logger.info(f'Received callback for bulk job {job_id}: {state}')
+        if state in TERMINAL_STATES:
+            self._get_event(job_id).set()
+
+    def wait(self, job_id: str, timeout: float) -> Optional[str]:
+        """
+        Block until a terminal callback arrives for the job or the timeout expires
+
+        Callbacks that arrived before the wait started are returned immediately.
+        A returned callback is consumed, so the next wait blocks again.
+
+        Args:
+            job_id (str): Bulk job ID
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            str: Reported job state, or None if no callback arrived in time
+        """
+        job_id = str(job_id)
+        event = self._get_event(job_id)
+        if not event.wait(timeout):
+            return None
+        event.clear()
+        return self.get_state(job_id)
+
+    def get_state(self, job_id: str) -> Optional[str]:
+        """Get the last state reported for a job, if any"""
+        with self._lock:
+            entry = self._payloads.get(str(job_id))
+        return entry['state'] if entry else None
+
+    def get_payload(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the last callback payload received for a job, if any"""
+        with self._lock:
+            entry = self._payloads.get(str(job_id))
+        return entry['payload'] if entry else None
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job once nobody is waiting on it any more"""
+        with self._lock:
+            self._events.pop(str(job_id), None)
+            self._payloads.pop(str(job_id), None)
+
+_notifier = BulkJobNotifier()
+
+def get_notifier() -> BulkJobNotifier:
+    """Get the process-wide bulk job notifier"""
+    return _notifier
+
+def parse_callback_payload(payload: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Extract the job ID and state from a Zoho bulk callback payload
+
+    Zoho posts the job details either as JSON or as form fields; the job ID is
+    sent as 'job_id' (older payloads use 'id').
+
+    Args:
+        payload (dict): Callback body
+
+    Returns:
+        dict: {'job_id': ..., 'state': ...}
+    """
+    job_id = payload.get('job_id') or payload.get('id')
+    state = payload.get('state') or payload.get('status')
+    return {
+        'job_id': str(job_id) if job_id else None,
+        'state': str(state).upper() if state else None
+    }
+
+def register_callback_route(app: Flask, notifier: Optional[BulkJobNotifier] = None) -> None:
+    """
+    Register the bulk job callback endpoint with a Flask application
+
+    Args:
+        app: Flask application instance
+        notifier (BulkJobNotifier, optional): Notifier to report to (default: process-wide)
+    """
+    notifier = notifier or get_notifier()
+
+    @app.route(CALLBACK_ROUTE, methods=['POST'])
+    def bulk_job_callback():
+        """Receive a bulk job notification from Zoho CRM"""
+        payload = request.get_json(silent=True) or request.form.to_dict()
+        details = parse_callback_payload(payload)
+
+        if not details['job_id'] or not details['state']:
+            return jsonify({
+                'error': 'Bad Request',
+                'message': 'Callback must include job_id and state'
+            }), 400
+
+        notifier.notify(details['job_id'], details['state'], payload)
+        return jsonify({'status': 'received', 'job_id': details['job_id']})
+
+def create_callback_app(notifier: Optional[BulkJobNotifier] = None) -> Flask:
+    """
+    Create a minimal Flask application that only receives bulk callbacks
+
+    Used by scripts that run outside the main web application.
+
+    Args:
+        notifier (BulkJobNotifier, optional): Notifier to report to (default: process-wide)
+
+    Returns:
+        Flask: Callback receiver application
+    """
+    app = Flask(__name__)
+    register_callback_route(app, notifier)
+    return app
+
+def start_callback_server(host: str = '0.0.0.0', port: int = 8765,
+                          notifier: Optional[BulkJobNotifier] = None):
+    """
+    Serve the callback receiver from a background thread
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free port)
+        notifier (BulkJobNotifier, optional): Notifier to report to (default: process-wide)
+
+    Returns:
+        werkzeug.serving.BaseWSGIServer: Running server; call shutdown() to stop it
+    """
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, create_callback_app(notifier), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name='bulk_callback_server', daemon=True)
+    thread.start()
+    logger.info(f'Bulk callback receiver listening on {host}:{server.server_port}{CALLBACK_ROUTE}')
+    return server
+
+def wait_for_job(job_id: str, get_status: Callable[[str], str],
+                 notifier: Optional[BulkJobNotifier] = None, timeout: float = 300,
+                 initial_interval: float = 1, max_interval: float = 30,
+                 backoff: float = 2) -> str:
+    """
+    Wait for a bulk job to finish
+
+    Waits on the job's callback event, then checks the job status. The
+    callback endpoint is not authenticated, so a callback only cuts the wait
+    short: the state it reports is never trusted without the status check.
+    The interval grows exponentially up to max_interval, so long-running
+    jobs cost few API calls.
+
+    Args:
+        job_id (str): Job ID
+        get_status (callable): Returns the current job state for a job ID
+        notifier (BulkJobNotifier, optional): Notifier receiving callbacks (default: process-wide)
+        timeout (float): Maximum time to wait in seconds
+        initial_interval (float): First wait before polling in seconds
+        max_interval (float): Upper bound for the wait between polls in seconds
+        backoff (float): Factor applied to the interval after every poll
+
+    Returns:
+        str: Final job status ('COMPLETED')
+
+    Raises:
+        Exception: If the job fails or times out
+    """
+    notifier = notifier or get_notifier()
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise Exception(f'Timeout waiting for job {job_id}')
+
+            reported = notifier.wait(job_id, min(interval, remaining))
+            status = get_status(job_id)
+            if reported is not None and reported != status:
+                logger.warning(f'Callback for job {job_id} reported {reported} but its status is {status}')
+
+            if status == 'COMPLETED':
+                return status
+            elif status == 'FAILED':
+                raise Exception(f'Bulk read job {job_id} failed')
+
+            logger.debug(f'Job {job_id} status: {status}, next check in {interval}s')
+            interval = min(interval * backoff, max_interval)
+    finally:
+        notifier.discard(job_id)
\ No newline at end of file
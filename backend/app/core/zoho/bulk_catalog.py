@@ -0,0 +1,226 @@
+"""
+Zoho Bulk Catalog Module
+Keeps a manifest of the bulk read results on disk so their module and schema are known without opening them
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from .chunked_transform import count_csv_rows
+from .field_cache import IMPLICIT_COLUMNS, read_csv_header
+
+logger = logging.getLogger(__name__)
+
+# Manifest file, kept in the directory of the files it lists
+CATALOG_FILE = 'catalog.json'
+
+# Version of the manifest layout; other versions are rebuilt from scratch
+CATALOG_VERSION = 1
+
+# Size of the blocks read when checksumming a file
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+
+# Serializes manifest updates of every catalog instance of the process
+_write_lock = threading.Lock()
+
+def header_hash(fields: Iterable[str]) -> str:
+    """
+    Hash the columns of a CSV file, in order
+
+    Args:
+        fields (iterable): Column names as in the header row
+
+    Returns:
+        str: Hex digest shared by every file with the same header
+    """
+    return hashlib.sha256('\n'.join(fields).encode('utf-8')).hexdigest()
+
+def file_checksum(path: Union[str, Path]) -> str:
+    """Get the SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHECKSUM_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def detect_module(fields: List[str], module_fields: Dict[str, Iterable[str]]) -> Optional[str]:
+    """
+    Work out the module of a CSV export from its header
+
+    Exports only hold fields of their module, so the module is the one
+    whose fields contain every column. Used for files that landed before
+    the catalog; files landing now are catalogued with their module.
+
+    Args:
+        fields (list): Column names of the file
+        module_fields (dict): Module name to its field API names, e.g. from
+            the field cache
+
+    Returns:
+        str: The only module matching, None if no module or several match
+    """
+    columns = set(fields) - set(IMPLICIT_COLUMNS)
+    matches = [module for module, names in module_fields.items() if columns and columns <= set(names)]
+    return matches[0] if len(matches) == 1 else None
+
+class BulkCatalog:
+    """Manifest of bulk read results by file, job and module"""
+
+    def __init__(self, data_dir: Union[str, Path]):
+        """
+        Open the catalog of a data directory
+
+        Args:
+            data_dir: Directory bulk read results are saved to
+        """
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / CATALOG_FILE
+        self._catalog = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        empty = {'version': CATALOG_VERSION, 'files': {}, 'jobs': {}, 'latest': {}}
+        try:
+            with open(self.path) as f:
+                catalog = json.load(f)
+        except FileNotFoundError:
+            return empty
+        except (OSError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable bulk catalog {self.path}: {str(e)}')
+            return empty
+        if catalog.get('version') != CATALOG_VERSION:
+            logger.warning(f"Ignoring bulk catalog version {catalog.get('version')}")
+            return empty
+        return catalog
+
+    def _save(self) -> None:
+        self.data_dir.mkdir(exist_ok=True, parents=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._catalog, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _entry(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        entry = self._catalog['files'].get(name) if name else None
+        if entry is None:
+            return None
+        return {**entry, 'file_path': str(self.data_dir / name)}
+
+    def register(self, file_path: Union[str, Path], module: str, job_ids: Optional[List[str]] = None,
+                 fields: Optional[List[str]] = None, record_count: Optional[int] = None,
+                 complete: bool = True, source: str = 'bulk') -> Dict[str, Any]:
+        """
+        Catalog a result that just landed
+
+        The file is read once for its checksum; the header and record count
+        are read too unless the caller already has them. The file becomes
+        the latest of its module, and its latest complete file unless it
+        only holds a delta.
+
+        Args:
+            file_path: CSV file in the data directory
+            module (str): Module the file was exported from
+            job_ids (list, optional): Bulk read jobs of the file, one per page
+            fields (list, optional): Columns of the file, in order
+            record_count (int, optional): Records in the file
+            complete (bool): The file holds every record of the module,
+                False for delta exports
+            source (str): 'bulk' or 'rest', how the file was read
+
+        Returns:
+            dict: The entry, with the absolute 'file_path'
+
+        Raises:
+            ValueError: If the file is not in the data directory
+        """
+        path = Path(file_path)
+        if path.resolve().parent != self.data_dir.resolve():
+            raise ValueError(f'{path} is not in the catalog directory {self.data_dir}')
+        fields = list(fields) if fields is not None else read_csv_header(path)
+        entry = {
+            'module': module,
+            'job_ids': [str(job_id) for job_id in job_ids or []],
+            'source': source,
+            'fields': fields,
+            'schema_hash': header_hash(fields),
+            'record_count': record_count if record_count is not None else count_csv_rows(path),
+            'complete': complete,
+            'size': path.stat().st_size,
+            'checksum': file_checksum(path),
+            'landed_at': datetime.utcnow().isoformat()
+        }
+
+        with _write_lock:
+            # Another instance may have catalogued files since this one loaded
+            self._catalog = self._load()
+            self._catalog['files'][path.name] = entry
+            for job_id in entry['job_ids']:
+                self._catalog['jobs'][job_id] = path.name
+            latest = self._catalog['latest'].setdefault(module, {})
+            latest['any'] = path.name
+            if complete:
+                latest['complete'] = path.name
+            self._save()
+        logger.info(f"Catalogued {path.name}: {entry['record_count']} {module} records, {entry['size']} bytes")
+        return {**entry, 'file_path': str(self.data_dir / path.name)}
+
+    def get(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """
+        Get the entry of a file
+
+        Args:
+            file_path: File in the data directory, or its name
+
+        Returns:
+            dict: The entry, None if the file is not catalogued
+        """
+        return self._entry(Path(file_path).name)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the entry of the file a bulk read job's result is in, None if not catalogued"""
+        return self._entry(self._catalog['jobs'].get(str(job_id)))
+
+    def latest(self, module: str, complete: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get the entry of the last result of a module that is still on disk
+
+        Args:
+            module (str): Module name
+            complete (bool): Only consider files holding every record,
+                skipping delta exports
+
+        Returns:
+            dict: The entry, None if no such file is catalogued
+        """
+        latest = self._catalog['latest'].get(module, {})
+        entry = self._entry(latest.get('complete' if complete else 'any'))
+        if entry is None or not os.path.exists(entry['file_path']):
+            return None
+        return entry
+
+    def entries(self, module: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the entries of every file, or of one module's files, oldest first"""
+        entries = [self._entry(name) for name in self._catalog['files']]
+        return sorted((entry for entry in entries if module is None or entry['module'] == module),
+                      key=lambda entry: entry['landed_at'])
+
+    def verify(self, file_path: Union[str, Path]) -> bool:
+        """
+        Check that a catalogued file is unchanged since it landed
+
+        Args:
+            file_path: File in the data directory
+
+        Returns:
+            bool: True if its size and checksum match the entry
+        """
+        entry = self.get(file_path)
+        if entry is None or not os.path.exists(entry['file_path']):
+            return False
+        if os.path.getsize(entry['file_path']) != entry['size']:
+            return False
+        return file_checksum(entry['file_path']) == entry['checksum']
\ No newline at end of file
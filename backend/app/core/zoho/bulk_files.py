@@ -0,0 +1,197 @@
+"""
+Zoho Bulk File Module
+Streams bulk read results to disk and extracts their CSV in bounded memory
+"""
+
+import logging
+import io
+import os
+import shutil
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+import requests
+from zohocrmsdk.src.com.zoho.crm.api.initializer import Initializer
+
+logger = logging.getLogger(__name__)
+
+# Size of the blocks read from the network and copied out of the ZIP
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Bulk read result endpoint, relative to the data center API URL
+BULK_RESULT_PATH = '/crm/bulk/v8/read/{job_id}/result'
+
+def open_bulk_result_stream(job_id: str, session: Optional[requests.Session] = None,
+                            timeout: int = 300) -> requests.Response:
+    """
+    Open a streaming HTTP response for a completed bulk read job
+
+    The SDK's download call buffers the whole body in memory, so the result is
+    requested directly with stream=True using the SDK's environment and token.
+
+    Args:
+        job_id (str): Job ID
+        session (requests.Session, optional): Session to send the request with
+        timeout (int): Socket timeout in seconds
+
+    Returns:
+        requests.Response: Unread streaming response; close it when done
+    """
+    initializer = Initializer.get_initializer()
+    url = initializer.environment.url + BULK_RESULT_PATH.format(job_id=job_id)
+    headers = {'Authorization': f'Zoho-oauthtoken {initializer.token.get_token()}'}
+
+    response = (session or requests).get(url, headers=headers, stream=True, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+def iter_chunks(source: Any, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Iterate over a download source in fixed-size chunks
+
+    Args:
+        source: bytes, a requests.Response, a binary file object or an iterable of bytes
+
+    Yields:
+        bytes: Non-empty chunks of the source
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    if hasattr(source, 'iter_content'):
+        chunks = source.iter_content(chunk_size=chunk_size)
+    elif hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), b'')
+    else:
+        chunks = source
+
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+
+def spool_to_file(source: Any, path: Union[str, Path], chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> int:
+    """
+    Write a download source to disk one chunk at a time
+
+    Data is written to a '.part' file which is renamed into place once complete,
+    so readers never see a truncated file.
+
+    Args:
+        source: Anything accepted by iter_chunks
+        path: Destination file path
+        chunk_size (int): Chunk size in bytes
+
+    Returns:
+        int: Number of bytes written
+    """
+    path = Path(path)
+    part_path = path.with_name(path.name + '.part')
+    written = 0
+
+    try:
+        with open(part_path, 'wb') as f:
+            for chunk in iter_chunks(source, chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(part_path, path)
+    finally:
+        if part_path.exists():
+            part_path.unlink()
+
+    return written
+
+def find_csv_member(zip_ref: zipfile.ZipFile) -> str:
+    """Get the name of the first CSV member of a bulk read ZIP"""
+    csv_files = [f for f in zip_ref.namelist() if f.endswith('.csv')]
+    if not csv_files:
+        raise ValueError("No CSV file found in ZIP archive")
+    return csv_files[0]
+
+def extract_csv_member(zip_path: Union[str, Path], csv_path: Union[str, Path],
+                       chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> str:
+    """
+    Decompress the CSV member of a bulk read ZIP straight to disk
+
+    Args:
+        zip_path: Path to the ZIP file
+        csv_path: Destination CSV path
+        chunk_size (int): Copy buffer size in bytes
+
+    Returns:
+        str: Name of the extracted member
+    """
+    with zipfile.ZipFile(zip_path) as zip_ref:
+        csv_filename = find_csv_member(zip_ref)
+        with zip_ref.open(csv_filename) as source, open(csv_path, 'wb') as target:
+            shutil.copyfileobj(source, target, chunk_size)
+    return csv_filename
+
+@contextmanager
+def open_csv_member(zip_path: Union[str, Path], encoding: str = 'utf-8-sig'):
+    """
+    Open the CSV member of a bulk read ZIP as a decompressing text stream
+
+    The stream can be handed to csv.reader or pd.read_csv without extracting
+    the file first.
+
+    Args:
+        zip_path: Path to the ZIP file
+        encoding (str): CSV text encoding (Zoho exports carry a BOM)
+
+    Yields:
+        io.TextIOWrapper: Text stream over the CSV member
+    """
+    with zipfile.ZipFile(zip_path) as zip_ref:
+        with zip_ref.open(find_csv_member(zip_ref)) as member:
+            yield io.TextIOWrapper(member, encoding=encoding, newline='')
+
+def store_bulk_result(source: Any, data_dir: Union[str, Path], stem: str, keep_zip: bool = False,
+                      chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Save a bulk read result as a CSV file without holding it in memory
+
+    The download is spooled to a temporary file; a ZIP result then has its CSV
+    member decompressed next to it, while a plain CSV result is renamed into place.
+
+    Args:
+        source: Anything accepted by iter_chunks (usually a streaming response)
+        data_dir: Directory to save into
+        stem (str): File name stem, e.g. the job ID
+        keep_zip (bool): Keep the downloaded ZIP next to the CSV
+        chunk_size (int): Chunk size in bytes
+
+    Returns:
+        Dict containing:
+            - 'file_path': Path to the CSV file
+            - 'zip_path': Path to the kept ZIP file, or None
+            - 'download_bytes': Size of the downloaded body
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(exist_ok=True, parents=True)
+
+    download_path = data_dir / f'bulk_read_{stem}.download'
+    csv_path = data_dir / f'bulk_read_{stem}.csv'
+    zip_path = None
+
+    download_bytes = spool_to_file(source, download_path, chunk_size)
+    logger.info(f"Downloaded {download_bytes} bytes to {download_path}")
+
+    try:
+        if zipfile.is_zipfile(download_path):
+            member = extract_csv_member(download_path, csv_path, chunk_size)
+            logger.info(f"Extracted {member} to {csv_path}")
+            if keep_zip:
+                zip_path = data_dir / f'bulk_read_{stem}.zip'
+                os.replace(download_path, zip_path)
+        else:
+            os.replace(download_path, csv_path)
+    finally:
+        if download_path.exists():
+            download_path.unlink()
+
+    return {
+        'file_path': str(csv_path),
+        'zip_path': str(zip_path) if zip_path else None,
+        'download_bytes': download_bytes
+    }
\ No newline at end of file
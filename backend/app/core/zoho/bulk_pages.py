@@ -0,0 +1,169 @@
+"""
+Zoho Bulk Pagination Module
+Reads modules larger than one bulk read page and stitches the pages together
+"""
+
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Records Zoho returns per bulk read job
+BULK_PAGE_SIZE = 200000
+
+# Maximum number of page jobs of one module in flight
+DEFAULT_PAGE_CONCURRENCY = 3
+
+# Size of the blocks copied while stitching pages
+STITCH_CHUNK_SIZE = 1024 * 1024
+
+def plan_page_count(first_page: Dict[str, Any], total_records: Optional[int] = None) -> Optional[int]:
+    """
+    Work out how many pages a module has from its first completed page
+
+    Args:
+        first_page (dict): Result of page 1 with 'more_records' and 'per_page'
+        total_records (int, optional): Module record count, if known
+
+    Returns:
+        int: Number of pages, or None if more pages exist but the total is unknown
+    """
+    if not first_page.get('more_records'):
+        return 1
+    if not total_records:
+        return None
+
+    per_page = first_page.get('per_page') or BULK_PAGE_SIZE
+    return max(2, math.ceil(total_records / per_page))
+
+def read_all_pages(read_page: Callable[[int], Dict[str, Any]], max_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+                   count_records: Optional[Callable[[], Optional[int]]] = None) -> List[Dict[str, Any]]:
+    """
+    Read every page of a module
+
+    Page 1 is read first to learn whether more pages exist. The remaining pages
+    are then read concurrently: all at once when the page count is known,
+    otherwise in windows of max_concurrency until a page reports no more records.
+
+    Args:
+        read_page (callable): Submits, waits for and downloads one page; returns a
+            dict with at least 'page', 'file_path', 'count' and 'more_records'
+        max_concurrency (int): Maximum number of page jobs in flight
+        count_records (callable, optional): Returns the module record count; only
+            called when page 1 reports more records
+
+    Returns:
+        List[Dict[str, Any]]: Page results in page order, ending at the last page
+    """
+    pages = [read_page(1)]
+    if not pages[0].get('more_records'):
+        return pages
+
+    total_records = count_records() if count_records else None
+    page_count = plan_page_count(pages[0], total_records)
+
+    logger.info(f"Module has {page_count or 'an unknown number of'} pages, "
+                f"reading with concurrency {max_concurrency}")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix='bulk_page') as executor:
+        # Page reads run in the caller's context so they keep its API priority
+        def read_pages(numbers):
+            futures = [executor.submit(copy_context().run, read_page, number) for number in numbers]
+            return [future.result() for future in futures]
+
+        if page_count:
+            pages.extend(read_pages(range(2, page_count + 1)))
+
+        # Keep probing if the total was unknown or grew after it was counted
+        while pages[-1].get('more_records') and pages[-1].get('count'):
+            next_page = pages[-1]['page'] + 1
+            pages.extend(read_pages(range(next_page, next_page + max(1, max_concurrency))))
+            pages = _trim_pages(pages)
+
+    return _trim_pages(pages)
+
+def _trim_pages(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop pages read past the last one and remove their files"""
+    for index, page in enumerate(pages):
+        if not page.get('more_records') or not page.get('count'):
+            last = index if page.get('count') or index == 0 else index - 1
+            for extra in pages[last + 1:]:
+                if extra.get('file_path') and os.path.exists(extra['file_path']):
+                    os.remove(extra['file_path'])
+            return pages[:last + 1]
+    return pages
+
+def append_csv_pages(target_path: Union[str, Path], page_paths: List[Union[str, Path]],
+                     remove_pages: bool = True) -> int:
+    """
+    Append CSV pages to the first page's file
+
+    Page bodies are copied byte for byte after dropping their header line, so
+    no page is parsed and the first page is not copied at all.
+
+    Args:
+        target_path: CSV file of the first page, extended in place
+        page_paths: CSV files of the following pages, in page order
+        remove_pages (bool): Delete page files once appended
+
+    Returns:
+        int: Size of the stitched file in bytes
+
+    Raises:
+        ValueError: If a page header does not match the first page
+    """
+    with open(target_path, 'rb') as f:
+        header = f.readline()
+        f.seek(-1, os.SEEK_END)
+        last_byte = f.read(1)
+
+    with open(target_path, 'ab') as target:
+        for page_path in page_paths:
+            with open(page_path, 'rb') as source:
+                if source.readline() != header:
+                    raise ValueError(f"CSV header of {page_path} does not match {target_path}")
+                first_chunk = True
+                for chunk in iter(lambda: source.read(STITCH_CHUNK_SIZE), b''):
+                    # The previous page may end without a trailing newline
+                    if first_chunk and last_byte != b'\n':
+                        target.write(b'\n')
+                    first_chunk = False
+                    target.write(chunk)
+                    last_byte = chunk[-1:]
+
+    if remove_pages:
+        for page_path in page_paths:
+            os.remove(page_path)
+
+    return os.path.getsize(target_path)
+
+def stitch_pages(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine page results into a single dataset
+
+    Args:
+        pages (list): Page results from read_all_pages
+
+    Returns:
+        Dict containing:
+            - 'file_path': Stitched CSV file (the first page's file)
+            - 'job_ids': Job ID of every page
+            - 'pages': Number of pages
+            - 'record_count': Total records reported by the jobs
+    """
+    first_path = pages[0]['file_path']
+    if len(pages) > 1:
+        size = append_csv_pages(first_path, [page['file_path'] for page in pages[1:]])
+        logger.info(f"Stitched {len(pages)} pages into {first_path} ({size} bytes)")
+
+    return {
+        'file_path': first_path,
+        'job_ids': [page.get('job_id') for page in pages],
+        'pages': len(pages),
+        'record_count': sum(page.get('count') or 0 for page in pages)
+    }
\ No newline at end of file
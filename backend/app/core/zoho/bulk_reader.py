@@ -4,15 +4,21 @@ Handles bulk data reading operations from Zoho CRM using the official SDK v8
 """
 
 import logging
-import time
 import os
-import zipfile
-import io
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from flask import current_app
 from .client import ZohoClient
+from .registry import get_registry
+from .bulk_callbacks import wait_for_job
+from .bulk_files import store_bulk_result
+from .bulk_catalog import BulkCatalog
+from .bulk_pages import DEFAULT_PAGE_CONCURRENCY, read_all_pages, stitch_pages
+from .fetch_strategy import (DEFAULT_REST_CONCURRENCY, STRATEGY_AUTO, FetchPlanner, FetchStats,
+                             read_rest_module, rest_modified_since)
+from .chunked_transform import count_csv_rows
+from .field_cache import read_csv_header
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -20,25 +26,33 @@ logger = logging.getLogger(__name__)
 class BulkReader:
     """Handles bulk reading of data from Zoho CRM using the official SDK v8"""
     
-    def __init__(self, use_indian_dc: bool = True):
+    def __init__(self, use_indian_dc: bool = True, client: Optional[ZohoClient] = None):
         """
         Initialize the BulkReader
         
         Args:
             use_indian_dc (bool): Whether to use Indian datacenter (default: True)
+            client (ZohoClient, optional): Client to use (default: the shared client)
         """
-        self.client = ZohoClient(use_indian_dc=use_indian_dc)
+        self.client = client or get_registry().get_client(use_indian_dc)
         self.data_dir = Path(current_app.config.get('ZOHO_DATA_DIR', 'backend/data'))
         self.data_dir.mkdir(exist_ok=True, parents=True)
+        self.catalog = BulkCatalog(self.data_dir)
+        
+        # Learns which strategy is faster for which module size
+        stats_path = current_app.config.get('DATA', {}).get('fetch_stats_path', self.data_dir / 'fetch_stats.json')
+        self.planner = FetchPlanner(FetchStats(stats_path), self.client.get_record_count)
     
-    def submit_bulk_read_job(self, module: str, fields: List[str], criteria: Optional[str] = None) -> str:
+    def submit_bulk_read_job(self, module: str, fields: List[str], criteria: Optional[Dict[str, Any]] = None,
+                             page: int = 1) -> str:
         """
         Submit a bulk read job to Zoho CRM
         
         Args:
             module (str): Module name (e.g., 'Deals')
             fields (list): List of field names to fetch
-            criteria (str, optional): Search criteria
+            criteria (dict, optional): Modified_Time delta criteria from modified_since_criteria
+            page (int): Page of the module to export
             
         Returns:
             str: Job ID
@@ -47,7 +61,7 @@ class BulkReader:
             Exception: If job submission fails
         """
         try:
-            return self.client.submit_bulk_read_job(module, fields, criteria)
+            return self.client.submit_bulk_read_job(module, fields, criteria, page)
         except Exception as e:
             logger.error(f"Failed to submit bulk read job for {module}: {str(e)}")
             raise
@@ -88,53 +102,43 @@ class BulkReader:
             Exception: If download fails
         """
         try:
-            # Get the file stream from the client
-            response = self.client.download_bulk_read_results(job_id)
+            # Stream the result to disk instead of loading it into memory
+            response = self.client.stream_bulk_read_results(job_id)
             
             # Create a timestamp for the file
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
-            # Save the ZIP file
-            zip_path = self.data_dir / f'bulk_read_{job_id}_{timestamp}.zip'
-            with open(zip_path, 'wb') as f:
-                f.write(response)
-            
-            # Extract the CSV file
-            with zipfile.ZipFile(io.BytesIO(response)) as zip_ref:
-                # Get the first CSV file
-                csv_files = [f for f in zip_ref.namelist() if f.endswith('.csv')]
-                if not csv_files:
-                    raise ValueError("No CSV file found in ZIP archive")
-                
-                csv_filename = csv_files[0]
-                csv_path = self.data_dir / f'bulk_read_{job_id}_{timestamp}.csv'
-                
-                # Extract the CSV file
-                with zip_ref.open(csv_filename) as source, open(csv_path, 'wb') as target:
-                    target.write(source.read())
-            
-            # Get record count and fields
-            import pandas as pd
-            df = pd.read_csv(csv_path)
+            # Save the ZIP file and decompress its CSV straight to disk
+            try:
+                stored = store_bulk_result(response, self.data_dir, f'{job_id}_{timestamp}', keep_zip=True)
+            finally:
+                response.close()
+            csv_path = stored['file_path']
             
+            # Count records in chunks rather than loading the file
             return {
                 'file_path': str(csv_path),
-                'record_count': len(df),
-                'fields': list(df.columns)
+                'record_count': count_csv_rows(csv_path),
+                'fields': read_csv_header(csv_path)
             }
             
         except Exception as e:
             logger.error(f"Failed to download results for job {job_id}: {str(e)}")
             raise
     
-    def wait_for_job_completion(self, job_id: str, timeout: int = 300, interval: int = 5) -> str:
+    def wait_for_job_completion(self, job_id: str, timeout: int = 300, initial_interval: float = 1,
+                                max_interval: float = 30) -> str:
         """
         Wait for a bulk read job to complete
         
+        Returns as soon as Zoho posts the completion callback; while no callback
+        arrives the job status is polled with exponential backoff.
+        
         Args:
             job_id (str): Job ID
             timeout (int): Maximum time to wait in seconds
-            interval (int): Time between status checks in seconds
+            initial_interval (float): First wait before polling in seconds
+            max_interval (float): Upper bound for the wait between polls in seconds
             
         Returns:
             str: Final job status
@@ -142,19 +146,13 @@ class BulkReader:
         Raises:
             Exception: If job fails or times out
         """
-        start_time = time.time()
-        while True:
-            status = self.get_job_status(job_id)
-            
-            if status == 'COMPLETED':
-                return status
-            elif status == 'FAILED':
-                raise Exception(f'Bulk read job {job_id} failed')
-            
-            if time.time() - start_time > timeout:
-                raise Exception(f'Timeout waiting for job {job_id}')
-            
-            time.sleep(interval)
+        return wait_for_job(
+            job_id,
+            self.get_job_status,
+            timeout=timeout,
+            initial_interval=initial_interval,
+            max_interval=max_interval
+        )
     
     def get_module_fields(self, module: str) -> List[str]:
         """
@@ -175,22 +173,59 @@ class BulkReader:
             logger.error(f"Failed to get fields for module {module}: {str(e)}")
             raise
     
+    def read_page(self, module: str, fields: List[str], page: int,
+                  criteria: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Submit, wait for and download a single page of a module
+        
+        Args:
+            module (str): Module name
+            fields (list): List of fields to fetch
+            page (int): Page number
+            criteria (dict, optional): Modified_Time delta criteria from modified_since_criteria
+            
+        Returns:
+            Dict containing the download results plus 'job_id', 'page', 'count',
+            'per_page' and 'more_records'
+        """
+        # Hold a bulk job slot until the result is on disk
+        with self.client.scheduler.bulk_job():
+            job_id = self.submit_bulk_read_job(module, fields, criteria, page)
+            logger.info(f"Submitted bulk read job {job_id} for {module} (page {page})")
+            
+            status = self.wait_for_job_completion(job_id)
+            logger.info(f"Job {job_id} completed with status: {status}")
+            
+            return {
+                'job_id': job_id,
+                **self.client.get_bulk_read_job_result(job_id),
+                **self.download_results(job_id)
+            }
+    
     def bulk_read_module(self, module: str, fields: Optional[List[str]] = None, 
-                        criteria: Optional[str] = None) -> Dict[str, Any]:
+                        criteria: Optional[Dict[str, Any]] = None,
+                        page_concurrency: int = DEFAULT_PAGE_CONCURRENCY) -> Dict[str, Any]:
         """
         Perform a complete bulk read operation for a module
         
+        Modules above the per-job record cap are read page by page, with up to
+        page_concurrency pages in flight, and stitched into a single CSV file.
+        
         Args:
             module (str): Module name
             fields (list, optional): List of fields to fetch. If None, all fields will be fetched
-            criteria (str, optional): Search criteria
+            criteria (dict, optional): Modified_Time delta criteria from modified_since_criteria
+            page_concurrency (int): Maximum number of page jobs in flight
             
         Returns:
             Dict containing:
-                - 'job_id': ID of the bulk read job
+                - 'job_id': ID of the first bulk read job
+                - 'job_ids': IDs of every page job
+                - 'pages': Number of pages read
                 - 'file_path': Path to the downloaded CSV file
                 - 'record_count': Number of records in the file
                 - 'fields': List of fields in the file
+                - 'schema_hash': Hash of the fields, see BulkCatalog
             
         Raises:
             Exception: If bulk read operation fails
@@ -200,25 +235,88 @@ class BulkReader:
             if fields is None:
                 fields = self.get_module_fields(module)
             
-            # Submit the job
-            job_id = self.submit_bulk_read_job(module, fields, criteria)
-            logger.info(f"Submitted bulk read job {job_id} for {module}")
+            pages = read_all_pages(
+                lambda page: self.read_page(module, fields, page, criteria),
+                max_concurrency=page_concurrency,
+                count_records=lambda: self.client.get_record_count(module)
+            )
+            stitched = stitch_pages(pages)
+            record_count = sum(page['record_count'] for page in pages)
+            logger.info(f"Downloaded {record_count} records for {module} in {stitched['pages']} pages")
             
-            # Wait for completion
-            status = self.wait_for_job_completion(job_id)
-            logger.info(f"Job {job_id} completed with status: {status}")
+            # Catalog the stitched file so readers know its module and schema without opening it
+            entry = self.catalog.register(stitched['file_path'], module, stitched['job_ids'], pages[0]['fields'],
+                                          record_count, complete=criteria is None)
             
-            if status == 'COMPLETED':
-                # Download and return results
-                results = self.download_results(job_id)
-                logger.info(f"Downloaded {results['record_count']} records for {module}")
-                return {
-                    'job_id': job_id,
-                    **results
-                }
-            else:
-                raise Exception(f'Job completed with unexpected status: {status}')
+            return {
+                'job_id': stitched['job_ids'][0],
+                'job_ids': stitched['job_ids'],
+                'pages': stitched['pages'],
+                'file_path': stitched['file_path'],
+                'record_count': record_count,
+                'fields': entry['fields'],
+                'schema_hash': entry['schema_hash']
+            }
                 
         except Exception as e:
             logger.error(f'Bulk read operation failed for {module}: {str(e)}')
-            raise 
\ No newline at end of file
+            raise
+    
+    def rest_read_module(self, module: str, fields: List[str], criteria: Optional[Dict[str, Any]] = None,
+                         max_concurrency: int = DEFAULT_REST_CONCURRENCY) -> Dict[str, Any]:
+        """
+        Read a module through paged REST calls into a bulk read style CSV file
+        
+        Args:
+            module (str): Module name
+            fields (list): List of fields to fetch
+            criteria (dict, optional): Modified_Time delta criteria
+            max_concurrency (int): Maximum number of pages in flight
+            
+        Returns:
+            Dict containing 'file_path', 'record_count', 'pages', 'fields' and 'schema_hash'
+            
+        Raises:
+            RestLimitExceeded: If the module has more records than REST serves
+        """
+        modified_since = rest_modified_since(criteria)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        result = read_rest_module(
+            lambda page: self.client.get_records(module, fields, page, modified_since=modified_since),
+            fields,
+            self.data_dir / f'{module}_rest_{timestamp}.csv',
+            max_concurrency=max_concurrency
+        )
+        entry = self.catalog.register(result['file_path'], module, fields=result['fields'],
+                                      record_count=result['record_count'], complete=criteria is None, source='rest')
+        return {**result, 'schema_hash': entry['schema_hash']}
+    
+    def read_module(self, module: str, fields: Optional[List[str]] = None,
+                    criteria: Optional[Dict[str, Any]] = None, stored_count: Optional[int] = None,
+                    strategy: str = STRATEGY_AUTO) -> Dict[str, Any]:
+        """
+        Read a module with whichever of paged REST or bulk read is faster for its size
+        
+        Args:
+            module (str): Module name
+            fields (list, optional): List of fields to fetch. If None, all fields will be fetched
+            criteria (dict, optional): Modified_Time delta criteria from modified_since_criteria
+            stored_count (int, optional): Records stored by the last sync, used as
+                the size estimate of full reads
+            strategy (str): 'auto' to decide, or 'rest' / 'bulk' to force one
+            
+        Returns:
+            Dict containing 'file_path', 'record_count', 'fields', 'strategy',
+            'estimated_rows' and 'elapsed'
+        """
+        if fields is None:
+            fields = self.get_module_fields(module)
+        
+        return self.planner.fetch(
+            module,
+            lambda query: self.rest_read_module(module, fields, query),
+            lambda query: self.bulk_read_module(module, fields=fields, criteria=query),
+            criteria=criteria,
+            stored_count=stored_count,
+            strategy=strategy
+        )
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Chunked Transform Module
+Transforms CSV exports of any size in bounded memory through mergeable partial aggregates
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+import numpy as np
+import pandas as pd
+from .field_cache import read_csv_header
+from .schema import iter_typed_csv
+from .transformers import CLOSED_WON_STAGE, _amounts, _codes, _months
+
+logger = logging.getLogger(__name__)
+
+# Memory a chunked transform may use by default
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+# Rows parsed to estimate the memory of a row
+SAMPLE_ROWS = 1000
+
+# Peak memory of parsing a chunk relative to the size of the parsed chunk
+PARSE_OVERHEAD = 4
+
+# Fewest rows per chunk, however small the budget
+MIN_CHUNK_ROWS = 1000
+
+# Rows per chunk when only counting rows
+COUNT_CHUNK_ROWS = 500000
+
+def _histogram(series: pd.Series) -> Dict[str, int]:
+    """Count the rows of each label of a column, missing values excluded"""
+    codes, labels = _codes(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    return {str(labels[i]): int(counts[i]) for i in np.flatnonzero(counts)}
+
+def _merge_counts(counts: Dict[str, int], other: Dict[str, int]) -> None:
+    for label, count in other.items():
+        counts[label] = counts.get(label, 0) + count
+
+def _ranked(counts: Dict[str, int]) -> Dict[str, int]:
+    """Order counts most frequent first, ties by label like sorted categoricals"""
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+class DealPartial:
+    """Deal count, total amount, stage histogram and month buckets of some deals"""
+
+    COLUMNS = ['Stage', 'Amount', 'Closing_Date']
+
+    def __init__(self):
+        self.total_deals = 0
+        self.total_value = 0.0
+        self.stages = {}
+        # 'YYYY-MM' to [deal count, summed amount]
+        self.months = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DealPartial':
+        """
+        Aggregate one chunk of deals
+
+        Args:
+            df (pd.DataFrame): Deals with Stage, Amount and Closing_Date
+
+        Returns:
+            DealPartial: The chunk's partial aggregates
+        """
+        partial = cls()
+        amount = _amounts(df['Amount'])
+        partial.total_deals = len(df)
+        partial.total_value = float(np.nansum(amount))
+        partial.stages = _histogram(df['Stage'])
+
+        months = _months(df['Closing_Date'])
+        has_month = ~np.isnat(months)
+        keys, index = np.unique(months[has_month], return_inverse=True)
+        counts = np.bincount(index, minlength=len(keys))
+        totals = np.bincount(index, weights=np.nan_to_num(amount[has_month]), minlength=len(keys))
+        partial.months = {str(month): [int(count), float(total)] for month, count, total in zip(keys, counts, totals)}
+        return partial
+
+    def merge(self, other: 'DealPartial') -> 'DealPartial':
+        """
+        Add the deals of another partial to this one
+
+        Args:
+            other (DealPartial): Partial of other deals
+
+        Returns:
+            DealPartial: This partial
+        """
+        self.total_deals += other.total_deals
+        self.total_value += other.total_value
+        _merge_counts(self.stages, other.stages)
+        for month, (count, total) in other.months.items():
+            bucket = self.months.setdefault(month, [0, 0.0])
+            bucket[0] += count
+            bucket[1] += total
+        return self
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the deal metrics in DataTransformer.deal_metrics format
+
+        Returns:
+            dict: total_deals, total_value, avg_deal_size, stages,
+                monthly_trends and win_rate
+        """
+        stages = _ranked(self.stages)
+        return {
+            'total_deals': self.total_deals,
+            'total_value': self.total_value,
+            'avg_deal_size': self.total_value / self.total_deals if self.total_deals > 0 else 0,
+            'stages': stages,
+            'monthly_trends': {month: self.months[month][1] for month in sorted(self.months)},
+            'win_rate': (stages.get(CLOSED_WON_STAGE, 0) / self.total_deals) * 100 if self.total_deals > 0 else 0
+        }
+
+class AccountPartial:
+    """Account count and industry and type histograms of some accounts"""
+
+    COLUMNS = ['Industry', 'Account_Type']
+
+    def __init__(self):
+        self.total_accounts = 0
+        self.industries = {}
+        self.account_types = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'AccountPartial':
+        """
+        Aggregate one chunk of accounts
+
+        Args:
+            df (pd.DataFrame): Accounts with Industry and Account_Type
+
+        Returns:
+            AccountPartial: The chunk's partial aggregates
+        """
+        partial = cls()
+        partial.total_accounts = len(df)
+        partial.industries = _histogram(df['Industry'])
+        partial.account_types = _histogram(df['Account_Type'])
+        return partial
+
+    def merge(self, other: 'AccountPartial') -> 'AccountPartial':
+        """
+        Add the accounts of another partial to this one
+
+        Args:
+            other (AccountPartial): Partial of other accounts
+
+        Returns:
+            AccountPartial: This partial
+        """
+        self.total_accounts += other.total_accounts
+        _merge_counts(self.industries, other.industries)
+        _merge_counts(self.account_types, other.account_types)
+        return self
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the account metrics in DataTransformer.transform_accounts format
+
+        Returns:
+            dict: industry_distribution, account_types and total_accounts
+        """
+        return {
+            'industry_distribution': _ranked(self.industries),
+            'account_types': _ranked(self.account_types),
+            'total_accounts': self.total_accounts
+        }
+
+# Partial aggregates of each module
+PARTIALS = {
+    'Deals': DealPartial,
+    'Accounts': AccountPartial
+}
+
+def chunk_rows(csv_path: Union[str, Path], fields: Optional[Iterable[Dict[str, Any]]] = None,
+               usecols: Optional[list] = None, memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB) -> int:
+    """
+    Get the rows per chunk that keep a chunked read within a memory budget
+
+    The memory of a row is measured on the first SAMPLE_ROWS rows parsed
+    with their dtypes, so long text columns shrink the chunks.
+
+    Args:
+        csv_path: CSV file to read
+        fields (list, optional): Field metadata of the module
+        usecols (list, optional): Columns that will be read
+        memory_budget_mb (float): Memory the read may use, in MB
+
+    Returns:
+        int: Rows per chunk, at least MIN_CHUNK_ROWS
+    """
+    sample = next(iter_typed_csv(csv_path, fields, usecols, SAMPLE_ROWS), None)
+    if sample is None or sample.empty:
+        return MIN_CHUNK_ROWS
+    row_bytes = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    return max(MIN_CHUNK_ROWS, int(memory_budget_mb * 1024 * 1024 / (row_bytes * PARSE_OVERHEAD)))
+
+def count_csv_rows(csv_path: Union[str, Path]) -> int:
+    """
+    Count the records of a CSV file without loading it
+
+    Only the first column is parsed, in chunks, so quoted line breaks in
+    text fields are not counted as records.
+
+    Args:
+        csv_path: CSV file to count
+
+    Returns:
+        int: Number of records, header excluded
+    """
+    if not read_csv_header(csv_path):
+        return 0
+    with pd.read_csv(csv_path, usecols=[0], dtype=str, chunksize=COUNT_CHUNK_ROWS) as reader:
+        return sum(len(chunk) for chunk in reader)
+
+def aggregate_csv(csv_path: Union[str, Path], module: str, fields: Optional[Iterable[Dict[str, Any]]] = None,
+                  memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB):
+    """
+    Aggregate a module's CSV export chunk by chunk
+
+    Only the columns the partial reads are parsed, chunks are sized to the
+    memory budget, and each chunk is reduced to a partial that is merged
+    into the running total and dropped, so memory does not grow with the
+    size of the export.
+
+    Args:
+        csv_path: CSV file to aggregate
+        module (str): Module of the export, a key of PARTIALS
+        fields (list, optional): Field metadata of the module
+        memory_budget_mb (float): Memory the read may use, in MB
+
+    Returns:
+        DealPartial or AccountPartial: Aggregates of the whole file
+
+    Raises:
+        ValueError: If the module has no partial aggregates
+    """
+    if module not in PARTIALS:
+        raise ValueError(f'No chunked transform for module: {module}')
+    partial_class = PARTIALS[module]
+    usecols = list(partial_class.COLUMNS)
+    chunksize = chunk_rows(csv_path, fields, usecols, memory_budget_mb)
+    total = partial_class()
+    chunks = 0
+    for chunk in iter_typed_csv(csv_path, fields, usecols, chunksize):
+        total.merge(partial_class.from_frame(chunk.reindex(columns=usecols)))
+        chunks += 1
+    logger.info(f'Aggregated {csv_path} in {chunks} chunks of up to {chunksize} rows')
+    return total
\ No newline at end of file
@@ -4,15 +4,21 @@ Handles communication with Zoho CRM API using the official SDK
 """
 
 import logging
-from zohocrmsdk.src.com.zoho.crm.api.initializer import Initializer
-from zohocrmsdk.src.com.zoho.crm.api.record import Record
+from zohocrmsdk.src.com.zoho.crm.api import HeaderMap, ParameterMap
+from zohocrmsdk.src.com.zoho.crm.api.record import Record, RecordOperations, GetRecordsParam, GetRecordsHeader
+from zohocrmsdk.src.com.zoho.crm.api.record import ResponseWrapper as RecordsResponseWrapper
 from zohocrmsdk.src.com.zoho.crm.api.users import Users
 from zohocrmsdk.src.com.zoho.crm.api.settings import Settings
 from zohocrmsdk.src.com.zoho.crm.api.bulk_read import BulkRead
 from zohocrmsdk.src.com.zoho.crm.api.currencies import CurrenciesOperations
-from flask import current_app
+from zohocrmsdk.src.com.zoho.crm.api.currencies import ResponseWrapper as CurrenciesResponseWrapper
+from flask import current_app, has_app_context
 from zohocrmsdk.src.com.zoho.crm.api.org import OrganizationOperations
 from zohocrmsdk.src.com.zoho.crm.api.org import OrganizationOperations as ZOHOCRMSDK
+from .api_scheduler import get_scheduler
+from .bulk_files import open_bulk_result_stream
+from .fetch_strategy import REST_PAGE_SIZE, flatten_record, if_modified_since
+from .registry import get_registry
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +32,16 @@ class ZohoClient:
             use_indian_dc (bool): Whether to use Indian datacenter
         """
         self.use_indian_dc = use_indian_dc
+        self.scheduler = get_scheduler()
         self.initialize_sdk()
     
     def initialize_sdk(self):
-        """Initialize the Zoho CRM SDK"""
+        """Initialize the Zoho CRM SDK once per process and attach the shared HTTP session"""
         try:
-            Initializer.initialize()
-            self.zoho_crm = Initializer.get_api_client()
+            registry = get_registry()
+            config = current_app.config.get('ZOHO_API') if has_app_context() else None
+            registry.initialize_sdk(config, use_indian_dc=self.use_indian_dc)
+            self.session = registry.get_session()
         except Exception as e:
             logger.error(f'Failed to initialize SDK: {str(e)}')
             raise
@@ -57,27 +66,51 @@ class ZohoClient:
         """Get field metadata for a module"""
         try:
             settings = Settings()
-            return settings.get_fields(module)
+            return self.scheduler.call('fields', settings.get_fields, module)
         except Exception as e:
             logger.error(f'Failed to get fields for {module}: {str(e)}')
             raise
     
-    def get_records(self, module, fields=None, criteria=None, page=1):
-        """Get records from a module with pagination"""
+    def get_records(self, module, fields, page=1, per_page=REST_PAGE_SIZE, modified_since=None):
+        """
+        Get one page of records from a module
+        
+        Args:
+            module (str): Module name
+            fields (list): Fields to fetch
+            page (int): Page number
+            per_page (int): Records per page (at most 200)
+            modified_since (str, optional): Only return records modified at or
+                after this Modified_Time
+            
+        Returns:
+            dict: 'records' as flat dicts keyed by field API name and 'more_records'
+        """
         try:
-            module_instance = self._get_module_instance(module)
+            param_instance = ParameterMap()
+            param_instance.add(GetRecordsParam.fields, ','.join(fields))
+            param_instance.add(GetRecordsParam.page, page)
+            param_instance.add(GetRecordsParam.per_page, per_page)
             
-            # Prepare parameters
-            param_instance = module_instance.get_param_instance()
-            if fields:
-                param_instance.add_key('fields', ','.join(fields))
-            if criteria:
-                param_instance.add_key('criteria', criteria)
-            param_instance.add_key('page', page)
-            param_instance.add_key('per_page', 200)
+            header_instance = HeaderMap()
+            if modified_since:
+                header_instance.add(GetRecordsHeader.if_modified_since, if_modified_since(modified_since))
+            
+            operations = RecordOperations(module)
+            with get_registry().record_call(module):
+                response = self.scheduler.call('records', operations.get_records, param_instance, header_instance)
+            
+            # 204 and 304 mean there are no (modified) records on this page
+            if response.get_status_code() in (204, 304):
+                return {'records': [], 'more_records': False}
             
-            # Get records
-            return module_instance.get_records(param_instance)
+            response_object = response.get_object()
+            if not isinstance(response_object, RecordsResponseWrapper):
+                raise Exception(f'Unexpected response: {response_object.get_message().get_value()}')
+            return {
+                'records': [flatten_record(record) for record in response_object.get_data()],
+                'more_records': bool(response_object.get_info().get_more_records())
+            }
             
         except Exception as e:
             logger.error(f'Failed to get records for {module}: {str(e)}')
@@ -89,7 +122,7 @@ class ZohoClient:
             users = Users()
             param_instance = users.get_param_instance()
             param_instance.add_key('type', 'AllUsers')
-            return users.get_users(param_instance)
+            return self.scheduler.call('users', users.get_users, param_instance)
         except Exception as e:
             logger.error(f'Failed to get users: {str(e)}')
             raise
@@ -105,7 +138,7 @@ class ZohoClient:
         try:
             # Get org info which includes currency
             org_ops = ZOHOCRMSDK.Org.OrganizationOperations()
-            response = org_ops.get_organization()
+            response = self.scheduler.call('org', org_ops.get_organization)
             
             if response.get_status_code() == 200:
                 org = response.get_response_object()[0]
@@ -133,14 +166,48 @@ class ZohoClient:
                 'name': 'US Dollar'
             }
     
-    def submit_bulk_read_job(self, module, fields, criteria=None):
+    def get_currencies(self):
+        """Get the organization's currencies and their exchange rates
+        
+        Returns:
+            list: Currency dicts with code, symbol, name, exchange_rate (units
+                of the currency per unit of the base currency) and is_base
+        """
+        try:
+            operations = CurrenciesOperations()
+            response = self.scheduler.call('currencies', operations.get_currencies)
+            
+            # 204 means the org has no currencies besides its base currency
+            if response.get_status_code() == 204:
+                return []
+            
+            response_object = response.get_object()
+            if not isinstance(response_object, CurrenciesResponseWrapper):
+                raise Exception(f'Unexpected response: {response_object.get_message().get_value()}')
+            return [
+                {
+                    'code': currency.get_iso_code(),
+                    'symbol': currency.get_symbol(),
+                    'name': currency.get_name(),
+                    'exchange_rate': float(currency.get_exchange_rate() or 0) or None,
+                    'is_base': bool(currency.get_is_base())
+                }
+                for currency in response_object.get_currencies()
+            ]
+            
+        except Exception as e:
+            logger.error(f'Failed to get currencies: {str(e)}')
+            raise
+    
+    def submit_bulk_read_job(self, module, fields, criteria=None, page=1):
         """
         Submit a bulk read job
         
         Args:
             module (str): Module name
             fields (list): List of fields to fetch
-            criteria (str): Search criteria
+            criteria (dict, optional): Modified_Time delta criteria from modified_since_criteria
+            page (int): Page of the module to export
             
         Returns:
             str: Job ID
@@ -150,21 +217,26 @@ class ZohoClient:
             
             # Prepare request body
             request_body = {
-                'callback': {
-                    'url': '',
-                    'method': 'post'
-                },
                 'query': {
                     'module': module,
-                    'fields': fields
+                    'fields': fields,
+                    'page': page
                 }
             }
             
+            # Ask Zoho to notify us on completion when a receiver is configured
+            callback_url = current_app.config['ZOHO_API'].get('bulk_callback_url')
+            if callback_url:
+                request_body['callback'] = {
+                    'url': callback_url,
+                    'method': 'post'
+                }
+            
             if criteria:
                 request_body['query']['criteria'] = criteria
             
             # Submit job
-            response = bulk_read.create_bulk_read_job(request_body)
+            response = self.scheduler.call('bulk_read_create', bulk_read.create_bulk_read_job, request_body)
             job_id = response.get_data()[0].get_details().get('id')
             
             logger.info(f'Submitted bulk read job for {module}. Job ID: {job_id}')
@@ -178,18 +250,66 @@ class ZohoClient:
         """Get the status of a bulk read job"""
         try:
             bulk_read = BulkRead()
-            response = bulk_read.get_bulk_read_job(job_id)
+            response = self.scheduler.call('bulk_read_status', bulk_read.get_bulk_read_job, job_id)
             return response.get_data()[0].get_state()
         except Exception as e:
             logger.error(f'Failed to get bulk read job status for {job_id}: {str(e)}')
             raise
     
+    def get_bulk_read_job_result(self, job_id):
+        """
+        Get the result details of a completed bulk read job
+        
+        Returns:
+            dict: page, count, per_page and more_records of the job
+        """
+        try:
+            bulk_read = BulkRead()
+            response = self.scheduler.call('bulk_read_status', bulk_read.get_bulk_read_job, job_id)
+            result = response.get_data()[0].get_result()
+            return {
+                'page': result.get_page(),
+                'count': result.get_count(),
+                'per_page': result.get_per_page(),
+                'more_records': bool(result.get_more_records())
+            }
+        except Exception as e:
+            logger.error(f'Failed to get bulk read job result for {job_id}: {str(e)}')
+            raise
+    
+    def get_record_count(self, module):
+        """
+        Get the number of records in a module
+        
+        Returns:
+            int: Record count, or None if it cannot be fetched
+        """
+        try:
+            response = self.scheduler.call('record_count', RecordOperations(module).record_count)
+            return response.get_object().get_count()
+        except Exception as e:
+            logger.warning(f'Failed to get record count for {module}: {str(e)}')
+            return None
+    
     def download_bulk_read_results(self, job_id):
         """Download the results of a completed bulk read job"""
         try:
             bulk_read = BulkRead()
-            response = bulk_read.download_bulk_read_result(job_id)
+            response = self.scheduler.call('bulk_read_download', bulk_read.download_bulk_read_result, job_id)
             return response.get_data()
         except Exception as e:
             logger.error(f'Failed to download bulk read results for {job_id}: {str(e)}')
+            raise
+    
+    def stream_bulk_read_results(self, job_id):
+        """
+        Open the results of a completed bulk read job as a streaming response
+        
+        Unlike download_bulk_read_results the body is not loaded into memory;
+        the caller reads it in chunks and must close the response.
+        """
+        try:
+            return self.scheduler.call('bulk_read_download', open_bulk_result_stream, job_id, self.session)
+        except Exception as e:
+            logger.error(f'Failed to stream bulk read results for {job_id}: {str(e)}')
             raise
\ No newline at end of file
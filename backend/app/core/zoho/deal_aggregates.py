@@ -0,0 +1,257 @@
+"""
+Deal Aggregates Module
+Maintains dashboard deal metrics incrementally from changed deals
+"""
+
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+import numpy as np
+import pandas as pd
+from .transformers import CLOSED_WON_STAGE, DataTransformer, _amounts, _codes, _months
+
+logger = logging.getLogger(__name__)
+
+# Columns a deal contributes to the aggregates through
+AGGREGATE_COLUMNS = ['id', 'Stage', 'Amount', 'Closing_Date']
+
+# Version of the persisted state; other versions are rebuilt from scratch
+STATE_VERSION = 1
+
+# Relative difference in summed amounts tolerated as floating point noise
+AMOUNT_TOLERANCE = 1e-9
+
+def contributions(deals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce deals to what each one adds to the aggregates
+
+    Args:
+        deals (pd.DataFrame): Deals with id, Stage, Amount and Closing_Date
+
+    Returns:
+        pd.DataFrame: 'stage', 'month' ('YYYY-MM') and 'amount' indexed by
+            deal id; a missing stage or month is '' and a missing amount 0
+    """
+    codes, labels = _codes(deals['Stage'])
+    stage = np.where(codes >= 0, np.asarray(labels, dtype=str)[codes] if len(labels) else '', '')
+    months = _months(deals['Closing_Date'])
+    month = np.where(np.isnat(months), '', months.astype(str))
+    amount = np.nan_to_num(_amounts(deals['Amount']))
+    frame = pd.DataFrame({'stage': stage, 'month': month, 'amount': amount},
+                         index=pd.Index(deals['id'].astype(str), name='id'))
+    # A deal listed twice in one export counts once, with its last values
+    return frame[~frame.index.duplicated(keep='last')]
+
+class DealAggregates:
+    """Deal totals, stage counts and monthly amounts updated by deal id"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize the aggregates, loading the persisted state if any
+
+        Args:
+            path: JSON file holding the aggregates; the per-deal contributions
+                are kept next to it in a .npz file of the same name
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix('.npz')
+        self.reset()
+        self._load()
+
+    def reset(self) -> None:
+        """Forget every deal"""
+        self.total_value = 0.0
+        self.stages = {}
+        self.months = {}
+        self.high_water_mark = None
+        self.ready = False
+        self.index = contributions(pd.DataFrame(columns=AGGREGATE_COLUMNS))
+
+    def _load(self) -> None:
+        if not self.path.exists() or not self.index_path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+            if state.get('version') != STATE_VERSION:
+                logger.info('Deal aggregates state version changed, rebuilding')
+                return
+            with np.load(self.index_path) as arrays:
+                self.index = pd.DataFrame({
+                    'stage': arrays['stage'],
+                    'month': arrays['month'],
+                    'amount': arrays['amount']
+                }, index=pd.Index(arrays['id'], name='id'))
+            self.total_value = state['total_value']
+            self.stages = state['stages']
+            self.months = {month: tuple(bucket) for month, bucket in state['months'].items()}
+            self.high_water_mark = state.get('high_water_mark')
+            self.ready = True
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f'Failed to load deal aggregates, rebuilding: {str(e)}')
+            self.reset()
+
+    def save(self) -> None:
+        """Persist the aggregates, replacing the previous state atomically"""
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        index_tmp = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(index_tmp, 'wb') as f:
+            np.savez(f, id=self.index.index.to_numpy(dtype=str),
+                     stage=self.index['stage'].to_numpy(dtype=str),
+                     month=self.index['month'].to_numpy(dtype=str),
+                     amount=self.index['amount'].to_numpy(dtype='float64'))
+        state_tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(state_tmp, 'w') as f:
+            json.dump({
+                'version': STATE_VERSION,
+                'high_water_mark': self.high_water_mark,
+                'total_value': self.total_value,
+                'stages': self.stages,
+                'months': self.months
+            }, f)
+        os.replace(index_tmp, self.index_path)
+        os.replace(state_tmp, self.path)
+
+    def _add(self, frame: pd.DataFrame, sign: int) -> None:
+        # Add (sign 1) or take back (sign -1) the contributions of some deals
+        self.total_value += sign * float(frame['amount'].sum())
+        for stage, count in frame.loc[frame['stage'] != '', 'stage'].value_counts().items():
+            count = self.stages.get(stage, 0) + sign * int(count)
+            if count:
+                self.stages[stage] = count
+            else:
+                self.stages.pop(stage, None)
+        dated = frame[frame['month'] != '']
+        for month, bucket in dated.groupby('month')['amount'].agg(['size', 'sum']).iterrows():
+            count, amount = self.months.get(month, (0, 0.0))
+            count += sign * int(bucket['size'])
+            if count:
+                self.months[month] = (count, amount + sign * float(bucket['sum']))
+            else:
+                self.months.pop(month, None)
+
+    def apply(self, changed: pd.DataFrame, deleted_ids: Iterable[str] = ()) -> Dict[str, int]:
+        """
+        Apply inserted, updated and deleted deals
+
+        An updated deal's previous contribution is taken back from its old
+        stage and month before the new one is added, so the work done is
+        proportional to the number of changed deals.
+
+        Args:
+            changed (pd.DataFrame): Inserted or updated deals with id, Stage,
+                Amount and Closing_Date
+            deleted_ids (iterable): Ids of deleted deals
+
+        Returns:
+            dict: inserted, updated and deleted counts
+        """
+        new = contributions(changed if len(changed) else pd.DataFrame(columns=AGGREGATE_COLUMNS))
+        # Positions of the changed and deleted deals among the known ones (-1 if unknown)
+        positions = self.index.index.get_indexer(new.index)
+        known = positions >= 0
+        deleted = pd.Index([str(deal_id) for deal_id in deleted_ids]).difference(new.index)
+        deleted_positions = self.index.index.get_indexer(deleted)
+        deleted_positions = deleted_positions[deleted_positions >= 0]
+
+        self._add(self.index.iloc[np.concatenate([positions[known], deleted_positions])], -1)
+        self._add(new, 1)
+
+        # Updated deals are overwritten in place; only inserts and deletes reshape the index
+        if known.any():
+            self.index.iloc[positions[known]] = new[known].to_numpy()
+        if len(deleted_positions):
+            self.index = self.index.drop(self.index.index[deleted_positions])
+        if not known.all():
+            self.index = pd.concat([self.index, new[~known]])
+
+        return {'inserted': int((~known).sum()), 'updated': int(known.sum()), 'deleted': len(deleted_positions)}
+
+    def rebuild(self, deals: pd.DataFrame) -> None:
+        """
+        Recompute the aggregates from every deal
+
+        Args:
+            deals (pd.DataFrame): All deals of the module
+        """
+        self.reset()
+        self.apply(deals)
+        self.ready = True
+
+    def reconcile(self, deals: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Bring the aggregates to a full set of deals and check them for drift
+
+        The full set is applied as a delta, deals missing from it being
+        deleted, and the result compared against DataTransformer.deal_metrics
+        computed from scratch. Drifted aggregates are rebuilt.
+
+        Args:
+            deals (pd.DataFrame): All deals of the module
+
+        Returns:
+            dict: The drift found, empty if there was none
+        """
+        if not self.ready:
+            self.rebuild(deals)
+            return {}
+
+        ids = deals['id'].astype(str) if len(deals) else pd.Index([])
+        self.apply(deals, self.index.index.difference(ids))
+        expected = DataTransformer.deal_metrics(deals) if len(deals) else DataTransformer.empty_deals()
+        drift = compare_metrics(self.metrics(), expected)
+        if drift:
+            logger.warning(f'Deal aggregates drifted from a full recompute, rebuilding: {drift}')
+            self.rebuild(deals)
+        return drift
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the deal metrics in DataTransformer.deal_metrics format
+
+        Returns:
+            dict: total_deals, total_value, avg_deal_size, stages,
+                monthly_trends and win_rate
+        """
+        total_deals = len(self.index)
+        stages = dict(sorted(self.stages.items(), key=lambda item: -item[1]))
+        return {
+            'total_deals': total_deals,
+            'total_value': self.total_value,
+            'avg_deal_size': self.total_value / total_deals if total_deals > 0 else 0,
+            'stages': stages,
+            'monthly_trends': {month: self.months[month][1] for month in sorted(self.months)},
+            'win_rate': (stages.get(CLOSED_WON_STAGE, 0) / total_deals) * 100 if total_deals > 0 else 0
+        }
+
+def compare_metrics(actual: Dict[str, Any], expected: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare two sets of deal metrics
+
+    Counts must match exactly, amounts up to floating point noise.
+
+    Args:
+        actual (dict): Metrics to check
+        expected (dict): Reference metrics
+
+    Returns:
+        dict: Metric name to (actual, expected) for every difference
+    """
+    def close(a, b):
+        return math.isclose(a, b, rel_tol=AMOUNT_TOLERANCE, abs_tol=AMOUNT_TOLERANCE)
+
+    drift = {}
+    if actual['total_deals'] != expected['total_deals']:
+        drift['total_deals'] = (actual['total_deals'], expected['total_deals'])
+    if not close(actual['total_value'], expected['total_value']):
+        drift['total_value'] = (actual['total_value'], expected['total_value'])
+    if actual['stages'] != expected['stages']:
+        drift['stages'] = (actual['stages'], expected['stages'])
+    months_actual, months_expected = actual['monthly_trends'], expected['monthly_trends']
+    if (months_actual.keys() != months_expected.keys()
+            or not all(close(months_actual[month], months_expected[month]) for month in months_expected)):
+        drift['monthly_trends'] = (months_actual, months_expected)
+    return drift
\ No newline at end of file
@@ -0,0 +1,318 @@
+"""
+Zoho Delta Sync Module
+Keeps a local copy of each module up to date from Modified_Time deltas
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import pandas as pd
+from app.core.utils.timestamps import parse_datetime_column
+from .schema import read_typed_csv
+
+logger = logging.getLogger(__name__)
+
+# Field holding the last modification time of a record
+MODIFIED_TIME_FIELD = 'Modified_Time'
+
+# Days between full syncs that reconcile records deleted in Zoho
+DEFAULT_FULL_SYNC_INTERVAL_DAYS = 7
+
+def modified_since_criteria(watermark: str) -> Dict[str, Any]:
+    """
+    Build bulk read criteria matching records modified at or after a watermark
+
+    'greater_equal' is used so records sharing the watermark's second are not
+    missed; re-reading them is harmless because deltas are merged by id.
+
+    Args:
+        watermark (str): Modified_Time of the newest record already stored
+
+    Returns:
+        dict: Bulk read query criteria
+    """
+    return {
+        'field': {'api_name': MODIFIED_TIME_FIELD},
+        'comparator': 'greater_equal',
+        'value': watermark
+    }
+
+def max_modified_time(df: pd.DataFrame) -> Optional[str]:
+    """
+    Get the newest Modified_Time in a frame, as Zoho formatted it
+
+    Args:
+        df (pd.DataFrame): Records with a Modified_Time column
+
+    Returns:
+        str: Newest Modified_Time value, or None if there is none
+    """
+    if MODIFIED_TIME_FIELD not in df.columns or df.empty:
+        return None
+
+    parsed = parse_datetime_column(df[MODIFIED_TIME_FIELD])
+    if parsed.isna().all():
+        return None
+    return str(df[MODIFIED_TIME_FIELD].loc[parsed.idxmax()])
+
+class SyncState:
+    """Per-module sync high-water marks persisted as JSON"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize the sync state
+
+        Args:
+            path: JSON file holding the state
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f'Failed to load sync state, starting from scratch: {str(e)}')
+            return {}
+
+    def get(self, module: str) -> Dict[str, Any]:
+        """Get the sync state of a module (empty if never synced)"""
+        with self._lock:
+            return dict(self._state.get(module, {}))
+
+    def update(self, module: str, **values) -> None:
+        """Update the sync state of a module and persist it"""
+        with self._lock:
+            self._state.setdefault(module, {}).update(values)
+            self.path.parent.mkdir(exist_ok=True, parents=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self._state, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def reset(self, module: str) -> None:
+        """Forget a module's watermark so the next sync is a full one"""
+        self.update(module, high_water_mark=None, last_full_sync=None)
+
+class RecordStore:
+    """Local copy of module records, one CSV file per module keyed by id"""
+
+    def __init__(self, root_dir: Union[str, Path]):
+        """
+        Initialize the record store
+
+        Args:
+            root_dir: Directory holding the module files
+        """
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(exist_ok=True, parents=True)
+
+    def path(self, module: str) -> Path:
+        """Get the file holding a module's records"""
+        return self.root_dir / f'{module}.csv'
+
+    def exists(self, module: str) -> bool:
+        """Check whether a module has been stored"""
+        return self.path(module).exists()
+
+    def load(self, module: str, fields: Optional[Iterable[Dict[str, Any]]] = None,
+             usecols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load a module's records with typed columns
+
+        Args:
+            module (str): Module name
+            fields (list, optional): Field metadata giving each column's data type
+            usecols (list, optional): Only load these columns
+
+        Returns:
+            pd.DataFrame: Stored records (empty if the module was never synced)
+        """
+        if not self.exists(module):
+            return pd.DataFrame()
+        return read_typed_csv(self.path(module), fields, usecols)
+
+    def _read_raw(self, path: Union[str, Path]) -> pd.DataFrame:
+        # Read every column as text so merging never changes stored values
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+    def _write(self, module: str, df: pd.DataFrame) -> None:
+        tmp_path = self.path(module).with_suffix('.csv.tmp')
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path(module))
+
+    def merge(self, module: str, delta_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Merge changed records into the store by id
+
+        Args:
+            module (str): Module name
+            delta_path: CSV file with the changed records
+
+        Returns:
+            dict: inserted, updated and total record counts plus the delta's
+                newest Modified_Time
+        """
+        delta = self._read_raw(delta_path)
+        if not self.exists(module):
+            self._write(module, delta)
+            return {
+                'inserted': len(delta),
+                'updated': 0,
+                'deleted': 0,
+                'total': len(delta),
+                'high_water_mark': max_modified_time(delta)
+            }
+
+        current = self._read_raw(self.path(module))
+        updated = int(delta['id'].isin(current['id']).sum())
+        merged = pd.concat([current, delta], ignore_index=True)
+        merged = merged.drop_duplicates(subset='id', keep='last').fillna('')
+        self._write(module, merged)
+
+        return {
+            'inserted': len(delta) - updated,
+            'updated': updated,
+            'deleted': 0,
+            'total': len(merged),
+            'high_water_mark': max_modified_time(delta)
+        }
+
+    def replace(self, module: str, full_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Replace a module's records with a full export
+
+        Records missing from the export were deleted in Zoho and are dropped.
+
+        Args:
+            module (str): Module name
+            full_path: CSV file with every record of the module
+
+        Returns:
+            dict: inserted, updated, deleted and total record counts plus the
+                export's newest Modified_Time
+        """
+        full = self._read_raw(full_path)
+        previous_ids = set()
+        if self.exists(module):
+            previous_ids = set(pd.read_csv(self.path(module), usecols=['id'], dtype=str)['id'])
+        current_ids = set(full['id'])
+        self._write(module, full)
+
+        return {
+            'inserted': len(current_ids - previous_ids),
+            'updated': len(current_ids & previous_ids),
+            'deleted': len(previous_ids - current_ids),
+            'total': len(full),
+            'high_water_mark': max_modified_time(full)
+        }
+
+class DeltaSync:
+    """Decides between full and delta syncs and applies their results"""
+
+    def __init__(self, state: SyncState, store: RecordStore,
+                 full_sync_interval_days: int = DEFAULT_FULL_SYNC_INTERVAL_DAYS):
+        """
+        Initialize the delta sync
+
+        Args:
+            state (SyncState): Per-module watermarks
+            store (RecordStore): Local record store
+            full_sync_interval_days (int): Days between reconciling full syncs
+        """
+        self.state = state
+        self.store = store
+        self.full_sync_interval = timedelta(days=full_sync_interval_days)
+
+    def plan(self, module: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Decide how to sync a module
+
+        A full sync runs when the module has no watermark or stored records, or
+        when the last full sync is older than the full sync interval.
+
+        Args:
+            module (str): Module name
+            now (datetime, optional): Current UTC time
+
+        Returns:
+            dict: 'mode' ('full' or 'delta'), 'criteria' for the bulk read (None
+                for full syncs) and 'since' (the watermark used)
+        """
+        now = now or datetime.utcnow()
+        module_state = self.state.get(module)
+        watermark = module_state.get('high_water_mark')
+        last_full_sync = module_state.get('last_full_sync')
+
+        full_sync_due = (
+            not watermark
+            or not last_full_sync
+            or not self.store.exists(module)
+            or datetime.fromisoformat(last_full_sync) + self.full_sync_interval <= now
+        )
+        if full_sync_due:
+            return {'mode': 'full', 'criteria': None, 'since': None}
+
+        return {'mode': 'delta', 'criteria': modified_since_criteria(watermark), 'since': watermark}
+
+    def apply(self, module: str, mode: str, csv_path: Union[str, Path],
+              now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Apply a finished export to the store and advance the watermark
+
+        Args:
+            module (str): Module name
+            mode (str): 'full' or 'delta', as planned
+            csv_path: Exported CSV file
+            now (datetime, optional): Current UTC time
+
+        Returns:
+            dict: Merge statistics including the mode
+        """
+        now = now or datetime.utcnow()
+        if mode == 'full':
+            stats = self.store.replace(module, csv_path)
+        else:
+            stats = self.store.merge(module, csv_path)
+
+        values = {'last_sync': now.isoformat(), 'record_count': stats['total']}
+        # An empty delta leaves the watermark where it was
+        if stats['high_water_mark']:
+            values['high_water_mark'] = stats['high_water_mark']
+        if mode == 'full':
+            values['last_full_sync'] = now.isoformat()
+        self.state.update(module, **values)
+
+        logger.info(f"{mode.capitalize()} sync of {module}: {stats['inserted']} inserted, "
+                    f"{stats['updated']} updated, {stats['deleted']} deleted, {stats['total']} total")
+        return {'mode': mode, **stats}
+
+    def sync_module(self, module: str, export: Callable[[Optional[Dict[str, Any]]], str]) -> Dict[str, Any]:
+        """
+        Sync a module using the given export function
+
+        Args:
+            module (str): Module name
+            export (callable): Runs a bulk read with the given criteria (None for
+                every record) and returns the path of the resulting CSV
+
+        Returns:
+            dict: Merge statistics including the mode, plus the exported
+                'file_path' and the watermark it was exported 'since'
+        """
+        plan = self.plan(module)
+        if plan['mode'] == 'delta':
+            logger.info(f"Syncing {module} records modified since {plan['since']}")
+        else:
+            logger.info(f"Running full sync of {module}")
+
+        csv_path = export(plan['criteria'])
+        return {**self.apply(module, plan['mode'], csv_path), 'file_path': csv_path, 'since': plan['since']}
\ No newline at end of file
@@ -0,0 +1,437 @@
+"""
+Zoho Fetch Strategy Module
+Chooses between paged REST reads and bulk reads by module size and measured latency
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+from .delta_sync import MODIFIED_TIME_FIELD
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_AUTO = 'auto'
+STRATEGY_REST = 'rest'
+STRATEGY_BULK = 'bulk'
+STRATEGIES = (STRATEGY_AUTO, STRATEGY_REST, STRATEGY_BULK)
+
+# Records Zoho returns per REST page
+REST_PAGE_SIZE = 200
+
+# Zoho only serves the first 2000 records of a listing through the page parameter
+REST_MAX_ROWS = 2000
+
+# Maximum number of REST pages of one module in flight
+DEFAULT_REST_CONCURRENCY = 4
+
+# Latency observations kept per strategy
+DEFAULT_MAX_OBSERVATIONS = 50
+
+# Cost models used until runs have been measured: seconds = base + per_row * rows.
+# A bulk read pays for submit, queue, poll, download and unzip before the first row.
+DEFAULT_MODELS = {
+    STRATEGY_REST: {'base': 0.5, 'per_row': 0.002},
+    STRATEGY_BULK: {'base': 15.0, 'per_row': 0.00005}
+}
+
+class RestLimitExceeded(Exception):
+    """Raised when a module has more records than paged REST reads can serve"""
+
+def rest_modified_since(criteria: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Get the watermark of Modified_Time delta criteria
+
+    Args:
+        criteria (dict, optional): Bulk read query criteria
+
+    Returns:
+        str: Modified_Time the criteria start at, or None for no criteria
+
+    Raises:
+        ValueError: If the criteria cannot be expressed as a REST read
+    """
+    if not criteria:
+        return None
+    if ((criteria.get('field') or {}).get('api_name') == MODIFIED_TIME_FIELD
+            and criteria.get('comparator') == 'greater_equal'):
+        return criteria['value']
+    raise ValueError(f'Criteria not supported by REST reads: {criteria}')
+
+def if_modified_since(watermark: str) -> datetime:
+    """
+    Convert a watermark to an If-Modified-Since value
+
+    The header only matches records modified after the given time, so it is
+    moved back by a second to keep records sharing the watermark's second.
+    """
+    return datetime.fromisoformat(watermark.replace('Z', '+00:00')) - timedelta(seconds=1)
+
+def flatten_value(value: Any) -> Any:
+    """
+    Flatten an SDK record value to what a bulk read CSV holds for it
+
+    Args:
+        value: Field value as parsed by the SDK
+
+    Returns:
+        Text or number; lookups become their name, picklists their value
+    """
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return ';'.join(str(flatten_value(item)) for item in value)
+    if hasattr(value, 'get_value'):
+        return flatten_value(value.get_value())
+    # Lookups: users expose get_name, looked up records a 'name' key
+    name = value.get_name() if hasattr(value, 'get_name') else None
+    if name is None and hasattr(value, 'get_key_value'):
+        name = value.get_key_value('name')
+    if name is not None:
+        return name
+    if hasattr(value, 'get_id'):
+        return value.get_id()
+    return value
+
+def flatten_record(record) -> Dict[str, Any]:
+    """Flatten an SDK Record to a dict of CSV values keyed by field API name"""
+    return {name: flatten_value(value) for name, value in record.get_key_values().items()}
+
+def read_rest_pages(fetch_page: Callable[[int], Dict[str, Any]],
+                    max_concurrency: int = DEFAULT_REST_CONCURRENCY,
+                    max_rows: int = REST_MAX_ROWS) -> List[Dict[str, Any]]:
+    """
+    Read every REST page of a listing
+
+    Page 1 is read first; when it reports more records the following pages are
+    read concurrently in windows of max_concurrency until a page is the last.
+
+    Args:
+        fetch_page (callable): Reads one page; returns a dict with 'records'
+            (list of flat dicts) and 'more_records'
+        max_concurrency (int): Maximum number of pages in flight
+        max_rows (int): Most records the listing may have
+
+    Returns:
+        List[Dict[str, Any]]: Records of every page, in page order
+
+    Raises:
+        RestLimitExceeded: If the listing has more than max_rows records
+    """
+    max_pages = max(1, max_rows // REST_PAGE_SIZE)
+    first = fetch_page(1)
+    records = list(first['records'])
+    more_records = first['more_records']
+    next_page = 2
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix='rest_page') as executor:
+        while more_records:
+            if next_page > max_pages:
+                raise RestLimitExceeded(f'Listing has more than {max_rows} records')
+            numbers = range(next_page, min(next_page + max(1, max_concurrency), max_pages + 1))
+            # Page reads run in the caller's context so they keep its API priority
+            futures = [executor.submit(copy_context().run, fetch_page, number) for number in numbers]
+            for future in futures:
+                page = future.result()
+                if more_records:
+                    records.extend(page['records'])
+                    more_records = page['more_records'] and bool(page['records'])
+            next_page += len(numbers)
+
+    return records
+
+def write_records_csv(records: List[Dict[str, Any]], fields: List[str], csv_path: Union[str, Path]) -> int:
+    """
+    Write records as a CSV file with the columns of a bulk read export
+
+    Args:
+        records (list): Flat record dicts
+        fields (list): Exported fields; 'id' always comes first
+        csv_path: File to write
+
+    Returns:
+        int: Number of records written
+    """
+    columns = ['id'] + [field for field in fields if field != 'id']
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='', extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+    return len(records)
+
+def read_rest_module(fetch_page: Callable[[int], Dict[str, Any]], fields: List[str], csv_path: Union[str, Path],
+                     max_concurrency: int = DEFAULT_REST_CONCURRENCY,
+                     max_rows: int = REST_MAX_ROWS) -> Dict[str, Any]:
+    """
+    Read a module through paged REST calls into a bulk read style CSV file
+
+    Args:
+        fetch_page (callable): Reads one page, see read_rest_pages
+        fields (list): Exported fields
+        csv_path: File to write
+        max_concurrency (int): Maximum number of pages in flight
+        max_rows (int): Most records the module may have
+
+    Returns:
+        Dict containing 'file_path', 'record_count', 'pages' and 'fields'
+
+    Raises:
+        RestLimitExceeded: If the module has more than max_rows records
+    """
+    records = read_rest_pages(fetch_page, max_concurrency, max_rows)
+    record_count = write_records_csv(records, fields, csv_path)
+    return {
+        'file_path': str(csv_path),
+        'record_count': record_count,
+        'pages': max(1, -(-record_count // REST_PAGE_SIZE)),
+        'fields': ['id'] + [field for field in fields if field != 'id']
+    }
+
+def _fit(observations: List[List[float]], default: Dict[str, float]) -> Dict[str, float]:
+    """
+    Fit seconds = base + per_row * rows to latency observations
+
+    Observations of a single size cannot separate the two terms, so the
+    default base is kept (or lowered to what was observed) and the rest of
+    the time is attributed to the rows.
+    """
+    if not observations:
+        return dict(default)
+
+    rows = [float(r) for r, _ in observations]
+    seconds = [float(s) for _, s in observations]
+    mean_rows = sum(rows) / len(rows)
+    mean_seconds = sum(seconds) / len(seconds)
+    variance = sum((r - mean_rows) ** 2 for r in rows)
+
+    if variance > 0:
+        slope = sum((r - mean_rows) * (s - mean_seconds) for r, s in zip(rows, seconds)) / variance
+        if slope > 0:
+            return {'base': max(0.0, mean_seconds - slope * mean_rows), 'per_row': slope}
+
+    base = min(default['base'], mean_seconds)
+    per_row = (mean_seconds - base) / mean_rows if mean_rows else default['per_row']
+    return {'base': base, 'per_row': per_row}
+
+class FetchStats:
+    """Measured fetch latency per strategy and recent sizes per module, persisted as JSON"""
+
+    def __init__(self, path: Union[str, Path], max_observations: int = DEFAULT_MAX_OBSERVATIONS):
+        """
+        Initialize the fetch statistics
+
+        Args:
+            path: JSON file holding the statistics
+            max_observations (int): Latency observations kept per strategy
+        """
+        self.path = Path(path)
+        self.max_observations = max_observations
+        self._lock = threading.Lock()
+        self._stats = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        stats = {'observations': {STRATEGY_REST: [], STRATEGY_BULK: []}, 'modules': {}}
+        if not self.path.exists():
+            return stats
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+            stats['observations'].update(stored.get('observations', {}))
+            stats['modules'].update(stored.get('modules', {}))
+        except (OSError, ValueError) as e:
+            logger.error(f'Failed to load fetch statistics, starting from defaults: {str(e)}')
+        return stats
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._stats, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def record(self, module: str, mode: str, strategy: str, rows: int, seconds: float) -> None:
+        """
+        Record how long a fetch took and persist it
+
+        Args:
+            module (str): Module name
+            mode (str): 'full' or 'delta'
+            strategy (str): Strategy used
+            rows (int): Records fetched
+            seconds (float): Wall-clock time of the fetch
+        """
+        with self._lock:
+            observations = self._stats['observations'].setdefault(strategy, [])
+            observations.append([int(rows), round(float(seconds), 3)])
+            del observations[:-self.max_observations]
+            self._stats['modules'].setdefault(module, {})[mode] = int(rows)
+            self._save()
+
+    def remember_rows(self, module: str, mode: str, rows: int) -> None:
+        """Remember a module's size without a latency observation"""
+        with self._lock:
+            self._stats['modules'].setdefault(module, {})[mode] = int(rows)
+            self._save()
+
+    def last_rows(self, module: str, mode: str) -> Optional[int]:
+        """Get the number of records the last fetch of a module in a mode returned"""
+        with self._lock:
+            return self._stats['modules'].get(module, {}).get(mode)
+
+    def model(self, strategy: str) -> Dict[str, float]:
+        """
+        Get the cost model of a strategy
+
+        Returns:
+            dict: 'base' seconds per fetch and 'per_row' seconds per record
+        """
+        with self._lock:
+            observations = list(self._stats['observations'].get(strategy, []))
+        return _fit(observations, DEFAULT_MODELS[strategy])
+
+    def predict(self, strategy: str, rows: int) -> float:
+        """Predict the seconds a strategy takes to fetch a number of records"""
+        model = self.model(strategy)
+        return model['base'] + model['per_row'] * rows
+
+    def threshold(self) -> int:
+        """
+        Get the module size up to which REST reads are predicted to be faster
+
+        Returns:
+            int: Largest record count to read through REST, at most REST_MAX_ROWS
+        """
+        rest = self.model(STRATEGY_REST)
+        bulk = self.model(STRATEGY_BULK)
+        if rest['base'] >= bulk['base']:
+            return 0
+        if rest['per_row'] <= bulk['per_row']:
+            return REST_MAX_ROWS
+        crossover = (bulk['base'] - rest['base']) / (rest['per_row'] - bulk['per_row'])
+        return int(min(crossover, REST_MAX_ROWS))
+
+class FetchPlanner:
+    """Picks the fetch strategy of each module and learns from the outcome"""
+
+    def __init__(self, stats: FetchStats, count_records: Optional[Callable[[str], Optional[int]]] = None):
+        """
+        Initialize the planner
+
+        Args:
+            stats (FetchStats): Measured latencies and module sizes
+            count_records (callable, optional): Returns a module's record count
+        """
+        self.stats = stats
+        self.count_records = count_records
+
+    def estimate_rows(self, module: str, criteria: Optional[Dict[str, Any]] = None,
+                      stored_count: Optional[int] = None) -> Optional[int]:
+        """
+        Estimate how many records a fetch returns
+
+        Full fetches use the record count of the last sync, or a count call;
+        deltas use the size of the last delta and assume a single page before
+        the first one.
+
+        Args:
+            module (str): Module name
+            criteria (dict, optional): Delta criteria, None for every record
+            stored_count (int, optional): Records stored by the last sync
+
+        Returns:
+            int: Estimated record count, or None if it is unknown
+        """
+        if criteria:
+            last_delta = self.stats.last_rows(module, 'delta')
+            return REST_PAGE_SIZE if last_delta is None else last_delta
+        if stored_count is not None:
+            return stored_count
+        return self.count_records(module) if self.count_records else None
+
+    def choose(self, module: str, criteria: Optional[Dict[str, Any]] = None,
+               stored_count: Optional[int] = None, strategy: str = STRATEGY_AUTO) -> Dict[str, Any]:
+        """
+        Choose how to fetch a module
+
+        Args:
+            module (str): Module name
+            criteria (dict, optional): Delta criteria, None for every record
+            stored_count (int, optional): Records stored by the last sync
+            strategy (str): 'auto' to decide, or 'rest' / 'bulk' to force one
+
+        Returns:
+            dict: 'strategy', 'estimated_rows' and 'threshold'
+        """
+        threshold = self.stats.threshold()
+        try:
+            rest_modified_since(criteria)
+            rest_supported = True
+        except ValueError:
+            rest_supported = False
+
+        estimated_rows = None
+        if strategy == STRATEGY_AUTO:
+            estimated_rows = self.estimate_rows(module, criteria, stored_count)
+            rest = rest_supported and estimated_rows is not None and estimated_rows <= threshold
+            strategy = STRATEGY_REST if rest else STRATEGY_BULK
+        elif strategy == STRATEGY_REST and not rest_supported:
+            logger.warning(f'REST reads cannot apply the criteria of {module}, using bulk read')
+            strategy = STRATEGY_BULK
+
+        return {'strategy': strategy, 'estimated_rows': estimated_rows, 'threshold': threshold}
+
+    def fetch(self, module: str, read_rest: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]],
+              read_bulk: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]],
+              criteria: Optional[Dict[str, Any]] = None, stored_count: Optional[int] = None,
+              strategy: str = STRATEGY_AUTO) -> Dict[str, Any]:
+        """
+        Fetch a module with the chosen strategy and record its latency
+
+        A REST read that finds more records than REST can serve falls back to a
+        bulk read, and the module's size is remembered so it goes straight to
+        bulk read next time.
+
+        Args:
+            module (str): Module name
+            read_rest (callable): Reads the module through REST with the given
+                criteria; returns a dict with 'file_path' and 'record_count'
+            read_bulk (callable): Same through bulk read
+            criteria (dict, optional): Delta criteria, None for every record
+            stored_count (int, optional): Records stored by the last sync
+            strategy (str): 'auto' to decide, or 'rest' / 'bulk' to force one
+
+        Returns:
+            dict: Result of the read plus 'strategy', 'estimated_rows' and 'elapsed'
+        """
+        mode = 'delta' if criteria else 'full'
+        plan = self.choose(module, criteria, stored_count, strategy)
+        logger.info(f"Fetching {module} ({mode}) via {plan['strategy']}: estimated "
+                    f"{plan['estimated_rows']} records, REST threshold {plan['threshold']}")
+
+        if plan['strategy'] == STRATEGY_REST:
+            started = time.monotonic()
+            try:
+                result = read_rest(criteria)
+                elapsed = time.monotonic() - started
+                self.stats.record(module, mode, STRATEGY_REST, result['record_count'], elapsed)
+                return {**result, 'strategy': STRATEGY_REST, 'estimated_rows': plan['estimated_rows'],
+                        'elapsed': round(elapsed, 2)}
+            except RestLimitExceeded as e:
+                logger.info(f'{module} is too large for REST reads ({str(e)}), using bulk read')
+                self.stats.remember_rows(module, mode, REST_MAX_ROWS + 1)
+
+        started = time.monotonic()
+        result = read_bulk(criteria)
+        elapsed = time.monotonic() - started
+        self.stats.record(module, mode, STRATEGY_BULK, result['record_count'], elapsed)
+        return {**result, 'strategy': STRATEGY_BULK, 'estimated_rows': plan['estimated_rows'],
+                'elapsed': round(elapsed, 2)}
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+Zoho Field Cache Module
+Caches module field metadata on disk so refreshes do not re-fetch it every time
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Default time a cached schema stays valid
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# Columns bulk read exports contain that are not listed as module fields
+IMPLICIT_COLUMNS = ('id',)
+
+def schema_hash(fields: List[Dict[str, Any]]) -> str:
+    """
+    Hash a module schema from its field names and data types
+
+    Args:
+        fields (list): Field metadata dicts with 'api_name' and 'data_type'
+
+    Returns:
+        str: Hex digest that changes whenever a field is added, removed or retyped
+    """
+    signature = sorted(f"{field['api_name']}:{field.get('data_type') or ''}" for field in fields)
+    return hashlib.sha256('\n'.join(signature).encode('utf-8')).hexdigest()
+
+def read_csv_header(csv_path: Union[str, Path]) -> List[str]:
+    """Read only the header row of a CSV file"""
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+class FieldMetadataCache:
+    """On-disk cache of module field metadata with a TTL and schema hash"""
+
+    def __init__(self, cache_dir: Union[str, Path], ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding one JSON file per module
+            ttl_seconds (int): Time a cached schema stays valid
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+    def _path(self, module: str) -> Path:
+        return self.cache_dir / f'{module}.json'
+
+    def _read(self, module: str) -> Optional[Dict[str, Any]]:
+        path = self._path(module)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable field cache for {module}: {str(e)}')
+            return None
+
+    def get(self, module: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached schema of a module
+
+        Args:
+            module (str): Module name
+
+        Returns:
+            dict: Entry with 'module', 'fetched_at', 'schema_hash' and 'fields',
+                or None if nothing is cached or the entry expired
+        """
+        entry = self._read(module)
+        if not entry:
+            return None
+        if time.time() - entry.get('fetched_at', 0) > self.ttl_seconds:
+            logger.info(f'Field cache for {module} expired')
+            return None
+        return entry
+
+    def put(self, module: str, fields: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store the schema of a module
+
+        Args:
+            module (str): Module name
+            fields (list): Field metadata dicts with at least 'api_name'
+
+        Returns:
+            dict: The stored entry
+        """
+        entry = {
+            'module': module,
+            'fetched_at': time.time(),
+            'schema_hash': schema_hash(fields),
+            'fields': fields
+        }
+        with self._lock:
+            tmp_path = self._path(module).with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f, indent=2)
+            os.replace(tmp_path, self._path(module))
+        return entry
+
+    def invalidate(self, module: Optional[str] = None) -> None:
+        """
+        Drop the cached schema of a module, or of every module
+
+        Args:
+            module (str, optional): Module name; all modules when omitted
+        """
+        with self._lock:
+            paths = [self._path(module)] if module else list(self.cache_dir.glob('*.json'))
+            for path in paths:
+                if path.exists():
+                    path.unlink()
+        logger.info(f"Invalidated field cache for {module or 'all modules'}")
+
+    def get_or_fetch(self, module: str, fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Get a module's fields from the cache, fetching them only when needed
+
+        Args:
+            module (str): Module name
+            fetch (callable): Returns fresh field metadata dicts from Zoho
+
+        Returns:
+            list: Field metadata dicts
+        """
+        entry = self.get(module)
+        if entry:
+            return entry['fields']
+
+        fields = fetch()
+        entry = self.put(module, fields)
+        logger.info(f"Cached {len(fields)} fields for {module} (schema {entry['schema_hash'][:12]})")
+        return fields
+
+    def validate_header(self, module: str, columns: Iterable[str]) -> bool:
+        """
+        Check a bulk read CSV header against the cached schema
+
+        A column the cache does not know means fields changed in Zoho, so the
+        module's entry is invalidated and re-fetched on next use.
+
+        Args:
+            module (str): Module name
+            columns: Column names from the CSV header
+
+        Returns:
+            bool: True if the header matches the cached schema
+        """
+        entry = self._read(module)
+        if not entry:
+            return False
+
+        known = {field['api_name'] for field in entry['fields']} | set(IMPLICIT_COLUMNS)
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            logger.info(f"{module} export has uncached fields {unknown}, invalidating field cache")
+            self.invalidate(module)
+            return False
+        return True
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Zoho Client Registry Module
+Initializes the SDK once per process and shares one HTTP session and client set
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from zohocrmsdk.src.com.zoho.api.authenticator import oauth_token
+from zohocrmsdk.src.com.zoho.api.authenticator.oauth_token import OAuthToken
+from zohocrmsdk.src.com.zoho.crm.api.dc import INDataCenter, USDataCenter
+from zohocrmsdk.src.com.zoho.crm.api.dc.data_center import DataCenter
+from zohocrmsdk.src.com.zoho.crm.api.initializer import Initializer
+from zohocrmsdk.src.com.zoho.crm.api.sdk_config import SDKConfig
+from zohocrmsdk.src.com.zoho.crm.api.util import api_http_connector
+from .api_scheduler import DEFAULT_MAX_BULK_JOBS, DEFAULT_MAX_CONCURRENCY
+from .token_store import EnvironmentTokenStore
+
+logger = logging.getLogger(__name__)
+
+# Connections kept open per Zoho host; covers every call and bulk download in flight
+DEFAULT_POOL_SIZE = DEFAULT_MAX_CONCURRENCY + DEFAULT_MAX_BULK_JOBS
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Create an HTTP session with a connection pool sized for concurrent callers
+
+    Args:
+        pool_size (int): Connections kept open per host
+
+    Returns:
+        requests.Session: Session reusing TLS connections across calls
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_environment(use_indian_dc: bool = True, base_url: Optional[str] = None):
+    """
+    Get the SDK environment to connect to
+
+    Args:
+        use_indian_dc (bool): Whether to use the Indian datacenter
+        base_url (str, optional): Serve every call, including OAuth, from this
+            URL instead, e.g. the local stand-in server
+
+    Returns:
+        DataCenter.Environment: SDK environment
+    """
+    if base_url:
+        base_url = base_url.rstrip('/')
+        return DataCenter.Environment(base_url, f'{base_url}/oauth/v2/token', base_url)
+    return INDataCenter.PRODUCTION() if use_indian_dc else USDataCenter.PRODUCTION()
+
+def _initialize_from_config(config: Dict[str, Any], use_indian_dc: bool) -> None:
+    """Initialize the SDK from the ZOHO_API configuration"""
+    token = OAuthToken(
+        client_id=config.get('client_id') or os.getenv('ZOHO_CLIENT_ID'),
+        client_secret=config.get('client_secret') or os.getenv('ZOHO_CLIENT_SECRET'),
+        refresh_token=config.get('refresh_token') or os.getenv('ZOHO_REFRESH_TOKEN')
+    )
+    environment = get_environment(use_indian_dc, config.get('api_base_url') or os.getenv('ZOHO_API_BASE_URL'))
+
+    Initializer.initialize(
+        environment=environment,
+        token=token,
+        store=EnvironmentTokenStore(),
+        sdk_config=SDKConfig(auto_refresh_fields=False, pick_list_validation=False)
+    )
+
+class ClientRegistry:
+    """Thread-safe, process-wide owner of the SDK setup, HTTP session and clients"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self._lock = threading.RLock()
+        self._initialized = False
+        self._session = None
+        self._clients = {}
+        self._records_condition = threading.Condition()
+        self._records_modules = set()
+        self._records_readers = 0
+        self._records_writer = False
+
+    def get_session(self) -> requests.Session:
+        """
+        Get the shared HTTP session
+
+        The SDK's HTTP connector and OAuth token module are pointed at the
+        session on first use, so SDK calls, token refreshes and streamed bulk
+        downloads share its pool.
+
+        Returns:
+            requests.Session: Shared session
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = create_session(self.pool_size)
+                api_http_connector.requests = self._session
+                # Token refreshes call requests.post at module level
+                oauth_token.requests = self._session
+                logger.info(f'Created shared Zoho HTTP session (pool size {self.pool_size})')
+            return self._session
+
+    def initialize_sdk(self, config: Optional[Dict[str, Any]] = None, use_indian_dc: bool = True,
+                       initializer: Optional[Callable[[], None]] = None, force: bool = False) -> None:
+        """
+        Initialize the Zoho CRM SDK unless it already was
+
+        Args:
+            config (dict, optional): ZOHO_API settings (default: environment variables)
+            use_indian_dc (bool): Whether to use the Indian datacenter
+            initializer (callable, optional): Custom initialization, e.g. from a script
+            force (bool): Initialize again, e.g. after the token was revoked
+
+        Raises:
+            Exception: If initialization fails
+        """
+        with self._lock:
+            if self._initialized and not force:
+                return
+            try:
+                if initializer:
+                    initializer()
+                else:
+                    _initialize_from_config(config or {}, use_indian_dc)
+                self.get_session()
+                self._initialized = True
+                logger.info('Zoho CRM SDK initialized successfully')
+            except Exception as e:
+                logger.error(f'Failed to initialize Zoho CRM SDK: {str(e)}')
+                raise
+
+    @contextmanager
+    def record_call(self, module: str) -> Iterator[None]:
+        """
+        Guard an SDK call that returns records of a module
+
+        The SDK loads a module's field metadata on the first record call and
+        mis-parses record responses of other calls while it does, so the first
+        call of each module runs alone and later ones run concurrently.
+
+        Args:
+            module (str): Module whose records the call returns
+        """
+        with self._records_condition:
+            exclusive = module not in self._records_modules
+            if exclusive:
+                self._records_condition.wait_for(lambda: not self._records_writer and not self._records_readers)
+                self._records_writer = True
+            else:
+                self._records_condition.wait_for(lambda: not self._records_writer)
+                self._records_readers += 1
+        try:
+            yield
+            if exclusive:
+                self._records_modules.add(module)
+        finally:
+            with self._records_condition:
+                if exclusive:
+                    self._records_writer = False
+                else:
+                    self._records_readers -= 1
+                self._records_condition.notify_all()
+
+    def _get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = factory()
+            return self._clients[key]
+
+    def get_client(self, use_indian_dc: bool = True):
+        """
+        Get the shared ZohoClient
+
+        The SDK is only initialized once, so the datacenter of the first
+        initialization applies to every client.
+
+        Args:
+            use_indian_dc (bool): Whether to use the Indian datacenter
+
+        Returns:
+            ZohoClient: Client reused by every caller in the process
+        """
+        from .client import ZohoClient
+        return self._get_or_create('client', lambda: ZohoClient(use_indian_dc=use_indian_dc))
+
+    def get_bulk_reader(self, use_indian_dc: bool = True):
+        """
+        Get the shared BulkReader, built on the shared ZohoClient
+
+        Must first be called inside a Flask application context.
+
+        Args:
+            use_indian_dc (bool): Whether to use the Indian datacenter
+
+        Returns:
+            BulkReader: Bulk reader reused by every caller in the process
+        """
+        from .bulk_reader import BulkReader
+        return self._get_or_create(
+            'bulk_reader',
+            lambda: BulkReader(use_indian_dc=use_indian_dc, client=self.get_client(use_indian_dc))
+        )
+
+    def reset(self) -> None:
+        """Drop the shared clients and session so they are built again on next use"""
+        with self._lock:
+            self._clients.clear()
+            self._records_modules.clear()
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                api_http_connector.requests = requests
+                oauth_token.requests = requests
+            self._initialized = False
+
+_registry = ClientRegistry()
+
+def get_registry() -> ClientRegistry:
+    """Get the process-wide Zoho client registry"""
+    return _registry
\ No newline at end of file
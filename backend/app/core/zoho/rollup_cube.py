@@ -0,0 +1,225 @@
+"""
+Rollup Cube Module
+Pre-aggregates deals over region, stage, owner, fiscal quarter and type for drill-down queries
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from app.core.utils.timestamps import parse_date_column
+from app.models.deal import DealTable
+from .sales_aggregates import FINANCIAL_YEAR_START_MONTH, UNASSIGNED_REGION, _groups
+from .transformers import _amounts, to_frame
+
+logger = logging.getLogger(__name__)
+
+# Cube dimensions and the deal column each one is read from
+DIMENSIONS = {
+    'region': 'Region',
+    'stage': 'Stage',
+    'owner': 'Owner',
+    'quarter': 'Closing_Date',
+    'type': 'Type'
+}
+
+# Measures held per cell
+MEASURES = ('count', 'amount', 'weighted_amount')
+
+# Label of a missing dimension value; deals without a region keep the dashboard's label
+UNKNOWN_LABEL = 'Unknown'
+
+# Columns kept per deal for drill-down detail tables
+DETAIL_COLUMNS = [column for _, column, _ in DealTable.FIELDS]
+
+# Columns the cube is built from
+CUBE_COLUMNS = list(dict.fromkeys([*DIMENSIONS.values(), 'Amount', 'Probability', *DETAIL_COLUMNS]))
+
+# Distinct queries whose results are kept
+MAX_CACHED_QUERIES = 256
+
+def fiscal_quarters(closing_dates: pd.Series):
+    """
+    Get the fiscal quarter of each closing date, e.g. '2024-2025 Q1'
+
+    Args:
+        closing_dates (pd.Series): Closing dates, as dates or text
+
+    Returns:
+        tuple: Integer codes per row (-1 without a date) and the sorted labels
+    """
+    closing = parse_date_column(closing_dates)
+    month = closing.dt.month.to_numpy(dtype='float64', na_value=np.nan)
+    year = closing.dt.year.to_numpy(dtype='float64', na_value=np.nan)
+    dated = ~np.isnan(month)
+    shifted = np.nan_to_num(month).astype(int) - FINANCIAL_YEAR_START_MONTH
+    # Quarters counted from year 0, so sorting keys sorts quarters chronologically
+    keys = np.where(dated, (np.nan_to_num(year).astype(int) + shifted // 12) * 4 + (shifted % 12) // 3, -1)
+    present, codes = np.unique(keys, return_inverse=True)
+    if len(present) and present[0] == -1:
+        present, codes = present[1:], codes - 1
+    labels = [f'{key // 4}-{key // 4 + 1} Q{key % 4 + 1}' for key in present]
+    return codes.reshape(-1), labels
+
+class RollupCube:
+    """Sum, count and probability-weighted amount of deals per dimension cell"""
+
+    def __init__(self, labels: Dict[str, List[str]], cell_codes: np.ndarray, measures: np.ndarray,
+                 row_cells: np.ndarray, details: DealTable):
+        """
+        Initialize the cube from built arrays, see RollupCube.build
+
+        Args:
+            labels (dict): Dimension to its labels, indexed by code
+            cell_codes (np.ndarray): Code of every dimension per cell (cells x dimensions)
+            measures (np.ndarray): Measures per cell (cells x MEASURES)
+            row_cells (np.ndarray): Cell of each deal in details
+            details (DealTable): Deals served by drill-down detail tables
+        """
+        self.labels = labels
+        self.cell_codes = cell_codes
+        self.measures = measures
+        self.row_cells = row_cells
+        self.details = details
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, deals_data) -> 'RollupCube':
+        """
+        Aggregate deals into cube cells
+
+        Args:
+            deals_data: Deals as a DataFrame or Arrow table with the
+                CUBE_COLUMNS; a list of deal records is accepted too
+
+        Returns:
+            RollupCube: The cube, holding one cell per occupied combination
+        """
+        df = to_frame(deals_data)
+        df = df.reindex(columns=list(dict.fromkeys([*df.columns, *CUBE_COLUMNS])))
+
+        labels = {}
+        codes = []
+        for dimension, column in DIMENSIONS.items():
+            if dimension == 'quarter':
+                dimension_codes, dimension_labels = fiscal_quarters(df[column])
+                dimension_labels = dimension_labels + [UNKNOWN_LABEL]
+                dimension_codes = np.where(dimension_codes >= 0, dimension_codes, len(dimension_labels) - 1)
+            else:
+                missing = UNASSIGNED_REGION if dimension == 'region' else UNKNOWN_LABEL
+                dimension_codes, dimension_labels = _groups(df[column], missing)
+            labels[dimension] = dimension_labels
+            codes.append(dimension_codes)
+
+        shape = tuple(max(len(labels[dimension]), 1) for dimension in DIMENSIONS)
+        keys = np.ravel_multi_index(codes, shape) if len(df) else np.zeros(0, dtype=np.int64)
+        cells, row_cells = np.unique(keys, return_inverse=True)
+        row_cells = row_cells.reshape(-1)
+
+        amount = np.nan_to_num(_amounts(df['Amount']))
+        probability = np.nan_to_num(_amounts(df['Probability']))
+        measures = np.column_stack([
+            np.bincount(row_cells, minlength=len(cells)).astype('float64'),
+            np.bincount(row_cells, weights=amount, minlength=len(cells)),
+            np.bincount(row_cells, weights=amount * probability / 100, minlength=len(cells))
+        ])
+        cell_codes = np.column_stack(np.unravel_index(cells, shape)) if len(cells) else \
+            np.zeros((0, len(DIMENSIONS)), dtype=np.int64)
+
+        logger.info(f'Built rollup cube of {len(cells)} cells from {len(df)} deals')
+        return cls(labels, cell_codes, measures, row_cells, DealTable.from_frame(df))
+
+    def _cell_mask(self, filters: Optional[Dict[str, Union[str, Iterable[str]]]]) -> np.ndarray:
+        """Select the cells matching every filter"""
+        mask = np.ones(len(self.cell_codes), dtype=bool)
+        for dimension, values in (filters or {}).items():
+            if dimension not in DIMENSIONS:
+                raise ValueError(f'Unknown cube dimension: {dimension}')
+            values = {values} if isinstance(values, str) else set(values)
+            allowed = np.array([label in values for label in self.labels[dimension]], dtype=bool)
+            mask &= allowed[self.cell_codes[:, list(DIMENSIONS).index(dimension)]]
+        return mask
+
+    def query(self, group_by: Sequence[str] = (),
+              filters: Optional[Dict[str, Union[str, Iterable[str]]]] = None) -> List[Dict[str, Any]]:
+        """
+        Slice and roll up the cube
+
+        Only cells are scanned, never deals, and results are cached until
+        the cube is rebuilt, so repeated drill-downs are answered from memory.
+
+        Args:
+            group_by (sequence): Dimensions to break the result down by, e.g.
+                ('region', 'stage'); empty for a grand total
+            filters (dict, optional): Dimension to the label or labels to keep
+
+        Returns:
+            list: One dict per group with its dimension labels and the
+                count, amount and weighted_amount measures, largest amount first
+
+        Raises:
+            ValueError: If a dimension is unknown
+        """
+        for dimension in group_by:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f'Unknown cube dimension: {dimension}')
+        cache_key = (tuple(group_by), tuple(sorted(
+            (dimension, (values,) if isinstance(values, str) else tuple(sorted(values)))
+            for dimension, values in (filters or {}).items()
+        )))
+        with self._cache_lock:
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+
+        mask = self._cell_mask(filters)
+        axes = [list(DIMENSIONS).index(dimension) for dimension in group_by]
+        codes = self.cell_codes[mask][:, axes]
+        shape = tuple(max(len(self.labels[dimension]), 1) for dimension in group_by)
+        keys = np.ravel_multi_index(codes.T, shape) if axes else np.zeros(len(codes), dtype=np.int64)
+        groups, index = np.unique(keys, return_inverse=True)
+        totals = np.column_stack([
+            np.bincount(index.reshape(-1), weights=self.measures[mask][:, m], minlength=len(groups))
+            for m in range(len(MEASURES))
+        ]) if len(groups) else np.zeros((0, len(MEASURES)))
+
+        group_codes = np.unravel_index(groups, shape) if axes else ()
+        result = []
+        for g in np.argsort(-totals[:, 1], kind='stable'):
+            row = {dimension: self.labels[dimension][group_codes[a][g]] for a, dimension in enumerate(group_by)}
+            row.update({'count': int(totals[g, 0]), 'amount': float(totals[g, 1]),
+                        'weighted_amount': float(totals[g, 2])})
+            result.append(row)
+
+        with self._cache_lock:
+            if len(self._cache) >= MAX_CACHED_QUERIES:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[cache_key] = result
+        return result
+
+    def deals(self, filters: Optional[Dict[str, Union[str, Iterable[str]]]] = None,
+              limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """
+        Get the deals behind a slice for a detail table
+
+        Args:
+            filters (dict, optional): Dimension to the label or labels to keep
+            limit (int, optional): Most deals returned, largest amount first;
+                every deal of the slice when None
+
+        Returns:
+            list: Deal dicts in Deal.to_dict format
+
+        Raises:
+            ValueError: If a dimension is unknown or the limit is not positive
+        """
+        if limit is not None and limit < 1:
+            # A negative slice bound would drop deals from the end instead
+            raise ValueError('limit must be a positive integer')
+        cells = np.flatnonzero(self._cell_mask(filters))
+        rows = np.flatnonzero(np.isin(self.row_cells, cells))
+        rows = rows[np.argsort(-self.details.column('amount')[rows], kind='stable')]
+        if limit is not None:
+            rows = rows[:limit]
+        return self.details.to_dict(rows)
\ No newline at end of file
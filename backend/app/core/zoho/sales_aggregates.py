@@ -0,0 +1,243 @@
+"""
+Sales Aggregates Module
+Computes the regional and quarterly dashboard views from deal columns
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from app.core.utils.timestamps import parse_date_column
+from .transformers import CLOSED_WON_STAGE, _amounts, _codes, to_frame
+
+logger = logging.getLogger(__name__)
+
+# Columns the sales aggregates read
+SALES_COLUMNS = ['Deal_Name', 'Region', 'Stage', 'Type', 'Amount', 'Probability', 'Closing_Date']
+
+# Region reported for deals without one
+UNASSIGNED_REGION = 'Unassigned'
+
+# Financial quarters; the financial year starts in April
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+FINANCIAL_YEAR_START_MONTH = 4
+
+# Opportunity types, matched in order against the upper-cased deal type
+OPPORTUNITY_TYPES = [('POC', 'POC'), ('MAP', 'MAP'), ('GenAI', 'GENAI')]
+
+# Probabilities (percent) of open deals listed as potential closures and of
+# deals counted in the 80% projection
+POTENTIAL_CLOSURE_PROBABILITY = 70
+PROJECTION_PROBABILITY = 80
+
+# Potential closures listed per region, largest first
+MAX_POTENTIAL_CLOSURES = 20
+
+def financial_year(today: Optional[date] = None) -> str:
+    """
+    Get the financial year containing a day, e.g. '2024-2025'
+
+    Args:
+        today (date, optional): Day to look at, today by default
+
+    Returns:
+        str: First and last calendar year of the financial year
+    """
+    today = today or date.today()
+    start = today.year if today.month >= FINANCIAL_YEAR_START_MONTH else today.year - 1
+    return f'{start}-{start + 1}'
+
+def _groups(series: pd.Series, missing: Optional[str] = None):
+    """
+    Get codes and labels of a column with labels in order of first appearance
+
+    Args:
+        series (pd.Series): Column to group by
+        missing (str, optional): Label of missing and empty values; they get
+            code -1 when not given
+
+    Returns:
+        tuple: Integer codes per row and the list of labels
+    """
+    codes, labels = _codes(series)
+    labels = [str(label) for label in labels]
+    # Empty text counts as missing, like a falsy value in the browser
+    missing_code = len(labels) if missing is not None else -1
+    remap = np.append(np.arange(len(labels)), missing_code)
+    remap[[i for i, label in enumerate(labels) if label == '']] = missing_code
+    codes = remap[np.where(codes >= 0, codes, len(labels))]
+    if missing is not None:
+        labels = labels + [missing]
+    present, first_seen = np.unique(codes, return_index=True)
+    order = present[np.argsort(first_seen, kind='stable')]
+    order = order[order >= 0]
+    remap = np.full(len(labels) + 1, -1)
+    remap[order] = np.arange(len(order))
+    return remap[codes], [labels[code] for code in order]
+
+def _label_flags(labels: List[str], codes: np.ndarray, predicate) -> np.ndarray:
+    """Evaluate a predicate once per label and spread it over the rows"""
+    flags = np.array([predicate(label) for label in labels] + [predicate('')], dtype=bool)
+    return flags[codes]
+
+def _sum_count(keys: np.ndarray, values: np.ndarray, size: int):
+    """Sum values and count rows per integer key in [0, size)"""
+    return (np.bincount(keys, weights=values, minlength=size),
+            np.bincount(keys, minlength=size))
+
+def _action(stage: Optional[str]) -> str:
+    """Next action suggested for a potential closure"""
+    stage = (stage or '').lower()
+    if 'proposal' in stage:
+        return 'Follow up on proposal'
+    if 'negotiation' in stage:
+        return 'Schedule negotiation meeting'
+    return 'Review and update'
+
+class SalesAggregator:
+    """Builds the regional dashboard views the browser used to compute from raw deals"""
+
+    @staticmethod
+    def empty(today: Optional[date] = None) -> Dict[str, Any]:
+        """Sales aggregates of an empty module"""
+        return {
+            'regional_pipeline': {quarter: {} for quarter in QUARTERS},
+            'stage_region_breakdown': {},
+            'en_nn_split': {},
+            'revenue_projection': {},
+            'potential_closures': {},
+            'opportunity_types': {},
+            'stage_movement': {},
+            'financial_year': financial_year(today)
+        }
+
+    @staticmethod
+    def transform_sales(deals_data, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Compute the regional views of the dashboard
+
+        Every view is a group-by over integer codes of region, closing
+        quarter, stage and type, so the payload depends on the number of
+        regions and stages rather than on the number of deals. Quarters
+        follow the financial year starting in April and, as in the browser,
+        are taken from the closing month alone.
+
+        Args:
+            deals_data: Deals as a DataFrame or Arrow table with the
+                SALES_COLUMNS; a list of deal records is accepted too
+            today (date, optional): Day the financial year is reported for
+
+        Returns:
+            dict: regional_pipeline, stage_region_breakdown, en_nn_split,
+                revenue_projection, potential_closures, opportunity_types,
+                stage_movement and financial_year
+        """
+        df = to_frame(deals_data)
+        if df.empty:
+            return SalesAggregator.empty(today)
+        df = df.reindex(columns=list(dict.fromkeys([*df.columns, *SALES_COLUMNS])))
+
+        amount = np.nan_to_num(_amounts(df['Amount']))
+        probability = np.nan_to_num(_amounts(df['Probability']))
+        region, regions = _groups(df['Region'], UNASSIGNED_REGION)
+        stage, stages = _groups(df['Stage'])
+        deal_type, types = _groups(df['Type'])
+        n_regions = len(regions)
+
+        # Financial quarter of the closing month: April-June is Q1
+        closing = parse_date_column(df['Closing_Date'])
+        month = closing.dt.month.to_numpy(dtype='float64', na_value=np.nan)
+        has_quarter = ~np.isnan(month)
+        quarter = ((np.nan_to_num(month).astype(int) - FINANCIAL_YEAR_START_MONTH) % 12) // 3
+
+        pipeline_value, pipeline_count = _sum_count(
+            quarter[has_quarter] * n_regions + region[has_quarter], amount[has_quarter], 4 * n_regions)
+        regional_pipeline = {
+            name: {
+                regions[r]: {'value': float(pipeline_value[q * n_regions + r]),
+                             'count': int(pipeline_count[q * n_regions + r])}
+                for r in range(n_regions)
+            }
+            for q, name in enumerate(QUARTERS)
+        }
+
+        # Stages per region in order of first appearance within the region
+        has_stage = stage >= 0
+        key = region[has_stage] * max(len(stages), 1) + stage[has_stage]
+        keys, first_row, key_index = np.unique(key, return_index=True, return_inverse=True)
+        stage_value, stage_count = _sum_count(key_index, amount[has_stage], len(keys))
+        stage_region_breakdown = {name: {'stages': []} for name in regions}
+        for i in np.argsort(first_row, kind='stable'):
+            r, s = divmod(int(keys[i]), max(len(stages), 1))
+            stage_region_breakdown[regions[r]]['stages'].append(
+                {'name': stages[s], 'value': float(stage_value[i]), 'count': int(stage_count[i])})
+
+        # Existing (EN) versus new (NN) business from the deal type
+        is_en = _label_flags(types, deal_type, lambda label: 'EN' in label or 'Existing' in label)
+        split_value, split_count = _sum_count(region * 2 + is_en, amount, 2 * n_regions)
+        en_nn_split = {
+            name: {split: {'value': float(split_value[r * 2 + flag]), 'count': int(split_count[r * 2 + flag])}
+                   for split, flag in (('EN', 1), ('NN', 0))}
+            for r, name in enumerate(regions)
+        }
+
+        # Won revenue and probability-weighted projections
+        won = _label_flags(stages, stage, lambda label: label == CLOSED_WON_STAGE)
+        weighted = amount * (probability / 100)
+        achieved = np.bincount(region, weights=np.where(won, amount, 0), minlength=n_regions)
+        projected_80 = np.bincount(region, weights=np.where(probability >= PROJECTION_PROBABILITY, weighted, 0),
+                                   minlength=n_regions)
+        projected_all = np.bincount(region, weights=weighted, minlength=n_regions)
+        revenue_projection = {
+            name: {'quota': 0, 'achieved': float(achieved[r]), 'projected_80': float(projected_80[r]),
+                   'projected_all': float(projected_all[r])}
+            for r, name in enumerate(regions)
+        }
+
+        # Likely open deals, largest first
+        closed = _label_flags(stages, stage, lambda label: 'closed' in label.lower())
+        candidates = np.flatnonzero((probability >= POTENTIAL_CLOSURE_PROBABILITY) & ~closed)
+        candidates = candidates[np.argsort(-amount[candidates], kind='stable')]
+        potential_closures = {name: [] for name in regions}
+        for row in candidates:
+            closures = potential_closures[regions[region[row]]]
+            if len(closures) >= MAX_POTENTIAL_CLOSURES:
+                continue
+            deal_stage = stages[stage[row]] if stage[row] >= 0 else None
+            closures.append({
+                'name': None if pd.isna(df['Deal_Name'].iat[row]) else str(df['Deal_Name'].iat[row]),
+                'value': float(amount[row]),
+                'stage': deal_stage,
+                'action': _action(deal_stage)
+            })
+
+        # POC, MAP and GenAI opportunities; each type counts toward the first match
+        type_index = np.full(len(types) + 1, -1)
+        for t, label in enumerate(types):
+            matches = [i for i, (_, token) in enumerate(OPPORTUNITY_TYPES) if token in label.upper()]
+            type_index[t] = matches[0] if matches else -1
+        opportunity = type_index[deal_type]
+        typed = opportunity >= 0
+        type_value, type_count = _sum_count(region[typed] * len(OPPORTUNITY_TYPES) + opportunity[typed],
+                                            amount[typed], n_regions * len(OPPORTUNITY_TYPES))
+        opportunity_types = {
+            name: {
+                label: {'value': float(type_value[r * len(OPPORTUNITY_TYPES) + t]),
+                        'count': int(type_count[r * len(OPPORTUNITY_TYPES) + t])}
+                for t, (label, _) in enumerate(OPPORTUNITY_TYPES)
+            }
+            for r, name in enumerate(regions)
+        }
+
+        return {
+            'regional_pipeline': regional_pipeline,
+            'stage_region_breakdown': stage_region_breakdown,
+            'en_nn_split': en_nn_split,
+            'revenue_projection': revenue_projection,
+            'potential_closures': potential_closures,
+            'opportunity_types': opportunity_types,
+            # Filled from the deal history by the data service
+            'stage_movement': {name: [] for name in regions},
+            'financial_year': financial_year(today)
+        }
\ No newline at end of file
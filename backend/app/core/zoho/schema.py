@@ -0,0 +1,170 @@
+"""
+Zoho Column Schema Module
+Maps Zoho field data types to explicit pandas dtypes applied while parsing CSV files
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+import pandas as pd
+from app.core.utils.timestamps import parse_date_column, parse_datetime_column
+from .field_cache import read_csv_header
+
+logger = logging.getLogger(__name__)
+
+# Zoho data types stored as categoricals: few distinct values repeated on every row
+CATEGORY_TYPES = ('picklist', 'ownerlookup', 'boolean')
+
+# Zoho data types stored as float64
+FLOAT_TYPES = ('currency', 'double', 'decimal', 'percent')
+
+# Zoho data types stored as nullable integers
+INTEGER_TYPES = ('integer', 'bigint')
+
+# Zoho data types parsed to datetime64
+DATE_TYPES = ('date',)
+DATETIME_TYPES = ('datetime',)
+
+# Data types of the columns the dashboard reads, used when a file has no field metadata
+DEFAULT_FIELD_TYPES = {
+    'Stage': 'picklist',
+    'Type': 'picklist',
+    'Region': 'picklist',
+    'Industry': 'picklist',
+    'Account_Type': 'picklist',
+    'Lead_Source': 'picklist',
+    'Currency': 'picklist',
+    'Owner': 'ownerlookup',
+    'Amount': 'currency',
+    'Expected_Revenue': 'currency',
+    'Annual_Revenue': 'currency',
+    'Exchange_Rate': 'double',
+    'Probability': 'integer',
+    'Closing_Date': 'date',
+    'Created_Time': 'datetime',
+    'Modified_Time': 'datetime'
+}
+
+def field_types(fields: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, str]:
+    """
+    Get the Zoho data type of each column
+
+    Args:
+        fields (list, optional): Field metadata dicts with 'api_name' and
+            'data_type', e.g. from the field cache
+
+    Returns:
+        dict: API name to data type; metadata overrides the defaults
+    """
+    types = dict(DEFAULT_FIELD_TYPES)
+    for field in fields or []:
+        if field.get('data_type'):
+            types[field['api_name']] = field['data_type']
+    return types
+
+def pandas_dtype(data_type: Optional[str]) -> Any:
+    """
+    Get the dtype a column of a Zoho data type is parsed as
+
+    Dates are parsed as text and converted afterwards by the shared
+    timestamp parsers, since Zoho datetimes carry UTC offsets that read_csv
+    cannot parse into one column.
+
+    Args:
+        data_type (str): Zoho field data type
+
+    Returns:
+        The dtype for read_csv
+    """
+    if data_type in CATEGORY_TYPES:
+        return 'category'
+    if data_type in FLOAT_TYPES:
+        return 'float64'
+    if data_type in INTEGER_TYPES:
+        return 'Int64'
+    return str
+
+def build_schema(columns: List[str], fields: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Build the parse schema of a CSV file
+
+    Args:
+        columns (list): Columns of the file
+        fields (list, optional): Field metadata of the module
+
+    Returns:
+        dict: 'dtype' for read_csv plus the 'dates' and 'datetimes' to convert
+    """
+    types = field_types(fields)
+    return {
+        'dtype': {column: pandas_dtype(types.get(column)) for column in columns},
+        'dates': [column for column in columns if types.get(column) in DATE_TYPES],
+        'datetimes': [column for column in columns if types.get(column) in DATETIME_TYPES]
+    }
+
+def _convert_dates(df: pd.DataFrame, schema: Dict[str, Any]) -> pd.DataFrame:
+    for column in schema['dates']:
+        df[column] = parse_date_column(df[column])
+    for column in schema['datetimes']:
+        df[column] = parse_datetime_column(df[column])
+    return df
+
+def read_typed_csv(csv_path: Union[str, Path], fields: Optional[Iterable[Dict[str, Any]]] = None,
+                   usecols: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a Zoho CSV export with explicit dtypes instead of inferring them
+
+    Picklists become categoricals, currency and decimals float64, integers
+    nullable Int64, dates and datetimes datetime64 (datetimes in UTC) and
+    everything else text, including ids.
+
+    Args:
+        csv_path: CSV file to read
+        fields (list, optional): Field metadata of the module; columns without
+            metadata fall back to DEFAULT_FIELD_TYPES, then to text
+        usecols (list, optional): Only read these columns
+
+    Returns:
+        pd.DataFrame: Typed records
+    """
+    columns = [column for column in read_csv_header(csv_path) if usecols is None or column in usecols]
+    schema = build_schema(columns, fields)
+    try:
+        df = pd.read_csv(csv_path, usecols=columns, dtype=schema['dtype'])
+    except (TypeError, ValueError) as e:
+        # A malformed number fails the whole parse; read numbers as text and coerce them
+        logger.warning(f'Typed parse of {csv_path} failed, coercing numeric columns: {str(e)}')
+        numeric = [column for column, dtype in schema['dtype'].items() if dtype in ('float64', 'Int64')]
+        df = pd.read_csv(csv_path, usecols=columns, dtype={**schema['dtype'], **{c: str for c in numeric}})
+        for column in numeric:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(schema['dtype'][column])
+    return _convert_dates(df, schema)
+
+def iter_typed_csv(csv_path: Union[str, Path], fields: Optional[Iterable[Dict[str, Any]]] = None,
+                   usecols: Optional[List[str]] = None, chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """
+    Read a Zoho CSV export in typed chunks of rows
+
+    Columns are typed as by read_typed_csv, except that numbers are parsed
+    per chunk with errors coerced to NaN: a malformed number found deep in
+    the file cannot restart a read whose earlier chunks were already used.
+    Categories are those of each chunk.
+
+    Args:
+        csv_path: CSV file to read
+        fields (list, optional): Field metadata of the module
+        usecols (list, optional): Only read these columns
+        chunksize (int): Rows per chunk
+
+    Yields:
+        pd.DataFrame: Typed records of one chunk
+    """
+    columns = [column for column in read_csv_header(csv_path) if usecols is None or column in usecols]
+    schema = build_schema(columns, fields)
+    numeric = [column for column, dtype in schema['dtype'].items() if dtype in ('float64', 'Int64')]
+    dtype = {**schema['dtype'], **{column: str for column in numeric}}
+    with pd.read_csv(csv_path, usecols=columns, dtype=dtype, chunksize=chunksize) as reader:
+        for chunk in reader:
+            for column in numeric:
+                chunk[column] = pd.to_numeric(chunk[column], errors='coerce').astype(schema['dtype'][column])
+            yield _convert_dates(chunk, schema)
\ No newline at end of file
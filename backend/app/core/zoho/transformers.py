@@ -5,19 +5,90 @@ Handles transformation of raw Zoho CRM data into the required format
 
 import logging
 from datetime import datetime
+import numpy as np
 import pandas as pd
+from app.core.utils.timestamps import parse_date_column
 
 logger = logging.getLogger(__name__)
 
+# Currency reported when the org currency is unknown
+DEFAULT_CURRENCY = {'code': 'USD', 'symbol': '$', 'name': 'US Dollar'}
+
+# Stage counted as a won deal
+CLOSED_WON_STAGE = 'Closed Won'
+
+def to_frame(data):
+    """Get a DataFrame view of columnar or legacy row data
+    
+    DataFrames are used as they are, and Arrow tables (anything with a
+    to_pandas method) are converted without copying numeric columns, so
+    callers reading CSV or Arrow files never go through Python objects.
+    Lists of dicts are still accepted for older callers.
+    
+    Args:
+        data: DataFrame, Arrow table, list of record dicts or None
+        
+    Returns:
+        pd.DataFrame: Records as columns; never modified by the transformer
+    """
+    if data is None:
+        return pd.DataFrame()
+    if isinstance(data, pd.DataFrame):
+        return data
+    if hasattr(data, 'to_pandas'):
+        return data.to_pandas()
+    return pd.DataFrame(list(data))
+
+def _codes(series):
+    """Get integer codes (-1 for missing) and labels of a column
+    
+    Categorical columns already hold their codes; other columns are
+    factorized once.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series, use_na_sentinel=True)
+
+def _counts(series):
+    """Count the values of a column, most frequent first, like value_counts"""
+    codes, labels = _codes(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    order = np.argsort(-counts, kind='stable')
+    return {labels[i]: int(counts[i]) for i in order if counts[i]}
+
+def _amounts(series):
+    """Get a column as float64 values, NaN where it is missing or not a number"""
+    if series.dtype.kind in 'fiu':
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+def _months(series):
+    """Get a date column as datetime64[M] values, NaT where it is missing"""
+    return parse_date_column(series).to_numpy(dtype='datetime64[ns]').astype('datetime64[M]')
+
 class DataTransformer:
     """Transform raw Zoho CRM data into dashboard format"""
     
+    @staticmethod
+    def empty_deals(currency_info=None):
+        """Deal metrics of an empty module"""
+        return {
+            'total_deals': 0,
+            'total_value': 0,
+            'avg_deal_size': 0,
+            'stages': {},
+            'monthly_trends': {},
+            'win_rate': 0,
+            'currency': currency_info or DEFAULT_CURRENCY
+        }
+    
     @staticmethod
     def transform_deals(deals_data, currency_info=None):
         """Transform raw deals data into dashboard format
         
         Args:
-            deals_data (list): List of raw deal records from Zoho CRM
+            deals_data: Deals as a DataFrame or Arrow table; a list of raw
+                deal records from Zoho CRM is accepted too
             currency_info (dict, optional): Currency information containing:
                 - code: Currency code (e.g. 'USD')
                 - symbol: Currency symbol (e.g. '$')
@@ -27,58 +98,61 @@ class DataTransformer:
             dict: Transformed deals data with metrics and currency info
         """
         try:
-            if not deals_data:
-                return {
-                    'total_deals': 0,
-                    'total_value': 0,
-                    'avg_deal_size': 0,
-                    'stages': {},
-                    'monthly_trends': {},
-                    'win_rate': 0,
-                    'currency': currency_info or {'code': 'USD', 'symbol': '$', 'name': 'US Dollar'}
-                }
-
-            # Convert to DataFrame
-            df = pd.DataFrame(deals_data)
-            
-            # Calculate metrics
-            total_deals = len(df)
-            total_value = df['Amount'].sum()
-            avg_deal_size = total_value / total_deals if total_deals > 0 else 0
-            
-            # Get stage distribution
-            stages = df['Stage'].value_counts().to_dict()
-            
-            # Calculate win rate
-            closed_won = df[df['Stage'] == 'Closed Won'].shape[0]
-            win_rate = (closed_won / total_deals) * 100 if total_deals > 0 else 0
-            
-            # Get monthly trends
-            df['Closing_Date'] = pd.to_datetime(df['Closing_Date'])
-            monthly = df.groupby(df['Closing_Date'].dt.strftime('%Y-%m'))[['Amount']].sum()
-            monthly_trends = monthly.to_dict()['Amount']
+            df = to_frame(deals_data)
+            if df.empty:
+                return DataTransformer.empty_deals(currency_info)
             
             return {
-                'total_deals': total_deals,
-                'total_value': total_value,
-                'avg_deal_size': avg_deal_size,
-                'stages': stages,
-                'monthly_trends': monthly_trends,
-                'win_rate': win_rate,
-                'currency': currency_info or {'code': 'USD', 'symbol': '$', 'name': 'US Dollar'}
+                **DataTransformer.deal_metrics(df),
+                'currency': currency_info or DEFAULT_CURRENCY
             }
             
         except Exception as e:
             logger.error(f"Error transforming deals data: {str(e)}")
-            return {
-                'total_deals': 0,
-                'total_value': 0,
-                'avg_deal_size': 0,
-                'stages': {},
-                'monthly_trends': {},
-                'win_rate': 0,
-                'currency': currency_info or {'code': 'USD', 'symbol': '$', 'name': 'US Dollar'}
-            }
+            return DataTransformer.empty_deals(currency_info)
+    
+    @staticmethod
+    def deal_metrics(df):
+        """Compute deal totals, stage counts, win rate and monthly trends
+        
+        Every metric comes from one pass over three columns: Amount is read
+        as float64 once, Stage is reduced to integer codes that are counted
+        with bincount, and Closing_Date is bucketed by month and summed with
+        bincount weights.
+        
+        Args:
+            df (pd.DataFrame): Deals with Amount, Stage and Closing_Date columns
+            
+        Returns:
+            dict: total_deals, total_value, avg_deal_size, stages,
+                monthly_trends ('YYYY-MM' to amount) and win_rate
+        """
+        total_deals = len(df)
+        amount = _amounts(df['Amount'])
+        total_value = float(np.nansum(amount))
+        
+        # Stage distribution and win rate from one set of codes
+        stages = _counts(df['Stage'])
+        closed_won = stages.get(CLOSED_WON_STAGE, 0)
+        
+        # Monthly trends: closing month -> summed amount
+        months = _months(df['Closing_Date'])
+        has_month = ~np.isnat(months)
+        month_keys, month_index = np.unique(months[has_month], return_inverse=True)
+        month_totals = np.bincount(month_index, weights=np.nan_to_num(amount[has_month]),
+                                   minlength=len(month_keys))
+        monthly_trends = {
+            str(month): float(total) for month, total in zip(month_keys, month_totals)
+        }
+        
+        return {
+            'total_deals': total_deals,
+            'total_value': total_value,
+            'avg_deal_size': total_value / total_deals if total_deals > 0 else 0,
+            'stages': stages,
+            'monthly_trends': monthly_trends,
+            'win_rate': (closed_won / total_deals) * 100 if total_deals > 0 else 0
+        }
     
     @staticmethod
     def transform_accounts(accounts_data):
@@ -86,23 +160,20 @@ class DataTransformer:
         Transform accounts data for dashboard
         
         Args:
-            accounts_data (list): Raw accounts data from Zoho
+            accounts_data: Accounts as a DataFrame or Arrow table; a list of
+                raw account records from Zoho is accepted too
             
         Returns:
             dict: Transformed accounts data
         """
         try:
-            df = pd.DataFrame(accounts_data)
-            
-            # Industry distribution
-            industry_distribution = df['Industry'].value_counts().to_dict()
-            
-            # Account types
-            account_types = df['Account_Type'].value_counts().to_dict()
+            df = to_frame(accounts_data)
+            if df.empty:
+                return {'industry_distribution': {}, 'account_types': {}, 'total_accounts': 0}
             
             return {
-                'industry_distribution': industry_distribution,
-                'account_types': account_types,
+                'industry_distribution': _counts(df['Industry']),
+                'account_types': _counts(df['Account_Type']),
                 'total_accounts': len(df)
             }
             
@@ -111,13 +182,15 @@ class DataTransformer:
             raise
     
     @staticmethod
-    def combine_dashboard_data(deals_data, accounts_data, currency_info=None):
+    def combine_dashboard_data(deals_data, accounts_data, currency_info=None, sales_data=None):
         """Combine transformed deals and accounts data
         
         Args:
             deals_data (dict): Transformed deals data
             accounts_data (dict): Transformed accounts data
             currency_info (dict, optional): Currency information
+            sales_data (dict, optional): Regional views from
+                SalesAggregator.transform_sales, served at the top level
             
         Returns:
             dict: Combined dashboard data with timestamp
@@ -127,7 +200,8 @@ class DataTransformer:
             deals_data['currency'] = currency_info
             
         return {
+            **(sales_data or {}),
             'deals': deals_data,
             'accounts': accounts_data,
             'last_updated': datetime.now().isoformat()
-        } 
\ No newline at end of file
+        }
\ No newline at end of file
@@ -3,11 +3,15 @@ Account Data Model
 Represents an Account in the system
 """
 
-from datetime import datetime
+from app.core.utils.timestamps import parse_timestamp
+from .table import CATEGORY, DATETIME, ID, TEXT, RecordTable
 
 class Account:
     """Account model representing a customer account"""
     
+    __slots__ = ('id', 'name', 'industry', 'type', 'website', 'phone', 'billing_country',
+                 'billing_state', 'owner', 'created_time', 'modified_time')
+    
     def __init__(self, data):
         """
         Initialize an Account from Zoho CRM data
@@ -28,13 +32,8 @@ class Account:
         self.modified_time = self._parse_date(data.get('Modified_Time'))
     
     def _parse_date(self, date_str):
-        """Parse date string to datetime object"""
-        if not date_str:
-            return None
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
-            return None
+        """Parse date string to datetime object, cached across records"""
+        return parse_timestamp(date_str)
     
     def to_dict(self):
         """Convert Account to dictionary"""
@@ -58,4 +57,21 @@ class Account:
         return cls(data)
     
     def __repr__(self):
-        return f"<Account {self.name} ({self.id})>" 
\ No newline at end of file
+        return f"<Account {self.name} ({self.id})>" 
+
+class AccountTable(RecordTable):
+    """Accounts held column by column, see RecordTable; rows convert like Account.to_dict"""
+    
+    FIELDS = (
+        ('id', 'id', ID),
+        ('name', 'Account_Name', TEXT),
+        ('industry', 'Industry', CATEGORY),
+        ('type', 'Account_Type', CATEGORY),
+        ('website', 'Website', TEXT),
+        ('phone', 'Phone', TEXT),
+        ('billing_country', 'Billing_Country', CATEGORY),
+        ('billing_state', 'Billing_State', CATEGORY),
+        ('owner', 'Owner', CATEGORY),
+        ('created_time', 'Created_Time', DATETIME),
+        ('modified_time', 'Modified_Time', DATETIME)
+    )
\ No newline at end of file
@@ -3,11 +3,15 @@ Deal Data Model
 Represents a Deal in the system
 """
 
-from datetime import datetime
+from app.core.utils.timestamps import parse_timestamp
+from .table import CATEGORY, DATE, DATETIME, ID, NUMBER, TEXT, RecordTable
 
 class Deal:
     """Deal model representing a sales opportunity"""
     
+    __slots__ = ('id', 'name', 'amount', 'stage', 'probability', 'closing_date', 'account_name',
+                 'owner', 'region', 'type', 'created_time', 'modified_time')
+    
     def __init__(self, data):
         """
         Initialize a Deal from Zoho CRM data
@@ -23,17 +27,14 @@ class Deal:
         self.closing_date = self._parse_date(data.get('Closing_Date'))
         self.account_name = data.get('Account_Name')
         self.owner = data.get('Owner')
+        self.region = data.get('Region')
+        self.type = data.get('Type')
         self.created_time = self._parse_date(data.get('Created_Time'))
         self.modified_time = self._parse_date(data.get('Modified_Time'))
     
     def _parse_date(self, date_str):
-        """Parse date string to datetime object"""
-        if not date_str:
-            return None
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
-            return None
+        """Parse date string to datetime object, cached across records"""
+        return parse_timestamp(date_str)
     
     def to_dict(self):
         """Convert Deal to dictionary"""
@@ -46,6 +47,8 @@ class Deal:
             'closing_date': self.closing_date.isoformat() if self.closing_date else None,
             'account_name': self.account_name,
             'owner': self.owner,
+            'region': self.region,
+            'type': self.type,
             'created_time': self.created_time.isoformat() if self.created_time else None,
             'modified_time': self.modified_time.isoformat() if self.modified_time else None
         }
@@ -56,4 +59,22 @@ class Deal:
         return cls(data)
     
     def __repr__(self):
-        return f"<Deal {self.name} ({self.id})>" 
\ No newline at end of file
+        return f"<Deal {self.name} ({self.id})>" 
+
+class DealTable(RecordTable):
+    """Deals held column by column, see RecordTable; rows convert like Deal.to_dict"""
+    
+    FIELDS = (
+        ('id', 'id', ID),
+        ('name', 'Deal_Name', TEXT),
+        ('amount', 'Amount', NUMBER),
+        ('stage', 'Stage', CATEGORY),
+        ('probability', 'Probability', NUMBER),
+        ('closing_date', 'Closing_Date', DATE),
+        ('account_name', 'Account_Name', CATEGORY),
+        ('owner', 'Owner', CATEGORY),
+        ('region', 'Region', CATEGORY),
+        ('type', 'Type', CATEGORY),
+        ('created_time', 'Created_Time', DATETIME),
+        ('modified_time', 'Modified_Time', DATETIME)
+    )
\ No newline at end of file
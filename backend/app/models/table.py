@@ -0,0 +1,412 @@
+"""
+Record Table Module
+Column-oriented containers keeping whole collections of records in NumPy arrays
+"""
+
+from datetime import timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from app.core.utils.timestamps import parse_date_column, parse_datetime_column
+
+# Column kinds: record id, free text, repeated labels, numbers defaulting to 0,
+# naive dates and UTC datetimes
+ID = 'id'
+TEXT = 'text'
+CATEGORY = 'category'
+NUMBER = 'number'
+DATE = 'date'
+DATETIME = 'datetime'
+
+def _positions(rows: Optional[Sequence[int]], size: int) -> np.ndarray:
+    """Get row positions as an integer array, every row when not given"""
+    if rows is None:
+        return np.arange(size)
+    return np.asarray(rows, dtype=np.int64).reshape(-1)
+
+def _code_dtype(size: int) -> np.dtype:
+    """Smallest signed integer type holding codes in [-1, size)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+def _lookup_name(value: Any) -> Any:
+    """Get the name of a Zoho lookup such as {'name': ..., 'id': ...}"""
+    return value.get('name') if isinstance(value, dict) else value
+
+class Column:
+    """Base of the column types; a column is fully described by the arrays in its slots"""
+
+    __slots__ = ()
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Get the arrays holding the column, e.g. to store them"""
+        return {name: np.asarray(getattr(self, name)) for name in self.__slots__}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'Column':
+        """Rebuild a column from the arrays given by arrays()"""
+        column = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(column, name, arrays[name])
+        return column
+
+class IdColumn(Column):
+    """Record ids as fixed-width UTF-8 bytes with a sort order for lookups"""
+
+    __slots__ = ('ids', 'order')
+
+    def __init__(self, values: pd.Series):
+        text = values.astype(object).where(values.notna(), '').astype(str).to_numpy(dtype=str)
+        self.ids = np.char.encode(text, 'utf-8') if len(text) else np.zeros(0, dtype='S1')
+        self.order = np.argsort(self.ids, kind='stable').astype(_code_dtype(len(self.ids)))
+
+    def value(self, row: int) -> Optional[str]:
+        return self.ids[row].decode('utf-8') or None
+
+    def values(self, rows: np.ndarray) -> List[Optional[str]]:
+        return [record_id.decode('utf-8') or None for record_id in self.ids[rows].tolist()]
+
+    def positions(self, ids: Iterable[Any]) -> np.ndarray:
+        """Row of each id, -1 if unknown; the last row wins for a repeated id"""
+        keys = np.char.encode(np.asarray([str(record_id) for record_id in ids], dtype=str), 'utf-8')
+        if not len(keys) or not len(self.ids):
+            return np.full(len(keys), -1, dtype=np.int64)
+        found = np.searchsorted(self.ids, keys, side='right', sorter=self.order) - 1
+        rows = self.order[np.clip(found, 0, None)].astype(np.int64)
+        return np.where((found >= 0) & (self.ids[rows] == keys), rows, -1)
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.order.nbytes
+
+class TextColumn(Column):
+    """Free text stored end to end in one UTF-8 buffer with row offsets"""
+
+    __slots__ = ('buffer', 'offsets', 'missing')
+
+    def __init__(self, values: pd.Series):
+        self.missing = values.isna().to_numpy()
+        chunks = [str(value).encode('utf-8') for value in values.where(~self.missing, '')]
+        self.offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in chunks], out=self.offsets[1:])
+        self.buffer = np.frombuffer(b''.join(chunks), dtype=np.uint8)
+
+    def value(self, row: int) -> Optional[str]:
+        if self.missing[row]:
+            return None
+        return str(memoryview(self.buffer)[self.offsets[row]:self.offsets[row + 1]], 'utf-8')
+
+    def values(self, rows: np.ndarray) -> List[Optional[str]]:
+        data = memoryview(self.buffer)
+        starts, ends = self.offsets[rows].tolist(), self.offsets[rows + 1].tolist()
+        return [None if missing else str(data[start:end], 'utf-8')
+                for start, end, missing in zip(starts, ends, self.missing[rows].tolist())]
+
+    @property
+    def nbytes(self) -> int:
+        return self.buffer.nbytes + self.offsets.nbytes + self.missing.nbytes
+
+class CategoryColumn(Column):
+    """Repeated labels stored once, with a small integer code per row (-1 if missing)"""
+
+    __slots__ = ('codes', 'labels')
+
+    def __init__(self, values: pd.Series):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, labels = pd.factorize(values, use_na_sentinel=True)
+        self.labels = np.array([str(label) for label in labels] + [None], dtype=object)
+        self.codes = codes.astype(_code_dtype(len(labels)))
+
+    def value(self, row: int) -> Optional[str]:
+        return self.labels[self.codes[row]]
+
+    def values(self, rows: np.ndarray) -> List[Optional[str]]:
+        return self.labels[self.codes[rows]].tolist()
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        # Labels as fixed-width text, without the missing sentinel, so no pickling is needed
+        return {'codes': self.codes, 'labels': np.array(self.labels[:-1].tolist(), dtype=str)}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'CategoryColumn':
+        column = cls.__new__(cls)
+        column.codes = arrays['codes']
+        column.labels = np.array(arrays['labels'].tolist() + [None], dtype=object)
+        return column
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(label) for label in self.labels[:-1])
+
+class NumberColumn(Column):
+    """float64 values, 0 where missing or not a number"""
+
+    __slots__ = ('array',)
+
+    def __init__(self, values: pd.Series):
+        if values.dtype.kind not in 'fiu':
+            values = pd.to_numeric(values, errors='coerce')
+        self.array = np.nan_to_num(values.to_numpy(dtype='float64', na_value=np.nan))
+
+    def value(self, row: int) -> float:
+        return float(self.array[row])
+
+    def values(self, rows: np.ndarray) -> List[float]:
+        return self.array[rows].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+class TimestampColumn(Column):
+    """datetime64 values, NaT where missing; datetimes are held in UTC"""
+
+    __slots__ = ('array', 'utc')
+
+    def __init__(self, values: pd.Series, utc: bool):
+        if utc:
+            parsed = parse_datetime_column(values).dt.tz_localize(None)
+        else:
+            parsed = parse_date_column(values)
+        self.array = parsed.to_numpy(dtype='datetime64[ns]')
+        self.utc = utc
+
+    def value(self, row: int):
+        if np.isnat(self.array[row]):
+            return None
+        value = self.array[row].astype('datetime64[us]').item()
+        return value.replace(tzinfo=timezone.utc) if self.utc else value
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'TimestampColumn':
+        column = cls.__new__(cls)
+        column.array = arrays['array']
+        column.utc = bool(arrays['utc'])
+        return column
+
+    def values(self, rows: np.ndarray) -> List[Optional[str]]:
+        """ISO 8601 text, as datetime.isoformat gives"""
+        # Formatted once per distinct value; closing dates in particular repeat heavily
+        codes, uniques = pd.factorize(self.array[rows])
+        text = np.datetime_as_string(np.asarray(uniques, dtype='datetime64[s]'), unit='s').astype(object)
+        if self.utc:
+            text = text + '+00:00'
+        return np.append(text, None)[codes].tolist()
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+def build_column(kind: str, values: pd.Series):
+    """
+    Build the column of a kind from pandas values
+
+    Args:
+        kind (str): ID, TEXT, CATEGORY, NUMBER, DATE or DATETIME
+        values (pd.Series): Column values, typed or text
+
+    Returns:
+        The column
+    """
+    if kind == ID:
+        return IdColumn(values)
+    if kind == TEXT:
+        return TextColumn(values)
+    if kind == CATEGORY:
+        return CategoryColumn(values)
+    if kind == NUMBER:
+        return NumberColumn(values)
+    if kind in (DATE, DATETIME):
+        return TimestampColumn(values, utc=kind == DATETIME)
+    raise ValueError(f'Unknown column kind: {kind}')
+
+# Column type of each kind
+COLUMN_TYPES = {
+    ID: IdColumn,
+    TEXT: TextColumn,
+    CATEGORY: CategoryColumn,
+    NUMBER: NumberColumn,
+    DATE: TimestampColumn,
+    DATETIME: TimestampColumn
+}
+
+def load_column(kind: str, arrays: Dict[str, np.ndarray]) -> Column:
+    """
+    Rebuild a column of a kind from its stored arrays
+
+    Args:
+        kind (str): Column kind
+        arrays (dict): Arrays given by the column's arrays()
+
+    Returns:
+        Column: The column, backed by the given arrays without copying
+
+    Raises:
+        ValueError: If the kind is unknown
+    """
+    if kind not in COLUMN_TYPES:
+        raise ValueError(f'Unknown column kind: {kind}')
+    return COLUMN_TYPES[kind].from_arrays(arrays)
+
+class RowView:
+    """One row of a table, read from its columns on access"""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: 'RecordTable', row: int):
+        self._table = table
+        self._row = row
+
+    def __getattr__(self, name: str) -> Any:
+        column = self._table.columns.get(name)
+        if column is None:
+            raise AttributeError(name)
+        return column.value(self._row)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the row to the dictionary its model's to_dict gives"""
+        return self._table.to_dict([self._row])[0]
+
+    def __repr__(self):
+        return f"<{self._table.__class__.__name__} row {self._row} ({self.id})>"
+
+class RecordTable:
+    """
+    Records of one module held column by column in NumPy arrays
+
+    Subclasses list their FIELDS as (attribute, Zoho column, kind). Text is
+    kept in one buffer, repeated labels as small integer codes and dates as
+    datetime64, so a record costs tens of bytes instead of a Python object
+    with a value object per field.
+    """
+
+    FIELDS: Tuple[Tuple[str, str, str], ...] = ()
+
+    def __init__(self, columns: Dict[str, Any], size: int):
+        """
+        Initialize the table from built columns, see from_frame
+
+        Args:
+            columns (dict): Attribute to its column; tables read back with
+                only some columns hold just those
+            size (int): Number of records
+        """
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'RecordTable':
+        """
+        Build a table from records with Zoho column names
+
+        Args:
+            df (pd.DataFrame): Records, e.g. from read_typed_csv; missing
+                columns are left empty
+
+        Returns:
+            RecordTable: The table
+        """
+        empty = pd.Series([None] * len(df), index=df.index, dtype=object)
+        columns = {
+            attribute: build_column(kind, df[column] if column in df else empty)
+            for attribute, column, kind in cls.FIELDS
+        }
+        return cls(columns, len(df))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'RecordTable':
+        """
+        Build a table from raw Zoho records
+
+        Lookups such as Owner or Account_Name are reduced to their names.
+
+        Args:
+            records (list): Record dicts from the Zoho API
+
+        Returns:
+            RecordTable: The table
+        """
+        df = pd.DataFrame(list(records))
+        for _, column, kind in cls.FIELDS:
+            if column in df and kind in (TEXT, CATEGORY) and df[column].dtype == object:
+                df[column] = df[column].map(_lookup_name)
+        return cls.from_frame(df)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, row: int) -> RowView:
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError('record table index out of range')
+        return RowView(self, row)
+
+    def __iter__(self) -> Iterator[RowView]:
+        return (RowView(self, row) for row in range(self.size))
+
+    def column(self, attribute: str) -> np.ndarray:
+        """
+        Get the array of a number or timestamp column
+
+        Args:
+            attribute (str): Attribute name, e.g. 'amount'
+
+        Returns:
+            np.ndarray: One value per row; not a copy, so do not modify it
+        """
+        return self.columns[attribute].array
+
+    def positions(self, ids: Iterable[Any]) -> np.ndarray:
+        """
+        Find the rows of many records at once
+
+        Args:
+            ids (iterable): Record ids
+
+        Returns:
+            np.ndarray: Row of each id, -1 for unknown ids
+        """
+        return self.columns['id'].positions(ids)
+
+    def get(self, record_id: Any) -> Optional[RowView]:
+        """
+        Look up a record by id without scanning the table
+
+        Args:
+            record_id: Record id
+
+        Returns:
+            RowView: The record, or None if it is not in the table
+        """
+        row = int(self.positions([record_id])[0])
+        return RowView(self, row) if row >= 0 else None
+
+    def to_dict(self, rows: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Convert records to dictionaries for serialization
+
+        Each column is converted once for all rows, so this is much faster
+        than calling to_dict on one model object per record.
+
+        Args:
+            rows (sequence, optional): Rows to convert, in order; every row
+                when not given
+
+        Returns:
+            list: One dict per row with the keys of the model's to_dict
+                that the table holds columns for
+        """
+        rows = _positions(rows, self.size)
+        keys = [attribute for attribute, _, _ in self.FIELDS if attribute in self.columns]
+        values = [self.columns[attribute].values(rows) for attribute in keys]
+        return [dict(zip(keys, row)) for row in zip(*values)]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns, in bytes"""
+        return sum(column.nbytes for column in self.columns.values())
\ No newline at end of file
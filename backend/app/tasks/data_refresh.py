@@ -4,23 +4,33 @@ Handles periodic data refresh from Zoho CRM
 """
 
 import logging
-from app.core.services.data_service import DataService
+from app.core.services.data_service import get_data_service
+from app.core.zoho.api_scheduler import PRIORITY_BACKGROUND
 
 logger = logging.getLogger(__name__)
 
-def refresh_data():
+def refresh_data(app=None):
     """
     Refresh data from Zoho CRM
     This function is called periodically by the scheduler
+    
+    Args:
+        app: Flask application whose context the refresh runs in, when
+            called from a scheduler thread
     """
+    if app is not None:
+        with app.app_context():
+            return refresh_data()
+    
     try:
         logger.info('Starting scheduled data refresh...')
         
-        # Create service instance
-        service = DataService()
+        # Reuse the process-wide service and its Zoho clients
+        service = get_data_service()
         
         # Fetch and process data
-        data = service.fetch_all_data()
+        data = service.fetch_all_data(priority=PRIORITY_BACKGROUND)
+        logger.info(f'Refresh API credit usage: {service.last_credit_usage}')
         
         logger.info('Scheduled data refresh completed successfully')
         return data
@@ -31,6 +31,7 @@ def init_scheduler(app):
         # Add data refresh job
         scheduler.add_job(
             func=refresh_data,
+            args=[app],
             trigger=IntervalTrigger(hours=refresh_interval),
             id='data_refresh',
             name='Refresh Zoho CRM data',
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Catalog bulk read results saved before the bulk catalog existed
+
+Results landing now are catalogued by the fetchers; this adds the CSV files
+of the data directory that the catalog does not list yet. Their module is
+worked out from their header and the cached field metadata, or given with
+--module for files that match no module or several. Files are added oldest
+first, so the newest file of each module becomes its latest.
+
+Usage:
+    python scripts/build_catalog.py --data-dir data --module bulk_read_495490000013190027.csv=Contacts
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.zoho.bulk_catalog import BulkCatalog, detect_module
+from app.core.zoho.field_cache import FieldMetadataCache, read_csv_header
+
+# Prefix of the files store_bulk_result saves, followed by the job id
+BULK_PREFIX = 'bulk_read_'
+
+def main():
+    parser = argparse.ArgumentParser(description='Catalog bulk read results saved before the bulk catalog')
+    parser.add_argument('--data-dir', default='data', help='Bulk read results (default: %(default)s)')
+    parser.add_argument('--field-cache', default='data/field_cache',
+                        help='Field metadata cache used to detect modules (default: %(default)s)')
+    parser.add_argument('--module', action='append', default=[], metavar='FILE=MODULE',
+                        help='Module of a file that cannot be detected; repeatable')
+    args = parser.parse_args()
+
+    assumed = dict(value.split('=', 1) for value in args.module)
+    # Expired metadata still names the fields of a module
+    field_cache = FieldMetadataCache(args.field_cache, ttl_seconds=float('inf'))
+    module_fields = {}
+    for path in Path(args.field_cache).glob('*.json'):
+        entry = field_cache.get(path.stem)
+        if entry:
+            module_fields[path.stem] = [field['api_name'] for field in entry['fields']]
+
+    catalog = BulkCatalog(args.data_dir)
+    for path in sorted(Path(args.data_dir).glob('*.csv'), key=lambda path: path.stat().st_mtime):
+        if catalog.get(path) is not None:
+            continue
+        fields = read_csv_header(path)
+        module = assumed.get(path.name) or detect_module(fields, module_fields)
+        if module is None:
+            print(f'{path.name}: module unknown, skipped; pass --module {path.name}=MODULE')
+            continue
+        job_id = path.stem[len(BULK_PREFIX):].split('_')[0] if path.name.startswith(BULK_PREFIX) else None
+        entry = catalog.register(path, module, [job_id] if job_id else None, fields)
+        print(f"{path.name}: {module}, {entry['record_count']} records")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
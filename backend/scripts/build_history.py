@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Replay archived snapshots into the deal history
+
+Refreshes record their deals in the history store as they run; this fills
+the store with the snapshots archived before it existed. Archives older
+than the latest recorded refresh are skipped, so it can be run again.
+
+Usage:
+    python scripts/build_history.py --archive-dir data/archive --history data/history.sqlite3
+"""
+
+import sys
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.services.history_store import HistoryStore, to_timestamp
+from app.core.services.snapshot import SnapshotReader
+from app.core.services.snapshot_archive import SnapshotArchive
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay archived snapshots into the deal history')
+    parser.add_argument('--archive-dir', default='data/archive', help='Snapshot archive (default: %(default)s)')
+    parser.add_argument('--history', default='data/history.sqlite3', help='History store (default: %(default)s)')
+    args = parser.parse_args()
+
+    archive = SnapshotArchive(args.archive_dir)
+    history = HistoryStore(args.history)
+    last = history.last_refresh()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = Path(tmp_dir) / 'archived.snapshot'
+        for entry in archive.entries():
+            if last is not None and to_timestamp(entry['archived_at']) <= last:
+                continue
+            archive.restore(entry['id'], snapshot_path)
+            with SnapshotReader(snapshot_path) as reader:
+                if 'deals' not in reader.meta['tables']:
+                    continue
+                result = history.record(reader.table('deals'), entry['archived_at'])
+            print(f"{result['refreshed_at']}: {result['added']} added, {result['changed']} changed, "
+                  f"{result['removed']} removed")
+    history.close()
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
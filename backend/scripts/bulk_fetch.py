@@ -8,9 +8,12 @@ import sys
 import json
 import time
 import logging
+import argparse
 import base64
 import io
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -20,7 +23,6 @@ from typing import List, Dict, Any
 sys.path.append(str(Path(__file__).parent.parent))
 
 from zohocrmsdk.src.com.zoho.api.authenticator.oauth_token import OAuthToken
-from zohocrmsdk.src.com.zoho.crm.api.dc import INDataCenter
 from zohocrmsdk.src.com.zoho.crm.api.initializer import Initializer
 from zohocrmsdk.src.com.zoho.api.authenticator.store.file_store import FileStore
 from zohocrmsdk.src.com.zoho.crm.api.sdk_config import SDKConfig
@@ -31,7 +33,24 @@ from zohocrmsdk.src.com.zoho.crm.api.modules import MinifiedModule
 from zohocrmsdk.src.com.zoho.crm.api.bulk_read.action_handler import ActionHandler
 from zohocrmsdk.src.com.zoho.crm.api.bulk_read.response_handler import ResponseHandler
 from zohocrmsdk.src.com.zoho.crm.api.fields import FieldsOperations, ResponseHandler as FieldsResponseHandler
-from zohocrmsdk.src.com.zoho.crm.api.fields import ParameterMap
+from zohocrmsdk.src.com.zoho.crm.api import ParameterMap
+from zohocrmsdk.src.com.zoho.crm.api.fields import GetFieldsParam
+from app.core.zoho.bulk_callbacks import start_callback_server, wait_for_job
+from app.core.zoho.bulk_files import open_bulk_result_stream, store_bulk_result
+from app.core.zoho.bulk_pages import DEFAULT_PAGE_CONCURRENCY, read_all_pages, stitch_pages
+from app.core.zoho.bulk_catalog import BulkCatalog
+from zohocrmsdk.src.com.zoho.crm.api.record import RecordOperations, CountWrapper, GetRecordsParam, GetRecordsHeader
+from zohocrmsdk.src.com.zoho.crm.api.record import ResponseWrapper as RecordsResponseWrapper
+from zohocrmsdk.src.com.zoho.crm.api import HeaderMap
+from zohocrmsdk.src.com.zoho.crm.api.fields import MinifiedField
+from app.core.zoho.delta_sync import DeltaSync, RecordStore, SyncState
+from app.core.zoho.registry import get_environment, get_registry
+from app.core.zoho.field_cache import DEFAULT_TTL_SECONDS, FieldMetadataCache
+from app.core.zoho.fetch_strategy import (REST_PAGE_SIZE, STRATEGIES, STRATEGY_AUTO, STRATEGY_BULK,
+                                          FetchPlanner, FetchStats, flatten_record, if_modified_since,
+                                          read_rest_module, rest_modified_since)
+from app.core.zoho.api_scheduler import (DEFAULT_DAILY_CREDITS, DEFAULT_MAX_BULK_JOBS, PRIORITIES,
+                                         RateLimitExceeded, configure_scheduler, get_scheduler)
 
 # Set up logging
 def setup_logger(name):
@@ -75,6 +94,15 @@ def setup_logger(name):
 # Set up logger
 logger = setup_logger('zoho_bulk_fetch')
 
+# Directory bulk read results are saved to
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+# Modules exported on every run
+DEFAULT_MODULES = ['Deals', 'Accounts', 'Contacts', 'Leads']
+
+# Maximum number of bulk read jobs kept in flight by the pipelined mode
+DEFAULT_MAX_CONCURRENCY = 4
+
 def initialize_sdk():
     """Initialize the Zoho CRM SDK"""
     try:
@@ -88,26 +116,47 @@ def initialize_sdk():
             refresh_token=os.getenv('ZOHO_REFRESH_TOKEN')
         )
         
-        # Initialize the SDK
+        # Initialize the SDK; ZOHO_API_BASE_URL points it at a stand-in server
         Initializer.initialize(
-            environment=INDataCenter.PRODUCTION(),
+            environment=get_environment(base_url=os.getenv('ZOHO_API_BASE_URL')),
             token=token,
-            sdk_config=SDKConfig(auto_refresh_fields=True, pick_list_validation=False)
+            sdk_config=SDKConfig(auto_refresh_fields=False, pick_list_validation=False)
         )
         
-        logger.info('Zoho CRM SDK initialized successfully')
-        
     except Exception as e:
         logger.error(f'Failed to initialize Zoho CRM SDK: {str(e)}', exc_info=True)
         raise
 
-def submit_bulk_read_job(module: str, fields: List[str]) -> str:
+def build_criteria(criteria: Dict[str, Any]) -> Criteria:
+    """
+    Convert a single-condition criteria dict into an SDK Criteria object.
+    
+    Args:
+        criteria: Criteria with 'field' ({'api_name': ...}), 'comparator' and 'value'
+        
+    Returns:
+        Criteria: SDK criteria for the bulk read query
+    """
+    field = MinifiedField()
+    field.set_api_name(criteria['field']['api_name'])
+    
+    sdk_criteria = Criteria()
+    sdk_criteria.set_field(field)
+    sdk_criteria.set_comparator(Choice(criteria['comparator']))
+    sdk_criteria.set_value(criteria['value'])
+    return sdk_criteria
+
+def submit_bulk_read_job(module: str, fields: List[str], callback_url: str = None, page: int = 1,
+                         criteria: Dict[str, Any] = None) -> str:
     """
     Submit a bulk read job for the specified module and fields.
     
     Args:
         module: The module name (e.g., 'Leads', 'Contacts')
         fields: List of fields to fetch
+        callback_url: URL Zoho should POST to when the job finishes
+        page: Page of the module to export (each page holds up to 200,000 records)
+        criteria: Only export records matching these criteria (see build_criteria)
         
     Returns:
         str: The job ID if successful
@@ -130,11 +179,20 @@ def submit_bulk_read_job(module: str, fields: List[str]) -> str:
         query = Query()
         query.set_module(module_instance)
         query.set_fields(fields)
-        query.set_page(1)
+        query.set_page(page)
+        if criteria:
+            query.set_criteria(build_criteria(criteria))
         request.set_query(query)
         
+        # Ask Zoho to notify the callback receiver on completion
+        if callback_url:
+            callback = CallBack()
+            callback.set_url(callback_url)
+            callback.set_method(Choice('post'))
+            request.set_callback(callback)
+        
         # Submit the bulk read job
-        response = bulk_read_operations.create_bulk_read_job(request)
+        response = get_scheduler().call('bulk_read_create', bulk_read_operations.create_bulk_read_job, request)
         
         # Log response status
         logger.info(f"Response status code: {response.get_status_code()}")
@@ -154,6 +212,8 @@ def submit_bulk_read_job(module: str, fields: List[str]) -> str:
                 return job_id
             else:
                 raise Exception(f"Unexpected response type: {type(response_obj)}")
+        elif response.get_status_code() == 429:
+            raise RateLimitExceeded(f"Bulk read job submission for {module} was throttled")
         else:
             error_msg = response.get_object().get_message()
             raise Exception(f"Failed to submit bulk read job: {error_msg}")
@@ -179,8 +239,11 @@ def get_job_status(job_id: str) -> str:
         # Convert job_id to integer since the SDK expects it
         job_id_int = int(job_id)
         bulk_read_operations = BulkReadOperations()
-        response = bulk_read_operations.get_bulk_read_job_details(job_id_int)
+        response = get_scheduler().call('bulk_read_status', bulk_read_operations.get_bulk_read_job_details,
+                                        job_id_int)
         
+        if response.get_status_code() == 429:
+            raise RateLimitExceeded(f"Status check of job {job_id} was throttled")
         if response.get_status_code() in [200, 201, 202]:
             response_obj = response.get_object()
             if isinstance(response_obj, ResponseHandler):
@@ -194,109 +257,133 @@ def get_job_status(job_id: str) -> str:
         logger.error(f"Failed to get job status for {job_id}: {str(e)}")
         raise
 
-def extract_csv_from_response(response_wrapper) -> bytes:
+def get_job_result(job_id: str) -> Dict[str, Any]:
     """
-    Extract data directly from the bulk read response.
+    Get the result details of a completed bulk read job.
     
     Args:
-        response_wrapper: The FileBodyWrapper response from the bulk read operation
+        job_id: The job ID to check
         
     Returns:
-        bytes: The raw data from the response
+        Dict[str, Any]: page, count, per_page and more_records of the job
+        
+    Raises:
+        Exception: If the job details cannot be fetched
     """
     try:
-        # Get the stream from FileBodyWrapper
-        stream_wrapper = response_wrapper.get_file()
-        if not stream_wrapper:
-            raise ValueError("No file stream found in response")
-            
-        # Get the response content
-        response = stream_wrapper.get_stream()
-        if not response:
-            raise ValueError("No response stream available")
+        bulk_read_operations = BulkReadOperations()
+        response = get_scheduler().call('bulk_read_status', bulk_read_operations.get_bulk_read_job_details,
+                                        int(job_id))
+        
+        if response.get_status_code() in [200, 201, 202]:
+            response_obj = response.get_object()
+            if isinstance(response_obj, ResponseHandler):
+                data = response_obj.get_data()
+                if data and data[0].get_result():
+                    result = data[0].get_result()
+                    return {
+                        'page': result.get_page(),
+                        'count': result.get_count(),
+                        'per_page': result.get_per_page(),
+                        'more_records': bool(result.get_more_records())
+                    }
             
-        # Try to get the raw content directly
-        try:
-            # First attempt: try to get raw content directly
-            content = response.raw.read()
-            if not content:
-                raise ValueError("No content in response stream")
-                
-            # Check if the content is a ZIP file (starts with PK\x03\x04)
-            if content.startswith(b'PK\x03\x04'):
-                logger.info("Detected ZIP file in response")
-                
-                # Create data directory if it doesn't exist
-                data_dir = Path('/Users/jrkphani/Projects/Sales_presales_tracker/backend/data')
-                data_dir.mkdir(exist_ok=True, parents=True)
-                
-                # Save the ZIP file
-                zip_file = data_dir / f'bulk_read_{int(time.time())}.zip'
-                logger.info(f"Saving ZIP file to: {zip_file}")
-                
-                with open(zip_file, 'wb') as f:
-                    f.write(content)
-                    
-                logger.info(f"Successfully downloaded and saved ZIP file to {zip_file}")
-                
-                # Extract the CSV file from the ZIP
-                import zipfile
-                import io
-                
-                with zipfile.ZipFile(io.BytesIO(content)) as zip_ref:
-                    # List files in the ZIP
-                    file_list = zip_ref.namelist()
-                    logger.info(f"Files in ZIP: {file_list}")
-                    
-                    # Extract the first CSV file
-                    csv_filename = next((f for f in file_list if f.endswith('.csv')), None)
-                    if csv_filename:
-                        logger.info(f"Extracting CSV file: {csv_filename}")
-                        csv_data = zip_ref.read(csv_filename)
-                        
-                        # Save the CSV file
-                        csv_file = data_dir / f'bulk_read_{int(time.time())}.csv'
-                        logger.info(f"Saving CSV file to: {csv_file}")
-                        
-                        with open(csv_file, 'wb') as f:
-                            f.write(csv_data)
-                            
-                        logger.info(f"Successfully extracted and saved CSV file to {csv_file}")
-                        
-                        # Verify the file was created
-                        if csv_file.exists():
-                            logger.info(f"CSV file exists and has size: {csv_file.stat().st_size} bytes")
-                        else:
-                            logger.error(f"CSV file was not created at {csv_file}")
-                            
-                        return csv_data
-                    else:
-                        logger.error("No CSV file found in ZIP")
-                        return content
-                        
-            return content
-                
-        except Exception as e:
-            logger.warning(f"Failed to read raw content: {str(e)}")
-            # Second attempt: try to read the stream in chunks
-            content = b""
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    content += chunk
-                    
-            if not content:
-                raise ValueError("No content in response stream")
-                
-            return content
+        raise Exception(f"Failed to get job result: {response.get_object().get_message()}")
             
     except Exception as e:
-        logger.error(f"Failed to extract data: {str(e)}")
+        logger.error(f"Failed to get job result for {job_id}: {str(e)}")
         raise
 
+def get_module_record_count(module: str):
+    """
+    Get the number of records in a module.
+    
+    Args:
+        module: The module name (e.g., 'Leads')
+        
+    Returns:
+        int: Record count, or None if it cannot be fetched
+    """
+    try:
+        response = get_scheduler().call('record_count', RecordOperations(module).record_count)
+        if response.get_status_code() == 200:
+            response_obj = response.get_object()
+            if isinstance(response_obj, CountWrapper):
+                return response_obj.get_count()
+        logger.warning(f"Could not get record count for {module}")
+    except Exception as e:
+        logger.warning(f"Failed to get record count for {module}: {str(e)}")
+    return None
+
+def fetch_records_page(module: str, fields: List[str], page: int, modified_since: str = None) -> Dict[str, Any]:
+    """
+    Get one page of records through the REST API.
+    
+    Args:
+        module: The module name (e.g., 'Leads')
+        fields: Fields to fetch
+        page: Page number
+        modified_since: Only return records modified at or after this Modified_Time
+        
+    Returns:
+        Dict[str, Any]: 'records' as flat dicts and 'more_records'
+    """
+    param_instance = ParameterMap()
+    param_instance.add(GetRecordsParam.fields, ','.join(fields))
+    param_instance.add(GetRecordsParam.page, page)
+    param_instance.add(GetRecordsParam.per_page, REST_PAGE_SIZE)
+    
+    header_instance = HeaderMap()
+    if modified_since:
+        header_instance.add(GetRecordsHeader.if_modified_since, if_modified_since(modified_since))
+    
+    # The SDK loads the module's field metadata on its first record call
+    with get_registry().record_call(module):
+        response = get_scheduler().call('records', RecordOperations(module).get_records,
+                                        param_instance, header_instance)
+    if response.get_status_code() == 429:
+        raise RateLimitExceeded(f"Rate limited while reading {module} page {page}")
+    if response.get_status_code() in (204, 304):
+        return {'records': [], 'more_records': False}
+    
+    response_obj = response.get_object()
+    if isinstance(response_obj, RecordsResponseWrapper):
+        return {
+            'records': [flatten_record(record) for record in response_obj.get_data()],
+            'more_records': bool(response_obj.get_info().get_more_records())
+        }
+    raise Exception(f"Failed to get records: {response_obj.get_message().get_value()}")
+
+def rest_read_module(module: str, fields: List[str], criteria: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Read a module through paged REST calls into a bulk read style CSV file.
+    
+    Args:
+        module: The module name (e.g., 'Leads')
+        fields: Fields to fetch
+        criteria: Modified_Time delta criteria, if any
+        
+    Returns:
+        Dict[str, Any]: file_path, record_count, pages and fields
+    """
+    modified_since = rest_modified_since(criteria)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    result = read_rest_module(
+        lambda page: fetch_records_page(module, fields, page, modified_since),
+        fields,
+        DATA_DIR / f'{module}_rest_{timestamp}.csv'
+    )
+    logger.info(f"Read {result['record_count']} {module} records through REST in {result['pages']} pages")
+    return result
+
 def download_results(job_id: str) -> str:
     """
     Download the results of a completed bulk read job and save as a file.
     
+    The response is streamed to disk in fixed-size chunks and the CSV is
+    decompressed straight from the ZIP file, so memory use does not grow with
+    the size of the export.
+    
     Args:
         job_id: The job ID to download results for
         
@@ -304,164 +391,105 @@ def download_results(job_id: str) -> str:
         str: The path to the downloaded file
     """
     try:
-        # Convert job_id to integer since the SDK expects it
-        job_id_int = int(job_id)
-        bulk_read_operations = BulkReadOperations()
-        
-        # Get the download URL
         logger.info(f"Downloading results for job ID: {job_id}")
-        response = bulk_read_operations.download_result(job_id_int)
-        
-        # Log response details for debugging
-        logger.info(f"Download response status code: {response.get_status_code()}")
+        response = get_scheduler().call('bulk_read_download', open_bulk_result_stream, job_id,
+                                        get_registry().get_session())
+        logger.info(f"Download response status code: {response.status_code}")
         
-        if response.get_status_code() in [200, 201, 202]:
-            # Get the response data
-            response_wrapper = response.get_object()
-            
-            # Log response wrapper type for debugging
-            logger.info(f"Response wrapper type: {type(response_wrapper)}")
-            
-            # Extract data
-            data = extract_csv_from_response(response_wrapper)
-            
-            # Create data directory if it doesn't exist
-            # Use absolute path
-            data_dir = Path('/Users/jrkphani/Projects/Sales_presales_tracker/backend/data')
-            data_dir.mkdir(exist_ok=True, parents=True)
+        try:
+            stored = store_bulk_result(response, DATA_DIR, str(job_id), keep_zip=True)
+        finally:
+            response.close()
             
-            # Check if the data is a ZIP file
-            if data.startswith(b'PK\x03\x04'):
-                logger.info("Detected ZIP file in response")
-                
-                # Save ZIP file
-                zip_file = data_dir / f'bulk_read_{job_id}.zip'
-                logger.info(f"Saving ZIP file to: {zip_file}")
-                
-                with open(zip_file, 'wb') as f:
-                    f.write(data)
-                    
-                logger.info(f"Successfully downloaded and saved ZIP file to {zip_file}")
-                
-                # Extract CSV from ZIP
-                import zipfile
-                import io
-                
-                with zipfile.ZipFile(io.BytesIO(data)) as zip_ref:
-                    # List files in the ZIP
-                    file_list = zip_ref.namelist()
-                    logger.info(f"Files in ZIP: {file_list}")
-                    
-                    # Extract the first CSV file
-                    csv_filename = next((f for f in file_list if f.endswith('.csv')), None)
-                    if csv_filename:
-                        logger.info(f"Extracting CSV file: {csv_filename}")
-                        csv_data = zip_ref.read(csv_filename)
-                        
-                        # Save CSV file
-                        csv_file = data_dir / f'bulk_read_{job_id}.csv'
-                        logger.info(f"Saving CSV file to: {csv_file}")
-                        
-                        with open(csv_file, 'wb') as f:
-                            f.write(csv_data)
-                            
-                        logger.info(f"Successfully extracted and saved CSV file to {csv_file}")
-                        
-                        # Verify file was created
-                        if csv_file.exists():
-                            logger.info(f"CSV file exists and has size: {csv_file.stat().st_size} bytes")
-                        else:
-                            logger.error(f"CSV file was not created at {csv_file}")
-                            
-                        return str(csv_file)
-                    else:
-                        logger.error("No CSV file found in ZIP")
-                        return str(zip_file)
-            else:
-                # Save file with binary mode
-                file_path = data_dir / f'bulk_read_{job_id}.csv'
-                logger.info(f"Saving file to: {file_path}")
-                
-                with open(file_path, 'wb') as f:
-                    f.write(data)
-                    
-                logger.info(f"Successfully downloaded and saved file to {file_path}")
-                
-                # Verify file was created
-                if file_path.exists():
-                    logger.info(f"File exists and has size: {file_path.stat().st_size} bytes")
-                else:
-                    logger.error(f"File was not created at {file_path}")
-                    
-                return str(file_path)
-        else:
-            error_msg = response.get_object().get_message()
-            raise Exception(f"Failed to download results: {error_msg}")
+        csv_file = Path(stored['file_path'])
+        logger.info(f"Saved CSV file to {csv_file} ({csv_file.stat().st_size} bytes)")
+        return str(csv_file)
             
     except Exception as e:
         logger.error(f"Failed to download results for job {job_id}: {str(e)}")
         raise
 
-def wait_for_job_completion(job_id, timeout=300, interval=5):
-    """Wait for a bulk read job to complete"""
-    start_time = datetime.now()
+def wait_for_job_completion(job_id, timeout=300, initial_interval=1, max_interval=30):
+    """
+    Wait for a bulk read job to complete.
+    
+    Returns as soon as the completion callback arrives; without a callback the
+    job status is polled with exponential backoff.
+    """
     logger.info(f'Waiting for job {job_id} to complete (timeout: {timeout}s)')
+    status = wait_for_job(
+        job_id,
+        get_job_status,
+        timeout=timeout,
+        initial_interval=initial_interval,
+        max_interval=max_interval
+    )
+    logger.info(f'Job {job_id} completed successfully')
+    return status
+
+def fetch_field_metadata(module: str) -> List[Dict[str, Any]]:
+    """
+    Fetch field metadata for a module from Zoho CRM.
     
-    while True:
-        status = get_job_status(job_id)
-        
-        if status == 'COMPLETED':
-            logger.info(f'Job {job_id} completed successfully')
-            return status
-        elif status == 'FAILED':
-            logger.error(f'Job {job_id} failed')
-            raise Exception(f'Bulk read job {job_id} failed')
-        
-        if (datetime.now() - start_time).total_seconds() > timeout:
-            logger.error(f'Timeout waiting for job {job_id}')
-            raise Exception(f'Timeout waiting for job {job_id}')
+    Args:
+        module: The module name (e.g., 'Deals', 'Leads')
         
-        logger.info(f'Job status: {status}, waiting {interval} seconds...')
-        time.sleep(interval)
+    Returns:
+        List[Dict[str, Any]]: Field metadata with api_name, data_type,
+            custom_field and read_only
+    """
+    # Initialize fields operations
+    fields_operations = FieldsOperations()
+    
+    # Create parameter map selecting the module
+    param_instance = ParameterMap()
+    param_instance.add(GetFieldsParam.module, module)
+    
+    # Get fields for the module
+    response = get_scheduler().call('fields', fields_operations.get_fields, param_instance)
+    
+    if response.get_status_code() in [200, 201, 202]:
+        response_obj = response.get_object()
+        if isinstance(response_obj, FieldsResponseHandler):
+            return [
+                {
+                    'api_name': field.get_api_name(),
+                    'data_type': field.get_data_type(),
+                    'custom_field': bool(field.get_custom_field()),
+                    'read_only': bool(field.get_read_only())
+                }
+                for field in response_obj.get_fields()
+            ]
+        else:
+            raise Exception(f"Unexpected response type: {type(response_obj)}")
+    else:
+        error_msg = response.get_object().get_message()
+        raise Exception(f"Failed to get fields: {error_msg}")
 
-def get_module_fields(module: str) -> List[str]:
+def get_module_fields(module: str, field_cache: FieldMetadataCache = None) -> List[str]:
     """
     Get all available fields (including custom fields) for a module.
     
+    Field metadata is served from the field cache when it holds a fresh entry
+    for the module and is only fetched from Zoho otherwise.
+    
     Args:
         module: The module name (e.g., 'Deals', 'Leads')
+        field_cache: On-disk field metadata cache, if enabled
         
     Returns:
         List[str]: List of field API names
     """
     try:
-        # Initialize fields operations
-        fields_operations = FieldsOperations()
-        
-        # Create parameter map
-        param_instance = ParameterMap()
-        
-        # Create module instance
-        module_instance = MinifiedModule()
-        module_instance.set_api_name(module)
-        
-        # Get fields for the module
-        response = fields_operations.get_fields(module_instance, param_instance)
-        
-        if response.get_status_code() in [200, 201, 202]:
-            response_obj = response.get_object()
-            if isinstance(response_obj, FieldsResponseHandler):
-                fields = response_obj.get_fields()
-                # Extract field API names
-                field_names = [field.get_api_name() for field in fields]
-                logger.info(f"Found {len(field_names)} fields for {module}")
-                logger.debug(f"Fields: {field_names}")
-                return field_names
-            else:
-                raise Exception(f"Unexpected response type: {type(response_obj)}")
+        if field_cache:
+            metadata = field_cache.get_or_fetch(module, lambda: fetch_field_metadata(module))
         else:
-            error_msg = response.get_object().get_message()
-            raise Exception(f"Failed to get fields: {error_msg}")
+            metadata = fetch_field_metadata(module)
+        
+        field_names = [field['api_name'] for field in metadata]
+        logger.info(f"Found {len(field_names)} fields for {module}")
+        logger.debug(f"Fields: {field_names}")
+        return field_names
             
     except Exception as e:
         logger.error(f"Failed to get fields for {module}: {str(e)}")
@@ -478,40 +506,307 @@ def get_module_fields(module: str) -> List[str]:
         else:
             return ['id', 'Created_Time', 'Modified_Time']
 
-def main():
-    """Main function to execute bulk fetch operations"""
+def process_module(module_name: str, callback_url: str = None,
+                   page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+                   delta_sync: DeltaSync = None,
+                   field_cache: FieldMetadataCache = None,
+                   planner: FetchPlanner = None,
+                   strategy: str = STRATEGY_AUTO) -> Dict[str, Any]:
+    """
+    Run the full read cycle for a single module.
+    
+    Modules larger than one bulk read page are read page by page and the
+    pages are stitched into a single CSV file. With delta_sync only records
+    modified since the last run are exported and merged into the record store.
+    With a planner, modules small enough are read through paged REST calls
+    instead of bulk read.
+    
+    Args:
+        module_name: The module name (e.g., 'Deals')
+        callback_url: URL Zoho should POST to when the job finishes
+        page_concurrency: Maximum number of page jobs of this module in flight
+        delta_sync: Incremental sync state and record store, if enabled
+        field_cache: On-disk field metadata cache, if enabled
+        planner: Chooses between REST and bulk read, if enabled
+        strategy: 'auto' to let the planner decide, or 'rest' / 'bulk'
+        
+    Returns:
+        Dict[str, Any]: Per-module result with module, status, strategy, job_id,
+            file_path, pages, record_count, sync, elapsed (seconds) and error
+    """
+    started = time.monotonic()
+    result = {
+        'module': module_name,
+        'status': 'FAILED',
+        'strategy': None,
+        'job_id': None,
+        'file_path': None,
+        'pages': 0,
+        'record_count': 0,
+        'sync': None,
+        'elapsed': 0.0,
+        'error': None
+    }
+    
     try:
-        # Initialize the SDK
-        initialize_sdk()
-        
-        # Define modules to process
-        modules = ['Deals', 'Accounts', 'Contacts', 'Leads']
-        
-        # Process each module
-        for module_name in modules:
-            try:
-                logger.info(f"Processing {module_name} module...")
-                
-                # Get available fields for the module
-                fields = get_module_fields(module_name)
-                
-                # Submit bulk read job
-                logger.info(f"Submitting bulk read job for {module_name} module...")
-                job_id = submit_bulk_read_job(module_name, fields)
-                
-                # Wait for job completion and download results
-                if job_id:
+        logger.info(f"Processing {module_name} module...")
+        
+        # Get available fields for the module
+        fields = get_module_fields(module_name, field_cache)
+        
+        # Only export records changed since the last sync when possible
+        plan = delta_sync.plan(module_name) if delta_sync else {'mode': 'full', 'criteria': None}
+        if plan['criteria']:
+            logger.info(f"Exporting {module_name} records modified since {plan['since']}")
+        
+        def read_bulk(criteria: Dict[str, Any]) -> Dict[str, Any]:
+            """Read every bulk read page of the module and stitch them"""
+            def read_page(page: int) -> Dict[str, Any]:
+                """Submit, wait for and download one page of the module"""
+                # Hold a bulk job slot until the result is on disk
+                with get_scheduler().bulk_job():
+                    logger.info(f"Submitting bulk read job for {module_name} module (page {page})...")
+                    job_id = submit_bulk_read_job(module_name, fields, callback_url, page, criteria)
+                    if page == 1:
+                        result['job_id'] = job_id
+                    
                     logger.info(f"Waiting for job {job_id} to complete...")
                     wait_for_job_completion(job_id)
-                    download_results(job_id)
                     
-            except Exception as e:
-                logger.error(f"Error processing {module_name} module: {str(e)}", exc_info=True)
-                continue
+                    return {
+                        'page': page,
+                        'job_id': job_id,
+                        **get_job_result(job_id),
+                        'file_path': download_results(job_id)
+                    }
+            
+            # Read every page; the record count is only needed once page 1 has more
+            pages = read_all_pages(
+                read_page,
+                max_concurrency=page_concurrency,
+                count_records=lambda: get_module_record_count(module_name)
+            )
+            return stitch_pages(pages)
+        
+        if planner:
+            stored_count = delta_sync.state.get(module_name).get('record_count') if delta_sync else None
+            fetched = planner.fetch(
+                module_name,
+                lambda criteria: rest_read_module(module_name, fields, criteria),
+                read_bulk,
+                criteria=plan['criteria'],
+                stored_count=stored_count,
+                strategy=strategy
+            )
+        else:
+            fetched = {**read_bulk(plan['criteria']), 'strategy': STRATEGY_BULK}
+        
+        # Catalog the result so scripts find it by module, then check its header from the entry
+        entry = BulkCatalog(DATA_DIR).register(fetched['file_path'], module_name, fetched.get('job_ids'),
+                                               record_count=fetched['record_count'],
+                                               complete=plan['criteria'] is None, source=fetched['strategy'])
+        
+        # A header the cache does not know means the schema changed in Zoho
+        if field_cache:
+            field_cache.validate_header(module_name, entry['fields'])
+        
+        result['strategy'] = fetched['strategy']
+        result['file_path'] = fetched['file_path']
+        result['pages'] = fetched['pages']
+        result['record_count'] = fetched['record_count']
+        
+        if delta_sync:
+            result['sync'] = delta_sync.apply(module_name, plan['mode'], fetched['file_path'])
+        result['status'] = 'COMPLETED'
+            
+    except Exception as e:
+        logger.error(f"Error processing {module_name} module: {str(e)}", exc_info=True)
+        result['error'] = str(e)
+        
+    result['elapsed'] = round(time.monotonic() - started, 2)
+    return result
+
+def run_sequential(modules: List[str], callback_url: str = None,
+                   page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+                   delta_sync: DeltaSync = None,
+                   field_cache: FieldMetadataCache = None,
+                   planner: FetchPlanner = None,
+                   strategy: str = STRATEGY_AUTO) -> List[Dict[str, Any]]:
+    """
+    Process modules one after another.
+    
+    Args:
+        modules: Module names to process
+        callback_url: URL Zoho should POST to when a job finishes
+        page_concurrency: Maximum number of page jobs per module in flight
+        delta_sync: Incremental sync state and record store, if enabled
+        field_cache: On-disk field metadata cache, if enabled
+        planner: Chooses between REST and bulk read, if enabled
+        strategy: 'auto' to let the planner decide, or 'rest' / 'bulk'
+        
+    Returns:
+        List[Dict[str, Any]]: Per-module results in processing order
+    """
+    return [
+        process_module(module_name, callback_url, page_concurrency, delta_sync, field_cache, planner, strategy)
+        for module_name in modules
+    ]
+
+def run_pipelined(modules: List[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                  callback_url: str = None,
+                  page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+                  delta_sync: DeltaSync = None,
+                  field_cache: FieldMetadataCache = None,
+                  planner: FetchPlanner = None,
+                  strategy: str = STRATEGY_AUTO) -> List[Dict[str, Any]]:
+    """
+    Process modules concurrently.
+    
+    Up to ``max_concurrency`` jobs are submitted at once and polled in parallel;
+    each result is downloaded and extracted as soon as its own job completes, so
+    the total run time follows the slowest job instead of the sum of all jobs.
+    
+    Args:
+        modules: Module names to process
+        max_concurrency: Maximum number of bulk read jobs in flight
+        callback_url: URL Zoho should POST to when a job finishes
+        page_concurrency: Maximum number of page jobs per module in flight
+        delta_sync: Incremental sync state and record store, if enabled
+        field_cache: On-disk field metadata cache, if enabled
+        planner: Chooses between REST and bulk read, if enabled
+        strategy: 'auto' to let the planner decide, or 'rest' / 'bulk'
+        
+    Returns:
+        List[Dict[str, Any]]: Per-module results in completion order
+    """
+    max_workers = max(1, min(max_concurrency, len(modules)))
+    logger.info(f"Running pipelined bulk fetch for {len(modules)} modules "
+                f"(max concurrency: {max_workers})")
+    
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bulk_fetch') as executor:
+        futures = {
+            executor.submit(copy_context().run, process_module, module_name, callback_url,
+                            page_concurrency, delta_sync, field_cache, planner, strategy): module_name
+            for module_name in modules
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            logger.info(f"{result['module']}: {result['status']} in {result['elapsed']}s")
+            results.append(result)
+            
+    return results
+
+def log_summary(results: List[Dict[str, Any]], elapsed: float, usage: Dict[str, Any] = None) -> None:
+    """Log a per-module summary of a bulk fetch run and the API credits it used"""
+    logger.info(f"Bulk fetch finished in {elapsed:.2f}s")
+    if usage:
+        logger.info(f"  API credits used: {usage['credits']} in {usage['total_calls']} calls "
+                    f"(waited {usage['wait_seconds']}s, throttled {usage['throttled']}x)")
+    for result in results:
+        if result['status'] == 'COMPLETED':
+            source = f"job {result['job_id']}" if result['strategy'] == STRATEGY_BULK else 'REST'
+            logger.info(f"  {result['module']}: {source} -> {result['file_path']} "
+                        f"({result['record_count']} records in {result['pages']} pages, {result['elapsed']}s)")
+            if result['sync']:
+                sync = result['sync']
+                logger.info(f"    {sync['mode']} sync: {sync['inserted']} inserted, {sync['updated']} updated, "
+                            f"{sync['deleted']} deleted, {sync['total']} stored")
+        else:
+            logger.error(f"  {result['module']}: {result['status']} after {result['elapsed']}s "
+                         f"({result['error']})")
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Bulk fetch modules from Zoho CRM')
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES,
+                        help='Modules to fetch (default: %(default)s)')
+    parser.add_argument('--sequential', action='store_true',
+                        help='Process modules one after another instead of pipelining them')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Maximum number of bulk read jobs in flight (default: %(default)s)')
+    parser.add_argument('--page-concurrency', type=int, default=DEFAULT_PAGE_CONCURRENCY,
+                        help='Maximum number of page jobs per module in flight (default: %(default)s)')
+    parser.add_argument('--max-bulk-jobs', type=int, default=DEFAULT_MAX_BULK_JOBS,
+                        help='Maximum number of bulk jobs in flight across all modules (default: %(default)s)')
+    parser.add_argument('--daily-credits', type=int,
+                        default=int(os.getenv('ZOHO_DAILY_CREDITS', DEFAULT_DAILY_CREDITS)),
+                        help="Org's API credits per 24 hours (default: %(default)s)")
+    parser.add_argument('--priority', choices=sorted(PRIORITIES), default='background',
+                        help='API priority class of this run (default: %(default)s)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only export records modified since the last run and merge them '
+                             'into the local record store')
+    parser.add_argument('--full-sync-interval', type=int, default=7,
+                        help='Days between full syncs that drop deleted records (default: %(default)s)')
+    parser.add_argument('--field-cache-ttl', type=int, default=DEFAULT_TTL_SECONDS // 3600,
+                        help='Hours cached field metadata stays valid (default: %(default)s)')
+    parser.add_argument('--refresh-fields', action='store_true',
+                        help='Discard cached field metadata and fetch it again')
+    parser.add_argument('--strategy', choices=STRATEGIES, default=STRATEGY_AUTO,
+                        help='Read small modules through paged REST calls and large ones through '
+                             'bulk read (auto), or force one (default: %(default)s)')
+    parser.add_argument('--callback-url', default=os.getenv('ZOHO_BULK_CALLBACK_URL'),
+                        help='Public URL forwarded to the local callback receiver; '
+                             'jobs are only polled when unset')
+    parser.add_argument('--callback-port', type=int, default=8765,
+                        help='Port for the local callback receiver (default: %(default)s)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main function to execute bulk fetch operations"""
+    try:
+        load_dotenv()
+        args = parse_args(argv)
+        
+        # Initialize the SDK once and share one HTTP session across workers
+        get_registry().initialize_sdk(initializer=initialize_sdk)
+        
+        # Keep every Zoho call within the org's credit and concurrency limits
+        scheduler = configure_scheduler(args.daily_credits, max_bulk_jobs=args.max_bulk_jobs)
+        
+        # Receive completion callbacks instead of relying on polling alone
+        callback_server = None
+        if args.callback_url:
+            callback_server = start_callback_server(port=args.callback_port)
+        
+        # Keep a local copy of each module up to date from deltas
+        delta_sync = None
+        if args.incremental:
+            delta_sync = DeltaSync(
+                SyncState(DATA_DIR / 'sync_state.json'),
+                RecordStore(DATA_DIR / 'records'),
+                args.full_sync_interval
+            )
+        
+        # Reuse field metadata across runs instead of fetching it every time
+        field_cache = FieldMetadataCache(DATA_DIR / 'field_cache', args.field_cache_ttl * 3600)
+        if args.refresh_fields:
+            field_cache.invalidate()
+        
+        # Pick REST or bulk read per module from its size and measured latencies
+        planner = FetchPlanner(FetchStats(DATA_DIR / 'fetch_stats.json'), get_module_record_count)
+        
+        try:
+            started = time.monotonic()
+            with scheduler.track('Bulk fetch', PRIORITIES[args.priority]) as usage:
+                if args.sequential:
+                    results = run_sequential(args.modules, args.callback_url, args.page_concurrency,
+                                             delta_sync, field_cache, planner, args.strategy)
+                else:
+                    results = run_pipelined(args.modules, args.max_concurrency, args.callback_url,
+                                            args.page_concurrency, delta_sync, field_cache, planner,
+                                            args.strategy)
+            log_summary(results, time.monotonic() - started, usage.summary())
+        finally:
+            if callback_server:
+                callback_server.shutdown()
+        
+        return results
             
     except Exception as e:
         logger.error(f"Error in main function: {str(e)}", exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
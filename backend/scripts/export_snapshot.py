@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Export the current dashboard snapshot as JSON
+
+Snapshots are the storage format of refreshed data; JSON is only written on
+request, e.g. for debugging or for tools that cannot read snapshots.
+
+Usage:
+    python scripts/export_snapshot.py data/current.snapshot current-data.json --tables deals accounts
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.services.snapshot import TABLES, export_json
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a dashboard snapshot as JSON')
+    parser.add_argument('snapshot', nargs='?', default='data/current.snapshot',
+                        help='Snapshot file (default: %(default)s)')
+    parser.add_argument('output', nargs='?', default='current-data.json',
+                        help='JSON file to write (default: %(default)s)')
+    parser.add_argument('--tables', nargs='*', default=[], choices=sorted(TABLES),
+                        help='Record tables to include row by row')
+    args = parser.parse_args()
+
+    export_json(args.snapshot, args.output, args.tables)
+    print(f'Exported {args.snapshot} to {args.output}')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
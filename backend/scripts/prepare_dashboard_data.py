@@ -3,11 +3,26 @@ Dashboard Data Preparation Script
 Processes raw CSV data and prepares it for dashboard visualization
 """
 
+import os
+import sys
 import pandas as pd
 import json
 from pathlib import Path
 from datetime import datetime
 
+# Add the backend directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.zoho.bulk_catalog import BulkCatalog
+from app.core.zoho.chunked_transform import DEFAULT_MEMORY_BUDGET_MB, AccountPartial, DealPartial, aggregate_csv
+
+def with_unknown(counts, total):
+    """Count records without a value as 'Unknown'"""
+    missing = total - sum(counts.values())
+    if missing:
+        counts = {**counts, 'Unknown': counts.get('Unknown', 0) + missing}
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
 class DataTransformer:
     """Transforms raw Zoho CRM data into the required format"""
     
@@ -17,43 +32,31 @@ class DataTransformer:
         Transform deals data for dashboard
         
         Args:
-            deals_data (list): Raw deals data from Zoho
+            deals_data: Deal aggregates from aggregate_csv, or raw deals
+                data from Zoho as a DataFrame
             
         Returns:
             dict: Transformed data with various metrics
         """
         try:
-            # Convert to DataFrame for easier manipulation
-            df = pd.DataFrame(deals_data)
-            
-            # Calculate basic metrics
-            total_deals = len(df)
-            total_value = df['Amount'].fillna(0).sum()
-            avg_deal_size = total_value / total_deals if total_deals > 0 else 0
-            
-            # Deal stages analysis
-            stage_distribution = df['Stage'].value_counts().to_dict()
-            
-            # Monthly trends
-            df['Closing_Date'] = pd.to_datetime(df['Closing_Date'])
-            monthly_deals = df.groupby(df['Closing_Date'].dt.strftime('%Y-%m'))[['Amount']].agg({
-                'Amount': 'sum',
-                'count': 'size'
-            }).to_dict('index')
-            
-            # Win rate calculation
-            won_deals = len(df[df['Stage'] == 'Closed Won'])
-            win_rate = (won_deals / total_deals * 100) if total_deals > 0 else 0
+            if isinstance(deals_data, DealPartial):
+                partial = deals_data
+            else:
+                partial = DealPartial.from_frame(pd.DataFrame(deals_data).reindex(columns=DealPartial.COLUMNS))
+            metrics = partial.metrics()
             
             return {
                 'metrics': {
-                    'total_deals': total_deals,
-                    'total_value': total_value,
-                    'avg_deal_size': avg_deal_size,
-                    'win_rate': win_rate
+                    'total_deals': metrics['total_deals'],
+                    'total_value': metrics['total_value'],
+                    'avg_deal_size': metrics['avg_deal_size'],
+                    'win_rate': metrics['win_rate']
                 },
-                'stage_distribution': stage_distribution,
-                'monthly_trends': monthly_deals
+                'stage_distribution': metrics['stages'],
+                'monthly_trends': {
+                    month: {'Amount': amount, 'count': count}
+                    for month, (count, amount) in sorted(partial.months.items())
+                }
             }
             
         except Exception as e:
@@ -66,24 +69,24 @@ class DataTransformer:
         Transform accounts data for dashboard
         
         Args:
-            accounts_data (list): Raw accounts data from Zoho
+            accounts_data: Account aggregates from aggregate_csv, or raw
+                accounts data from Zoho as a DataFrame
             
         Returns:
             dict: Transformed accounts data
         """
         try:
-            df = pd.DataFrame(accounts_data)
-            
-            # Industry distribution
-            industry_distribution = df['Industry'].fillna('Unknown').value_counts().to_dict()
-            
-            # Account types
-            account_types = df['Account_Type'].fillna('Unknown').value_counts().to_dict()
+            if isinstance(accounts_data, AccountPartial):
+                partial = accounts_data
+            else:
+                partial = AccountPartial.from_frame(
+                    pd.DataFrame(accounts_data).reindex(columns=AccountPartial.COLUMNS))
+            metrics = partial.metrics()
             
             return {
-                'industry_distribution': industry_distribution,
-                'account_types': account_types,
-                'total_accounts': len(df)
+                'industry_distribution': with_unknown(metrics['industry_distribution'], partial.total_accounts),
+                'account_types': with_unknown(metrics['account_types'], partial.total_accounts),
+                'total_accounts': partial.total_accounts
             }
             
         except Exception as e:
@@ -108,9 +111,16 @@ class DataTransformer:
             'last_updated': datetime.utcnow().isoformat()
         }
 
-def load_csv_data(file_path):
-    """Load data from CSV file"""
-    return pd.read_csv(file_path).to_dict('records')
+def load_csv_data(file_path, module, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    """Aggregate a module's CSV file chunk by chunk within a memory budget"""
+    return aggregate_csv(file_path, module, memory_budget_mb=memory_budget_mb)
+
+def latest_result(catalog, module):
+    """Get the catalog entry of the latest complete bulk read result of a module"""
+    entry = catalog.latest(module)
+    if entry is None:
+        raise FileNotFoundError(f'No complete {module} export in {catalog.path}; run scripts/bulk_fetch.py first')
+    return entry
 
 def save_dashboard_data(data, output_path):
     """Save transformed data to JSON file"""
@@ -123,10 +133,13 @@ def main():
     output_dir = Path('backend/data/dashboard')
     output_dir.mkdir(exist_ok=True)
     
-    # Load data from CSV files
-    deals_data = load_csv_data(data_dir / 'bulk_read_495490000013193038.csv')
-    accounts_data = load_csv_data(data_dir / 'bulk_read_495490000013192045.csv')
-    contacts_data = load_csv_data(data_dir / 'bulk_read_495490000013190027.csv')
+    # Pick the latest exports from the bulk catalog and stream them; contacts are only
+    # counted, which the catalog already has
+    catalog = BulkCatalog(data_dir)
+    memory_budget_mb = float(os.getenv('TRANSFORM_MEMORY_BUDGET_MB', DEFAULT_MEMORY_BUDGET_MB))
+    deals_data = load_csv_data(latest_result(catalog, 'Deals')['file_path'], 'Deals', memory_budget_mb)
+    accounts_data = load_csv_data(latest_result(catalog, 'Accounts')['file_path'], 'Accounts', memory_budget_mb)
+    total_contacts = latest_result(catalog, 'Contacts')['record_count']
     
     # Transform data
     transformer = DataTransformer()
@@ -142,7 +155,7 @@ def main():
     
     # Add contacts summary
     dashboard_data['contacts'] = {
-        'total_contacts': len(contacts_data),
+        'total_contacts': total_contacts,
         'last_updated': datetime.utcnow().isoformat()
     }
     
@@ -157,7 +170,7 @@ def main():
     print(f"Total Value: ${deals_metrics['metrics']['total_value']:,.2f}")
     print(f"Win Rate: {deals_metrics['metrics']['win_rate']:.1f}%")
     print(f"Total Accounts: {accounts_metrics['total_accounts']}")
-    print(f"Total Contacts: {len(contacts_data)}")
+    print(f"Total Contacts: {total_contacts}")
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
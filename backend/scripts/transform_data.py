@@ -5,7 +5,7 @@ Script to transform Zoho CRM bulk read CSV data using the DataTransformer
 
 import sys
 import os
-import pandas as pd
+import argparse
 from datetime import datetime
 import json
 import logging
@@ -18,53 +18,71 @@ logger = logging.getLogger(__name__)
 try:
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
     sys.path.insert(0, project_root)
+    # The app package imports itself as 'app', so the backend directory must be on the path too
+    sys.path.insert(0, os.path.join(project_root, 'backend'))
     logger.info(f"Added project root to Python path: {project_root}")
     
-    from backend.app.core.zoho.transformers import DataTransformer
-    logger.info("Successfully imported DataTransformer")
+    from app.core.zoho.transformers import DEFAULT_CURRENCY
+    from app.core.zoho.bulk_catalog import BulkCatalog
+    from app.core.zoho.field_cache import DEFAULT_TTL_SECONDS, FieldMetadataCache
+    from app.core.zoho.chunked_transform import DEFAULT_MEMORY_BUDGET_MB, aggregate_csv
+    logger.info("Successfully imported the chunked transform")
 except Exception as e:
     logger.error(f"Failed to set up environment: {str(e)}")
     sys.exit(1)
 
-def transform_csv_data(csv_path):
+# Directory bulk read results and their catalog are saved to
+DATA_DIR = os.path.join(project_root, 'backend', 'data')
+
+def transform_csv_data(csv_path, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, module=None):
     """
     Transform data from a Zoho CRM bulk read CSV file
     
+    The file is streamed in chunks sized to the memory budget, so exports
+    of any size fit on small workers.
+    
     Args:
         csv_path (str): Path to the CSV file
+        memory_budget_mb (float): Memory the transform may use, in MB
+        module (str, optional): Module of the file; looked up in the bulk
+            catalog next to it when not given
         
     Returns:
         dict: Transformed data
     """
     try:
-        # Read the CSV file
-        logger.info(f"Reading CSV file: {csv_path}")
-        df = pd.read_csv(csv_path)
-        logger.info(f"Found {len(df)} records")
-        
-        # Show sample of columns
-        logger.info(f"Columns in CSV: {', '.join(df.columns)}")
+        # Result files are named by job id; the catalog written when they landed knows their module
+        if module is None:
+            entry = BulkCatalog(os.path.dirname(os.path.abspath(csv_path))).get(csv_path)
+            if entry is None:
+                raise ValueError(f"{os.path.basename(csv_path)} is not in the bulk catalog; pass --module")
+            module = entry['module']
+        if module not in ('Deals', 'Accounts'):
+            raise ValueError(f"Cannot transform {module} records")
         
-        # Convert DataFrame to list of dictionaries (format expected by transformer)
-        records = df.to_dict('records')
+        # Stream the CSV file, typing columns from the cached field metadata if any
+        logger.info(f"Reading CSV file: {csv_path} within {memory_budget_mb} MB")
+        field_cache = FieldMetadataCache(os.path.join(project_root, 'backend', 'data', 'field_cache'),
+                                         DEFAULT_TTL_SECONDS)
+        metadata = field_cache.get(module)
+        partial = aggregate_csv(csv_path, module, metadata['fields'] if metadata else None, memory_budget_mb)
         
-        # Get module type from filename
-        filename = os.path.basename(csv_path)
-        if 'Deals' in filename:
+        if module == 'Deals':
             logger.info("Processing as Deals module")
             module_type = 'deals'
-            transformed_data = DataTransformer.transform_deals(records)
-        elif 'Accounts' in filename:
+            record_count = partial.total_deals
+            transformed_data = {**partial.metrics(), 'currency': DEFAULT_CURRENCY}
+        else:
             logger.info("Processing as Accounts module")
             module_type = 'accounts'
-            transformed_data = DataTransformer.transform_accounts(records)
-        else:
-            raise ValueError(f"Could not determine module type from filename: {filename}")
+            record_count = partial.total_accounts
+            transformed_data = partial.metrics()
+        logger.info(f"Found {record_count} records")
             
         # Add metadata
         result = {
             'module': module_type,
-            'record_count': len(records),
+            'record_count': record_count,
             'transformed_at': datetime.now().isoformat(),
             'data': transformed_data
         }
@@ -77,18 +95,31 @@ def transform_csv_data(csv_path):
 
 def main():
     try:
-        if len(sys.argv) != 2:
-            logger.error("Usage: python transform_data.py <path_to_csv>")
-            sys.exit(1)
+        parser = argparse.ArgumentParser(description='Transform a Zoho CRM bulk read CSV file')
+        parser.add_argument('csv_path', nargs='?',
+                            help='Path to the CSV file (default: the latest complete file of --module in the catalog)')
+        parser.add_argument('--module', choices=['Deals', 'Accounts'],
+                            help='Module of the file, for files the bulk catalog does not list')
+        parser.add_argument('--memory-budget-mb', type=float,
+                            default=float(os.getenv('TRANSFORM_MEMORY_BUDGET_MB', DEFAULT_MEMORY_BUDGET_MB)),
+                            help='Memory the transform may use (default: $TRANSFORM_MEMORY_BUDGET_MB or '
+                                 f'{DEFAULT_MEMORY_BUDGET_MB})')
+        args = parser.parse_args()
             
-        csv_path = sys.argv[1]
+        csv_path = args.csv_path
+        if csv_path is None:
+            entry = BulkCatalog(DATA_DIR).latest(args.module) if args.module else None
+            if entry is None:
+                logger.error("Error: Give a CSV file, or a --module with a complete file in the bulk catalog")
+                sys.exit(1)
+            csv_path = entry['file_path']
         logger.info(f"Processing file: {csv_path}")
         
         if not os.path.exists(csv_path):
             logger.error(f"Error: File not found: {csv_path}")
             sys.exit(1)
             
-        result = transform_csv_data(csv_path)
+        result = transform_csv_data(csv_path, args.memory_budget_mb, args.module)
         if result:
             # Print formatted JSON output
             print(json.dumps(result, indent=2))
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Zoho CRM stand-in server for ingestion load testing.
+
+Serves synthetic modules through the Zoho CRM v8 endpoints the ingestion path
+uses: bulk read create/status/download, fields metadata, org and currencies,
+record listing and record counts, plus the OAuth token endpoint. Bulk jobs
+complete after a configurable latency and POST to their callback URL;
+throttling can be injected at random or as a requests-per-minute cap.
+
+Usage:
+    python scripts/zoho_stub_server.py --module Deals=1000000 --module Accounts=50000 \\
+        --job-latency 5 --throttle-rate 0.02
+    ZOHO_API_BASE_URL=http://localhost:8766 python scripts/bulk_fetch.py
+"""
+
+import csv
+import math
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+import zipfile
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import requests
+from flask import Flask, Response, jsonify, request, send_file
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('zoho_stub_server')
+
+# Records per bulk read page and per REST page, as in Zoho CRM
+BULK_PAGE_SIZE = 200000
+REST_PAGE_SIZE = 200
+
+# Field types REST responses return as {'name', 'id'} objects
+LOOKUP_TYPES = ('lookup', 'ownerlookup')
+LOOKUP_ID_BASE = 4876876000100000000
+
+# Default port, chosen next to the bulk callback receiver's
+DEFAULT_PORT = 8766
+
+# Time zone synthetic timestamps are written in (IST, like the org)
+ORG_TIMEZONE = timezone(timedelta(hours=5, minutes=30))
+
+# Synthetic records are spread over this many days before server start
+HISTORY_DAYS = 365
+
+REGIONS = ['India', 'ASEAN', 'ANZ', 'Middle East', 'Africa']
+STAGES = ['Qualification', 'Needs Analysis', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
+STAGE_PROBABILITY = {'Qualification': 10, 'Needs Analysis': 20, 'Proposal': 50, 'Negotiation': 75,
+                     'Closed Won': 100, 'Closed Lost': 0}
+DEAL_TYPES = ['EN - POC', 'EN - MAP', 'NN - GenAI', 'NN - Migration', 'Existing Business']
+CURRENCIES = [('INR', '₹', 'Indian Rupee', 1.0), ('USD', '$', 'US Dollar', 83.2),
+              ('SGD', 'S$', 'Singapore Dollar', 61.5), ('AUD', 'A$', 'Australian Dollar', 54.8)]
+INDUSTRIES = ['Banking', 'Retail', 'Healthcare', 'Manufacturing', 'Telecom', 'Public Sector']
+ACCOUNT_TYPES = ['Customer', 'Prospect', 'Partner', 'Reseller']
+OWNERS = ['Asha Rao', 'Vikram Shah', 'Mei Tan', 'Liam Brown', 'Omar Haddad', 'Grace Mensah']
+
+def _pick(values: List[Any], i: int, salt: int = 0) -> Any:
+    """Pick a value deterministically for a row"""
+    return values[(i * 2654435761 + salt) % len(values)]
+
+def _format_time(value: datetime) -> str:
+    return value.astimezone(ORG_TIMEZONE).isoformat(timespec='seconds')
+
+# Field generators per module: api_name -> (data_type, value for row i of module m)
+MODULE_FIELDS: Dict[str, Dict[str, Tuple[str, Callable[['SyntheticModule', int], Any]]]] = {
+    'Deals': {
+        'Deal_Name': ('text', lambda m, i: f'Deal {i}'),
+        'Account_Name': ('lookup', lambda m, i: f'Account {(i * 7) % 50000}'),
+        'Stage': ('picklist', lambda m, i: _pick(STAGES, i, 1)),
+        'Amount': ('currency', lambda m, i: round(5000 + (i * 7919) % 995000, 2)),
+        'Probability': ('integer', lambda m, i: STAGE_PROBABILITY[_pick(STAGES, i, 1)]),
+        'Closing_Date': ('date', lambda m, i: (m.start_time + timedelta(days=(i * 13) % 540)).date().isoformat()),
+        'Type': ('picklist', lambda m, i: _pick(DEAL_TYPES, i, 2)),
+        'Region': ('picklist', lambda m, i: _pick(REGIONS, i, 3)),
+        'Owner': ('ownerlookup', lambda m, i: _pick(OWNERS, i, 4)),
+        'Currency': ('picklist', lambda m, i: _pick(CURRENCIES, i, 5)[0]),
+        'Exchange_Rate': ('double', lambda m, i: _pick(CURRENCIES, i, 5)[3]),
+        'Lead_Source': ('picklist', lambda m, i: _pick(['Web', 'Partner', 'Event', 'Referral'], i, 6)),
+        'Created_Time': ('datetime', lambda m, i: _format_time(m.start_time + timedelta(days=(i * 3) % 60))),
+        'Modified_Time': ('datetime', lambda m, i: _format_time(m.modified_time(i)))
+    },
+    'Accounts': {
+        'Account_Name': ('text', lambda m, i: f'Account {i}'),
+        'Account_Type': ('picklist', lambda m, i: _pick(ACCOUNT_TYPES, i, 1)),
+        'Industry': ('picklist', lambda m, i: _pick(INDUSTRIES, i, 2)),
+        'Billing_Country': ('text', lambda m, i: _pick(REGIONS, i, 3)),
+        'Billing_State': ('text', lambda m, i: f'State {i % 30}'),
+        'Phone': ('phone', lambda m, i: f'+91 98{i % 100000000:08d}'),
+        'Website': ('website', lambda m, i: f'https://account{i}.example.com'),
+        'Owner': ('ownerlookup', lambda m, i: _pick(OWNERS, i, 4)),
+        'Created_Time': ('datetime', lambda m, i: _format_time(m.start_time)),
+        'Modified_Time': ('datetime', lambda m, i: _format_time(m.modified_time(i)))
+    },
+    'Contacts': {
+        'First_Name': ('text', lambda m, i: f'First{i}'),
+        'Last_Name': ('text', lambda m, i: f'Last{i}'),
+        'Email': ('email', lambda m, i: f'contact{i}@example.com'),
+        'Account_Name': ('lookup', lambda m, i: f'Account {(i * 3) % 50000}'),
+        'Owner': ('ownerlookup', lambda m, i: _pick(OWNERS, i, 4)),
+        'Created_Time': ('datetime', lambda m, i: _format_time(m.start_time)),
+        'Modified_Time': ('datetime', lambda m, i: _format_time(m.modified_time(i)))
+    }
+}
+
+# Fields of modules without a template
+GENERIC_FIELDS = {
+    'Name': ('text', lambda m, i: f'{m.name} {i}'),
+    'Owner': ('ownerlookup', lambda m, i: _pick(OWNERS, i, 4)),
+    'Created_Time': ('datetime', lambda m, i: _format_time(m.start_time)),
+    'Modified_Time': ('datetime', lambda m, i: _format_time(m.modified_time(i)))
+}
+
+class SyntheticModule:
+    """Deterministic synthetic records of one module
+
+    Row i always has the same values, and Modified_Time grows with i, so
+    records modified since a point in time are a suffix of the rows.
+    """
+
+    def __init__(self, name: str, rows: int, start_time: datetime, id_base: int):
+        self.name = name
+        self.rows = rows
+        self.start_time = start_time
+        self.id_base = id_base
+        self.fields = MODULE_FIELDS.get(name, GENERIC_FIELDS)
+        self.modified_step = max(1.0, HISTORY_DAYS * 86400 / max(rows, 1))
+
+    def modified_time(self, i: int) -> datetime:
+        """Modified_Time of row i"""
+        return self.start_time + timedelta(seconds=i * self.modified_step)
+
+    def first_row_since(self, value: str, inclusive: bool = True) -> int:
+        """Index of the first row modified at or after (or strictly after) a time"""
+        since = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=ORG_TIMEZONE)
+        offset = (since - self.start_time).total_seconds() / self.modified_step
+        first = math.ceil(offset) if inclusive else math.floor(offset) + 1
+        return min(max(first, 0), self.rows)
+
+    def field_metadata(self) -> List[Dict[str, Any]]:
+        """Fields metadata in the shape of GET /settings/fields"""
+        return [
+            {
+                'id': str(self.id_base + 900000 + index),
+                'api_name': api_name,
+                'field_label': api_name.replace('_', ' '),
+                'data_type': data_type,
+                'json_type': 'string',
+                'read_only': api_name in ('Created_Time', 'Modified_Time'),
+                'system_mandatory': api_name in ('Deal_Name', 'Account_Name', 'Last_Name', 'Name'),
+                'custom_field': api_name in ('Region',),
+                'visible': True
+            }
+            for index, (api_name, (data_type, _)) in enumerate(self.fields.items())
+        ]
+
+    def record(self, i: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Record i with the given fields (all by default), as the REST API returns it"""
+        record = {'id': str(self.id_base + i)}
+        for api_name in fields or self.fields:
+            if api_name in self.fields:
+                data_type, generate = self.fields[api_name]
+                value = generate(self, i)
+                # REST responses nest lookups as objects, bulk read CSVs flatten them
+                if data_type in LOOKUP_TYPES:
+                    value = {'name': value, 'id': str(LOOKUP_ID_BASE + zlib.crc32(value.encode('utf-8')) % 1000000)}
+                record[api_name] = value
+        return record
+
+    def write_csv(self, path: Path, fields: List[str], start: int, stop: int) -> int:
+        """Write rows [start, stop) as a bulk read CSV and return the row count"""
+        columns = ['id'] + [f for f in fields if f in self.fields and f != 'id']
+        generators = [self.fields[f][1] for f in columns[1:]]
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for i in range(start, stop):
+                writer.writerow([self.id_base + i] + [generate(self, i) for generate in generators])
+        return max(stop - start, 0)
+
+class Throttle:
+    """Injects HTTP 429 responses at random and above a requests-per-minute cap"""
+
+    def __init__(self, rate: float = 0.0, requests_per_minute: int = 0, retry_after: int = 5):
+        self.rate = rate
+        self.requests_per_minute = requests_per_minute
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.throttled = 0
+
+    def check(self) -> Optional[int]:
+        """Get the Retry-After delay if this request should be throttled"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+
+            if self.requests_per_minute and self._window_count > self.requests_per_minute:
+                self.throttled += 1
+                return max(1, int(60 - (now - self._window_start)))
+            if self.rate and random.random() < self.rate:
+                self.throttled += 1
+                return self.retry_after
+        return None
+
+class BulkJobStore:
+    """Bulk read jobs of the stand-in server
+
+    A job's CSV is generated in the background as soon as it is created and the
+    job reports COMPLETED once both the file is ready and its latency elapsed.
+    """
+
+    def __init__(self, modules: Dict[str, SyntheticModule], data_dir: Path,
+                 job_latency: float = 2.0, rows_per_second: float = 0):
+        self.modules = modules
+        self.data_dir = data_dir
+        self.job_latency = job_latency
+        self.rows_per_second = rows_per_second
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._ids = iter(range(5000000000000, 10 ** 19))
+
+    def create(self, module: str, fields: List[str], page: int = 1,
+               criteria: Optional[Dict[str, Any]] = None, callback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create a job and start generating its result"""
+        synthetic = self.modules[module]
+        first = 0
+        if criteria:
+            first = self._first_matching_row(synthetic, criteria)
+
+        start = first + (page - 1) * BULK_PAGE_SIZE
+        stop = min(start + BULK_PAGE_SIZE, synthetic.rows)
+        latency = self.job_latency + (max(stop - start, 0) / self.rows_per_second if self.rows_per_second else 0)
+
+        with self._lock:
+            job_id = str(next(self._ids))
+            job = {
+                'id': job_id,
+                'module': module,
+                'fields': fields or list(synthetic.fields),
+                'page': page,
+                'criteria': criteria,
+                'callback': callback,
+                'created_time': datetime.now(ORG_TIMEZONE),
+                'ready_at': time.monotonic() + latency,
+                'count': max(stop - start, 0),
+                'more_records': stop < synthetic.rows,
+                'zip_path': None,
+                'error': None
+            }
+            self._jobs[job_id] = job
+
+        threading.Thread(target=self._build, args=(job, start, stop), daemon=True).start()
+        return job
+
+    @staticmethod
+    def _first_matching_row(synthetic: SyntheticModule, criteria: Dict[str, Any]) -> int:
+        """Apply a Modified_Time / Created_Time lower bound; other criteria are ignored"""
+        api_name = (criteria.get('field') or {}).get('api_name')
+        comparator = criteria.get('comparator')
+        if api_name == 'Modified_Time' and comparator in ('greater_equal', 'greater_than'):
+            return synthetic.first_row_since(criteria['value'], inclusive=comparator == 'greater_equal')
+        logger.warning(f'Ignoring unsupported criteria {criteria}')
+        return 0
+
+    def _build(self, job: Dict[str, Any], start: int, stop: int) -> None:
+        """Generate and zip a job's CSV, then fire its callback once it is due"""
+        try:
+            csv_path = self.data_dir / f"{job['id']}.csv"
+            zip_path = self.data_dir / f"{job['id']}.zip"
+            started = time.monotonic()
+            self.modules[job['module']].write_csv(csv_path, job['fields'], start, stop)
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_ref:
+                zip_ref.write(csv_path, f"{job['id']}.csv")
+            csv_path.unlink()
+            job['zip_path'] = zip_path
+            logger.info(f"Built job {job['id']} ({job['module']} page {job['page']}, {job['count']} rows) "
+                        f"in {time.monotonic() - started:.2f}s")
+        except Exception as e:
+            logger.error(f"Failed to build job {job['id']}: {str(e)}")
+            job['error'] = str(e)
+
+        delay = job['ready_at'] - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._send_callback(job)
+
+    def _send_callback(self, job: Dict[str, Any]) -> None:
+        callback = job.get('callback') or {}
+        if not callback.get('url'):
+            return
+        try:
+            requests.post(callback['url'], json={'job_id': job['id'], 'state': self.state(job),
+                                                 'operation': 'read'}, timeout=10)
+        except Exception as e:
+            logger.warning(f"Callback for job {job['id']} failed: {str(e)}")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._jobs.get(str(job_id))
+
+    def state(self, job: Dict[str, Any]) -> str:
+        """Current state of a job"""
+        if job['error']:
+            return 'FAILED'
+        if job['zip_path'] and time.monotonic() >= job['ready_at']:
+            return 'COMPLETED'
+        return 'IN PROGRESS'
+
+    def describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job details in the shape of GET /bulk/v8/read/{id}"""
+        state = self.state(job)
+        details = {
+            'id': job['id'],
+            'operation': 'read',
+            'state': state,
+            'query': {
+                'module': {'api_name': job['module']},
+                'fields': job['fields'],
+                'page': job['page'],
+                'criteria': job['criteria']
+            },
+            'created_by': {'id': '1000', 'name': 'Stub User'},
+            'created_time': job['created_time'].isoformat(timespec='seconds'),
+            'file_type': 'csv'
+        }
+        if state == 'COMPLETED':
+            details['result'] = {
+                'page': job['page'],
+                'count': job['count'],
+                'download_url': f"/crm/bulk/v8/read/{job['id']}/result",
+                'per_page': BULK_PAGE_SIZE,
+                'more_records': job['more_records']
+            }
+        return details
+
+def _error(code: str, message: str, status: int):
+    return jsonify({'code': code, 'details': {}, 'message': message, 'status': 'error'}), status
+
+def _no_content(status: int = 204) -> Response:
+    # Zoho sends empty responses without a Content-Type; the SDK only parses typed bodies
+    response = Response(status=status)
+    response.headers.pop('Content-Type', None)
+    return response
+
+def create_stub_app(module_rows: Dict[str, int], data_dir: Optional[Path] = None, job_latency: float = 2.0,
+                    rows_per_second: float = 0, throttle: Optional[Throttle] = None,
+                    base_currency: str = 'INR') -> Flask:
+    """
+    Create the stand-in Flask application
+
+    Args:
+        module_rows (dict): Module name to number of synthetic records
+        data_dir (Path, optional): Directory for generated job results (default: a temp dir)
+        job_latency (float): Seconds before a bulk job completes
+        rows_per_second (float): Extra job latency per exported row (0 disables it)
+        throttle (Throttle, optional): Throttling injected into /crm requests
+        base_currency (str): ISO code of the org's home currency
+
+    Returns:
+        Flask: Stand-in application; its 'ZOHO_STUB' config holds the job store
+    """
+    data_dir = Path(data_dir or tempfile.mkdtemp(prefix='zoho_stub_'))
+    data_dir.mkdir(exist_ok=True, parents=True)
+    start_time = datetime.now(ORG_TIMEZONE).replace(microsecond=0) - timedelta(days=HISTORY_DAYS)
+    modules = {
+        name: SyntheticModule(name, rows, start_time, id_base=4876876000000000000 + index * 10 ** 12)
+        for index, (name, rows) in enumerate(module_rows.items())
+    }
+    jobs = BulkJobStore(modules, data_dir, job_latency, rows_per_second)
+    throttle = throttle or Throttle()
+
+    app = Flask(__name__)
+    app.config['ZOHO_STUB'] = {'modules': modules, 'jobs': jobs, 'throttle': throttle}
+
+    def get_module(name):
+        return modules.get(name)
+
+    @app.before_request
+    def inject_throttling():
+        if request.path.startswith('/crm/'):
+            retry_after = throttle.check()
+            if retry_after:
+                response, status = _error('TOO_MANY_REQUESTS', 'API call limit exceeded', 429)
+                response.headers['Retry-After'] = str(retry_after)
+                return response, status
+
+    @app.route('/oauth/v2/token', methods=['POST'])
+    def token():
+        return jsonify({
+            'access_token': f'stub.{int(time.time())}',
+            'api_domain': request.host_url.rstrip('/'),
+            'token_type': 'Bearer',
+            'expires_in': 3600
+        })
+
+    @app.route('/crm/bulk/v8/read', methods=['POST'])
+    def create_bulk_read():
+        body = request.get_json(silent=True) or {}
+        query = body.get('query') or {}
+        module = query.get('module')
+        module = module.get('api_name') if isinstance(module, dict) else module
+        if not get_module(module):
+            return _error('INVALID_DATA', f'Unknown module {module}', 400)
+
+        job = jobs.create(module, query.get('fields') or [], int(query.get('page') or 1),
+                          query.get('criteria'), body.get('callback'))
+        return jsonify({
+            'data': [{
+                'status': 'success',
+                'code': 'ADDED_SUCCESSFULLY',
+                'message': 'Added successfully.',
+                'details': {
+                    'id': job['id'],
+                    'operation': 'read',
+                    'state': 'ADDED',
+                    'created_by': {'id': '1000', 'name': 'Stub User'},
+                    'created_time': job['created_time'].isoformat(timespec='seconds')
+                }
+            }],
+            'info': {}
+        }), 201
+
+    @app.route('/crm/bulk/v8/read/<job_id>', methods=['GET'])
+    def bulk_read_status(job_id):
+        job = jobs.get(job_id)
+        if not job:
+            return _error('INVALID_URL_PATTERN', f'Unknown job {job_id}', 404)
+        return jsonify({'data': [jobs.describe(job)]})
+
+    @app.route('/crm/bulk/v8/read/<job_id>/result', methods=['GET'])
+    def bulk_read_result(job_id):
+        job = jobs.get(job_id)
+        if not job or jobs.state(job) != 'COMPLETED':
+            return _error('RESOURCE_NOT_FOUND', f'No result for job {job_id}', 404)
+        return send_file(job['zip_path'], mimetype='application/zip',
+                         as_attachment=True, download_name=f'{job_id}.zip')
+
+    @app.route('/crm/v8/settings/fields', methods=['GET'])
+    def fields():
+        synthetic = get_module(request.args.get('module'))
+        if not synthetic:
+            return _error('INVALID_MODULE', 'Unknown module', 400)
+        return jsonify({'fields': synthetic.field_metadata()})
+
+    @app.route('/crm/v8/org', methods=['GET'])
+    def org():
+        currency = next(c for c in CURRENCIES if c[0] == base_currency)
+        return jsonify({'org': [{
+            'id': '60000000001',
+            'company_name': 'Stub Org',
+            'currency': currency[2],
+            'currency_symbol': currency[1],
+            'iso_code': currency[0],
+            'time_zone': 'Asia/Kolkata',
+            'country_code': 'IN'
+        }]})
+
+    @app.route('/crm/v8/org/currencies', methods=['GET'])
+    def currencies():
+        home_rate = next(c[3] for c in CURRENCIES if c[0] == base_currency)
+        return jsonify({'currencies': [
+            {
+                'id': str(70000000000 + index),
+                'iso_code': code,
+                'symbol': symbol,
+                'name': name,
+                'exchange_rate': str(round(home_rate / rate, 6)),
+                'is_active': True,
+                'is_base': code == base_currency
+            }
+            for index, (code, symbol, name, rate) in enumerate(CURRENCIES)
+        ]})
+
+    @app.route('/crm/v8/<module>/actions/count', methods=['GET'])
+    def record_count(module):
+        synthetic = get_module(module)
+        if not synthetic:
+            return _error('INVALID_MODULE', 'Unknown module', 400)
+        return jsonify({'count': synthetic.rows})
+
+    @app.route('/crm/v8/<module>', methods=['GET'])
+    def records(module):
+        synthetic = get_module(module)
+        if not synthetic:
+            return _error('INVALID_MODULE', 'Unknown module', 400)
+
+        page = max(1, int(request.args.get('page', 1)))
+        per_page = min(REST_PAGE_SIZE, max(1, int(request.args.get('per_page', REST_PAGE_SIZE))))
+        fields = [f for f in request.args.get('fields', '').split(',') if f] or None
+        # If-Modified-Since lists only the suffix of rows modified after it
+        since = request.headers.get('If-Modified-Since')
+        first = synthetic.first_row_since(since, inclusive=False) if since else 0
+        start = first + (page - 1) * per_page
+        stop = min(start + per_page, synthetic.rows)
+        if start >= stop:
+            return _no_content(304 if since and page == 1 else 204)
+
+        return jsonify({
+            'data': [synthetic.record(i, fields) for i in range(start, stop)],
+            'info': {'per_page': per_page, 'count': stop - start, 'page': page,
+                     'more_records': stop < synthetic.rows}
+        })
+
+    return app
+
+def parse_module(value: str) -> Tuple[str, int]:
+    """Parse a NAME=ROWS module argument"""
+    name, _, rows = value.partition('=')
+    if not name or not rows.isdigit():
+        raise argparse.ArgumentTypeError(f'Expected NAME=ROWS, got {value!r}')
+    return name, int(rows)
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Serve synthetic Zoho CRM data for load testing')
+    parser.add_argument('--module', type=parse_module, action='append', dest='modules',
+                        help='Synthetic module as NAME=ROWS, repeatable '
+                             '(default: Deals=100000 Accounts=20000 Contacts=50000 Leads=50000)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to bind (default: %(default)s)')
+    parser.add_argument('--job-latency', type=float, default=2.0,
+                        help='Seconds before a bulk job completes (default: %(default)s)')
+    parser.add_argument('--rows-per-second', type=float, default=0,
+                        help='Extra job latency per exported row, as a processing rate (default: off)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='Fraction of API requests answered with 429 (default: %(default)s)')
+    parser.add_argument('--requests-per-minute', type=int, default=0,
+                        help='Answer requests above this rate with 429 (default: unlimited)')
+    parser.add_argument('--retry-after', type=int, default=5,
+                        help='Retry-After seconds sent with injected 429s (default: %(default)s)')
+    parser.add_argument('--data-dir', type=Path, help='Directory for generated job results (default: temp dir)')
+    parser.add_argument('--base-currency', default='INR', choices=[c[0] for c in CURRENCIES],
+                        help='Org home currency (default: %(default)s)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the stand-in server"""
+    args = parse_args(argv)
+    module_rows = dict(args.modules or [('Deals', 100000), ('Accounts', 20000),
+                                        ('Contacts', 50000), ('Leads', 50000)])
+    throttle = Throttle(args.throttle_rate, args.requests_per_minute, args.retry_after)
+    app = create_stub_app(module_rows, args.data_dir, args.job_latency, args.rows_per_second,
+                          throttle, args.base_currency)
+
+    logger.info(f"Serving {', '.join(f'{name}={rows}' for name, rows in module_rows.items())} "
+                f"on http://{args.host}:{args.port}")
+    logger.info(f"Point the ingestion path at it with ZOHO_API_BASE_URL=http://{args.host}:{args.port}")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Tests for the Zoho API scheduler
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+import pytest
+from app.core.zoho.api_scheduler import (ApiScheduler, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE,
+                                         RateLimitExceeded, TokenBucket)
+
+@pytest.fixture
+def scheduler():
+    """Scheduler with a small credit pool and one call in flight"""
+    pools = {'crm': {'capacity': 100, 'refill_per_second': 1000}, 'bulk': {'capacity': 2, 'refill_per_second': 100}}
+    return ApiScheduler(pools, max_concurrency=1, max_bulk_jobs=1)
+
+def test_token_bucket_waits_for_refill():
+    """Test the bucket reports how long until enough tokens are available"""
+    bucket = TokenBucket(capacity=10, refill_per_second=5)
+    bucket.take(10)
+    
+    assert bucket.time_until(5) == pytest.approx(1.0, abs=0.05)
+    assert bucket.time_until(0) == 0
+
+def test_track_reports_credits(scheduler):
+    """Test credits are attributed to the refresh making the calls"""
+    with scheduler.track('refresh', PRIORITY_INTERACTIVE) as usage:
+        scheduler.call('bulk_read_create', lambda: 'job')
+        scheduler.call('bulk_read_status', lambda: 'COMPLETED')
+    
+    summary = usage.summary()
+    assert summary['credits'] == {'crm': 51, 'bulk': 1}
+    assert summary['calls'] == {'bulk_read_create': 1, 'bulk_read_status': 1}
+    assert scheduler.totals.summary()['total_calls'] == 2
+
+def test_interactive_calls_run_first(scheduler):
+    """Test waiting interactive calls are admitted before background ones"""
+    order = []
+    release = threading.Event()
+    
+    def blocker():
+        release.wait(5)
+    
+    def caller(label, priority):
+        with scheduler.track(label, priority):
+            scheduler.call('records', order.append, label)
+    
+    holder = threading.Thread(target=scheduler.call, args=('records', blocker))
+    holder.start()
+    time.sleep(0.05)
+    
+    background = threading.Thread(target=caller, args=('background', PRIORITY_BACKGROUND))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=caller, args=('interactive', PRIORITY_INTERACTIVE))
+    interactive.start()
+    time.sleep(0.05)
+    
+    release.set()
+    for thread in (holder, background, interactive):
+        thread.join(5)
+    
+    assert order == ['interactive', 'background']
+
+def test_throttled_call_is_retried(scheduler, monkeypatch):
+    """Test a call rejected with 429 is retried after pausing"""
+    monkeypatch.setattr(scheduler, 'pause', lambda seconds: None)
+    attempts = []
+    
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RateLimitExceeded('throttled', retry_after=0)
+        return 'ok'
+    
+    with scheduler.track('refresh') as usage:
+        assert scheduler.call('records', flaky) == 'ok'
+    
+    assert len(attempts) == 2
+    assert usage.summary()['throttled'] == 1
+
+def test_throttled_sdk_response_is_retried(scheduler, monkeypatch):
+    """Test a 429 SDK response, which the SDK does not raise, is retried"""
+    monkeypatch.setattr(scheduler, 'pause', lambda seconds: None)
+    throttled = Mock()
+    throttled.get_status_code.return_value = 429
+    ok = Mock()
+    ok.get_status_code.return_value = 200
+    
+    func = Mock(side_effect=[throttled, ok])
+    
+    assert scheduler.call('bulk_read_status', func) is ok
+    assert func.call_count == 2
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Tests for Zoho bulk job callbacks
+"""
+
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import Mock
+from app.core.zoho import bulk_callbacks
+from app.core.zoho.bulk_callbacks import (
+    BulkJobNotifier,
+    CALLBACK_ROUTE,
+    create_callback_app,
+    start_callback_server,
+    wait_for_job
+)
+
+@pytest.fixture
+def notifier():
+    """Fresh notifier per test"""
+    return BulkJobNotifier()
+
+@pytest.fixture
+def callback_server(notifier):
+    """Callback receiver running on a free local port"""
+    server = start_callback_server(host='127.0.0.1', port=0, notifier=notifier)
+    yield f'http://127.0.0.1:{server.server_port}{CALLBACK_ROUTE}'
+    server.shutdown()
+
+def _post_later(url, payload, delay=0.2):
+    """Stand-in for Zoho posting the callback after the job finishes"""
+    def post():
+        time.sleep(delay)
+        requests.post(url, json=payload, timeout=5)
+    thread = threading.Thread(target=post)
+    thread.start()
+    return thread
+
+def test_callback_wakes_waiter(notifier, callback_server):
+    """Test the callback cuts the wait short and is confirmed with one status check"""
+    get_status = Mock(return_value='COMPLETED')
+    poster = _post_later(callback_server, {'job_id': '42', 'state': 'COMPLETED'})
+    
+    started = time.monotonic()
+    status = wait_for_job('42', get_status, notifier=notifier, timeout=10, initial_interval=5)
+    poster.join()
+    
+    assert status == 'COMPLETED'
+    assert time.monotonic() - started < 2
+    get_status.assert_called_once_with('42')
+
+def test_callback_failed_job(notifier, callback_server):
+    """Test a failure callback raises"""
+    poster = _post_later(callback_server, {'job_id': '7', 'state': 'FAILED'})
+    
+    with pytest.raises(Exception) as exc:
+        wait_for_job('7', Mock(return_value='FAILED'), notifier=notifier,
+                     timeout=10, initial_interval=5)
+    poster.join()
+        
+    assert 'failed' in str(exc.value)
+
+def test_forged_callback_is_not_trusted(notifier):
+    """Test a callback the job status contradicts neither completes nor fails the wait"""
+    notifier.notify('5', 'FAILED')
+    get_status = Mock(side_effect=['IN PROGRESS', 'COMPLETED'])
+    
+    status = wait_for_job('5', get_status, notifier=notifier, timeout=10, initial_interval=0.01)
+    
+    assert status == 'COMPLETED'
+    assert get_status.call_count == 2
+
+def test_unclaimed_callbacks_expire(notifier, monkeypatch):
+    """Test callbacks for discarded or unknown jobs are not kept forever"""
+    monkeypatch.setattr(bulk_callbacks, 'MAX_CALLBACKS', 3)
+    notifier.discard('1')
+    for job_id in ['1', '2', '3', '4']:
+        notifier.notify(job_id, 'COMPLETED')
+    
+    assert notifier.get_state('1') is None
+    assert notifier.get_state('4') == 'COMPLETED'
+    
+    monkeypatch.setattr(bulk_callbacks, 'UNCLAIMED_CALLBACK_TTL', 0)
+    notifier.notify('5', 'COMPLETED')
+    
+    assert [notifier.get_state(job_id) for job_id in ['2', '3', '4', '5']] == [None, None, None, 'COMPLETED']
+
+def test_polling_fallback_backs_off(notifier):
+    """Test status is polled with a growing interval when no callback arrives"""
+    get_status = Mock(side_effect=['ADDED', 'IN PROGRESS', 'COMPLETED'])
+    
+    status = wait_for_job('9', get_status, notifier=notifier, timeout=10,
+                          initial_interval=0.01, max_interval=0.05)
+    
+    assert status == 'COMPLETED'
+    assert get_status.call_count == 3
+
+def test_polling_timeout(notifier):
+    """Test timeout when the job never finishes"""
+    with pytest.raises(Exception) as exc:
+        wait_for_job('9', Mock(return_value='IN PROGRESS'), notifier=notifier,
+                     timeout=0.1, initial_interval=0.02)
+        
+    assert 'Timeout' in str(exc.value)
+
+def test_callback_requires_job_id(notifier):
+    """Test malformed callbacks are rejected"""
+    client = create_callback_app(notifier).test_client()
+    
+    response = client.post(CALLBACK_ROUTE, json={'state': 'COMPLETED'})
+    
+    assert response.status_code == 400
\ No newline at end of file
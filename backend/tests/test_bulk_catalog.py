@@ -0,0 +1,73 @@
+"""
+Tests for the bulk read result catalog
+"""
+
+import pytest
+from app.core.zoho.bulk_catalog import BulkCatalog, detect_module, header_hash
+
+def _write_csv(path, header, rows):
+    path.write_text('\n'.join([','.join(header), *(','.join(row) for row in rows)]) + '\n')
+    return path
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Catalog with a full Deals export and a later delta"""
+    catalog = BulkCatalog(tmp_path)
+    header = ['id', 'Deal_Name', 'Stage']
+    full = _write_csv(tmp_path / 'bulk_read_111.csv', header, [['1', 'a', 'Won'], ['2', 'b', 'Lost']])
+    delta = _write_csv(tmp_path / 'bulk_read_222.csv', header, [['2', 'b', 'Won']])
+    catalog.register(full, 'Deals', ['111'])
+    catalog.register(delta, 'Deals', ['222'], complete=False)
+    return catalog
+
+def test_register_records_file_facts(catalog, tmp_path):
+    """Test an entry holds the job, fields, schema hash, row count, size and checksum of its file"""
+    entry = catalog.get(tmp_path / 'bulk_read_111.csv')
+    
+    assert entry['module'] == 'Deals'
+    assert entry['job_ids'] == ['111']
+    assert entry['fields'] == ['id', 'Deal_Name', 'Stage']
+    assert entry['schema_hash'] == header_hash(['id', 'Deal_Name', 'Stage'])
+    assert entry['schema_hash'] != header_hash(['id', 'Stage', 'Deal_Name'])
+    assert entry['record_count'] == 2
+    assert entry['size'] == (tmp_path / 'bulk_read_111.csv').stat().st_size
+    assert len(entry['checksum']) == 64
+    assert catalog.get_job('222')['record_count'] == 1
+    assert catalog.get('bulk_read_333.csv') is None
+
+def test_latest_skips_deltas_and_missing_files(catalog, tmp_path):
+    """Test the latest complete file of a module is found, and the manifest is shared through disk"""
+    reopened = BulkCatalog(tmp_path)
+    
+    assert reopened.latest('Deals')['file_path'] == str(tmp_path / 'bulk_read_111.csv')
+    assert reopened.latest('Deals', complete=False)['job_ids'] == ['222']
+    assert reopened.latest('Accounts') is None
+    
+    (tmp_path / 'bulk_read_111.csv').unlink()
+    
+    assert reopened.latest('Deals') is None
+    assert [entry['job_ids'] for entry in reopened.entries('Deals')] == [['111'], ['222']]
+
+def test_verify_detects_changed_files(catalog, tmp_path):
+    """Test a file rewritten after it landed no longer verifies"""
+    path = tmp_path / 'bulk_read_222.csv'
+    
+    assert catalog.verify(path)
+    
+    path.write_text(path.read_text().replace('Won', 'Wan'))
+    
+    assert not catalog.verify(path)
+    with pytest.raises(ValueError):
+        catalog.register(tmp_path.parent / 'elsewhere.csv', 'Deals')
+
+def test_detect_module():
+    """Test the module of an uncatalogued file is the only one with every column of its header"""
+    modules = {
+        'Deals': ['Deal_Name', 'Stage', 'Account_Name', 'Owner'],
+        'Accounts': ['Account_Name', 'Industry', 'Owner']
+    }
+    
+    assert detect_module(['id', 'Deal_Name', 'Account_Name'], modules) == 'Deals'
+    assert detect_module(['id', 'Account_Name', 'Industry'], modules) == 'Accounts'
+    assert detect_module(['id', 'Account_Name', 'Owner'], modules) is None
+    assert detect_module(['id', 'Email'], modules) is None
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Tests for streaming bulk read result handling
+"""
+
+import io
+import zipfile
+import pytest
+from app.core.zoho.bulk_files import iter_chunks, open_csv_member, store_bulk_result
+
+CSV_BODY = b'\xef\xbb\xbfid,Deal_Name,Amount\n1,Alpha,100\n2,Beta,250\n'
+
+def _zip_bytes(name='495490000013182039.csv', body=CSV_BODY):
+    """Build a bulk read style ZIP in memory"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.writestr(name, body)
+    return buffer.getvalue()
+
+def _chunked(data, size=7):
+    """Simulate a streamed response body"""
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+def test_store_zip_result(tmp_path):
+    """Test a ZIP download is spooled and its CSV extracted"""
+    data = _zip_bytes()
+    
+    stored = store_bulk_result(_chunked(data), tmp_path, '42', keep_zip=True, chunk_size=7)
+    
+    assert stored['download_bytes'] == len(data)
+    assert open(stored['file_path'], 'rb').read() == CSV_BODY
+    assert zipfile.is_zipfile(stored['zip_path'])
+    assert not list(tmp_path.glob('*.download*'))
+
+def test_store_plain_csv_result(tmp_path):
+    """Test a non-ZIP download is saved as the CSV itself"""
+    stored = store_bulk_result(_chunked(CSV_BODY), tmp_path, '43')
+    
+    assert open(stored['file_path'], 'rb').read() == CSV_BODY
+    assert stored['zip_path'] is None
+
+def test_store_zip_without_csv(tmp_path):
+    """Test a ZIP without a CSV member is rejected and cleaned up"""
+    with pytest.raises(ValueError):
+        store_bulk_result(_zip_bytes(name='notes.txt'), tmp_path, '44')
+        
+    assert not list(tmp_path.glob('bulk_read_44.download*'))
+
+def test_open_csv_member(tmp_path):
+    """Test the CSV member can be parsed without extraction"""
+    zip_path = tmp_path / 'result.zip'
+    zip_path.write_bytes(_zip_bytes())
+    
+    with open_csv_member(zip_path) as stream:
+        lines = stream.read().splitlines()
+        
+    assert lines[0] == 'id,Deal_Name,Amount'
+    assert len(lines) == 3
+
+def test_iter_chunks_file_object():
+    """Test file objects are read in fixed-size chunks"""
+    chunks = list(iter_chunks(io.BytesIO(b'x' * 10), chunk_size=4))
+    
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Tests for multi-page bulk reads
+"""
+
+import pytest
+from app.core.zoho.bulk_pages import append_csv_pages, read_all_pages, stitch_pages
+
+HEADER = 'id,Last_Name\n'
+
+@pytest.fixture
+def page_reader(tmp_path):
+    """Fake read_page over a module with 5 records and 2 records per page"""
+    records = [f'{i},Lead {i}' for i in range(1, 6)]
+    calls = []
+    
+    def read_page(page):
+        calls.append(page)
+        rows = records[(page - 1) * 2:page * 2]
+        path = tmp_path / f'page_{page}.csv'
+        path.write_text(HEADER + ''.join(row + '\n' for row in rows))
+        return {
+            'page': page,
+            'job_id': str(page),
+            'file_path': str(path),
+            'count': len(rows),
+            'per_page': 2,
+            'more_records': page * 2 < len(records)
+        }
+    
+    read_page.calls = calls
+    return read_page
+
+def test_single_page_module(page_reader):
+    """Test no extra jobs are submitted when page 1 holds everything"""
+    def read_page(page):
+        return {**page_reader(page), 'more_records': False}
+    
+    pages = read_all_pages(read_page, count_records=pytest.fail)
+    
+    assert len(pages) == 1
+
+def test_pages_planned_from_record_count(page_reader):
+    """Test remaining pages are read from the planned page count"""
+    pages = read_all_pages(page_reader, max_concurrency=2, count_records=lambda: 5)
+    
+    assert [page['page'] for page in pages] == [1, 2, 3]
+    assert sorted(page_reader.calls) == [1, 2, 3]
+
+def test_pages_probed_without_record_count(page_reader, tmp_path):
+    """Test pages are probed in windows when the total is unknown"""
+    pages = read_all_pages(page_reader, max_concurrency=3)
+    
+    assert [page['page'] for page in pages] == [1, 2, 3]
+    assert not (tmp_path / 'page_4.csv').exists()
+
+def test_stitch_pages(page_reader, tmp_path):
+    """Test pages are stitched into the first page's file with one header"""
+    pages = read_all_pages(page_reader, max_concurrency=2, count_records=lambda: 5)
+    
+    stitched = stitch_pages(pages)
+    
+    lines = open(stitched['file_path']).read().splitlines()
+    assert lines == ['id,Last_Name'] + [f'{i},Lead {i}' for i in range(1, 6)]
+    assert stitched['record_count'] == 5
+    assert stitched['job_ids'] == ['1', '2', '3']
+    assert not (tmp_path / 'page_2.csv').exists()
+
+def test_append_page_without_trailing_newline(tmp_path):
+    """Test a page ending without a newline does not merge rows"""
+    first = tmp_path / 'first.csv'
+    second = tmp_path / 'second.csv'
+    first.write_text(HEADER + '1,A')
+    second.write_text(HEADER + '2,B\n')
+    
+    append_csv_pages(first, [second])
+    
+    assert first.read_text() == HEADER + '1,A\n2,B\n'
+
+def test_append_rejects_mismatched_header(tmp_path):
+    """Test pages with a different header are rejected"""
+    first = tmp_path / 'first.csv'
+    second = tmp_path / 'second.csv'
+    first.write_text(HEADER + '1,A\n')
+    second.write_text('id,Email\n2,b@example.com\n')
+    
+    with pytest.raises(ValueError):
+        append_csv_pages(first, [second])
\ No newline at end of file
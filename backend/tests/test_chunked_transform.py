@@ -0,0 +1,68 @@
+"""
+Tests for the chunked transform
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.zoho.chunked_transform import (MIN_CHUNK_ROWS, DealPartial, aggregate_csv, chunk_rows,
+                                             count_csv_rows)
+from app.core.zoho.schema import read_typed_csv
+from app.core.zoho.transformers import DataTransformer
+
+@pytest.fixture
+def deals_csv(tmp_path):
+    """Deals export spanning several minimum-size chunks"""
+    rows = 2 * MIN_CHUNK_ROWS + 500
+    rng = np.random.default_rng(7)
+    path = tmp_path / 'Deals.csv'
+    pd.DataFrame({
+        'id': [str(4876876000000000000 + i) for i in range(rows)],
+        'Deal_Name': [f'Deal {i}' for i in range(rows)],
+        'Stage': rng.choice(['Qualification', 'Proposal', 'Closed Won', 'Closed Lost', ''], rows),
+        'Amount': np.where(rng.random(rows) < 0.1, np.nan, rng.integers(100, 50000, rows)),
+        'Closing_Date': rng.choice(['2024-04-10', '2024-05-31', '2025-01-02', ''], rows),
+        'Industry': rng.choice(['Retail', 'Energy', ''], rows),
+        'Account_Type': rng.choice(['Customer', 'Partner'], rows)
+    }).to_csv(path, index=False)
+    return path
+
+def test_chunked_deals_match_full_transform(deals_csv):
+    """Test merged chunk partials give the metrics of a transform of the whole file"""
+    expected = DataTransformer.deal_metrics(read_typed_csv(deals_csv))
+    
+    actual = aggregate_csv(deals_csv, 'Deals', memory_budget_mb=0).metrics()
+    
+    assert actual['total_deals'] == expected['total_deals']
+    assert actual['total_value'] == pytest.approx(expected['total_value'])
+    assert actual['stages'] == expected['stages'] and list(actual['stages']) == list(expected['stages'])
+    assert actual['monthly_trends'] == pytest.approx(expected['monthly_trends'])
+    assert actual['win_rate'] == pytest.approx(expected['win_rate'])
+
+def test_chunked_accounts_match_full_transform(deals_csv):
+    """Test account histograms merge across chunks"""
+    expected = DataTransformer.transform_accounts(read_typed_csv(deals_csv))
+    
+    assert aggregate_csv(deals_csv, 'Accounts', memory_budget_mb=0).metrics() == expected
+
+def test_partials_merge_in_any_split():
+    """Test merging partials of two halves equals the partial of the whole"""
+    deals = pd.DataFrame({'Stage': ['A', 'B', 'A', None], 'Amount': [1.0, 2.0, None, 4.0],
+                          'Closing_Date': ['2024-01-05', '2024-01-20', '2024-02-01', None]})
+    
+    merged = DealPartial.from_frame(deals.iloc[:1]).merge(DealPartial.from_frame(deals.iloc[1:]))
+    
+    assert merged.metrics() == DealPartial.from_frame(deals).metrics()
+    assert merged.months == {'2024-01': [2, 3.0], '2024-02': [1, 0.0]}
+
+def test_chunk_rows_and_row_count(deals_csv, tmp_path):
+    """Test chunks follow the memory budget and records are counted without loading them"""
+    assert chunk_rows(deals_csv, memory_budget_mb=0) == MIN_CHUNK_ROWS
+    assert chunk_rows(deals_csv, memory_budget_mb=1024) > chunk_rows(deals_csv, memory_budget_mb=16)
+    
+    quoted = tmp_path / 'quoted.csv'
+    quoted.write_text('id,Description\n1,"two\nlines"\n2,plain\n')
+    header_only = tmp_path / 'empty.csv'
+    header_only.write_text('id,Description\n')
+    assert count_csv_rows(deals_csv) == 2 * MIN_CHUNK_ROWS + 500
+    assert count_csv_rows(quoted) == 2 and count_csv_rows(header_only) == 0
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Tests for the currency service
+"""
+
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.services.currency_service import FAILED_LOOKUP_TTL_SECONDS, CurrencyService, to_base_amounts
+
+class FakeClient:
+    """Zoho client stub counting currency lookups"""
+    
+    def __init__(self, currencies=None, error=None, base_error=None):
+        self.currencies = currencies or []
+        self.error = error
+        self.base_error = base_error
+        self.calls = 0
+    
+    def get_currencies(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.currencies
+    
+    def get_base_currency(self):
+        if self.base_error:
+            raise self.base_error
+        return {'code': 'EUR', 'symbol': '€', 'name': 'Euro'}
+
+@pytest.fixture
+def client():
+    """Org with USD as base currency, plus INR and SGD"""
+    return FakeClient([
+        {'code': 'USD', 'symbol': '$', 'name': 'US Dollar', 'exchange_rate': 1.0, 'is_base': True},
+        {'code': 'INR', 'symbol': '₹', 'name': 'Indian Rupee', 'exchange_rate': 80.0, 'is_base': False},
+        {'code': 'SGD', 'symbol': 'S$', 'name': 'Singapore Dollar', 'exchange_rate': 1.25, 'is_base': False}
+    ])
+
+def test_to_base_amounts_prefers_record_rates():
+    """Test amounts divide by their own rate, then the org rate of their currency"""
+    amounts = pd.Series([100.0, 800.0, 50.0, 30.0, None])
+    currencies = pd.Series(['USD', 'INR', 'SGD', 'XYZ', 'INR'], dtype='category')
+    exchange_rates = pd.Series([1.0, 100.0, None, None, 80.0])
+    
+    converted = to_base_amounts(amounts, currencies, exchange_rates, {'INR': 80.0, 'SGD': 1.25})
+    
+    np.testing.assert_allclose(converted[:4], [100.0, 8.0, 40.0, 30.0])
+    assert np.isnan(converted[4])
+
+def test_table_is_cached_until_ttl(client):
+    """Test the org currencies are fetched once and reused until they expire"""
+    service = CurrencyService(client)
+    
+    assert service.get_base_currency() == {'code': 'USD', 'symbol': '$', 'name': 'US Dollar'}
+    assert service.get_table()['rates'] == {'USD': 1.0, 'INR': 80.0, 'SGD': 1.25}
+    assert client.calls == 1
+    
+    service.invalidate()
+    service.get_table()
+    assert client.calls == 2
+
+def test_normalize_converts_money_columns(client):
+    """Test every money column of a frame is converted and other columns kept"""
+    records = pd.DataFrame({
+        'Amount': [160.0, 25.0],
+        'Expected_Revenue': [80.0, 5.0],
+        'Probability': [50, 20],
+        'Currency': ['INR', 'SGD'],
+        'Exchange_Rate': [None, 1.25]
+    })
+    
+    normalized = CurrencyService(client).normalize(records)
+    
+    assert normalized['Amount'].tolist() == [2.0, 20.0]
+    assert normalized['Expected_Revenue'].tolist() == [1.0, 4.0]
+    assert normalized['Probability'].tolist() == [50, 20]
+    assert records['Amount'].tolist() == [160.0, 25.0]
+
+def test_failed_lookup_keeps_amounts():
+    """Test orgs whose currencies cannot be fetched fall back to the org currency"""
+    service = CurrencyService(FakeClient(error=RuntimeError('multi-currency disabled')))
+    records = pd.DataFrame({'Amount': [10.0], 'Currency': ['INR']})
+    
+    assert service.get_base_currency()['code'] == 'EUR'
+    assert service.normalize(records)['Amount'].tolist() == [10.0]
+
+def test_failed_lookup_is_retried_soon(client, monkeypatch):
+    """Test a failed lookup is only reused for FAILED_LOOKUP_TTL_SECONDS"""
+    client.error = RuntimeError('rate limited')
+    service = CurrencyService(client)
+    
+    assert service.get_table()['rates'] == {}
+    service.get_table()
+    assert client.calls == 1
+    
+    client.error = None
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + FAILED_LOOKUP_TTL_SECONDS)
+    
+    assert service.get_table()['rates'] == {'USD': 1.0, 'INR': 80.0, 'SGD': 1.25}
+    assert client.calls == 2
+
+def test_failed_base_currency_lookup_uses_default():
+    """Test the org currency falls back to the default when it cannot be fetched either"""
+    service = CurrencyService(FakeClient(error=RuntimeError('multi-currency disabled'),
+                                         base_error=RuntimeError('org unavailable')))
+    
+    assert service.get_base_currency()['code'] == 'USD'
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Tests for the data service
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+import pytest
+from flask import Flask
+from app.core.services.data_service import DataService
+
+@pytest.fixture
+def service(tmp_path):
+    """Service on stand-in Zoho clients, with its data under a temporary directory"""
+    app = Flask(__name__)
+    app.config['DATA'] = {
+        'sync_state_path': str(tmp_path / 'sync_state.json'),
+        'records_dir': str(tmp_path / 'records'),
+        'full_sync_interval_days': 7,
+        'field_cache_dir': str(tmp_path / 'field_cache'),
+        'field_cache_ttl_hours': 24,
+        'currency_cache_ttl_hours': 6,
+        'archive_dir': str(tmp_path / 'archive'),
+        'history_path': str(tmp_path / 'history.sqlite3'),
+        'records_db_path': str(tmp_path / 'records.sqlite3'),
+        'deal_aggregates_path': str(tmp_path / 'aggregates' / 'deals.json')
+    }
+    with app.app_context():
+        yield DataService(Mock(), Mock())
+
+def test_concurrent_refreshes_share_one_run(service):
+    """Test a refresh requested while one runs waits for it and gets its result"""
+    started = threading.Event()
+    runs = []
+    
+    def fetch():
+        runs.append(threading.current_thread().name)
+        started.set()
+        time.sleep(0.2)
+        return {'run': len(runs)}
+    
+    service._fetch_all_data = fetch
+    results = {}
+    first = threading.Thread(target=lambda: results.update(first=service.fetch_all_data()))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.update(second=service.fetch_all_data()))
+    second.start()
+    first.join(5)
+    second.join(5)
+    
+    assert len(runs) == 1
+    assert results == {'first': {'run': 1}, 'second': {'run': 1}}
+    assert service.fetch_all_data() == {'run': 2}
+
+def test_history_failure_does_not_fail_refresh(service):
+    """Test a failing history store leaves the refresh without stage movement"""
+    service.history = Mock(record=Mock(side_effect=Exception('database is locked')),
+                           stage_movement=Mock(side_effect=Exception('database is locked')))
+    
+    assert service._record_history(Mock()) == {}
+    
+    service.history.record = Mock()
+    
+    assert service._record_history(Mock()) == {}
\ No newline at end of file
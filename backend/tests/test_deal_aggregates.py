@@ -0,0 +1,70 @@
+"""
+Tests for incremental deal aggregates
+"""
+
+import pandas as pd
+import pytest
+from app.core.zoho.deal_aggregates import DealAggregates
+from app.core.zoho.transformers import DataTransformer
+
+@pytest.fixture
+def deals():
+    """Deals across two stages and two closing months"""
+    return pd.DataFrame({
+        'id': ['1', '2', '3'],
+        'Stage': ['Closed Won', 'Qualification', 'Qualification'],
+        'Amount': [100.0, 200.0, 300.0],
+        'Closing_Date': ['2024-04-10', '2024-04-20', '2024-05-01']
+    })
+
+@pytest.fixture
+def aggregates(tmp_path, deals):
+    """Aggregates built from the deals"""
+    aggregates = DealAggregates(tmp_path / 'deals.json')
+    aggregates.rebuild(deals)
+    return aggregates
+
+def test_rebuild_matches_full_recompute(aggregates, deals):
+    """Test aggregates built from scratch equal the transformer's metrics"""
+    assert aggregates.metrics() == DataTransformer.deal_metrics(deals)
+
+def test_update_moves_old_contribution(aggregates):
+    """Test an updated deal leaves its old stage and month buckets"""
+    changed = pd.DataFrame({
+        'id': ['2', '4'],
+        'Stage': ['Closed Won', 'Qualification'],
+        'Amount': [250.0, 50.0],
+        'Closing_Date': ['2024-05-15', '2024-05-20']
+    })
+    
+    counts = aggregates.apply(changed, deleted_ids=['3'])
+    metrics = aggregates.metrics()
+    
+    assert counts == {'inserted': 1, 'updated': 1, 'deleted': 1}
+    assert metrics['total_deals'] == 3
+    assert metrics['total_value'] == 400.0
+    assert metrics['stages'] == {'Closed Won': 2, 'Qualification': 1}
+    assert metrics['monthly_trends'] == {'2024-04': 100.0, '2024-05': 300.0}
+
+def test_state_persists(aggregates, tmp_path):
+    """Test saved aggregates are loaded by the next run"""
+    aggregates.high_water_mark = '2024-05-01T10:00:00+05:30'
+    aggregates.save()
+    
+    loaded = DealAggregates(tmp_path / 'deals.json')
+    
+    assert loaded.ready
+    assert loaded.high_water_mark == '2024-05-01T10:00:00+05:30'
+    assert loaded.metrics() == aggregates.metrics()
+    assert loaded.apply(pd.DataFrame({'id': ['1'], 'Stage': ['Lost'], 'Amount': [1.0],
+                                      'Closing_Date': ['2024-04-10']}))['updated'] == 1
+
+def test_reconcile_repairs_drift(aggregates, deals):
+    """Test a full recompute detects and replaces drifted aggregates"""
+    aggregates.stages['Closed Won'] += 1
+    
+    drift = aggregates.reconcile(deals)
+    
+    assert 'stages' in drift
+    assert aggregates.metrics() == DataTransformer.deal_metrics(deals)
+    assert aggregates.reconcile(deals) == {}
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Tests for incremental delta sync
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from app.core.zoho.delta_sync import DeltaSync, RecordStore, SyncState
+
+HEADER = 'id,Deal_Name,Amount,Modified_Time\n'
+
+@pytest.fixture
+def sync(tmp_path):
+    """Delta sync over a temporary state file and record store"""
+    return DeltaSync(SyncState(tmp_path / 'sync_state.json'), RecordStore(tmp_path / 'records'),
+                     full_sync_interval_days=7)
+
+def _export(tmp_path, name, rows):
+    """Write a bulk read style CSV export"""
+    path = tmp_path / name
+    path.write_text(HEADER + ''.join(row + '\n' for row in rows))
+    return str(path)
+
+def test_first_sync_is_full(sync, tmp_path):
+    """Test a module without a watermark gets a full export"""
+    criteria_seen = []
+    
+    def export(criteria):
+        criteria_seen.append(criteria)
+        return _export(tmp_path, 'full.csv', [
+            '1,Alpha,100,2024-03-01T10:00:00+05:30',
+            '2,Beta,200,2024-03-02T10:00:00+05:30'
+        ])
+    
+    stats = sync.sync_module('Deals', export)
+    
+    assert criteria_seen == [None]
+    assert stats['mode'] == 'full'
+    assert stats['total'] == 2
+    assert sync.state.get('Deals')['high_water_mark'] == '2024-03-02T10:00:00+05:30'
+
+def test_delta_merges_by_id(sync, tmp_path):
+    """Test a delta only exports changes and merges them by id"""
+    sync.sync_module('Deals', lambda criteria: _export(tmp_path, 'full.csv', [
+        '1,Alpha,100,2024-03-01T10:00:00+05:30',
+        '2,Beta,200,2024-03-02T10:00:00+05:30'
+    ]))
+    
+    plan = sync.plan('Deals')
+    stats = sync.apply('Deals', plan['mode'], _export(tmp_path, 'delta.csv', [
+        '2,Beta,250,2024-03-05T09:00:00+05:30',
+        '3,Gamma,300,2024-03-05T09:30:00+05:30'
+    ]))
+    
+    assert plan['mode'] == 'delta'
+    assert plan['criteria']['comparator'] == 'greater_equal'
+    assert plan['criteria']['value'] == '2024-03-02T10:00:00+05:30'
+    assert (stats['inserted'], stats['updated'], stats['total']) == (1, 1, 3)
+    
+    records = sync.store.load('Deals').set_index('id')
+    assert records.loc['2', 'Amount'] == 250
+    assert sync.state.get('Deals')['high_water_mark'] == '2024-03-05T09:30:00+05:30'
+
+def test_periodic_full_sync_drops_deleted(sync, tmp_path):
+    """Test the periodic full sync reconciles records deleted in Zoho"""
+    sync.sync_module('Deals', lambda criteria: _export(tmp_path, 'full.csv', [
+        '1,Alpha,100,2024-03-01T10:00:00+05:30',
+        '2,Beta,200,2024-03-02T10:00:00+05:30'
+    ]))
+    
+    plan = sync.plan('Deals', now=datetime.utcnow() + timedelta(days=8))
+    stats = sync.apply('Deals', plan['mode'], _export(tmp_path, 'full2.csv', [
+        '2,Beta,200,2024-03-02T10:00:00+05:30'
+    ]))
+    
+    assert plan['mode'] == 'full'
+    assert stats['deleted'] == 1
+    assert list(sync.store.load('Deals')['id']) == ['2']
+
+def test_empty_delta_keeps_watermark(sync, tmp_path):
+    """Test an empty delta does not move the watermark"""
+    sync.sync_module('Deals', lambda criteria: _export(tmp_path, 'full.csv', [
+        '1,Alpha,100,2024-03-01T10:00:00+05:30'
+    ]))
+    
+    stats = sync.sync_module('Deals', lambda criteria: _export(tmp_path, 'delta.csv', []))
+    
+    assert stats['mode'] == 'delta'
+    assert stats['total'] == 1
+    assert sync.state.get('Deals')['high_water_mark'] == '2024-03-01T10:00:00+05:30'
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Tests for the adaptive fetch strategy
+"""
+
+from unittest.mock import Mock
+import pytest
+from app.core.zoho.delta_sync import modified_since_criteria
+from app.core.zoho.fetch_strategy import (REST_MAX_ROWS, STRATEGY_BULK, STRATEGY_REST, FetchPlanner,
+                                          FetchStats, RestLimitExceeded, read_rest_pages)
+
+@pytest.fixture
+def stats(tmp_path):
+    """Fetch statistics in a temporary directory"""
+    return FetchStats(tmp_path / 'fetch_stats.json')
+
+def page_of(page, size, last_page):
+    """REST page result with records numbered by page"""
+    return {
+        'records': [{'id': f'{page}-{i}'} for i in range(size)],
+        'more_records': page < last_page
+    }
+
+def test_reads_pages_until_last():
+    """Test REST pages are read in order and stop at the last page"""
+    fetch_page = Mock(side_effect=lambda page: page_of(page, 200 if page < 3 else 50, 3))
+
+    records = read_rest_pages(fetch_page, max_concurrency=4)
+
+    assert len(records) == 450
+    assert records[0]['id'] == '1-0'
+    assert records[-1]['id'] == '3-49'
+
+def test_too_many_pages_raise():
+    """Test listings beyond the REST page limit are refused"""
+    fetch_page = Mock(side_effect=lambda page: page_of(page, 200, 100))
+
+    with pytest.raises(RestLimitExceeded):
+        read_rest_pages(fetch_page, max_concurrency=4)
+
+def test_threshold_tunes_from_observations(stats):
+    """Test slow REST reads lower the size up to which REST is chosen"""
+    assert stats.threshold() == REST_MAX_ROWS
+
+    stats.record('Accounts', 'full', STRATEGY_REST, 200, 1.0)
+    stats.record('Accounts', 'full', STRATEGY_REST, 1000, 5.0)
+    stats.record('Deals', 'full', STRATEGY_BULK, 1000, 3.0)
+    stats.record('Deals', 'full', STRATEGY_BULK, 100000, 6.0)
+
+    assert 0 < stats.threshold() < 1000
+    assert FetchStats(stats.path).threshold() == stats.threshold()
+
+def test_planner_picks_by_size(stats):
+    """Test small modules are read through REST and large ones through bulk read"""
+    planner = FetchPlanner(stats, count_records=Mock(return_value=500000))
+
+    assert planner.choose('Accounts', stored_count=150)['strategy'] == STRATEGY_REST
+    assert planner.choose('Deals')['strategy'] == STRATEGY_BULK
+    # Deltas are assumed small until one has been measured
+    assert planner.choose('Deals', modified_since_criteria('2024-01-01T00:00:00+05:30'))['strategy'] == STRATEGY_REST
+
+def test_rest_falls_back_to_bulk(stats):
+    """Test a module too large for REST is read through bulk read and remembered"""
+    planner = FetchPlanner(stats)
+    read_rest = Mock(side_effect=RestLimitExceeded('too large'))
+    read_bulk = Mock(return_value={'file_path': 'deals.csv', 'record_count': 5000})
+    criteria = modified_since_criteria('2024-01-01T00:00:00+05:30')
+
+    result = planner.fetch('Deals', read_rest, read_bulk, criteria=criteria)
+
+    assert result['strategy'] == STRATEGY_BULK
+    read_bulk.assert_called_once_with(criteria)
+    assert planner.choose('Deals', criteria)['strategy'] == STRATEGY_BULK
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Tests for the field metadata cache
+"""
+
+import time
+from unittest.mock import Mock
+import pytest
+from app.core.zoho.field_cache import FieldMetadataCache, schema_hash
+
+FIELDS = [
+    {'api_name': 'Deal_Name', 'data_type': 'text', 'system_field': False, 'read_only': False},
+    {'api_name': 'Amount', 'data_type': 'currency', 'system_field': False, 'read_only': False}
+]
+
+@pytest.fixture
+def cache(tmp_path):
+    """Field cache in a temporary directory"""
+    return FieldMetadataCache(tmp_path / 'field_cache', ttl_seconds=60)
+
+def test_fetches_once_within_ttl(cache):
+    """Test field metadata is only fetched when nothing is cached"""
+    fetch = Mock(return_value=FIELDS)
+    
+    assert cache.get_or_fetch('Deals', fetch) == FIELDS
+    assert cache.get_or_fetch('Deals', fetch) == FIELDS
+    
+    fetch.assert_called_once()
+    assert cache.get('Deals')['schema_hash'] == schema_hash(FIELDS)
+
+def test_refetches_after_expiry(cache, monkeypatch):
+    """Test an expired entry is fetched again"""
+    fetch = Mock(return_value=FIELDS)
+    cache.get_or_fetch('Deals', fetch)
+    
+    later = time.time() + 120
+    monkeypatch.setattr(time, 'time', lambda: later)
+    cache.get_or_fetch('Deals', fetch)
+    
+    assert fetch.call_count == 2
+
+def test_header_mismatch_invalidates(cache):
+    """Test a CSV header with unknown columns drops the cached schema"""
+    cache.put('Deals', FIELDS)
+    
+    assert cache.validate_header('Deals', ['id', 'Deal_Name', 'Amount'])
+    assert cache.get('Deals') is not None
+    
+    assert not cache.validate_header('Deals', ['id', 'Deal_Name', 'Amount', 'Region'])
+    assert cache.get('Deals') is None
+
+def test_invalidate_all(cache):
+    """Test invalidating without a module clears every entry"""
+    cache.put('Deals', FIELDS)
+    cache.put('Accounts', FIELDS)
+    
+    cache.invalidate()
+    
+    assert cache.get('Deals') is None
+    assert cache.get('Accounts') is None
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Tests for the deal history store
+"""
+
+import pytest
+from app.core.services.history_store import HistoryStore, to_timestamp
+from app.models.deal import DealTable
+
+def _deals(*rows):
+    return DealTable.from_records([
+        {'id': deal_id, 'Deal_Name': f'Deal {deal_id}', 'Stage': stage, 'Amount': amount, 'Region': region,
+         'Probability': 50, 'Owner': {'name': 'Ana', 'id': '7'}, 'Modified_Time': modified}
+        for deal_id, stage, amount, region, modified in rows
+    ])
+
+@pytest.fixture
+def history(tmp_path):
+    """Store with three refreshes: a stage change, then an amount change and a removal"""
+    store = HistoryStore(tmp_path / 'history.sqlite3')
+    store.record(_deals(('1', 'Proposal', 100.0, 'APAC', '2024-01-01T00:00:00Z'),
+                        ('2', 'Proposal', 50.0, None, '2024-01-01T00:00:00Z')), '2024-01-01T00:00:00')
+    store.record(_deals(('1', 'Closed Won', 100.0, 'APAC', '2024-01-20T00:00:00Z'),
+                        ('2', 'Proposal', 50.0, None, '2024-01-25T00:00:00Z')), '2024-02-01T00:00:00')
+    store.record(_deals(('1', 'Closed Won', 120.0, 'APAC', '2024-02-10T00:00:00Z')), '2024-03-01T00:00:00')
+    yield store
+    store.close()
+
+def test_record_tracks_changes_only(history):
+    """Test unchanged deals keep their version, even when only untracked fields moved"""
+    result = history.record(_deals(('1', 'Closed Won', 120.0, 'APAC', '2024-03-05T00:00:00Z'),
+                                   ('3', 'Proposal', 10.0, 'EMEA', '2024-03-05T00:00:00Z')), '2024-04-01T00:00:00')
+    
+    assert result == {'refreshed_at': '2024-04-01T00:00:00', 'deals': 2, 'added': 1, 'changed': 0,
+                      'removed': 0, 'stage_changes': 0}
+    assert len(history.deal_timeline('2')) == 1
+    with pytest.raises(ValueError):
+        history.record(_deals(), '2024-03-15T00:00:00')
+
+def test_as_of_queries(history):
+    """Test deals and pipeline totals read as they were at a time"""
+    before = history.deals_as_of('2024-01-15')
+    after = history.deals_as_of('2024-03-15', filters={'stage': ['Closed Won']})
+    
+    assert [(deal['deal_id'], deal['stage']) for deal in before] == [('1', 'Proposal'), ('2', 'Proposal')]
+    assert [(deal['deal_id'], deal['amount']) for deal in after] == [('1', 120.0)]
+    assert history.deals_as_of('2023-12-31') == []
+    assert history.pipeline_as_of('2024-02-15T10:00:00+02:00') == {
+        'as_of': '2024-02-01T00:00:00',
+        'stages': [{'region': 'APAC', 'stage': 'Closed Won', 'count': 1, 'amount': 100.0},
+                   {'region': 'Unassigned', 'stage': 'Proposal', 'count': 1, 'amount': 50.0}]
+    }
+    assert history.pipeline_as_of('2023-12-31') is None
+    with pytest.raises(ValueError):
+        history.deals_as_of('2024-01-15', filters={'modified_time': ['x']})
+
+def test_deal_timeline(history):
+    """Test a deal's versions list their intervals and the fields that changed"""
+    timeline = history.deal_timeline('1')
+    
+    assert [(version['valid_from'], version['valid_to']) for version in timeline] == [
+        ('2024-01-01T00:00:00', '2024-02-01T00:00:00'),
+        ('2024-02-01T00:00:00', '2024-03-01T00:00:00'),
+        ('2024-03-01T00:00:00', None)
+    ]
+    assert timeline[1]['changed'] == ['stage'] and timeline[2]['changed'] == ['amount']
+    assert history.deal_timeline('2')[-1]['valid_to'] == '2024-03-01T00:00:00'
+    assert history.deal_timeline('404') == []
+
+def test_stage_movement(history):
+    """Test stage transitions are counted by region within the period"""
+    assert history.stage_movement('2024-01-15', '2024-02-15') == {
+        'APAC': [{'name': 'Proposal → Closed Won', 'from': 'Proposal', 'to': 'Closed Won', 'count': 1,
+                  'value': 100.0}]
+    }
+    assert history.stage_movement('2024-02-15', '2024-03-15') == {}
+    assert to_timestamp('2024-05-01T09:30:00+05:30') == '2024-05-01T04:00:00'
\ No newline at end of file
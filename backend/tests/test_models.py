@@ -0,0 +1,71 @@
+"""
+Tests for the record models and tables
+"""
+
+import pandas as pd
+import pytest
+from app.models.account import Account, AccountTable
+from app.models.deal import Deal, DealTable
+
+@pytest.fixture
+def records():
+    """Raw Zoho deals, with lookups as the API returns them"""
+    return [
+        {'id': '101', 'Deal_Name': 'Alpha', 'Amount': 100.0, 'Stage': 'Proposal', 'Probability': 50,
+         'Closing_Date': '2024-04-10', 'Account_Name': {'name': 'Acme', 'id': '9'},
+         'Owner': {'name': 'Ana', 'id': '7'}, 'Region': 'APAC', 'Type': 'EN - POC',
+         'Created_Time': '2024-01-31T10:15:00Z', 'Modified_Time': '2024-02-01T08:00:00Z'},
+        {'id': '102', 'Deal_Name': 'Beta', 'Amount': 250.5, 'Stage': 'Closed Won', 'Probability': 100,
+         'Closing_Date': None, 'Account_Name': None, 'Owner': {'name': 'Ben', 'id': '8'}, 'Region': None,
+         'Type': 'NN - MAP', 'Created_Time': None, 'Modified_Time': '2024-02-02T08:00:00+05:30'}
+    ]
+
+def test_models_use_slots():
+    """Test single records carry no per-instance dictionary"""
+    deal = Deal({'id': '1', 'Amount': 10, 'Probability': 20, 'Closing_Date': '2024-04-10'})
+    account = Account({'id': '2', 'Account_Name': 'Acme'})
+    
+    assert not hasattr(deal, '__dict__') and not hasattr(account, '__dict__')
+    assert deal.to_dict()['closing_date'] == '2024-04-10T00:00:00'
+    with pytest.raises(AttributeError):
+        deal.extra = 1
+
+def test_table_to_dict_matches_model(records):
+    """Test vectorized conversion gives the keys and values of Deal.to_dict"""
+    table = DealTable.from_records(records)
+    
+    rows = table.to_dict()
+    
+    assert len(table) == 2
+    assert [list(row) for row in rows] == [list(Deal(records[0]).to_dict())] * 2
+    assert rows[0] == {**Deal(records[0]).to_dict(), 'account_name': 'Acme', 'owner': 'Ana'}
+    assert rows[1]['closing_date'] is None and rows[1]['region'] is None and rows[1]['created_time'] is None
+    assert rows[1]['modified_time'] == '2024-02-02T02:30:00+00:00'
+
+def test_lookup_by_id_and_row_views(records):
+    """Test records are found by id and read lazily through row views"""
+    table = DealTable.from_records(records)
+    
+    deal = table.get('102')
+    
+    assert deal.name == 'Beta' and deal.amount == 250.5 and deal.owner == 'Ben'
+    assert deal.to_dict() == table.to_dict([1])[0]
+    assert table.get('999') is None
+    assert list(table.positions(['102', '101', '999'])) == [1, 0, -1]
+    assert table[-1].stage == 'Closed Won'
+    with pytest.raises(IndexError):
+        table[2]
+
+def test_account_table_from_typed_frame():
+    """Test tables build from typed frames such as read_typed_csv returns"""
+    df = pd.DataFrame({
+        'id': ['1', '2', '3'],
+        'Account_Name': ['Acme', 'Globex', None],
+        'Industry': pd.Categorical(['Retail', 'Retail', 'Energy'])
+    })
+    
+    table = AccountTable.from_frame(df)
+    
+    assert [row['industry'] for row in table.to_dict()] == ['Retail', 'Retail', 'Energy']
+    assert table.to_dict([2])[0]['name'] is None and table[0].website is None
+    assert table.nbytes < df.memory_usage(deep=True).sum()
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Tests for the record repository
+"""
+
+import pandas as pd
+import pytest
+from app.core.services.record_repository import RecordDatabase, record_attributes
+
+def _deals(*rows):
+    return pd.DataFrame([
+        {'id': deal_id, 'Deal_Name': f'Deal {deal_id}', 'Stage': stage, 'Amount': amount, 'Region': region,
+         'Closing_Date': closing_date, 'Owner': 'Ana'}
+        for deal_id, stage, amount, region, closing_date in rows
+    ])
+
+@pytest.fixture
+def database(tmp_path):
+    """Database with four deals loaded in two chunks"""
+    database = RecordDatabase(tmp_path / 'records.sqlite3')
+    database.load('Deals', [
+        _deals(('1', 'Proposal', 100.0, 'APAC', '2024-04-15'), ('2', 'Proposal', 50.0, 'EMEA', '2024-05-01')),
+        _deals(('3', 'Closed Won', 300.0, 'APAC', '2024-06-30'), ('4', 'Proposal', 75.0, 'APAC', None))
+    ], replace=True)
+    yield database
+    database.close()
+
+def test_load_upserts_and_replaces(database):
+    """Test a delta load updates and adds records by id, and a replacing load drops the others"""
+    assert database.loaded('Deals') and not database.loaded('Accounts')
+    
+    result = database.load('Deals', [_deals(('2', 'Closed Won', 60.0, 'EMEA', '2024-05-01'),
+                                            ('5', 'Proposal', 10.0, None, None))])
+    
+    assert result == {'loaded': 2, 'total': 5}
+    assert database.repository('Deals').get('2')['stage'] == 'Closed Won'
+    
+    result = database.load('Deals', [_deals(('9', 'Proposal', 1.0, 'APAC', None))], replace=True)
+    
+    assert result == {'loaded': 1, 'total': 1}
+    assert database.repository('Deals').get('1') is None
+
+def test_find_filters_and_ranges(database):
+    """Test records are found by field values and inclusive ranges, a date bound covering its whole day"""
+    deals = database.repository('Deals')
+    
+    apac = deals.find(filters={'region': ['APAC'], 'stage': ['Proposal', 'Closed Won']})
+    closing = deals.find(ranges={'closing_date': ('2024-05-01', '2024-06-30')})
+    
+    assert sorted(deal['id'] for deal in apac) == ['1', '3', '4']
+    assert sorted(deal['id'] for deal in closing) == ['2', '3']
+    assert deals.count(ranges={'amount': (75, None)}) == 3
+    assert deals.count(filters={'amount': ['100']}) == 1
+
+def test_find_orders_and_pages(database):
+    """Test records are sorted by any field and paged with limit and offset"""
+    deals = database.repository('Deals')
+    
+    largest = deals.find(order_by='amount', limit=2)
+    rest = deals.find(order_by='amount', limit=2, offset=2)
+    
+    assert [deal['id'] for deal in largest] == ['3', '1']
+    assert [deal['id'] for deal in rest] == ['4', '2']
+    assert [deal['id'] for deal in deals.find(order_by='amount', descending=False, limit=1)] == ['2']
+    assert largest[0] == {**largest[0], 'name': 'Deal 3', 'amount': 300.0, 'owner': 'Ana'}
+
+def test_unknown_fields_and_modules(database):
+    """Test queries on fields or modules without a record table are rejected"""
+    deals = database.repository('Deals')
+    
+    with pytest.raises(ValueError):
+        deals.find(filters={'stage; DROP TABLE deals': ['x']})
+    with pytest.raises(ValueError):
+        deals.find(order_by='unknown')
+    with pytest.raises(ValueError):
+        database.repository('Contacts')
+    assert 'closing_date' in record_attributes('Deals')
\ No newline at end of file
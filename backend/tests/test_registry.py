@@ -0,0 +1,57 @@
+"""
+Tests for the Zoho client registry
+"""
+
+import threading
+from unittest.mock import Mock
+import pytest
+import requests
+from zohocrmsdk.src.com.zoho.api.authenticator import oauth_token
+from zohocrmsdk.src.com.zoho.crm.api.util import api_http_connector
+from app.core.zoho.registry import ClientRegistry
+
+@pytest.fixture
+def registry():
+    """Registry that is reset after the test"""
+    registry = ClientRegistry(pool_size=4)
+    yield registry
+    registry.reset()
+
+def test_sdk_initialized_once_across_threads(registry):
+    """Test concurrent callers initialize the SDK a single time"""
+    initializer = Mock()
+    threads = [
+        threading.Thread(target=registry.initialize_sdk, kwargs={'initializer': initializer})
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    initializer.assert_called_once()
+    
+    registry.initialize_sdk(initializer=initializer, force=True)
+    assert initializer.call_count == 2
+
+def test_sdk_shares_session(registry):
+    """Test the SDK connector and token refreshes send requests through the shared session"""
+    session = registry.get_session()
+    
+    assert registry.get_session() is session
+    assert api_http_connector.requests is session
+    assert oauth_token.requests is session
+    
+    registry.reset()
+    assert api_http_connector.requests is requests
+    assert oauth_token.requests is requests
+
+def test_clients_are_reused(registry):
+    """Test every caller gets the same client instance"""
+    factory = Mock(side_effect=lambda: object())
+    
+    first = registry._get_or_create('client', factory)
+    second = registry._get_or_create('client', factory)
+    
+    assert first is second
+    factory.assert_called_once()
\ No newline at end of file
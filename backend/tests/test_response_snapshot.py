@@ -0,0 +1,68 @@
+"""
+Tests for ready-to-serve response snapshots
+"""
+
+import numpy as np
+import pytest
+from flask import Flask, request
+from app.core.services.response_snapshot import ResponseSnapshot, ResponseSnapshotServer, publish_response
+
+@pytest.fixture
+def pointer(tmp_path):
+    """Pointer file of the published generations"""
+    return tmp_path / 'current.response'
+
+def test_publish_and_map(pointer):
+    """Test the body and arrays read back in place from the mapping"""
+    amounts = np.array([1.5, 2.5, 4.0])
+    dates = np.array(['2024-04-01', 'NaT'], dtype='datetime64[ns]')
+    
+    generation = publish_response(pointer, b'{"deals":{}}\n', {'deals.amount': amounts, 'deals.closing_date': dates},
+                                  last_updated='2024-02-02T09:00:00')
+    snapshot = ResponseSnapshot(pointer.with_name(pointer.read_text()))
+    
+    assert generation == snapshot.generation == 1
+    assert bytes(snapshot.body()) == b'{"deals":{}}\n' and snapshot.last_updated == '2024-02-02T09:00:00'
+    assert np.array_equal(snapshot.array('deals.amount'), amounts)
+    assert np.array_equal(snapshot.array('deals.closing_date'), dates, equal_nan=True)
+    assert not snapshot.array('deals.amount').flags.writeable
+    assert snapshot.header['arrays']['deals.amount']['offset'] % 64 == 0
+    with pytest.raises(ValueError):
+        snapshot.array('missing')
+
+def test_server_swaps_generations(pointer):
+    """Test a new generation is served once published while the old one stays readable"""
+    server = ResponseSnapshotServer(pointer)
+    assert server.current() is None
+    publish_response(pointer, b'"first"')
+    first = server.current()
+    old_body = first.body()
+    
+    publish_response(pointer, b'"second"')
+    publish_response(pointer, b'"third"')
+    
+    assert server.current().generation == 3 and bytes(server.current().body()) == b'"third"'
+    assert bytes(old_body) == b'"first"'
+    assert sorted(path.name for path in pointer.parent.iterdir()) == [
+        'current.response', 'current.response.2', 'current.response.3'
+    ]
+
+def test_response_sends_body(pointer):
+    """Test the HTTP response carries exactly the published bytes"""
+    publish_response(pointer, b'{"total": 3}\n', {'deals.amount': np.arange(1000.0)})
+    server = ResponseSnapshotServer(pointer)
+    app = Flask(__name__)
+    app.add_url_rule('/data', 'data', lambda: server.current().response(request.environ))
+    
+    response = app.test_client().get('/data')
+    
+    assert response.data == b'{"total": 3}\n'
+    assert response.mimetype == 'application/json' and response.content_length == 13
+
+def test_rejects_other_files(tmp_path):
+    """Test files that are not generations are refused"""
+    path = tmp_path / 'current.response.1'
+    path.write_bytes(b'{"not": "a generation file at all, just json"}')
+    
+    with pytest.raises(ValueError):
+        ResponseSnapshot(path)
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Tests for the rollup cube
+"""
+
+import pandas as pd
+import pytest
+from app.core.zoho.rollup_cube import RollupCube, fiscal_quarters
+
+@pytest.fixture
+def cube():
+    """Cube over deals in two regions and fiscal years"""
+    return RollupCube.build(pd.DataFrame({
+        'id': ['1', '2', '3', '4'],
+        'Deal_Name': ['Alpha', 'Beta', 'Gamma', 'Delta'],
+        'Region': ['APAC', 'APAC', 'EMEA', None],
+        'Stage': ['Closed Won', 'Proposal', 'Proposal', 'Proposal'],
+        'Owner': ['Ana', 'Ben', 'Ana', 'Ben'],
+        'Type': ['EN - POC', 'NN - MAP', 'EN - POC', None],
+        'Amount': [100.0, 200.0, 300.0, 50.0],
+        'Probability': [100, 50, 20, 10],
+        'Closing_Date': ['2024-04-10', '2025-03-31', '2025-04-01', None]
+    }))
+
+def test_fiscal_quarters_start_in_april():
+    """Test closing dates fall into April-based fiscal quarters"""
+    codes, labels = fiscal_quarters(pd.Series(['2025-03-31', '2024-04-10', '2025-04-01', None]))
+    
+    assert [labels[code] if code >= 0 else None for code in codes] == [
+        '2024-2025 Q4', '2024-2025 Q1', '2025-2026 Q1', None]
+
+def test_query_groups_and_filters(cube):
+    """Test slices are rolled up from cells with every measure"""
+    assert cube.query() == [{'count': 4, 'amount': 650.0, 'weighted_amount': 265.0}]
+    assert cube.query(['region']) == [
+        {'region': 'APAC', 'count': 2, 'amount': 300.0, 'weighted_amount': 200.0},
+        {'region': 'EMEA', 'count': 1, 'amount': 300.0, 'weighted_amount': 60.0},
+        {'region': 'Unassigned', 'count': 1, 'amount': 50.0, 'weighted_amount': 5.0}
+    ]
+    assert cube.query(['owner', 'quarter'], {'stage': 'Proposal', 'region': ['APAC', 'EMEA']}) == [
+        {'owner': 'Ana', 'quarter': '2025-2026 Q1', 'count': 1, 'amount': 300.0, 'weighted_amount': 60.0},
+        {'owner': 'Ben', 'quarter': '2024-2025 Q4', 'count': 1, 'amount': 200.0, 'weighted_amount': 100.0}
+    ]
+
+def test_unknown_dimension_raises(cube):
+    """Test queries on dimensions outside the cube are refused"""
+    with pytest.raises(ValueError):
+        cube.query(['account'])
+
+def test_deals_drill_down(cube):
+    """Test the detail table lists the deals of a slice, largest first"""
+    deals = cube.deals({'stage': 'Proposal'}, limit=2)
+    
+    assert [deal['name'] for deal in deals] == ['Gamma', 'Beta']
+    assert deals[0]['closing_date'] == '2025-04-01T00:00:00'
+    assert deals[0]['region'] == 'EMEA'
+    with pytest.raises(ValueError):
+        cube.deals({'stage': 'Proposal'}, limit=-1)
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Tests for the regional sales aggregates
+"""
+
+from datetime import date
+import pandas as pd
+import pytest
+from app.core.zoho.sales_aggregates import MAX_POTENTIAL_CLOSURES, SalesAggregator, financial_year
+
+@pytest.fixture
+def deals():
+    """Deals across two regions, one without a region"""
+    return pd.DataFrame({
+        'Deal_Name': ['Alpha', 'Beta', 'Gamma', 'Delta'],
+        'Region': ['APAC', 'EMEA', 'APAC', None],
+        'Stage': ['Closed Won', 'Proposal', 'Negotiation', 'Proposal'],
+        'Type': ['EN - POC', 'NN - GenAI', 'Existing Business', None],
+        'Amount': [100.0, 200.0, 300.0, 50.0],
+        'Probability': [100, 75, 80, 10],
+        'Closing_Date': ['2024-04-10', '2024-07-01', '2025-02-15', None]
+    })
+
+def test_regional_pipeline_by_financial_quarter(deals):
+    """Test deals are summed per region and April-based quarter"""
+    result = SalesAggregator.transform_sales(deals)
+    
+    assert result['regional_pipeline']['Q1']['APAC'] == {'value': 100.0, 'count': 1}
+    assert result['regional_pipeline']['Q2']['EMEA'] == {'value': 200.0, 'count': 1}
+    assert result['regional_pipeline']['Q4']['APAC'] == {'value': 300.0, 'count': 1}
+    assert result['regional_pipeline']['Q3']['Unassigned'] == {'value': 0.0, 'count': 0}
+    assert [stage['name'] for stage in result['stage_region_breakdown']['APAC']['stages']] == [
+        'Closed Won', 'Negotiation']
+
+def test_split_projection_and_types(deals):
+    """Test EN/NN split, revenue projection and opportunity types per region"""
+    result = SalesAggregator.transform_sales(deals)
+    
+    assert result['en_nn_split']['APAC']['EN'] == {'value': 400.0, 'count': 2}
+    assert result['en_nn_split']['Unassigned']['NN'] == {'value': 50.0, 'count': 1}
+    assert result['revenue_projection']['APAC'] == {
+        'quota': 0, 'achieved': 100.0, 'projected_80': 340.0, 'projected_all': 340.0}
+    assert result['opportunity_types']['APAC']['POC'] == {'value': 100.0, 'count': 1}
+    assert result['opportunity_types']['EMEA']['GenAI'] == {'value': 200.0, 'count': 1}
+
+def test_potential_closures_are_capped():
+    """Test potential closures list the largest open deals per region"""
+    count = MAX_POTENTIAL_CLOSURES + 5
+    deals = pd.DataFrame({
+        'Deal_Name': [f'Deal {i}' for i in range(count)],
+        'Region': ['APAC'] * count,
+        'Stage': ['Proposal'] * count,
+        'Amount': [float(i) for i in range(count)],
+        'Probability': [90] * count
+    })
+    
+    closures = SalesAggregator.transform_sales(deals)['potential_closures']['APAC']
+    
+    assert len(closures) == MAX_POTENTIAL_CLOSURES
+    assert closures[0] == {'name': f'Deal {count - 1}', 'value': float(count - 1), 'stage': 'Proposal',
+                           'action': 'Follow up on proposal'}
+
+def test_financial_year_starts_in_april():
+    """Test the financial year rolls over on April 1"""
+    assert financial_year(date(2025, 3, 31)) == '2024-2025'
+    assert financial_year(date(2025, 4, 1)) == '2025-2026'
\ No newline at end of file
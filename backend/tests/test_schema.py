@@ -0,0 +1,43 @@
+"""
+Tests for the typed CSV schema
+"""
+
+import pandas as pd
+import pytest
+from app.core.zoho.schema import read_typed_csv
+
+@pytest.fixture
+def deals_csv(tmp_path):
+    """Deals export with picklist, currency, date and datetime columns"""
+    path = tmp_path / 'Deals.csv'
+    pd.DataFrame({
+        'id': ['001', '002', '003'],
+        'Stage': ['Closed Won', 'Qualification', 'Closed Won'],
+        'Amount': ['100.5', '', '300'],
+        'Closing_Date': ['2024-04-01', '2024-05-15', ''],
+        'Modified_Time': ['2024-04-01T10:00:00+05:30', '2024-04-01T10:00:00Z', ''],
+        'Lead_Score': ['7', '8', '9']
+    }).to_csv(path, index=False)
+    return path
+
+def test_default_types(deals_csv):
+    """Test known dashboard columns are typed without field metadata"""
+    df = read_typed_csv(deals_csv)
+    
+    assert df['id'].tolist() == ['001', '002', '003']
+    assert isinstance(df['Stage'].dtype, pd.CategoricalDtype)
+    assert df['Amount'].dtype == 'float64'
+    assert df['Amount'].isna().tolist() == [False, True, False]
+    assert df['Closing_Date'].dtype == 'datetime64[ns]'
+    assert str(df['Modified_Time'].dtype) == 'datetime64[ns, UTC]'
+    assert df['Lead_Score'].dtype == object
+
+def test_metadata_overrides_defaults(deals_csv):
+    """Test field metadata types columns the defaults do not know"""
+    fields = [{'api_name': 'Lead_Score', 'data_type': 'integer'}, {'api_name': 'Stage', 'data_type': 'text'}]
+    
+    df = read_typed_csv(deals_csv, fields, usecols=['id', 'Stage', 'Lead_Score'])
+    
+    assert list(df.columns) == ['id', 'Stage', 'Lead_Score']
+    assert df['Lead_Score'].dtype == 'Int64'
+    assert df['Stage'].dtype == object
\ No newline at end of file
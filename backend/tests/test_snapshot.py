@@ -0,0 +1,94 @@
+"""
+Tests for the columnar snapshot
+"""
+
+import json
+import zipfile
+import pytest
+from app.core.services.snapshot import (META_MEMBER, SNAPSHOT_VERSION, SnapshotReader, export_json,
+                                        read_dashboard_data, write_snapshot)
+from app.models.account import AccountTable
+from app.models.deal import DealTable
+
+@pytest.fixture
+def tables():
+    """Deal and account tables as a refresh builds them"""
+    deals = DealTable.from_records([
+        {'id': '101', 'Deal_Name': 'Alpha', 'Amount': 100.0, 'Stage': 'Proposal', 'Probability': 50,
+         'Closing_Date': '2024-04-10', 'Account_Name': {'name': 'Acme', 'id': '9'},
+         'Owner': {'name': 'Ana', 'id': '7'}, 'Region': 'APAC', 'Type': 'EN - POC',
+         'Created_Time': '2024-01-31T10:15:00Z', 'Modified_Time': '2024-02-01T08:00:00Z'},
+        {'id': '102', 'Deal_Name': 'Beta', 'Amount': 250.5, 'Stage': 'Closed Won', 'Probability': 100,
+         'Closing_Date': None, 'Account_Name': None, 'Owner': {'name': 'Ben', 'id': '8'}, 'Region': None,
+         'Type': 'NN - MAP', 'Created_Time': None, 'Modified_Time': None}
+    ])
+    accounts = AccountTable.from_records([
+        {'id': '9', 'Account_Name': 'Acme', 'Industry': 'Retail', 'Account_Type': 'Customer', 'Website': None}
+    ])
+    return {'deals': deals, 'accounts': accounts}
+
+@pytest.fixture
+def dashboard_data():
+    """Aggregates as served by /api/dashboard-data"""
+    return {'last_updated': '2024-02-02T09:00:00', 'deals': {'total_deals': 2, 'stages': {'Proposal': 1}}}
+
+def test_round_trip(tmp_path, tables, dashboard_data):
+    """Test aggregates and tables read back as they were written"""
+    path = tmp_path / 'current.snapshot'
+    
+    meta = write_snapshot(path, dashboard_data, tables)
+    
+    assert meta['version'] == SNAPSHOT_VERSION and meta['tables']['deals']['rows'] == 2
+    assert read_dashboard_data(path) == dashboard_data
+    with SnapshotReader(path) as reader:
+        assert reader.table('deals').to_dict() == tables['deals'].to_dict()
+        assert reader.table('accounts').to_dict() == tables['accounts'].to_dict()
+    assert not (tmp_path / 'current.snapshot.tmp').exists()
+
+def test_column_selective_load(tmp_path, tables, dashboard_data):
+    """Test single columns load without the rest of the table"""
+    path = tmp_path / 'current.snapshot'
+    write_snapshot(path, dashboard_data, tables)
+    
+    with SnapshotReader(path) as reader:
+        deals = reader.table('deals', ['id', 'amount'])
+        
+        assert list(deals.columns) == ['id', 'amount']
+        assert deals.to_dict() == [{'id': '101', 'amount': 100.0}, {'id': '102', 'amount': 250.5}]
+        assert deals.get('102').amount == 250.5
+        with pytest.raises(ValueError):
+            reader.table('deals', ['missing'])
+        with pytest.raises(ValueError):
+            reader.table('contacts')
+
+def test_rejects_other_versions(tmp_path, dashboard_data):
+    """Test files of another version or format are refused"""
+    path = tmp_path / 'current.snapshot'
+    write_snapshot(path, dashboard_data)
+    with zipfile.ZipFile(path) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+    meta = json.loads(members[META_MEMBER])
+    meta['version'] = SNAPSHOT_VERSION + 1
+    members[META_MEMBER] = json.dumps(meta)
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    not_snapshot = tmp_path / 'other.zip'
+    with zipfile.ZipFile(not_snapshot, 'w') as archive:
+        archive.writestr('data.json', '{}')
+    
+    with pytest.raises(ValueError):
+        read_dashboard_data(path)
+    with pytest.raises(ValueError):
+        read_dashboard_data(not_snapshot)
+
+def test_export_json(tmp_path, tables, dashboard_data):
+    """Test snapshots export to JSON on request, tables included"""
+    path = tmp_path / 'current.snapshot'
+    write_snapshot(path, dashboard_data, tables)
+    
+    export_json(path, tmp_path / 'current-data.json', ['accounts'])
+    
+    exported = json.loads((tmp_path / 'current-data.json').read_text())
+    assert exported['deals'] == dashboard_data['deals']
+    assert exported['tables']['accounts'] == tables['accounts'].to_dict()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Tests for the snapshot archive
+"""
+
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+from app.core.services.snapshot import SnapshotReader, write_snapshot
+from app.core.services.snapshot_archive import SnapshotArchive
+from app.models.deal import DealTable
+
+@pytest.fixture
+def deals():
+    """Deals large enough for deltas to matter"""
+    rows = 20000
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        'id': [str(4876876000000000000 + i) for i in range(rows)],
+        'Deal_Name': [f'Deal {i}' for i in range(rows)],
+        'Amount': rng.integers(100, 50000, rows).astype('float64'),
+        'Stage': rng.choice(['Proposal', 'Closed Won'], rows)
+    })
+
+def _snapshot(path, deals, last_updated):
+    write_snapshot(path, {'last_updated': last_updated}, {'deals': DealTable.from_frame(deals)})
+    return path
+
+def test_unchanged_refresh_is_stored_once(tmp_path, deals):
+    """Test a refresh without changes only adds the members holding timestamps"""
+    archive = SnapshotArchive(tmp_path / 'archive')
+    
+    first = archive.add(_snapshot(tmp_path / 'current.snapshot', deals, '1'))
+    second = archive.add(_snapshot(tmp_path / 'current.snapshot', deals, '2'))
+    
+    assert second['written'] < 1000 < first['written']
+    assert archive.disk_usage() == first['written'] + second['written']
+    assert [entry['id'] for entry in archive.entries()] == [first['id'], second['id']]
+
+def test_changed_rows_are_stored_as_deltas(tmp_path, deals):
+    """Test a few changed rows cost about their size and restore exactly"""
+    archive = SnapshotArchive(tmp_path / 'archive')
+    first = archive.add(_snapshot(tmp_path / 'current.snapshot', deals, '1'))
+    changed = deals.copy()
+    changed.loc[[5, 700, 15000], 'Amount'] += 1.0
+    
+    second = archive.add(_snapshot(tmp_path / 'current.snapshot', changed, '2'))
+    archive.restore(first['id'], tmp_path / 'first.snapshot')
+    archive.restore(second['id'], tmp_path / 'second.snapshot')
+    
+    assert second['written'] < first['written'] / 50
+    with SnapshotReader(tmp_path / 'first.snapshot') as reader:
+        assert reader.dashboard_data() == {'last_updated': '1'}
+        assert np.array_equal(reader.table('deals', ['amount']).column('amount'), deals['Amount'])
+    with SnapshotReader(tmp_path / 'second.snapshot') as reader:
+        assert reader.table('deals').to_dict() == DealTable.from_frame(changed).to_dict()
+
+def test_index_survives_reopening(tmp_path, deals):
+    """Test the index is read back by a new archive instance"""
+    archive = SnapshotArchive(tmp_path / 'archive')
+    entry = archive.add(_snapshot(tmp_path / 'current.snapshot', deals, '1'))
+    
+    reopened = SnapshotArchive(tmp_path / 'archive')
+    reopened.restore(entry['id'], tmp_path / 'restored.snapshot')
+    
+    assert reopened.entries() == archive.entries()
+    with SnapshotReader(tmp_path / 'restored.snapshot') as reader:
+        assert reader.table('deals').to_dict() == DealTable.from_frame(deals).to_dict()
+    with pytest.raises(ValueError):
+        reopened.restore('missing', tmp_path / 'missing.snapshot')
+
+def test_prune_keeps_delta_bases(tmp_path, deals):
+    """Test pruning drops expired snapshots but not blobs a kept delta needs"""
+    archive = SnapshotArchive(tmp_path / 'archive')
+    now = datetime.utcnow()
+    archive.add(_snapshot(tmp_path / 'current.snapshot', deals, '1'), now - timedelta(days=40))
+    changed = deals.assign(Amount=deals['Amount'].where(deals.index != 3, 1.0))
+    kept = archive.add(_snapshot(tmp_path / 'current.snapshot', changed, '2'), now)
+    legacy = tmp_path / 'archive' / 'data_20200101_000000.json'
+    legacy.write_text('{}')
+    
+    archive.prune(retention_days=30)
+    archive.restore(kept['id'], tmp_path / 'restored.snapshot')
+    
+    assert [entry['id'] for entry in archive.entries()] == [kept['id']]
+    assert not legacy.exists()
+    with SnapshotReader(tmp_path / 'restored.snapshot') as reader:
+        assert reader.table('deals', ['amount']).column('amount')[3] == 1.0
\ No newline at end of file
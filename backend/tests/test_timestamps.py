@@ -0,0 +1,51 @@
+"""
+Tests for shared timestamp parsing
+"""
+
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+from app.core.utils.timestamps import parse_date_column, parse_datetime_column, parse_timestamp
+from app.core.utils.validators import validate_date_string
+
+def test_parse_timestamp():
+    """Test single values parse like datetime.fromisoformat with Zoho's Z suffix"""
+    assert parse_timestamp('2024-01-31') == datetime(2024, 1, 31)
+    assert parse_timestamp('2024-01-31T10:15:00Z') == datetime(2024, 1, 31, 10, 15, tzinfo=timezone.utc)
+    assert parse_timestamp('2024-01-31T10:15:00+05:30').utcoffset() == timedelta(hours=5, minutes=30)
+    assert parse_timestamp('not a date') is None
+    assert parse_timestamp(None) is None
+    assert validate_date_string('2024-01-31') and not validate_date_string('31/01/2024')
+
+def test_datetime_column_applies_offsets():
+    """Test Zoho datetimes are shifted to UTC by their own offset"""
+    values = pd.Series(['2024-01-31T10:15:00+05:30', '2024-01-31T10:15:00-08:00', None, 'not a date',
+                        '2024-01-31T10:15:00.250Z'])
+    
+    parsed = parse_datetime_column(values)
+    
+    assert parsed.iloc[0] == pd.Timestamp('2024-01-31T04:45:00Z')
+    assert parsed.iloc[1] == pd.Timestamp('2024-01-31T18:15:00Z')
+    assert parsed.iloc[2:4].isna().all()
+    assert parsed.iloc[4] == pd.Timestamp('2024-01-31T10:15:00.250Z')
+
+def test_datetime_column_malformed_offset():
+    """Test a row with a malformed offset is NaT instead of failing the whole column"""
+    values = pd.Series(['2024-01-31T10:15:00Z', '2024-01-31T10:15:00+05:3x', '2024-01-31T10:15:00X'])
+    
+    parsed = parse_datetime_column(values)
+    
+    assert parsed.iloc[0] == pd.Timestamp('2024-01-31T10:15:00Z')
+    assert parsed.iloc[1:].isna().all()
+
+def test_date_column_parses_repeated_days():
+    """Test repeated dates are parsed once per day and spread over the rows"""
+    values = pd.Series(['2024-04-01', '2024-04-02'] * 10 + [None, '', '2024-04-03T10:00:00+00:00'],
+                       index=range(100, 123))
+    
+    parsed = parse_date_column(values)
+    
+    assert parsed.dtype == 'datetime64[ns]'
+    assert list(parsed.index) == list(values.index)
+    assert parsed.iloc[0] == pd.Timestamp('2024-04-01') and parsed.iloc[19] == pd.Timestamp('2024-04-02')
+    assert parsed.iloc[20:22].isna().all()
+    assert parsed.iloc[22] == pd.Timestamp('2024-04-03T10:00:00')
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Tests for the columnar data transformer
+"""
+
+from unittest.mock import Mock
+import pandas as pd
+import pytest
+from app.core.zoho.transformers import DataTransformer
+
+DEALS = [
+    {'Amount': 100.0, 'Stage': 'Closed Won', 'Closing_Date': '2024-04-10'},
+    {'Amount': 250.0, 'Stage': 'Proposal', 'Closing_Date': '2024-04-28'},
+    {'Amount': None, 'Stage': 'Proposal', 'Closing_Date': '2024-05-02'},
+    {'Amount': 50.0, 'Stage': None, 'Closing_Date': None}
+]
+
+@pytest.fixture
+def deals_frame():
+    """Deals as a DataFrame"""
+    return pd.DataFrame(DEALS)
+
+def test_deal_metrics(deals_frame):
+    """Test totals, stages, win rate and monthly trends of a DataFrame"""
+    result = DataTransformer.transform_deals(deals_frame)
+    
+    assert result['total_deals'] == 4
+    assert result['total_value'] == 400.0
+    assert result['avg_deal_size'] == 100.0
+    assert result['stages'] == {'Proposal': 2, 'Closed Won': 1}
+    assert result['win_rate'] == 25.0
+    assert result['monthly_trends'] == {'2024-04': 350.0, '2024-05': 0.0}
+    assert result['currency']['code'] == 'USD'
+
+def test_legacy_records_match_frame(deals_frame):
+    """Test a list of dicts gives the same metrics as a DataFrame"""
+    assert DataTransformer.transform_deals(DEALS) == DataTransformer.transform_deals(deals_frame)
+
+def test_typed_columns_and_arrow_input(deals_frame):
+    """Test categorical and datetime columns and Arrow tables are used as they are"""
+    typed = deals_frame.astype({'Stage': 'category'})
+    typed['Closing_Date'] = pd.to_datetime(typed['Closing_Date'])
+    table = Mock(to_pandas=Mock(return_value=typed))
+    
+    result = DataTransformer.transform_deals(table)
+    
+    assert result['stages'] == {'Proposal': 2, 'Closed Won': 1}
+    assert result['monthly_trends'] == {'2024-04': 350.0, '2024-05': 0.0}
+    # The caller's frame is not modified
+    assert typed['Closing_Date'].dtype.kind == 'M'
+    assert list(deals_frame['Closing_Date'])[:1] == ['2024-04-10']
+
+def test_accounts_distribution():
+    """Test industry and account type counts of accounts"""
+    accounts = pd.DataFrame({
+        'Industry': ['Banking', 'Retail', 'Banking'],
+        'Account_Type': ['Customer', 'Customer', 'Partner']
+    })
+    
+    result = DataTransformer.transform_accounts(accounts)
+    
+    assert result == {
+        'industry_distribution': {'Banking': 2, 'Retail': 1},
+        'account_types': {'Customer': 2, 'Partner': 1},
+        'total_accounts': 3
+    }
+    assert DataTransformer.transform_accounts([])['total_accounts'] == 0
\ No newline at end of file